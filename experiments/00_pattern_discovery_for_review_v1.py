@@ -4,8 +4,9 @@ Pattern Discovery for Human Review v1
 Specialized script for discovering new geographic patterns that require human validation.
 
 Features:
-1. Enhanced HTML processing with table extraction
-2. Dual spaCy model analysis for confidence validation
+1. Enhanced HTML processing with table extraction (single-pass lxml, cached by content hash)
+2. Dual spaCy model analysis for confidence validation (NER-only, nlp.pipe batches,
+   optional worker processes: --batch-size / --n-process)
 3. Human-readable output with approval checkboxes
 4. Safe pattern addition with term vs alias detection
 5. Conflict resolution for existing patterns
@@ -19,28 +20,33 @@ Usage:
 
 import os
 import sys
-import spacy
 import time
 import json
 import logging
 import re
 import html
+import argparse
 from datetime import datetime
-from typing import List, Dict, Set, Tuple
+from typing import List, Dict, Set, Tuple, Iterable, Iterator, Union, Any, Optional
 from collections import Counter, defaultdict
-from dotenv import load_dotenv
-from pymongo import MongoClient
+import itertools
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from pymongo.errors import ConnectionFailure
-from bs4 import BeautifulSoup
 
-# Load environment variables
-load_dotenv()
+# Cached pipeline module loader (each module executes once per process, from any working directory)
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
+from experiments import load_module
+
+# Shared MongoDB connection manager
+_conn_module = load_module("mongodb_connection_manager")
+get_mongo_client = _conn_module.get_mongo_client
+find_projected = _conn_module.find_projected
+
+# Single-pass lxml description cleaner with content-hash cache
+_cleaner_module = load_module("html_description_cleaner")
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 def get_timestamp():
@@ -61,13 +67,14 @@ def get_timestamp():
 def connect_to_mongodb():
     """Connect to MongoDB Atlas."""
     try:
+        from dotenv import load_dotenv
+        load_dotenv()
         mongodb_uri = os.getenv('MONGODB_URI')
         if not mongodb_uri:
             logger.error("MONGODB_URI not found in environment variables")
             return None, None, None
         
-        client = MongoClient(mongodb_uri, serverSelectionTimeoutMS=10000)
-        client.admin.command('ping')
+        client = get_mongo_client(mongodb_uri)
         
         db = client['deathstar']
         markets_collection = db['markets_raw']
@@ -81,63 +88,9 @@ def connect_to_mongodb():
         return None, None, None
 
 def enhanced_html_cleaning(html_content: str) -> Dict[str, str]:
-    """Enhanced HTML processing with table extraction and proper block separation."""
-    if not html_content:
-        return {"body_text": "", "table_text": "", "combined_text": ""}
-    
-    try:
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Extract table content for structured region data
-        tables = soup.find_all(['table', 'tbody', 'thead'])
-        table_texts = []
-        
-        for table in tables:
-            rows = table.find_all(['tr', 'td', 'th'])
-            for row in rows:
-                cell_text = row.get_text(separator=' | ', strip=True)
-                if cell_text and len(cell_text) > 3:
-                    table_texts.append(cell_text)
-        
-        table_text = " ; ".join(table_texts)
-        
-        # Remove tables for body processing
-        for table in soup.find_all(['table', 'tbody', 'thead']):
-            table.decompose()
-        
-        # Process body with block awareness
-        block_elements = ['div', 'p', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 
-                         'section', 'article', 'blockquote', 'pre']
-        
-        for tag_name in block_elements:
-            for tag in soup.find_all(tag_name):
-                if tag.string:
-                    tag.string.replace_with(f" ; {tag.string} ; ")
-        
-        body_text = soup.get_text(separator=' ; ', strip=True)
-        body_text = html.unescape(body_text)
-        body_text = re.sub(r'\s*;\s*', ' ; ', body_text)
-        body_text = re.sub(r'\s+', ' ', body_text)
-        body_text = body_text.strip()
-        
-        combined_text = f"{body_text} ; {table_text}".strip()
-        
-        return {
-            "body_text": body_text,
-            "table_text": table_text,
-            "combined_text": combined_text
-        }
-        
-    except Exception as e:
-        logger.warning(f"HTML parsing error: {e}")
-        clean_text = html.unescape(html_content)
-        clean_text = re.sub(r'<[^>]+>', ' ; ', clean_text)
-        clean_text = re.sub(r'\s+', ' ', clean_text)
-        return {
-            "body_text": clean_text,
-            "table_text": "",
-            "combined_text": clean_text
-        }
+    """Enhanced HTML processing with table extraction and proper block separation (cached on disk)."""
+    return _cleaner_module.clean_description_html_cached(html_content)
+
 
 def load_existing_patterns(patterns_collection) -> Dict[str, Dict]:
     """Load existing patterns with detailed information for conflict detection."""
@@ -180,32 +133,22 @@ def extract_geographic_entities_with_context(nlp, text: str, source_type: str) -
             'source_type': source_type
         }
     
-    text = text[:150000]
+    text = text[:MAX_TEXT_LENGTH]
     
     try:
         doc = nlp(text)
         entities = []
         entity_counts = Counter()
         
-        for ent in doc.ents:
-            if ent.label_ in ['GPE', 'LOC']:
-                entity_text = ent.text.strip()
-                # Enhanced filtering
-                if (len(entity_text) >= 2 and 
-                    not re.match(r'^[\d\.\s\-\_]+$', entity_text) and
-                    not re.match(r'^[^\w\s]+$', entity_text) and
-                    not entity_text.lower().startswith('scope') and
-                    not re.search(r'\d{4}', entity_text) and
-                    len(entity_text) < 100 and
-                    not entity_text.lower() in ['region', 'country', 'market', 'analysis']):
-                    
-                    entities.append({
-                        'text': entity_text,
-                        'start': ent.start_char,
-                        'end': ent.end_char,
-                        'label': ent.label_
-                    })
-                    entity_counts[entity_text] += 1
+        for ent in _geographic_entities(doc):
+            entity_text = ent.text.strip()
+            entities.append({
+                'text': entity_text,
+                'start': ent.start_char,
+                'end': ent.end_char,
+                'label': ent.label_
+            })
+            entity_counts[entity_text] += 1
         
         return {
             'entities': entities,
@@ -221,14 +164,207 @@ def extract_geographic_entities_with_context(nlp, text: str, source_type: str) -
             'source_type': source_type
         }
 
-def classify_potential_patterns(discovered_entities: Dict, existing_patterns: Dict, existing_terms: Set) -> Dict:
-    """Classify discovered entities as new terms, potential aliases, or existing patterns."""
+# NER-only model loading: discovery needs entities, not tags, parses or lemmas
+DISCOVERY_MODELS = ["en_core_web_md", "en_core_web_lg"]
+NER_EXCLUDED_COMPONENTS = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer"]
+MAX_TEXT_LENGTH = 150000
+GEOGRAPHIC_LABELS = ('GPE', 'LOC')
+
+def load_ner_model(model_name: str):
+    """Load a spaCy pipeline with everything except NER excluded (en_core_web_* NER has its own tok2vec)."""
+    import spacy
+    return spacy.load(model_name, exclude=NER_EXCLUDED_COMPONENTS)
+
+def _is_geographic_candidate(entity_text: str) -> bool:
+    """Filter NER spans that are not plausible geographic pattern candidates."""
+    return (len(entity_text) >= 2 and
+            not re.match(r'^[\d\.\s\-\_]+$', entity_text) and
+            not re.match(r'^[^\w\s]+$', entity_text) and
+            not entity_text.lower().startswith('scope') and
+            not re.search(r'\d{4}', entity_text) and
+            len(entity_text) < 100 and
+            not entity_text.lower() in ['region', 'country', 'market', 'analysis'])
+
+def _geographic_entities(doc) -> List:
+    """GPE/LOC spans of a processed doc that pass candidate filtering."""
+    return [ent for ent in doc.ents
+            if ent.label_ in GEOGRAPHIC_LABELS and _is_geographic_candidate(ent.text.strip())]
+
+def clean_description(doc: Dict) -> Tuple[str, bool]:
+    """
+    Pre-clean one markets_raw description once, for every model that will read it.
+    
+    Returns:
+        (text, from_html) - text is empty when the document has no usable description
+    """
+    description_html = doc.get('report_description_html', '')
+    description_plain = doc.get('report_description_full', '')
+    
+    if description_html:
+        return enhanced_html_cleaning(description_html)['combined_text'], True
+    if description_plain:
+        text = html.unescape(description_plain)
+        text = re.sub(r'<[^>]+>', ' ; ', text)
+        text = re.sub(r'\s+', ' ', text)
+        return text, False
+    return "", False
+
+def count_geographic_entities(nlp, texts: Iterable[str], batch_size: int = 64) -> Counter:
+    """
+    Count geographic entities over texts with nlp.pipe batching.
+    
+    Args:
+        nlp: Loaded spaCy pipeline (NER only)
+        texts: Pre-cleaned texts
+        batch_size: Texts per nlp.pipe batch
+        
+    Returns:
+        Counter of entity text -> occurrences
+    """
+    entity_counts = Counter()
+    texts = (text[:MAX_TEXT_LENGTH] for text in texts if text and len(text) >= 10)
+    for doc in nlp.pipe(texts, batch_size=batch_size):
+        entity_counts.update(ent.text.strip() for ent in _geographic_entities(doc))
+    return entity_counts
+
+# Per-process models for worker pools (loaded once by the pool initializer)
+_worker_models: Dict = {}
+_worker_batch_size = 64
+
+def _init_ner_worker(model_names: List[str], batch_size: int) -> None:
+    """Process pool initializer: load every discovery model once per worker."""
+    global _worker_models, _worker_batch_size
+    _worker_models = {name: load_ner_model(name) for name in model_names}
+    _worker_batch_size = batch_size
+
+def _count_chunk_in_worker(texts: List[str]) -> Dict[str, Counter]:
+    """Run every worker model over one chunk of texts; only the Counters cross the process boundary."""
+    return {name: count_geographic_entities(nlp, texts, _worker_batch_size) for name, nlp in _worker_models.items()}
+
+def _chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """Yield lists of up to size items from any iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+def count_entities_streaming(texts: Iterable[str], models: Union[List[str], Dict[str, Any]],
+                             batch_size: int = 64, n_process: int = 1, chunk_size: int = 512) -> Dict[str, Counter]:
+    """
+    Stream texts through every model and merge per-model entity Counters.
+    
+    With n_process > 1, chunks of texts are fanned out to a process pool whose
+    workers each hold their own NER-only models; only Counters are returned and
+    merged here, and at most 2 * n_process chunks are in flight at once.
+    
+    Args:
+        texts: Pre-cleaned texts (any iterable, consumed lazily)
+        models: Model names/paths, or already-loaded pipelines keyed by name (n_process=1 only)
+        batch_size: nlp.pipe batch size
+        n_process: Worker processes (1 = in-process)
+        chunk_size: Texts per work unit sent to a worker
+        
+    Returns:
+        Dict of model name -> Counter of entity occurrences
+    """
+    model_names = list(models)
+    totals = {name: Counter() for name in model_names}
+    
+    if n_process <= 1:
+        loaded = models if isinstance(models, dict) else {name: load_ner_model(name) for name in model_names}
+        for chunk in _chunked(texts, chunk_size):
+            for name, nlp in loaded.items():
+                totals[name].update(count_geographic_entities(nlp, chunk, batch_size))
+        return totals
+    
+    if isinstance(models, dict):
+        raise ValueError("Worker processes load models by name; pass model names or paths when n_process > 1")
+    
+    with ProcessPoolExecutor(max_workers=n_process, initializer=_init_ner_worker,
+                             initargs=(model_names, batch_size)) as executor:
+        pending = set()
+        for chunk in _chunked(texts, chunk_size):
+            pending.add(executor.submit(_count_chunk_in_worker, chunk))
+            if len(pending) >= 2 * n_process:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for name, counts in future.result().items():
+                        totals[name].update(counts)
+        for future in pending:
+            for name, counts in future.result().items():
+                totals[name].update(counts)
+    
+    return totals
+
+class PatternSubstringIndex:
+    """
+    Substring lookup over existing pattern terms and aliases (lowercased).
+    
+    Queries of NGRAM_SIZE characters or more intersect the posting lists of their
+    character n-grams and verify only the surviving candidates; shorter queries
+    are answered from the set of every short substring. Either way the answer
+    equals scanning every term and alias with 'in'.
+    """
+    
+    NGRAM_SIZE = 3
+    
+    def __init__(self, existing_patterns: Dict):
+        strings = set()
+        for existing_pattern in existing_patterns.values():
+            strings.add(existing_pattern['term'].lower())
+            strings.update(alias.lower() for alias in existing_pattern['aliases'])
+        self.strings = sorted(strings)
+        
+        n = self.NGRAM_SIZE
+        # '' is a substring of any string, so it matches as soon as one string exists
+        self.short_substrings = {""} if self.strings else set()
+        postings = defaultdict(set)
+        for string_id, string in enumerate(self.strings):
+            for length in range(1, n):
+                self.short_substrings.update(string[i:i + length] for i in range(len(string) - length + 1))
+            for i in range(len(string) - n + 1):
+                postings[string[i:i + n]].add(string_id)
+        self.postings = dict(postings)
+    
+    def contains_substring(self, query: str) -> bool:
+        """True when query occurs inside any term or alias."""
+        n = self.NGRAM_SIZE
+        if len(query) < n:
+            return query in self.short_substrings
+        
+        posting_lists = []
+        for gram in {query[i:i + n] for i in range(len(query) - n + 1)}:
+            posting = self.postings.get(gram)
+            if posting is None:
+                return False
+            posting_lists.append(posting)
+        
+        posting_lists.sort(key=len)
+        candidates = set(posting_lists[0])
+        for posting in posting_lists[1:]:
+            candidates &= posting
+            if not candidates:
+                return False
+        return any(query in self.strings[string_id] for string_id in candidates)
+
+def classify_potential_patterns(discovered_entities: Dict, existing_patterns: Dict, existing_terms: Set,
+                                pattern_index: Optional[PatternSubstringIndex] = None) -> Dict:
+    """
+    Classify discovered entities as new terms, potential aliases, or existing patterns.
+    
+    Exact matches use the existing_terms hash set; the "part of an existing term or
+    alias" check uses a PatternSubstringIndex (built here unless one is passed in).
+    """
     classification = {
         'new_terms': [],
         'potential_aliases': [],
         'existing_patterns': [],
         'noise_candidates': []
     }
+    if pattern_index is None:
+        pattern_index = PatternSubstringIndex(existing_patterns)
     
     for entity, count in discovered_entities.items():
         entity_lower = entity.lower()
@@ -239,9 +375,7 @@ def classify_potential_patterns(discovered_entities: Dict, existing_patterns: Di
                 'count': count,
                 'reason': 'already_exists'
             })
-        elif any(entity_lower in existing_pattern['term'].lower() or 
-                any(entity_lower in alias.lower() for alias in existing_pattern['aliases'])
-                for existing_pattern in existing_patterns.values()):
+        elif pattern_index.contains_substring(entity_lower):
             # Potential alias for existing pattern
             classification['potential_aliases'].append({
                 'entity': entity,
@@ -265,20 +399,32 @@ def classify_potential_patterns(discovered_entities: Dict, existing_patterns: Di
     
     return classification
 
-def discover_patterns_for_review(markets_collection, patterns_collection, limit=1000):
-    """Main pattern discovery function with human review preparation."""
-    timestamp = get_timestamp()
+def discover_patterns_for_review(markets_collection, patterns_collection, limit=1000,
+                                 batch_size=64, n_process=1, chunk_size=512, models=None):
+    """
+    Main pattern discovery function with human review preparation.
     
-    # Load spaCy models
-    logger.info("Loading spaCy models...")
-    nlp_md = spacy.load("en_core_web_md", disable=["tagger", "parser", "attribute_ruler", "lemmatizer"])
-    nlp_lg = spacy.load("en_core_web_lg", disable=["tagger", "parser", "attribute_ruler", "lemmatizer"])
+    Descriptions are streamed from the cursor, cleaned once, and run through
+    both NER-only models in nlp.pipe batches (optionally across n_process workers).
+    
+    Args:
+        markets_collection: markets_raw collection
+        patterns_collection: pattern_libraries collection
+        limit: Maximum documents to analyze (0 = all)
+        batch_size: nlp.pipe batch size
+        n_process: Worker processes for NER
+        chunk_size: Texts per worker work unit
+        models: Model names (defaults to DISCOVERY_MODELS: md + lg)
+    """
+    timestamp = get_timestamp()
+    model_names = models or DISCOVERY_MODELS
     
     # Load existing patterns
     existing_patterns, existing_terms = load_existing_patterns(patterns_collection)
     
     # Load documents
-    logger.info(f"Loading {limit} documents for pattern discovery...")
+    logger.info(f"Streaming {limit or 'all'} documents for pattern discovery "
+                f"(batch_size={batch_size}, n_process={n_process})...")
     pipeline = [
         {"$match": {
             "$or": [
@@ -290,45 +436,34 @@ def discover_patterns_for_review(markets_collection, patterns_collection, limit=
             "report_description_html": 1,
             "report_description_full": 1,
             "report_title_short": 1
-        }},
-        {"$limit": limit}
+        }}
     ]
+    if limit:
+        pipeline.append({"$limit": limit})
     
-    cursor = markets_collection.aggregate(pipeline)
-    
-    # Collect all entities
-    all_md_entities = Counter()
-    all_lg_entities = Counter()
-    documents_processed = 0
-    html_processed = 0
-    
-    for doc in cursor:
-        documents_processed += 1
-        
-        # Process description
-        description_html = doc.get('report_description_html', '')
-        description_plain = doc.get('report_description_full', '')
-        
-        if description_html:
-            html_data = enhanced_html_cleaning(description_html)
-            text_to_process = html_data['combined_text']
-            html_processed += 1
-        elif description_plain:
-            text_to_process = html.unescape(description_plain)
-            text_to_process = re.sub(r'<[^>]+>', ' ; ', text_to_process)
-            text_to_process = re.sub(r'\s+', ' ', text_to_process)
-        else:
-            continue
-        
-        # Extract with both models
-        md_results = extract_geographic_entities_with_context(nlp_md, text_to_process, 'description')
-        lg_results = extract_geographic_entities_with_context(nlp_lg, text_to_process, 'description')
-        
-        all_md_entities.update(md_results['entity_counts'])
-        all_lg_entities.update(lg_results['entity_counts'])
-        
-        if documents_processed % 100 == 0:
-            logger.info(f"Processed {documents_processed} documents...")
+    cursor = markets_collection.aggregate(pipeline, batchSize=chunk_size)
+    
+    counters = {'documents_processed': 0, 'html_processed': 0}
+    
+    def cleaned_texts():
+        for doc in cursor:
+            counters['documents_processed'] += 1
+            text, from_html = clean_description(doc)
+            counters['html_processed'] += from_html
+            if counters['documents_processed'] % 1000 == 0:
+                logger.info(f"Cleaned {counters['documents_processed']} documents...")
+            if text:
+                yield text
+    
+    model_counts = count_entities_streaming(cleaned_texts(), model_names, batch_size=batch_size,
+                                            n_process=n_process, chunk_size=chunk_size)
+    all_md_entities = model_counts[model_names[0]]
+    all_lg_entities = model_counts[model_names[-1]] if len(model_names) > 1 else Counter()
+    documents_processed = counters['documents_processed']
+    html_processed = counters['html_processed']
+    cache_stats = _cleaner_module.get_description_cache().get_statistics()
+    logger.info(f"Description cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                f"({cache_stats['hit_rate']:.1%} hit rate)")
     
     # Combine and classify results
     combined_entities = all_md_entities + all_lg_entities
@@ -461,6 +596,15 @@ def generate_pattern_summary(results: Dict, filename: str):
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(
+        description="Discover geographic patterns for human review (batched spaCy NER)"
+    )
+    parser.add_argument('--limit', type=int, default=1000, help='Documents to analyze, 0 for all (default: 1000)')
+    parser.add_argument('--batch-size', type=int, default=64, help='nlp.pipe batch size (default: 64)')
+    parser.add_argument('--n-process', type=int, default=1, help='NER worker processes (default: 1)')
+    parser.add_argument('--chunk-size', type=int, default=512, help='Texts per worker work unit (default: 512)')
+    args = parser.parse_args()
+    
     logger.info("Starting Pattern Discovery for Human Review")
     
     # Connect to MongoDB
@@ -471,7 +615,9 @@ def main():
     
     try:
         # Run pattern discovery
-        results = discover_patterns_for_review(markets_collection, patterns_collection, limit=1000)
+        results = discover_patterns_for_review(markets_collection, patterns_collection, limit=args.limit,
+                                               batch_size=args.batch_size, n_process=args.n_process,
+                                               chunk_size=args.chunk_size)
         
         # Save results
         timestamp = get_timestamp()
@@ -512,4 +658,8 @@ def main():
             logger.info("MongoDB connection closed")
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
     main()
\ No newline at end of file
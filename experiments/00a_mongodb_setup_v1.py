@@ -3,21 +3,89 @@
 import os
 import logging
 from datetime import datetime, timezone
+import sys
+from typing import Dict, List, Any
 from dotenv import load_dotenv
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
-import pytz
+from pymongo import IndexModel
+from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError, OperationFailure
+
+# Cached pipeline module loader (each module executes once per process, from any working directory)
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
+from experiments import load_module
+
+# Shared MongoDB connection manager
+_conn_module = load_module("mongodb_connection_manager")
+get_mongo_client = _conn_module.get_mongo_client
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# markets_processed indexes, derived from the documents PipelineOrchestrator.saveResults writes
+# (_id = processing_id, status, batch_id, confidence_analysis.*, extracted_elements.*) and the queries run on them.
+# Keys follow equality -> sort -> range order; trailing fields let the projected queries be index-only.
+PROCESSED_INDEXES = [
+    {
+        "name": "review_queue",
+        "keys": [("status", 1), ("confidence_analysis.overall_confidence", 1), ("title", 1), ("_id", 1)],
+        "purpose": "Review queue: status equality, lowest confidence first, covered title/_id projection"
+    },
+    {
+        "name": "batch_status",
+        "keys": [("batch_id", 1), ("status", 1)],
+        "purpose": "Per-batch status counts and batch reporting"
+    },
+    {
+        "name": "region_topic",
+        "keys": [("extracted_elements.extracted_regions", 1), ("extracted_elements.topicName", 1)],
+        "purpose": "Reporting by region, optionally narrowed to a topicName (multikey: never covered)"
+    },
+    {
+        "name": "topic_confidence",
+        "keys": [("extracted_elements.topicName", 1), ("confidence_analysis.overall_confidence", -1)],
+        "purpose": "Reporting by topicName, most confident first"
+    },
+]
+
+# Indexes from the original setup on fields saveResults never writes
+STALE_PROCESSED_INDEXES = ["processing_date_-1", "confidence_score_-1", "market_term_type_1"]
+
+# Query shapes the indexes must serve; verify_processed_indexes explains each one
+PROCESSED_QUERY_SHAPES = {
+    "review_queue": {
+        "filter": {"status": "requires_review", "confidence_analysis.overall_confidence": {"$lt": 0.8}},
+        "projection": {"_id": 1, "title": 1, "confidence_analysis.overall_confidence": 1},
+        "sort": [("confidence_analysis.overall_confidence", 1)],
+        "index": "review_queue",
+        "covered": True
+    },
+    "batch_status": {
+        "filter": {"batch_id": "batch_sample", "status": "failed"},
+        "projection": {"_id": 0, "batch_id": 1, "status": 1},
+        "sort": None,
+        "index": "batch_status",
+        "covered": True
+    },
+    "region_topic": {
+        "filter": {"extracted_elements.extracted_regions": "Europe", "extracted_elements.topicName": "sample-topic"},
+        "projection": None,
+        "sort": None,
+        "index": "region_topic",
+        "covered": False
+    },
+    "topic_confidence": {
+        "filter": {"extracted_elements.topicName": "sample-topic"},
+        "projection": None,
+        "sort": [("confidence_analysis.overall_confidence", -1)],
+        "index": "topic_confidence",
+        "covered": False
+    },
+}
+
 def get_timestamps():
     """Generate PDT and UTC timestamps for output files."""
     utc_now = datetime.now(timezone.utc)
+    import pytz
     pdt_tz = pytz.timezone('America/Los_Angeles')
     pdt_now = utc_now.astimezone(pdt_tz)
     
@@ -36,8 +104,7 @@ def connect_to_mongodb():
         return None, None
     
     try:
-        client = MongoClient(mongodb_uri, serverSelectionTimeoutMS=10000)
-        client.admin.command('ping')
+        client = get_mongo_client(mongodb_uri)
         
         db = client['deathstar']
         logger.info("Successfully connected to MongoDB Atlas")
@@ -171,10 +238,8 @@ def create_indexes(db):
         # Index for performance tracking
         db.pattern_libraries.create_index([("success_count", -1)])
         
-        # Index for markets_processed collection (to be used later)
-        db.markets_processed.create_index([("processing_date", -1)])
-        db.markets_processed.create_index([("confidence_score", -1)])
-        db.markets_processed.create_index([("market_term_type", 1)])
+        # Query-shaped indexes for markets_processed
+        ensure_processed_indexes(db)
         
         logger.info("Indexes created successfully")
         return True
@@ -183,6 +248,91 @@ def create_indexes(db):
         logger.error(f"Failed to create indexes: {e}")
         return False
 
+def ensure_processed_indexes(db, collection_name: str = "markets_processed") -> List[str]:
+    """
+    Create the PROCESSED_INDEXES on markets_processed and drop the stale ones.
+    
+    Returns:
+        Names of the indexes created (existing identical indexes are a no-op)
+    """
+    collection = db[collection_name]
+    existing = collection.index_information()
+    for name in STALE_PROCESSED_INDEXES:
+        if name in existing:
+            collection.drop_index(name)
+            logger.info(f"Dropped stale index {collection_name}.{name}")
+    
+    created = collection.create_indexes([IndexModel(spec["keys"], name=spec["name"]) for spec in PROCESSED_INDEXES])
+    logger.info(f"Ensured {len(created)} query-shaped indexes on {collection_name}")
+    return created
+
+def _plan_stages(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten an explain() plan tree into its stages (root first)."""
+    stages = [plan]
+    children = list(plan.get("inputStages", []))
+    if "inputStage" in plan:
+        children.insert(0, plan["inputStage"])
+    for child in children:
+        stages.extend(_plan_stages(child))
+    return stages
+
+def explain_query_shape(collection, shape: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Explain one query shape and summarize its winning plan.
+    
+    Returns:
+        Dictionary with the stages, index used, collection-scan and covered (no FETCH) flags
+    """
+    cursor = collection.find(shape["filter"], shape["projection"])
+    if shape["sort"]:
+        cursor = cursor.sort(shape["sort"])
+    winning_plan = cursor.explain()["queryPlanner"]["winningPlan"]
+    # Slot-based engine nests the classic plan under queryPlan
+    stages = _plan_stages(winning_plan.get("queryPlan", winning_plan))
+    stage_names = [stage["stage"] for stage in stages]
+    index_names = [stage["indexName"] for stage in stages if "indexName" in stage]
+    
+    return {
+        "stages": stage_names,
+        "index": index_names[0] if index_names else None,
+        "collection_scan": "COLLSCAN" in stage_names,
+        "covered": bool(index_names) and "FETCH" not in stage_names,
+        "in_memory_sort": "SORT" in stage_names
+    }
+
+def verify_processed_indexes(db, collection_name: str = "markets_processed") -> Dict[str, Dict[str, Any]]:
+    """
+    Explain every PROCESSED_QUERY_SHAPES query and check it uses its index.
+    
+    A shape passes when its planned index is used without a collection scan
+    or in-memory sort, and, for shapes expected to be covered, without a
+    FETCH stage.
+    
+    Returns:
+        Dictionary of shape name -> explain summary with an 'ok' flag
+    """
+    collection = db[collection_name]
+    report = {}
+    for name, shape in PROCESSED_QUERY_SHAPES.items():
+        try:
+            summary = explain_query_shape(collection, shape)
+        except OperationFailure as e:
+            logger.error(f"  {name}: explain failed: {e}")
+            report[name] = {"ok": False, "error": str(e)}
+            continue
+        
+        summary["ok"] = (summary["index"] == shape["index"] and not summary["collection_scan"]
+                         and not summary["in_memory_sort"] and (summary["covered"] or not shape["covered"]))
+        report[name] = summary
+        
+        plan = " -> ".join(reversed(summary["stages"]))
+        if summary["ok"]:
+            logger.info(f"  {name}: {plan} ({'covered' if summary['covered'] else 'index scan'})")
+        else:
+            logger.warning(f"  {name}: expected {'covered ' if shape['covered'] else ''}use of "
+                           f"{shape['index']}, got {plan}")
+    return report
+
 def verify_setup(db):
     """Verify the MongoDB setup is working correctly."""
     
@@ -215,6 +365,13 @@ def verify_setup(db):
         
         logger.info(f"  Sample compound regions: {[item['term'] for item in sample_geo]}")
         
+        # Query plans for markets_processed
+        logger.info("markets_processed query plans:")
+        plan_report = verify_processed_indexes(db)
+        if not all(summary["ok"] for summary in plan_report.values()):
+            logger.error("markets_processed queries are not served by their indexes")
+            return False
+        
         return True
         
     except Exception as e:
@@ -249,6 +406,7 @@ def main():
                 logger.info("Cleared existing pattern libraries")
             else:
                 logger.info("Keeping existing data, skipping initialization")
+                create_indexes(db)
                 verify_setup(db)
                 return
         
@@ -283,4 +441,8 @@ def main():
             client.close()
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
     main()
\ No newline at end of file
@@ -7,22 +7,33 @@ Created for Market Research Title Parser project.
 """
 
 import os
+import re
 import logging
 import time
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Union
 from dataclasses import dataclass
 from enum import Enum
-from dotenv import load_dotenv
-from pymongo import MongoClient, ASCENDING, DESCENDING
+import sys
+from pymongo import ASCENDING, DESCENDING
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError, DuplicateKeyError
-import pytz
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# Cached pipeline module loader (each module executes once per process, from any working directory)
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
+from experiments import load_module
+
+# Shared MongoDB connection manager
+_conn_module = load_module("mongodb_connection_manager")
+get_mongo_client = _conn_module.get_mongo_client
+get_connection_string = _conn_module.get_connection_string
+resolve_projection = _conn_module.resolve_projection
+
+# Regex linter applied to stored patterns at load time
+_linter_module = load_module("regex_pattern_linter")
+get_pattern_linter = _linter_module.get_pattern_linter
+
 logger = logging.getLogger(__name__)
 
 class PatternType(Enum):
@@ -59,6 +70,80 @@ class Pattern:
     created_date: Optional[datetime] = None
     last_updated: Optional[datetime] = None
 
+# Fields that distinguish otherwise identical terms within a pattern type
+DUPLICATE_SUBTYPE_FIELDS = ("format_type", "entity_type", "processing_type")
+
+def duplicate_group_pipeline(match: Optional[Dict[str, Any]] = None,
+                             group_by_subtype: bool = True) -> List[Dict[str, Any]]:
+    """
+    Aggregation pipeline grouping pattern documents on (type, subtype, trimmed lowercase term).
+
+    Only the group key, document IDs and distinct raw terms leave the server.
+    """
+    subtype: Any = None
+    for field in reversed(DUPLICATE_SUBTYPE_FIELDS):
+        subtype = {"$ifNull": [f"${field}", subtype]}
+    key = {
+        "type": "$type",
+        "term": {"$trim": {"input": {"$toLower": {"$ifNull": ["$term", ""]}}}}
+    }
+    if group_by_subtype:
+        key["subtype"] = subtype
+
+    pipeline = [{"$match": match}] if match else []
+    pipeline.extend([
+        {"$project": {"type": 1, "term": 1, **{field: 1 for field in DUPLICATE_SUBTYPE_FIELDS}}},
+        {"$group": {"_id": key, "count": {"$sum": 1}, "ids": {"$push": "$_id"}, "terms": {"$addToSet": "$term"}}},
+        {"$sort": {"_id.type": ASCENDING, "_id.term": ASCENDING}}
+    ])
+    return pipeline
+
+def canonical_term_key(term: str) -> str:
+    """Case, whitespace and punctuation insensitive key ('Market  Report', 'market-report' -> 'market report')."""
+    term = (term or "").lower().replace("&", " and ")
+    return " ".join(re.sub(r"[\W_]+", " ", term).split())
+
+def merge_duplicate_groups(groups: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Split server-side groups into exact and near duplicates.
+
+    Exact duplicates share a normalized term (one server group with several
+    documents); near duplicates are separate server groups whose terms collapse
+    to the same canonical_term_key within a type (and subtype). duplicate_groups
+    holds every canonical group with more than one document (both kinds merged).
+    """
+    exact = []
+    by_canonical: Dict[tuple, List[Dict[str, Any]]] = {}
+    for group in groups:
+        key = group["_id"]
+        if group["count"] > 1:
+            exact.append(group)
+        canonical = (key.get("type"), key.get("subtype"), canonical_term_key(key.get("term")))
+        by_canonical.setdefault(canonical, []).append(group)
+
+    near, combined = [], []
+    for (pattern_type, subtype, canonical), variants in by_canonical.items():
+        group = {
+            "type": pattern_type,
+            "subtype": subtype,
+            "canonical_term": canonical,
+            "count": sum(variant["count"] for variant in variants),
+            "terms": sorted({term for variant in variants for term in variant["terms"]}),
+            "ids": [doc_id for variant in variants for doc_id in variant["ids"]]
+        }
+        if len(variants) > 1:
+            near.append(group)
+        if group["count"] > 1:
+            combined.append(group)
+
+    return {
+        "exact_duplicates": exact,
+        "near_duplicates": near,
+        "duplicate_groups": combined,
+        "total_duplicate_terms": len(combined),
+        "total_duplicate_documents": sum(group["count"] for group in combined)
+    }
+
 class PatternLibraryManager:
     """
     MongoDB-based pattern library manager with CRUD operations and performance tracking.
@@ -67,16 +152,21 @@ class PatternLibraryManager:
     including geographic entities, market terms, date patterns, and report types.
     """
     
-    def __init__(self, connection_string: Optional[str] = None, database_name: str = "deathstar"):
+    def __init__(self, connection_string: Optional[str] = None, database_name: str = "deathstar",
+                 lint_patterns: bool = True):
         """
         Initialize the Pattern Library Manager.
         
         Args:
             connection_string: MongoDB connection string (from env if not provided)
             database_name: Name of the MongoDB database
+            lint_patterns: If True, regexes that fail the pattern linter are quarantined
+                           (left out of get_patterns results)
         """
         self.connection_string = connection_string or self._get_connection_string()
         self.database_name = database_name
+        self.lint_patterns = lint_patterns
+        self.quarantined_patterns = {}  # pattern id -> PatternLintResult
         self.client = None
         self.db = None
         self.collection = None
@@ -88,17 +178,12 @@ class PatternLibraryManager:
     
     def _get_connection_string(self) -> str:
         """Get MongoDB connection string from environment variables."""
-        load_dotenv()
-        mongodb_uri = os.getenv('MONGODB_URI')
-        if not mongodb_uri:
-            raise ValueError("MONGODB_URI not found in environment variables")
-        return mongodb_uri
+        return get_connection_string()
     
     def _connect(self) -> None:
-        """Establish connection to MongoDB."""
+        """Attach to the shared MongoDB client for this process."""
         try:
-            self.client = MongoClient(self.connection_string, serverSelectionTimeoutMS=10000)
-            self.client.admin.command('ping')
+            self.client = get_mongo_client(self.connection_string)
             self.db = self.client[self.database_name]
             self.collection = self.db.pattern_libraries
             logger.info(f"Connected to MongoDB database: {self.database_name}")
@@ -109,6 +194,7 @@ class PatternLibraryManager:
     def _get_timestamps(self) -> tuple:
         """Generate PDT and UTC timestamps."""
         utc_now = datetime.now(timezone.utc)
+        import pytz
         pdt_tz = pytz.timezone('America/Los_Angeles')
         pdt_now = utc_now.astimezone(pdt_tz)
         
@@ -152,7 +238,7 @@ class PatternLibraryManager:
             use_cache: If True, use cached data when available
             
         Returns:
-            List of pattern documents
+            List of pattern documents (fields of the shared 'pattern' projection)
         """
         cache_key = f"patterns_{pattern_type.value}_{active_only}"
         
@@ -166,7 +252,9 @@ class PatternLibraryManager:
             if active_only:
                 query["active"] = True
             
-            patterns = list(self.collection.find(query).sort("priority", ASCENDING))
+            patterns = list(self.collection.find(query, resolve_projection('pattern')).sort("priority", ASCENDING))
+            if self.lint_patterns:
+                patterns = self.filter_unsafe_patterns(patterns)
             
             # Cache the results
             if use_cache:
@@ -179,6 +267,21 @@ class PatternLibraryManager:
             logger.error(f"Failed to retrieve patterns: {e}")
             raise
     
+    def filter_unsafe_patterns(self, patterns: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Drop documents whose regex fails the pattern linter (see 00h_regex_pattern_linter_v1.py).
+        
+        Args:
+            patterns: Pattern documents as loaded from the collection
+            
+        Returns:
+            Documents safe for the extraction hot path; offenders are kept in quarantined_patterns
+        """
+        safe, quarantined = get_pattern_linter().filter_documents(patterns)
+        for result in quarantined:
+            self.quarantined_patterns[result.pattern_id] = result
+        return safe
+    
     def get_patterns_by_priority(self, pattern_type: PatternType, 
                                 priority: int, active_only: bool = True) -> List[Dict[str, Any]]:
         """
@@ -242,6 +345,11 @@ class PatternLibraryManager:
             # Add pattern-specific fields
             pattern_doc.update(kwargs)
             
+            duplicates = self.find_term_duplicates(pattern_type, term)
+            if duplicates:
+                logger.warning(f"Adding {pattern_type.value} pattern '{term}' that duplicates "
+                               f"{[(str(doc['_id']), doc.get('term')) for doc in duplicates]}")
+            
             result = self.collection.insert_one(pattern_doc)
             pattern_id = str(result.inserted_id)
             
@@ -284,6 +392,8 @@ class PatternLibraryManager:
                 # Invalidate all cache since we don't know the pattern type
                 self._invalidate_cache()
                 logger.info(f"Updated pattern {pattern_id}")
+                if "term" in updates:
+                    self._warn_term_duplicates(ObjectId(pattern_id), updates["term"])
                 return True
             else:
                 logger.warning(f"No pattern found with ID {pattern_id}")
@@ -293,6 +403,17 @@ class PatternLibraryManager:
             logger.error(f"Failed to update pattern: {e}")
             raise
     
+    def _warn_term_duplicates(self, object_id, term: str) -> None:
+        """Log other patterns of the same type that the renamed term duplicates."""
+        doc = self.collection.find_one({"_id": object_id}, {"type": 1})
+        if not doc or doc.get("type") not in {member.value for member in PatternType}:
+            return
+        duplicates = [dup for dup in self.find_term_duplicates(PatternType(doc["type"]), term)
+                      if dup["_id"] != object_id]
+        if duplicates:
+            logger.warning(f"Pattern {object_id} term '{term}' duplicates "
+                           f"{[(str(dup['_id']), dup.get('term')) for dup in duplicates]}")
+    
     def delete_pattern(self, pattern_id: str) -> bool:
         """
         Delete a pattern from the library.
@@ -557,6 +678,61 @@ class PatternLibraryManager:
             logger.error(f"Failed to get top performing patterns: {e}")
             raise
     
+    def find_duplicate_patterns(self, pattern_type: Optional[PatternType] = None,
+                                group_by_subtype: bool = True) -> Dict[str, Any]:
+        """
+        Audit the library for duplicate and near-duplicate terms.
+        
+        Grouping runs server-side (see duplicate_group_pipeline); only group keys
+        and IDs are transferred, then a client-side canonical-key pass merges
+        case/whitespace/punctuation variants.
+        
+        Args:
+            pattern_type: If provided, audit only this pattern type
+            group_by_subtype: If False, group on (type, term) only
+            
+        Returns:
+            Dictionary with 'exact_duplicates', 'near_duplicates', 'duplicate_groups' and totals
+        """
+        try:
+            match = {"type": pattern_type.value} if pattern_type else None
+            groups = list(self.collection.aggregate(duplicate_group_pipeline(match, group_by_subtype),
+                                                    allowDiskUse=True))
+            audit = merge_duplicate_groups(groups)
+            logger.info(f"Duplicate audit: {len(audit['exact_duplicates'])} exact and "
+                        f"{len(audit['near_duplicates'])} near-duplicate term groups "
+                        f"({audit['total_duplicate_documents']} documents)")
+            return audit
+            
+        except Exception as e:
+            logger.error(f"Failed to audit duplicate patterns: {e}")
+            raise
+    
+    def find_term_duplicates(self, pattern_type: PatternType, term: str) -> List[Dict[str, Any]]:
+        """
+        Find patterns of a type whose term is a (near-)duplicate of the given term.
+        
+        The server matches candidates with an anchored case-insensitive regex over
+        the term's words, so a single pattern change is audited without a library scan.
+        
+        Args:
+            pattern_type: Type of the changed pattern
+            term: Term to check
+            
+        Returns:
+            List of matching pattern documents (_id, term and subtype fields)
+        """
+        canonical = canonical_term_key(term)
+        if not canonical:
+            return []
+        # Prefilter only: a superset of the canonical matches, verified below
+        words = ["(?:and|&)" if word == "and" else re.escape(word) for word in canonical.split()]
+        term_regex = r"^[\W_]*" + r"[\W_]*".join(words) + r"[\W_]*$"
+        projection = {"term": 1, **{field: 1 for field in DUPLICATE_SUBTYPE_FIELDS}}
+        candidates = self.collection.find({"type": pattern_type.value,
+                                           "term": {"$regex": term_regex, "$options": "i"}}, projection)
+        return [doc for doc in candidates if canonical_term_key(doc.get("term")) == canonical]
+    
     def validate_pattern_format(self, pattern_type: PatternType, pattern_data: Dict[str, Any]) -> List[str]:
         """
         Validate pattern data format and return any errors.
@@ -594,10 +770,17 @@ class PatternLibraryManager:
         return errors
     
     def close_connection(self) -> None:
-        """Close the MongoDB connection."""
+        """
+        Release this manager's handle on the MongoDB connection.
+        
+        The underlying client is shared process-wide (see 00e_mongodb_connection_manager_v1.py)
+        and stays open for other components; close_all_clients() closes it at process exit.
+        """
         if self.client:
-            self.client.close()
-            logger.info("MongoDB connection closed")
+            self.client = None
+            self.db = None
+            self.collection = None
+            logger.info("MongoDB connection released")
 
 
 def demo_usage():
@@ -654,4 +837,8 @@ def demo_usage():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
     demo_usage()
\ No newline at end of file
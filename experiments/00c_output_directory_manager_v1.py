@@ -7,7 +7,6 @@ with YYYY/MM/DD structure and consistent naming conventions.
 """
 
 import os
-import pytz
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -49,6 +48,7 @@ def create_organized_output_directory(
             project_root = Path.cwd()
     
     # Create timestamp in Pacific Time (as per project standards)
+    import pytz
     pdt = pytz.timezone('America/Los_Angeles')
     now = datetime.now(pdt)
     
@@ -83,6 +83,7 @@ def create_output_file_header(script_name: str, description: str = "") -> str:
     Returns:
         str: Formatted header string with PDT and UTC timestamps
     """
+    import pytz
     pdt = pytz.timezone('America/Los_Angeles')
     utc = pytz.timezone('UTC')
     
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+
+"""
+Title Deduplicator v1.0
+Pre-processing deduplication stage that runs ahead of the Pipeline Orchestrator.
+Groups source documents by normalized report_title_short so each unique title is
+processed once, then fans the result back out to every source _id on write.
+Created for Market Research Title Parser project.
+"""
+
+import os
+import re
+import sys
+import logging
+import unicodedata
+from typing import Dict, List, Optional, Any, Iterable, Iterator, Tuple
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+
+def normalize_title(title: Optional[str]) -> str:
+    """
+    Build the deduplication key for a title.
+
+    Applies NFKC normalization (folds non-breaking spaces and full-width
+    characters), collapses whitespace runs, trims and case-folds. Punctuation
+    is left untouched because it is significant to the extractors
+    (e.g. "U.S." vs "US", "&" vs "And").
+
+    Args:
+        title: Raw title text
+
+    Returns:
+        Normalized key ("" for empty or missing titles)
+    """
+    if not title:
+        return ""
+    normalized = unicodedata.normalize('NFKC', title)
+    normalized = _WHITESPACE_PATTERN.sub(' ', normalized).strip()
+    return normalized.casefold()
+
+
+@dataclass
+class TitleGroup:
+    """All source documents that share one normalized title."""
+    normalized_title: str
+    representative_title: str  # First-seen raw title, sent through the pipeline
+    source_ids: List[Any] = field(default_factory=list)
+    source_titles: List[str] = field(default_factory=list)  # Raw title per source _id
+
+    @property
+    def size(self) -> int:
+        return len(self.source_ids)
+
+
+@dataclass
+class DeduplicationStats:
+    """Statistics for a deduplication pass."""
+    total_documents: int
+    unique_titles: int
+    duplicate_documents: int
+    skipped_documents: int
+    exact_duplicates: int
+    variant_duplicates: int
+    dedup_ratio: float  # total_documents / unique_titles (1.0 = no duplicates)
+    duplicate_percentage: float
+    largest_group_size: int
+
+
+class DeduplicationResult:
+    """
+    Output of TitleDeduplicator.group_documents().
+
+    Groups are kept in first-seen order so that results produced for
+    unique_titles() line up positionally with groups.
+    """
+
+    def __init__(self, groups: List[TitleGroup], stats: DeduplicationStats):
+        self.groups = groups
+        self.stats = stats
+
+    def unique_titles(self) -> List[str]:
+        """Representative raw title for each group, in group order."""
+        return [group.representative_title for group in self.groups]
+
+    def fan_out(self, documents: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Expand one processed document per group into one document per source _id.
+
+        Args:
+            documents: Processed documents aligned with self.groups
+
+        Yields:
+            Copy of the group's document keyed by each source _id, carrying that
+            source's own raw title as original_title. processing_id is set to the
+            same source _id, so every markets_processed document keeps _id ==
+            processing_id (as saveResults writes them); the id the group was
+            processed under is kept as dedup_processing_id.
+        """
+        if len(documents) != len(self.groups):
+            raise ValueError(
+                f"Expected {len(self.groups)} processed documents for fan-out, got {len(documents)}"
+            )
+
+        for group, document in zip(self.groups, documents):
+            for source_id, source_title in zip(group.source_ids, group.source_titles):
+                fanned = dict(document)
+                fanned['_id'] = source_id
+                fanned['processing_id'] = source_id
+                fanned['dedup_processing_id'] = document.get('processing_id')
+                fanned['original_title'] = source_title
+                fanned['dedup_key'] = group.normalized_title
+                fanned['dedup_group_size'] = group.size
+                yield fanned
+
+    def build_bulk_operations(self, documents: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Build upsert operations that write every fanned-out document in one bulk_write.
+
+        Args:
+            documents: Processed documents aligned with self.groups
+
+        Returns:
+            List of pymongo ReplaceOne operations (upsert on source _id)
+        """
+        from pymongo import ReplaceOne
+
+        return [
+            ReplaceOne({'_id': fanned['_id']}, fanned, upsert=True)
+            for fanned in self.fan_out(documents)
+        ]
+
+    def get_report(self) -> str:
+        """Human-readable dedup summary."""
+        stats = self.stats
+        return (
+            f"Deduplication Summary\n"
+            f"{'=' * 40}\n"
+            f"  Source documents:     {stats.total_documents:,}\n"
+            f"  Unique titles:        {stats.unique_titles:,}\n"
+            f"  Duplicate documents:  {stats.duplicate_documents:,} ({stats.duplicate_percentage:.2f}%)\n"
+            f"    Exact duplicates:   {stats.exact_duplicates:,}\n"
+            f"    Case/space variants:{stats.variant_duplicates:,}\n"
+            f"  Skipped (no title):   {stats.skipped_documents:,}\n"
+            f"  Dedup ratio:          {stats.dedup_ratio:.4f}x\n"
+            f"  Largest group:        {stats.largest_group_size:,}\n"
+        )
+
+
+class TitleDeduplicator:
+    """
+    Groups source documents by normalized title ahead of pipeline processing.
+
+    Work downstream of this stage scales with the number of unique titles
+    rather than the number of source rows.
+    """
+
+    def __init__(self, title_field: str = 'report_title_short', id_field: str = '_id'):
+        """
+        Initialize the Title Deduplicator.
+
+        Args:
+            title_field: Document field holding the title
+            id_field: Document field holding the source identifier. Documents
+                      without it (e.g. JSON exports) fall back to their position
+                      in the input stream.
+        """
+        self.title_field = title_field
+        self.id_field = id_field
+
+    def group_documents(self, documents: Iterable[Dict[str, Any]]) -> DeduplicationResult:
+        """
+        Group source documents by normalized title in a single pass.
+
+        Args:
+            documents: Iterable of source documents (cursor, list, generator)
+
+        Returns:
+            DeduplicationResult with groups in first-seen order and stats
+        """
+        groups: Dict[str, TitleGroup] = {}
+        total_documents = 0
+        skipped_documents = 0
+        exact_duplicates = 0
+        variant_duplicates = 0
+
+        for position, document in enumerate(documents):
+            total_documents += 1
+            raw_title = document.get(self.title_field)
+            key = normalize_title(raw_title)
+
+            if not key:
+                skipped_documents += 1
+                continue
+
+            source_id = document.get(self.id_field, position)
+            group = groups.get(key)
+
+            if group is None:
+                groups[key] = TitleGroup(
+                    normalized_title=key,
+                    representative_title=raw_title,
+                    source_ids=[source_id],
+                    source_titles=[raw_title]
+                )
+                continue
+
+            if raw_title == group.representative_title:
+                exact_duplicates += 1
+            else:
+                variant_duplicates += 1
+            group.source_ids.append(source_id)
+            group.source_titles.append(raw_title)
+
+        group_list = list(groups.values())
+        stats = self._build_stats(group_list, total_documents, skipped_documents,
+                                  exact_duplicates, variant_duplicates)
+
+        logger.info(f"Deduplicated {stats.total_documents:,} documents into "
+                    f"{stats.unique_titles:,} unique titles (ratio {stats.dedup_ratio:.4f}x)")
+
+        return DeduplicationResult(group_list, stats)
+
+    def _build_stats(self, groups: List[TitleGroup], total_documents: int, skipped_documents: int,
+                     exact_duplicates: int, variant_duplicates: int) -> DeduplicationStats:
+        """Assemble DeduplicationStats for a completed pass."""
+        unique_titles = len(groups)
+        titled_documents = total_documents - skipped_documents
+        duplicate_documents = titled_documents - unique_titles
+
+        return DeduplicationStats(
+            total_documents=total_documents,
+            unique_titles=unique_titles,
+            duplicate_documents=duplicate_documents,
+            skipped_documents=skipped_documents,
+            exact_duplicates=exact_duplicates,
+            variant_duplicates=variant_duplicates,
+            dedup_ratio=(titled_documents / unique_titles) if unique_titles else 1.0,
+            duplicate_percentage=(duplicate_documents / titled_documents * 100) if titled_documents else 0.0,
+            largest_group_size=max((group.size for group in groups), default=0)
+        )
+
+    def load_from_collection(self, collection, query: Optional[Dict[str, Any]] = None,
+                             batch_size: int = 1000) -> DeduplicationResult:
+        """
+        Stream markets_raw (or any source collection) and group its titles.
+
+        Only the title field is projected so large description fields are never transferred.
+
+        Args:
+            collection: pymongo Collection
+            query: Optional filter
+            batch_size: Cursor batch size
+
+        Returns:
+            DeduplicationResult
+        """
+        cursor = collection.find(query or {}, {self.title_field: 1}).batch_size(batch_size)
+        return self.group_documents(cursor)
+
+    def load_from_json_export(self, file_path: str) -> DeduplicationResult:
+        """
+        Group titles from a mongoexport JSON array (e.g. resources/deathstar.markets_raw.json).
+
+        Extended JSON values are decoded, so {"$oid": ...} ids come back as
+        ObjectIds that upsert onto the original markets_raw _id.
+
+        Args:
+            file_path: Path to JSON export
+
+        Returns:
+            DeduplicationResult
+        """
+        from bson import json_util
+
+        with open(file_path, 'r', encoding='utf-8') as f:
+            documents = json_util.loads(f.read())
+        return self.group_documents(documents)
+
+
+def demo_deduplication():
+    """Run deduplication against a JSON export and print the summary."""
+    default_export = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                  'resources', 'deathstar.markets_raw.json')
+    export_path = sys.argv[1] if len(sys.argv) > 1 else default_export
+
+    print("Title Deduplicator Demo")
+    print("=" * 50)
+    print(f"Source: {export_path}\n")
+
+    deduplicator = TitleDeduplicator()
+    result = deduplicator.load_from_json_export(export_path)
+    print(result.get_report())
+
+    duplicate_groups = sorted((g for g in result.groups if g.size > 1), key=lambda g: -g.size)
+    if duplicate_groups:
+        print("Top duplicate groups:")
+        for group in duplicate_groups[:10]:
+            print(f"  {group.size:3d} x {group.representative_title}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    demo_deduplication()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+
+"""
+MongoDB Connection Manager v1.0
+Shared, tuned MongoDB connection factory used by every pipeline component.
+Provides process-wide client reuse, configurable pool size and wire compression,
+cursor batch sizing, field projections and fork-safe client re-creation.
+Created for Market Research Title Parser project.
+"""
+
+import os
+import logging
+import threading
+from typing import Dict, List, Optional, Any, Tuple, Union
+from dataclasses import dataclass, asdict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DATABASE = "deathstar"
+
+# Field projections for the collections read in bulk. Only the listed fields are
+# transferred; report_description_* fields can be hundreds of KB per document.
+PROJECTIONS = {
+    'title': {'report_title_short': 1},
+    'title_and_description': {'report_title_short': 1, 'report_description_full': 1},
+    'title_and_description_html': {'report_title_short': 1, 'report_description_html': 1},
+    'pattern': {
+        'type': 1, 'subtype': 1, 'term': 1, 'aliases': 1, 'pattern': 1, 'priority': 1,
+        'active': 1, 'processing_type': 1, 'format_type': 1, 'replacement': 1,
+        'description': 1, 'exclude_from': 1, 'success_count': 1, 'failure_count': 1,
+        'confidence_weight': 1, 'quarantined': 1, 'quarantine_reason': 1
+    }
+}
+
+
+@dataclass(frozen=True)
+class MongoConnectionSettings:
+    """Tunable MongoClient options (environment overridable)."""
+    max_pool_size: int = 50
+    min_pool_size: int = 0
+    compressors: str = "zstd,snappy,zlib"  # Negotiated with the server; unavailable codecs are skipped
+    zlib_compression_level: int = 6
+    server_selection_timeout_ms: int = 10000
+    max_idle_time_ms: int = 300000
+    retry_writes: bool = True
+    batch_size: int = 1000  # Default cursor batch size for bulk reads
+
+    @classmethod
+    def from_env(cls) -> "MongoConnectionSettings":
+        """Build settings from MONGODB_* environment variables, falling back to defaults."""
+        defaults = cls()
+        return cls(
+            max_pool_size=int(os.getenv('MONGODB_MAX_POOL_SIZE', defaults.max_pool_size)),
+            min_pool_size=int(os.getenv('MONGODB_MIN_POOL_SIZE', defaults.min_pool_size)),
+            compressors=os.getenv('MONGODB_COMPRESSORS', defaults.compressors),
+            zlib_compression_level=int(os.getenv('MONGODB_ZLIB_COMPRESSION_LEVEL', defaults.zlib_compression_level)),
+            server_selection_timeout_ms=int(os.getenv('MONGODB_SERVER_SELECTION_TIMEOUT_MS',
+                                                      defaults.server_selection_timeout_ms)),
+            max_idle_time_ms=int(os.getenv('MONGODB_MAX_IDLE_TIME_MS', defaults.max_idle_time_ms)),
+            retry_writes=os.getenv('MONGODB_RETRY_WRITES', str(defaults.retry_writes)).lower() == 'true',
+            batch_size=int(os.getenv('MONGODB_BATCH_SIZE', defaults.batch_size))
+        )
+
+    def client_options(self) -> Dict[str, Any]:
+        """Keyword arguments for MongoClient."""
+        return {
+            'maxPoolSize': self.max_pool_size,
+            'minPoolSize': self.min_pool_size,
+            'compressors': self.compressors,
+            'zlibCompressionLevel': self.zlib_compression_level,
+            'serverSelectionTimeoutMS': self.server_selection_timeout_ms,
+            'maxIdleTimeMS': self.max_idle_time_ms,
+            'retryWrites': self.retry_writes
+        }
+
+
+# Process-wide client registry: (connection_string, settings) -> MongoClient
+_clients: Dict[Tuple[str, MongoConnectionSettings], Any] = {}
+_clients_pid = os.getpid()
+_clients_lock = threading.Lock()
+_default_settings: Optional[MongoConnectionSettings] = None
+
+
+def _reset_after_fork() -> None:
+    """
+    Drop clients inherited from the parent process.
+
+    MongoClient is not fork-safe; the child must build its own pools. Inherited
+    clients are discarded without close() so the parent's sockets are untouched.
+    """
+    global _clients, _clients_pid, _clients_lock
+    _clients = {}
+    _clients_pid = os.getpid()
+    _clients_lock = threading.Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_default_settings() -> MongoConnectionSettings:
+    """Settings used when a caller does not pass its own (read once from the environment)."""
+    global _default_settings
+    if _default_settings is None:
+        _default_settings = MongoConnectionSettings.from_env()
+    return _default_settings
+
+
+def get_connection_string(connection_string: Optional[str] = None) -> str:
+    """
+    Resolve the MongoDB connection string.
+
+    Args:
+        connection_string: Explicit connection string (takes precedence)
+
+    Returns:
+        Connection string from argument or MONGODB_URI (.env loaded on demand)
+    """
+    if connection_string:
+        return connection_string
+
+    mongodb_uri = os.getenv('MONGODB_URI')
+    if not mongodb_uri:
+        from dotenv import load_dotenv
+        load_dotenv()
+        mongodb_uri = os.getenv('MONGODB_URI')
+    if not mongodb_uri:
+        raise ValueError("MONGODB_URI not found in environment variables")
+    return mongodb_uri
+
+
+def get_mongo_client(connection_string: Optional[str] = None,
+                     settings: Optional[MongoConnectionSettings] = None,
+                     verify: bool = True):
+    """
+    Get the shared MongoClient for this process.
+
+    Repeated calls with the same connection string and settings return the same
+    client, so components share one connection pool and pay the TLS/auth
+    handshake once. A new client is created transparently after fork().
+
+    Args:
+        connection_string: MongoDB connection string (MONGODB_URI if not provided)
+        settings: Client tuning settings (environment defaults if not provided)
+        verify: Ping the server when a new client is created
+
+    Returns:
+        pymongo MongoClient
+    """
+    if _clients_pid != os.getpid():
+        # Fork without register_at_fork support (or a spawn-unaware caller)
+        _reset_after_fork()
+
+    uri = get_connection_string(connection_string)
+    settings = settings or get_default_settings()
+    key = (uri, settings)
+
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            from pymongo import MongoClient
+
+            client = MongoClient(uri, **settings.client_options())
+            if verify:
+                client.admin.command('ping')
+            _clients[key] = client
+            logger.info(f"Created shared MongoDB client (pid {os.getpid()}, "
+                        f"maxPoolSize={settings.max_pool_size}, compressors={settings.compressors})")
+    return client
+
+
+def get_database(database_name: str = DEFAULT_DATABASE, connection_string: Optional[str] = None,
+                 settings: Optional[MongoConnectionSettings] = None):
+    """
+    Get a database handle on the shared client.
+
+    Args:
+        database_name: Name of the MongoDB database
+        connection_string: MongoDB connection string (MONGODB_URI if not provided)
+        settings: Client tuning settings
+
+    Returns:
+        pymongo Database
+    """
+    return get_mongo_client(connection_string, settings)[database_name]
+
+
+def resolve_projection(projection: Union[str, Dict[str, int], List[str], None]) -> Optional[Dict[str, int]]:
+    """
+    Normalize a projection argument.
+
+    Args:
+        projection: Name from PROJECTIONS, explicit projection dict, list of field names, or None
+
+    Returns:
+        Projection dict for pymongo (None means all fields)
+    """
+    if projection is None or isinstance(projection, dict):
+        return projection
+    if isinstance(projection, str):
+        if projection not in PROJECTIONS:
+            raise ValueError(f"Unknown projection '{projection}'. Available: {sorted(PROJECTIONS)}")
+        return PROJECTIONS[projection]
+    return {field_name: 1 for field_name in projection}
+
+
+def find_projected(collection, query: Optional[Dict[str, Any]] = None,
+                   projection: Union[str, Dict[str, int], List[str], None] = 'title',
+                   batch_size: Optional[int] = None, **find_kwargs):
+    """
+    Run find() with a field projection and a tuned cursor batch size.
+
+    Args:
+        collection: pymongo Collection
+        query: Filter document
+        projection: Name from PROJECTIONS, projection dict or list of fields
+        batch_size: Cursor batch size (settings default if not provided)
+        **find_kwargs: Extra arguments passed to find() (sort, limit, no_cursor_timeout, ...)
+
+    Returns:
+        pymongo Cursor
+    """
+    cursor = collection.find(query or {}, resolve_projection(projection), **find_kwargs)
+    return cursor.batch_size(batch_size or get_default_settings().batch_size)
+
+
+def close_all_clients() -> None:
+    """Close every shared client created by this process (call at process exit)."""
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+    logger.info("Closed shared MongoDB clients")
+
+
+def get_connection_summary() -> Dict[str, Any]:
+    """Describe the shared clients held by this process."""
+    return {
+        'pid': os.getpid(),
+        'client_count': len(_clients),
+        'settings': [asdict(settings) for _, settings in _clients.keys()]
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    print("MongoDB Connection Manager Demo")
+    print("=" * 50)
+
+    try:
+        db = get_database()
+        same_db = get_database()
+        print(f"Shared client reused: {db.client is same_db.client}")
+        print(f"markets_raw documents: {db.markets_raw.estimated_document_count():,}")
+
+        sample = list(find_projected(db.markets_raw, projection='title', limit=3))
+        for doc in sample:
+            print(f"  - {doc.get('report_title_short')}")
+
+        print(f"\nConnection summary: {get_connection_summary()}")
+    except Exception as e:
+        print(f"❌ Demo failed: {e}")
+    finally:
+        close_all_clients()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+
+"""
+Columnar Results Writer v1.0
+Streams processed pipeline results into a columnar store for downstream analysis.
+Writes Parquet row groups through pyarrow when available, with a pure-numpy
+fallback (one compressed .npz per row group) when it is not. The store is
+append-only: writing a processing_id again (a retried or slow-path title's
+final result) supersedes its earlier row, and readers pass latest_only=True
+to drop superseded rows.
+Created for Market Research Title Parser project.
+"""
+
+import os
+import re
+import glob
+import logging
+from typing import Dict, List, Optional, Any, Iterable, Union
+from dataclasses import asdict, is_dataclass
+from enum import Enum
+
+logger = logging.getLogger(__name__)
+
+# Column layout shared by both backends
+STRING_COLUMNS = [
+    'processing_id',
+    'title',
+    'status',
+    'market_term_type',
+    'extracted_forecast_date_range',
+    'extracted_report_type',
+    'topic',
+    'topicName'
+]
+YEAR_COLUMNS = ['date_range_start', 'date_range_end']  # Parsed from the date range, -1/null when absent
+FLOAT_COLUMNS = ['confidence']
+LIST_COLUMNS = ['extracted_regions']
+ALL_COLUMNS = STRING_COLUMNS + YEAR_COLUMNS + FLOAT_COLUMNS + LIST_COLUMNS
+
+_YEAR_PATTERN = re.compile(r'\b(?:19|20)\d{2}\b')
+
+
+def _parse_year_bounds(date_range: Optional[str]) -> tuple:
+    """Return (start_year, end_year) from a date range string such as '2024-2030' or '2030'."""
+    if not date_range:
+        return None, None
+    years = [int(year) for year in _YEAR_PATTERN.findall(date_range)]
+    if not years:
+        return None, None
+    return min(years), max(years)
+
+
+def result_to_row(result: Any) -> Dict[str, Any]:
+    """
+    Flatten a ProcessingResult (or its saved-document / harness dict form) to one columnar row.
+
+    Args:
+        result: ProcessingResult dataclass or dict
+
+    Returns:
+        Dict keyed by ALL_COLUMNS
+    """
+    if is_dataclass(result):
+        result = asdict(result)
+
+    elements = result.get('extracted_elements') or result
+    confidence_analysis = result.get('confidence_analysis') or {}
+    status = result.get('status')
+    if isinstance(status, Enum):
+        status = status.value
+
+    date_range = elements.get('extracted_forecast_date_range') or None
+    start_year, end_year = _parse_year_bounds(date_range)
+    confidence = confidence_analysis.get('overall_confidence', result.get('confidence'))
+
+    return {
+        'processing_id': str(result.get('processing_id') or result.get('_id', '')),
+        'title': result.get('original_title') or result.get('title') or '',
+        'status': status or '',
+        'market_term_type': elements.get('market_term_type') or '',
+        'extracted_forecast_date_range': date_range or '',
+        'extracted_report_type': elements.get('extracted_report_type') or '',
+        'topic': elements.get('topic') or '',
+        'topicName': elements.get('topicName') or '',
+        'date_range_start': start_year,
+        'date_range_end': end_year,
+        'confidence': float(confidence) if confidence is not None else None,
+        'extracted_regions': list(elements.get('extracted_regions') or [])
+    }
+
+
+def _pyarrow_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class ColumnarResultsWriter:
+    """
+    Buffered columnar sink for pipeline results.
+
+    Rows are accumulated per column and flushed as one row group every
+    row_group_size results, so memory stays bounded for arbitrarily long runs.
+    Rows are never rewritten; the last row written for a processing_id wins.
+    """
+
+    def __init__(self, output_path: str, row_group_size: int = 50000,
+                 backend: str = "auto", compression: str = "zstd"):
+        """
+        Initialize the Columnar Results Writer.
+
+        Args:
+            output_path: Target path without extension. Parquet writes '<path>.parquet';
+                         the numpy backend writes '<path>_columns/row_group_NNNNN.npz'.
+            row_group_size: Rows per row group
+            backend: 'parquet', 'numpy' or 'auto' (parquet if pyarrow is installed)
+            compression: Parquet compression codec
+        """
+        if backend == "auto":
+            backend = "parquet" if _pyarrow_available() else "numpy"
+        if backend not in ("parquet", "numpy"):
+            raise ValueError(f"Unsupported backend: {backend}")
+
+        self.backend = backend
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.rows_written = 0
+        self.row_groups_written = 0
+
+        base_path = re.sub(r'\.(parquet|npz)$', '', output_path)
+        if backend == "parquet":
+            self.path = base_path + ".parquet"
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        else:
+            self.path = base_path + "_columns"
+            os.makedirs(self.path, exist_ok=True)
+
+        self._parquet_writer = None
+        self._schema = None
+        self._buffer = self._empty_buffer()
+
+        logger.info(f"Columnar results writer ready ({self.backend}): {self.path}")
+
+    def _empty_buffer(self) -> Dict[str, List[Any]]:
+        return {column: [] for column in ALL_COLUMNS}
+
+    def write(self, result: Any) -> None:
+        """Append one result; flushes a row group when the buffer is full."""
+        row = result_to_row(result)
+        for column in ALL_COLUMNS:
+            self._buffer[column].append(row[column])
+
+        if len(self._buffer['processing_id']) >= self.row_group_size:
+            self.flush()
+
+    def write_many(self, results: Iterable[Any]) -> None:
+        """Append results from any iterable."""
+        for result in results:
+            self.write(result)
+
+    def flush(self) -> None:
+        """Write buffered rows as one row group."""
+        row_count = len(self._buffer['processing_id'])
+        if row_count == 0:
+            return
+
+        if self.backend == "parquet":
+            self._flush_parquet()
+        else:
+            self._flush_numpy()
+
+        self.rows_written += row_count
+        self.row_groups_written += 1
+        self._buffer = self._empty_buffer()
+        logger.debug(f"Flushed row group {self.row_groups_written} ({row_count} rows)")
+
+    def _flush_parquet(self) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self._schema is None:
+            fields = [pa.field(column, pa.string()) for column in STRING_COLUMNS]
+            fields += [pa.field(column, pa.int16()) for column in YEAR_COLUMNS]
+            fields += [pa.field(column, pa.float32()) for column in FLOAT_COLUMNS]
+            fields += [pa.field(column, pa.list_(pa.string())) for column in LIST_COLUMNS]
+            self._schema = pa.schema(fields)
+
+        table = pa.Table.from_pydict(self._buffer, schema=self._schema)
+
+        if self._parquet_writer is None:
+            self._parquet_writer = pq.ParquetWriter(self.path, self._schema, compression=self.compression)
+        self._parquet_writer.write_table(table)
+
+    def _flush_numpy(self) -> None:
+        import numpy as np
+
+        arrays = {column: np.array(self._buffer[column], dtype=np.str_) for column in STRING_COLUMNS}
+        for column in YEAR_COLUMNS:
+            arrays[column] = np.array([-1 if year is None else year for year in self._buffer[column]],
+                                      dtype=np.int16)
+        for column in FLOAT_COLUMNS:
+            arrays[column] = np.array([np.nan if value is None else value for value in self._buffer[column]],
+                                      dtype=np.float32)
+        for column in LIST_COLUMNS:
+            # Arrow-style list encoding: flat values + row offsets
+            lengths = [len(values) for values in self._buffer[column]]
+            offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            flat_values = [value for values in self._buffer[column] for value in values]
+            arrays[f"{column}_values"] = np.array(flat_values, dtype=np.str_)
+            arrays[f"{column}_offsets"] = offsets
+
+        file_path = os.path.join(self.path, f"row_group_{self.row_groups_written:05d}.npz")
+        np.savez_compressed(file_path, **arrays)
+
+    def close(self) -> str:
+        """Flush remaining rows and finalize the output. Returns the output path."""
+        self.flush()
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        logger.info(f"Columnar export complete: {self.rows_written:,} rows in "
+                    f"{self.row_groups_written} row groups -> {self.path}")
+        return self.path
+
+    def __enter__(self) -> "ColumnarResultsWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+
+def _latest_row_indices(processing_ids):
+    """Sorted indices of the last row per processing_id (numpy array of ids)."""
+    import numpy as np
+
+    _, last_from_end = np.unique(processing_ids[::-1], return_index=True)
+    return np.sort(len(processing_ids) - 1 - last_from_end)
+
+
+def read_columnar_results(path: str, columns: Optional[List[str]] = None,
+                          latest_only: bool = False) -> Union[Any, Dict[str, Any]]:
+    """
+    Load a columnar export.
+
+    Args:
+        path: '.parquet' file or numpy '_columns' directory written by ColumnarResultsWriter
+        columns: Optional subset of columns to load
+        latest_only: Keep only the last row written per processing_id (drops rows superseded
+                     by retried or slow-path results); processing_id is always loaded
+
+    Returns:
+        pyarrow.Table for Parquet (use .to_pandas() for a DataFrame); for the numpy
+        backend, a dict of concatenated numpy arrays where list columns are returned
+        as '<column>_values' plus '<column>_offsets' (row i spans offsets[i]:offsets[i+1]).
+    """
+    if latest_only and columns is not None and 'processing_id' not in columns:
+        columns = ['processing_id'] + list(columns)
+
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        table = pq.read_table(path, columns=columns)
+        if latest_only:
+            table = table.take(_latest_row_indices(table.column('processing_id').to_numpy(zero_copy_only=False)))
+        return table
+
+    import numpy as np
+
+    row_group_files = sorted(glob.glob(os.path.join(path, "row_group_*.npz")))
+    if not row_group_files:
+        raise FileNotFoundError(f"No row groups found in {path}")
+
+    wanted = set(columns or ALL_COLUMNS)
+    parts: Dict[str, List[Any]] = {}
+    offset_base = {column: 0 for column in LIST_COLUMNS}
+
+    for file_path in row_group_files:
+        with np.load(file_path) as row_group:
+            for column in STRING_COLUMNS + YEAR_COLUMNS + FLOAT_COLUMNS:
+                if column in wanted:
+                    parts.setdefault(column, []).append(row_group[column])
+            for column in LIST_COLUMNS:
+                if column not in wanted:
+                    continue
+                offsets = row_group[f"{column}_offsets"]
+                previous = parts.setdefault(f"{column}_offsets", [])
+                # Drop the leading 0 of every group after the first and rebase
+                previous.append(offsets + offset_base[column] if not previous else offsets[1:] + offset_base[column])
+                parts.setdefault(f"{column}_values", []).append(row_group[f"{column}_values"])
+                offset_base[column] += int(offsets[-1])
+
+    loaded = {name: np.concatenate(arrays) for name, arrays in parts.items()}
+    if not latest_only:
+        return loaded
+
+    keep = _latest_row_indices(loaded['processing_id'])
+    for column in STRING_COLUMNS + YEAR_COLUMNS + FLOAT_COLUMNS:
+        if column in loaded:
+            loaded[column] = loaded[column][keep]
+    for column in LIST_COLUMNS:
+        if f"{column}_offsets" not in loaded:
+            continue
+        offsets = loaded[f"{column}_offsets"]
+        lengths = np.diff(offsets)
+        kept_rows = np.zeros(len(lengths), dtype=bool)
+        kept_rows[keep] = True
+        loaded[f"{column}_values"] = loaded[f"{column}_values"][np.repeat(kept_rows, lengths)]
+        kept_offsets = np.zeros(len(keep) + 1, dtype=np.int64)
+        np.cumsum(lengths[keep], out=kept_offsets[1:])
+        loaded[f"{column}_offsets"] = kept_offsets
+    return loaded
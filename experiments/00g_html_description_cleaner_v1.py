@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+
+"""
+HTML Description Cleaner v1.0
+Single-pass lxml cleaner for report_description_html plus a content-hash keyed
+on-disk cache of cleaned text, shared by pattern discovery and the HTML
+analysis scripts so repeated runs do not re-parse the same descriptions.
+Created for Market Research Title Parser project.
+"""
+
+import os
+import re
+import html
+import json
+import hashlib
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump whenever cleaning output changes so stale cache entries are never served
+CLEANER_VERSION = "1"
+
+# Containers removed from the body text; their rows are collected as table text
+TABLE_TAGS = frozenset(['table', 'thead', 'tbody', 'tfoot'])
+ROW_TAGS = frozenset(['tr'])
+CELL_TAGS = frozenset(['td', 'th'])
+# Never part of the visible description
+SKIPPED_TAGS = frozenset(['script', 'style', 'noscript', 'template'])
+
+MIN_TABLE_ROW_LENGTH = 4  # Rows of 3 characters or fewer are layout noise
+
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CACHE_DIR = os.path.join(_project_root, ".cache", "cleaned_descriptions")
+
+_EMPTY_RESULT = {"body_text": "", "table_text": "", "combined_text": ""}
+
+
+def _normalize_body(parts: List[str]) -> str:
+    body_text = html.unescape(" ; ".join(parts))
+    body_text = re.sub(r'\s*;\s*', ' ; ', body_text)
+    body_text = re.sub(r'\s+', ' ', body_text)
+    return body_text.strip()
+
+
+def _fallback_cleaning(html_content: str) -> Dict[str, str]:
+    """Regex tag strip used when lxml is unavailable or the markup cannot be parsed."""
+    clean_text = html.unescape(html_content)
+    clean_text = re.sub(r'<[^>]+>', ' ; ', clean_text)
+    clean_text = re.sub(r'\s+', ' ', clean_text)
+    return {
+        "body_text": clean_text,
+        "table_text": "",
+        "combined_text": clean_text
+    }
+
+
+def _walk_description(root) -> Dict[str, str]:
+    """
+    Collect body text and table rows in one iterative walk of the parsed tree.
+
+    Body text nodes are joined with ' ; ' separators (block boundaries included).
+    Inside tables, every row becomes one ' | '-joined entry; text outside rows is
+    dropped, cells outside rows become their own entry, and nested tables emit
+    their own rows.
+    """
+    body_parts: List[str] = []
+    table_rows: List[str] = []
+    collectors: List[List[str]] = []  # Open row/cell text buffers, innermost last
+    table_depth = 0
+
+    def emit(text: Optional[str]) -> None:
+        if not text:
+            return
+        text = text.strip()
+        if not text:
+            return
+        if collectors:
+            collectors[-1].append(text)
+        elif not table_depth:
+            body_parts.append(text)
+
+    # (element, closing, opened_collector)
+    stack = [(root, False, False)]
+    while stack:
+        element, closing, opened_collector = stack.pop()
+        tag = element.tag
+
+        if closing:
+            if opened_collector:
+                row_text = " | ".join(collectors.pop())
+                if len(row_text) >= MIN_TABLE_ROW_LENGTH:
+                    table_rows.append(row_text)
+            if tag in TABLE_TAGS:
+                table_depth -= 1
+            emit(element.tail)
+            continue
+
+        # Comments, processing instructions and skipped tags contribute only their tail
+        if not isinstance(tag, str) or tag in SKIPPED_TAGS:
+            emit(element.tail)
+            continue
+
+        if tag in TABLE_TAGS:
+            table_depth += 1
+        opens_collector = tag in ROW_TAGS or (tag in CELL_TAGS and not collectors)
+        if opens_collector:
+            collectors.append([])
+
+        emit(element.text)
+        stack.append((element, True, opens_collector))
+        stack.extend((child, False, False) for child in reversed(element))
+
+    body_text = _normalize_body(body_parts)
+    table_text = " ; ".join(table_rows)
+    return {
+        "body_text": body_text,
+        "table_text": table_text,
+        "combined_text": f"{body_text} ; {table_text}".strip()
+    }
+
+
+def clean_description_html(html_content: str) -> Dict[str, str]:
+    """
+    Convert report_description_html to text with table extraction and block separation.
+
+    Args:
+        html_content: Raw description HTML
+
+    Returns:
+        Dict with body_text (tables removed), table_text (one entry per row) and
+        combined_text ('<body> ; <tables>')
+    """
+    if not html_content:
+        return dict(_EMPTY_RESULT)
+
+    try:
+        import lxml.html
+        root = lxml.html.document_fromstring(html_content)
+    except Exception as e:
+        # ImportError (no lxml) or ParserError (e.g. comment-only documents)
+        logger.debug(f"HTML parsing fallback: {e}")
+        return _fallback_cleaning(html_content)
+
+    return _walk_description(root)
+
+
+class CleanedDescriptionCache:
+    """
+    On-disk cache of cleaned descriptions keyed by SHA-256 of the raw HTML.
+
+    Entries are small JSON files sharded by the first two hex digits of the key
+    and written atomically, so concurrent discovery workers can share one cache
+    directory safely. The cleaner version is part of the key.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        Initialize the Cleaned Description Cache.
+
+        Args:
+            cache_dir: Cache directory (defaults to $DESCRIPTION_CACHE_DIR or
+                       <project_root>/.cache/cleaned_descriptions)
+        """
+        self.cache_dir = cache_dir or os.getenv('DESCRIPTION_CACHE_DIR') or DEFAULT_CACHE_DIR
+        self.hits = 0
+        self.misses = 0
+        self.write_errors = 0
+
+    @staticmethod
+    def content_key(html_content: str) -> str:
+        """Cache key for one raw description."""
+        digest = hashlib.sha256(f"{CLEANER_VERSION}\0".encode('utf-8'))
+        digest.update(html_content.encode('utf-8', 'surrogatepass'))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key[2:]}.json")
+
+    def get(self, html_content: str) -> Optional[Dict[str, str]]:
+        """Return the cached cleaning result, or None on a miss."""
+        try:
+            with open(self._entry_path(self.content_key(html_content)), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, html_content: str, cleaned: Dict[str, str]) -> None:
+        """Store a cleaning result (atomic rename; failures only disable caching for this entry)."""
+        entry_path = self._entry_path(self.content_key(html_content))
+        temp_path = f"{entry_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(cleaned, f, ensure_ascii=False)
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            self.write_errors += 1
+            logger.debug(f"Could not cache cleaned description: {e}")
+
+    def clean(self, html_content: str) -> Dict[str, str]:
+        """Cleaned description from the cache, cleaning and storing it on a miss."""
+        if not html_content:
+            return dict(_EMPTY_RESULT)
+
+        cached = self.get(html_content)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        cleaned = clean_description_html(html_content)
+        self.put(html_content, cleaned)
+        return cleaned
+
+    def get_statistics(self) -> Dict[str, float]:
+        """Hit/miss counters for this process."""
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'write_errors': self.write_errors,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+_default_cache: Optional[CleanedDescriptionCache] = None
+
+
+def get_description_cache() -> CleanedDescriptionCache:
+    """Process-wide cache instance used by clean_description_html_cached."""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = CleanedDescriptionCache()
+    return _default_cache
+
+
+def clean_description_html_cached(html_content: str,
+                                  cache: Optional[CleanedDescriptionCache] = None) -> Dict[str, str]:
+    """clean_description_html through the on-disk cache (process-wide cache by default)."""
+    return (cache or get_description_cache()).clean(html_content)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    sample = ("<div><h2>Regional Outlook</h2><p>North America &amp; Europe lead demand.</p>"
+              "<table><tr><th>Region</th><th>Share</th></tr>"
+              "<tr><td>Asia Pacific</td><td>34%</td></tr></table>"
+              "<ul><li>Latin America</li><li>Middle East &amp; Africa</li></ul></div>")
+    html_input = open(sys.argv[1], encoding='utf-8').read() if len(sys.argv) > 1 else sample
+
+    start = time.perf_counter()
+    result = clean_description_html(html_input)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"Cleaned in {elapsed_ms:.2f} ms")
+    for field, text in result.items():
+        print(f"{field}: {text}")
@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+
+"""
+Regex Pattern Linter v1.0
+Lints the free-form regex strings stored in pattern_libraries before they reach
+the extraction hot path: compile errors, nested unbounded quantifiers
+(catastrophic backtracking), super-linear growth on adversarial inputs, slow
+matches on a title sample, storage artifacts (double escaping, double spaces)
+and duplicates. Pattern loads run only the deterministic static checks and
+honour the quarantine flag persisted by the CLI, which runs the timing checks
+and deactivates offenders in MongoDB.
+Created for Market Research Title Parser project.
+"""
+
+import os
+import re
+import sys
+import math
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+
+try:  # Python 3.11+
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # pragma: no cover - older interpreters
+    import sre_parse
+    import sre_constants
+
+logger = logging.getLogger(__name__)
+
+# Issue codes that quarantine a pattern; everything else is reported only
+# ('quarantined' is the flag the CLI persists with --quarantine)
+ERROR_ISSUES = frozenset(['compile_error', 'catastrophic_backtracking', 'slow_match', 'quarantined'])
+
+# Adversarial probes: input length doubles from the first to the last entry (256
+# covers the longest titles) and probing stops once a search exceeds the time budget
+ADVERSARIAL_LENGTHS = (32, 64, 128, 256)
+# Patterns with nested quantifiers are only probed at short lengths, where even
+# exponential backtracking finishes, and judged by their growth rate
+NESTED_PROBE_LENGTHS = (8, 12, 16, 20)
+ADVERSARIAL_SEEDS = (' ', 'a', 'A', '1', '-', ',')
+MAX_LITERAL_SEEDS = 4
+
+DEFAULT_TIME_BUDGET_MS = 20.0      # Any single search slower than this is an offender
+SUPERLINEAR_EXPONENT = 1.6         # Fitted growth exponent above which a pattern is super-linear
+CATASTROPHIC_EXPONENT = 4.0        # Growth over the short nested probes that indicates exponential backtracking
+TIMING_NOISE_FLOOR_MS = 0.2        # Growth below this absolute time is timer noise
+NESTED_NOISE_FLOOR_MS = 0.005
+TIMING_REPEATS = 3
+
+# Stored patterns that should match a regex escape but carry an extra backslash (e.g. "\\\\b")
+_DOUBLE_ESCAPE = re.compile(r'\\\\[bBdDsSwW]')
+_UNBOUNDED = sre_constants.MAXREPEAT
+_REPEAT_OPS = tuple(op for op in (getattr(sre_constants, name, None)
+                                  for name in ('MAX_REPEAT', 'MIN_REPEAT', 'POSSESSIVE_REPEAT')) if op is not None)
+_NON_BACKTRACKING_OPS = tuple(op for op in (getattr(sre_constants, name, None)
+                                            for name in ('POSSESSIVE_REPEAT', 'ATOMIC_GROUP')) if op is not None)
+
+
+@dataclass
+class PatternLintResult:
+    """Lint outcome for one stored regex."""
+    pattern: str
+    pattern_id: Optional[str] = None
+    pattern_type: Optional[str] = None
+    term: Optional[str] = None
+    issues: List[str] = field(default_factory=list)
+    details: Dict[str, Any] = field(default_factory=dict)
+    adversarial_ms: Dict[str, float] = field(default_factory=dict)
+    corpus_ms: Optional[float] = None
+
+    @property
+    def quarantined(self) -> bool:
+        return any(issue in ERROR_ISSUES for issue in self.issues)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'pattern_id': self.pattern_id,
+            'pattern_type': self.pattern_type,
+            'term': self.term,
+            'pattern': self.pattern,
+            'issues': self.issues,
+            'quarantined': self.quarantined,
+            'details': self.details,
+            'adversarial_ms': self.adversarial_ms,
+            'corpus_ms': self.corpus_ms
+        }
+
+
+def _can_match_nonempty(items) -> bool:
+    """True when a parsed subpattern can consume at least one character."""
+    try:
+        return items.getwidth()[1] > 0
+    except AttributeError:
+        return True
+
+
+def _iter_children(op, av):
+    """Subpatterns nested under one parsed node."""
+    if op in _REPEAT_OPS:
+        yield av[2]
+    elif op == sre_constants.SUBPATTERN:
+        yield av[-1]
+    elif op == sre_constants.BRANCH:
+        yield from av[1]
+    elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+        yield av[1]
+    elif op == getattr(sre_constants, 'ATOMIC_GROUP', object()):
+        yield av
+    elif op == sre_constants.GROUPREF_EXISTS:
+        yield from (child for child in av[1:] if child is not None)
+
+
+def find_nested_quantifiers(parsed) -> List[str]:
+    """
+    Unbounded quantifiers applied to subpatterns that themselves contain an
+    unbounded quantifier, e.g. (a+)+ or (\\s*\\w+)* - the classic catastrophic
+    backtracking shape. Possessive and atomic constructs are exempt.
+    """
+    findings = []
+
+    def walk(items, enclosing: Optional[str]) -> None:
+        for op, av in items:
+            if op in _NON_BACKTRACKING_OPS:
+                continue
+            if op in _REPEAT_OPS:
+                low, high, sub = av
+                unbounded = high == _UNBOUNDED and _can_match_nonempty(sub)
+                if unbounded and enclosing:
+                    findings.append(f"{{{low},}} quantifier nested inside {enclosing}")
+                walk(sub, enclosing or (f"{{{low},}} quantifier" if unbounded else None))
+            else:
+                for child in _iter_children(op, av):
+                    walk(child, enclosing)
+
+    walk(parsed, None)
+    return findings
+
+
+def _literal_runs(parsed, limit: int = MAX_LITERAL_SEEDS) -> List[str]:
+    """Longest literal runs of a pattern, used to build pattern-specific probes."""
+    runs, current = [], []
+
+    def flush():
+        if current:
+            runs.append(''.join(current))
+            current.clear()
+
+    def walk(items):
+        for op, av in items:
+            if op == sre_constants.LITERAL:
+                current.append(chr(av))
+                continue
+            flush()
+            for child in _iter_children(op, av):
+                walk(child)
+                flush()
+
+    walk(parsed)
+    flush()
+    unique = sorted({run for run in runs if run.strip()}, key=len, reverse=True)
+    return unique[:limit]
+
+
+def probe_units(parsed) -> List[str]:
+    """Repeated units for adversarial inputs: generic seeds plus the pattern's own literal runs."""
+    units = list(ADVERSARIAL_SEEDS)
+    for run in _literal_runs(parsed):
+        units.extend([run, run + ' '])
+    return list(dict.fromkeys(units))
+
+
+def adversarial_input(unit: str, length: int) -> str:
+    """About `length` characters of a repeated unit followed by a non-matching tail."""
+    return unit * max(1, length // len(unit)) + '\x00!'
+
+
+def _time_search(compiled, text: str, repeats: int = TIMING_REPEATS) -> float:
+    """Best-of-N search time in milliseconds, so one GC pause or preemption cannot fail a pattern."""
+    best = math.inf
+    for _ in range(repeats):
+        start = time.perf_counter()
+        compiled.search(text)
+        best = min(best, (time.perf_counter() - start) * 1000)
+    return best
+
+
+def _growth_exponent(timings: List[Tuple[int, float]], noise_floor_ms: float = TIMING_NOISE_FLOOR_MS) -> float:
+    """Fitted exponent between the first and last probe above the noise floor."""
+    above = [(length, ms) for length, ms in timings if ms >= noise_floor_ms]
+    if len(above) < 2:
+        return 1.0
+    (n1, t1), (n2, t2) = above[0], above[-1]
+    return math.log(t2 / t1) / math.log(n2 / n1) if n2 > n1 and t1 > 0 else 1.0
+
+
+class RegexPatternLinter:
+    """
+    Static and timing-based linter for pattern_libraries regexes.
+
+    Results are memoised per regex string, so re-linting on every cache refresh
+    of the pattern library costs nothing after the first load.
+    """
+
+    def __init__(self, corpus: Optional[Iterable[str]] = None,
+                 time_budget_ms: float = DEFAULT_TIME_BUDGET_MS,
+                 adversarial_lengths: Tuple[int, ...] = ADVERSARIAL_LENGTHS,
+                 dynamic: bool = True):
+        """
+        Initialize the linter.
+
+        Args:
+            corpus: Sample titles each pattern is timed against (optional)
+            time_budget_ms: Per-search budget; slower searches quarantine the pattern
+            adversarial_lengths: Increasing probe lengths for the growth check
+            dynamic: If False, only static checks run (no timing)
+        """
+        self.corpus = list(corpus or [])
+        self.time_budget_ms = time_budget_ms
+        self.adversarial_lengths = tuple(adversarial_lengths)
+        self.dynamic = dynamic
+        self._memo: Dict[str, PatternLintResult] = {}
+
+    def lint_pattern(self, pattern: str, pattern_id: Optional[str] = None,
+                     pattern_type: Optional[str] = None, term: Optional[str] = None) -> PatternLintResult:
+        """Lint one regex string."""
+        cached = self._memo.get(pattern)
+        if cached is None:
+            cached = self._lint(pattern)
+            self._memo[pattern] = cached
+        return PatternLintResult(pattern=pattern, pattern_id=pattern_id, pattern_type=pattern_type, term=term,
+                                 issues=list(cached.issues), details=dict(cached.details),
+                                 adversarial_ms=dict(cached.adversarial_ms), corpus_ms=cached.corpus_ms)
+
+    def _lint(self, pattern: str) -> PatternLintResult:
+        result = PatternLintResult(pattern=pattern)
+
+        if _DOUBLE_ESCAPE.search(pattern):
+            result.issues.append('double_escaped')
+        if '  ' in pattern:
+            result.issues.append('double_space')
+
+        try:
+            compiled = re.compile(pattern)
+            parsed = sre_parse.parse(pattern)
+        except (re.error, RecursionError, OverflowError) as e:
+            result.issues.append('compile_error')
+            result.details['compile_error'] = str(e)
+            return result
+
+        nested = find_nested_quantifiers(parsed)
+        if nested:
+            result.issues.append('nested_quantifier')
+            result.details['nested_quantifier'] = nested
+
+        if self.dynamic:
+            if nested:
+                # Long probes could stall the linter itself on an exponential pattern
+                self._time_nested(compiled, parsed, result)
+            else:
+                self._time_adversarial(compiled, parsed, result)
+            if self.corpus and not result.quarantined:
+                self._time_corpus(compiled, result)
+        elif nested:
+            result.issues.append('catastrophic_backtracking')
+        return result
+
+    def _probe(self, compiled, unit: str, lengths: Tuple[int, ...]) -> List[Tuple[int, float]]:
+        """Timings of one probe unit at increasing lengths, stopping once a search exceeds the budget."""
+        timings = []
+        for length in lengths:
+            elapsed = _time_search(compiled, adversarial_input(unit, length))
+            timings.append((length, elapsed))
+            if elapsed > self.time_budget_ms:
+                break
+        return timings
+
+    def _time_nested(self, compiled, parsed, result: PatternLintResult) -> None:
+        for unit in probe_units(parsed):
+            timings = self._probe(compiled, unit, NESTED_PROBE_LENGTHS)
+            result.adversarial_ms[repr(unit)] = round(timings[-1][1], 4)
+            exponent = _growth_exponent(timings, NESTED_NOISE_FLOOR_MS)
+            if timings[-1][1] > self.time_budget_ms or exponent > CATASTROPHIC_EXPONENT:
+                result.issues.append('catastrophic_backtracking')
+                result.details['catastrophic_backtracking'] = (
+                    f"{unit!r} repeated grows ~n^{exponent:.1f} ({timings[-1][1]:.2f} ms at length {timings[-1][0]})")
+                return
+
+    def _time_adversarial(self, compiled, parsed, result: PatternLintResult) -> None:
+        worst_unit, worst_exponent = None, 1.0
+        for unit in probe_units(parsed):
+            timings = self._probe(compiled, unit, self.adversarial_lengths)
+            result.adversarial_ms[repr(unit)] = round(timings[-1][1], 4)
+            exponent = _growth_exponent(timings)
+            if exponent > worst_exponent:
+                worst_unit, worst_exponent = unit, exponent
+            if timings[-1][1] > self.time_budget_ms:
+                result.issues.append('slow_match')
+                result.details['slow_match'] = (f"{unit!r} repeated took {timings[-1][1]:.1f} ms "
+                                                f"at length {timings[-1][0]}")
+                break
+
+        if worst_exponent > SUPERLINEAR_EXPONENT:
+            result.issues.append('superlinear')
+            result.details['superlinear'] = f"{worst_unit!r} repeated grows ~n^{worst_exponent:.1f}"
+
+    def _time_corpus(self, compiled, result: PatternLintResult) -> None:
+        total, slowest, slowest_text = 0.0, 0.0, None
+        for text in self.corpus:
+            start = time.perf_counter()
+            compiled.search(text)
+            elapsed = (time.perf_counter() - start) * 1000
+            total += elapsed
+            if elapsed > slowest:
+                slowest, slowest_text = elapsed, text
+        result.corpus_ms = round(total, 4)
+        if slowest > self.time_budget_ms:
+            # The sweep times each title once; confirm the offender best-of-N before quarantining
+            slowest = _time_search(compiled, slowest_text)
+        if slowest > self.time_budget_ms:
+            result.issues.append('slow_match')
+            result.details['slow_match'] = f"corpus title took {slowest:.1f} ms: {slowest_text[:80]!r}"
+
+    def lint_documents(self, documents: Iterable[Dict[str, Any]]) -> List[PatternLintResult]:
+        """
+        Lint pattern_libraries documents that carry a 'pattern' field.
+
+        Repeats of the same regex within a pattern type are flagged 'duplicate'
+        (reported, not quarantined).
+        """
+        results = []
+        seen: Dict[Tuple[Optional[str], str], Optional[str]] = {}
+        for doc in documents:
+            pattern = doc.get('pattern')
+            if not isinstance(pattern, str) or not pattern:
+                continue
+            pattern_id = str(doc['_id']) if doc.get('_id') is not None else None
+            result = self.lint_pattern(pattern, pattern_id=pattern_id, pattern_type=doc.get('type'),
+                                       term=doc.get('term'))
+            key = (doc.get('type'), pattern)
+            if key in seen:
+                result.issues.append('duplicate')
+                result.details['duplicate'] = f"same pattern as {seen[key]}"
+            else:
+                seen[key] = pattern_id
+            results.append(result)
+        return results
+
+    def filter_documents(self, documents: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[PatternLintResult]]:
+        """
+        Split documents into those safe for the hot path and quarantined lint results.
+
+        Documents without a 'pattern' field pass through untouched; documents the
+        CLI has flagged 'quarantined' are dropped without re-linting.
+        """
+        persisted = [PatternLintResult(pattern=doc.get('pattern', ''),
+                                       pattern_id=str(doc['_id']) if doc.get('_id') is not None else None,
+                                       pattern_type=doc.get('type'), term=doc.get('term'), issues=['quarantined'],
+                                       details={'quarantined': doc.get('quarantine_reason')})
+                     for doc in documents if doc.get('quarantined')]
+        if persisted:
+            documents = [doc for doc in documents if not doc.get('quarantined')]
+        quarantined = persisted + [result for result in self.lint_documents(documents) if result.quarantined]
+        if not quarantined:
+            return documents, []
+        offenders = {(result.pattern_type, result.pattern) for result in quarantined}
+        safe = [doc for doc in documents if (doc.get('type'), doc.get('pattern')) not in offenders]
+        for result in quarantined:
+            logger.warning(f"Quarantined {result.pattern_type} pattern {result.pattern_id} "
+                           f"('{result.term}'): {', '.join(result.issues)} - {result.pattern!r}")
+        return safe, quarantined
+
+
+_default_linter: Optional[RegexPatternLinter] = None
+
+
+def get_pattern_linter() -> RegexPatternLinter:
+    """
+    Process-wide linter used at pattern load time.
+
+    Static checks only: timing a regex depends on machine load, so a pattern
+    could load on one run and be dropped on the next. Timing-based quarantine
+    runs from the CLI and reaches loads through the persisted flag.
+    """
+    global _default_linter
+    if _default_linter is None:
+        _default_linter = RegexPatternLinter(dynamic=False)
+    return _default_linter
+
+
+def quarantine_updates(results: List[PatternLintResult]) -> List[Dict[str, Any]]:
+    """PatternLibraryManager.bulk_update_patterns operations deactivating quarantined patterns."""
+    from bson import ObjectId
+    return [{
+        "filter": {"_id": ObjectId(result.pattern_id)},
+        "update": {"$set": {"active": False, "quarantined": True,
+                            "quarantine_reason": ", ".join(issue for issue in result.issues if issue in ERROR_ISSUES)}}
+    } for result in results if result.quarantined and result.pattern_id]
+
+
+def main():
+    import json
+    import argparse
+    import random
+
+    _project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _project_root not in sys.path:
+        sys.path.append(_project_root)
+    from experiments import load_module
+
+    parser = argparse.ArgumentParser(description="Lint pattern_libraries regexes")
+    parser.add_argument("--types", nargs="*", help="Pattern types to lint (default: every type with a 'pattern' field)")
+    parser.add_argument("--titles-file", help="markets_raw JSON export used as the timing corpus")
+    parser.add_argument("--sample-size", type=int, default=2000, help="Corpus titles to sample")
+    parser.add_argument("--time-budget-ms", type=float, default=DEFAULT_TIME_BUDGET_MS)
+    parser.add_argument("--include-inactive", action="store_true", help="Also lint inactive patterns")
+    parser.add_argument("--quarantine", action="store_true", help="Deactivate quarantined patterns in MongoDB")
+    args = parser.parse_args()
+
+    corpus = []
+    if args.titles_file:
+        with open(args.titles_file, 'r', encoding='utf-8') as f:
+            titles = [doc.get('report_title_short', '') for doc in json.load(f)]
+        titles = [title for title in titles if title]
+        corpus = random.Random(0).sample(titles, min(args.sample_size, len(titles)))
+
+    pattern_module = load_module("pattern_library_manager")
+    output_module = load_module("output_directory_manager")
+    manager = pattern_module.PatternLibraryManager()
+
+    query: Dict[str, Any] = {"pattern": {"$type": "string"}}
+    if args.types:
+        query["type"] = {"$in": args.types}
+    if not args.include_inactive:
+        query["active"] = True
+    documents = list(manager.collection.find(query, {"type": 1, "term": 1, "pattern": 1}))
+
+    linter = RegexPatternLinter(corpus=corpus, time_budget_ms=args.time_budget_ms)
+    start = time.perf_counter()
+    results = linter.lint_documents(documents)
+    elapsed = time.perf_counter() - start
+
+    quarantined = [result for result in results if result.quarantined]
+    flagged = [result for result in results if result.issues]
+    print(f"Linted {len(results)} patterns in {elapsed:.1f}s: {len(flagged)} flagged, {len(quarantined)} quarantined")
+    for result in flagged:
+        marker = "QUARANTINE" if result.quarantined else "warning"
+        print(f"  [{marker}] {result.pattern_type}/{result.term}: {', '.join(result.issues)} - {result.pattern!r}")
+
+    if args.quarantine and quarantined:
+        updated = manager.bulk_update_patterns(quarantine_updates(quarantined))
+        print(f"Deactivated {updated} quarantined patterns")
+
+    output_dir = output_module.create_organized_output_directory("regex_pattern_lint")
+    with open(os.path.join(output_dir, "regex_lint_report.json"), 'w', encoding='utf-8') as f:
+        json.dump({'linted': len(results), 'corpus_titles': len(corpus), 'seconds': elapsed,
+                   'results': [result.to_dict() for result in flagged]}, f, indent=2, ensure_ascii=False)
+    print(f"Report: {output_dir}")
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
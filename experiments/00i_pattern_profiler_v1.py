@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+
+"""
+Pattern Profiler v1.0
+Per-pattern hit/cost profiling for the extraction components. When a profiler
+is attached to an extractor, every pattern evaluation in its hot loop records
+an evaluation count, a match count and the cumulative nanoseconds spent. After
+a corpus run the ranked report shows which date patterns, report type
+keywords, geographic aliases and topic cleanup rules actually fire, which are
+dead and which dominate the cost; the stats are written back to
+pattern_libraries in a single bulk update.
+Created for Market Research Title Parser project.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Report section sizes
+TOP_PATTERNS_LIMIT = 50
+EXPENSIVE_PATTERNS_LIMIT = 25
+# '<type>_alias' stats count which alias of a pattern matched; they share the pattern's _id
+ALIAS_TYPE_SUFFIX = "_alias"
+
+
+@dataclass
+class PatternStats:
+    """Counters for one pattern over a profiling run."""
+    pattern_type: str
+    label: str
+    pattern_id: Optional[str] = None
+    evaluations: int = 0
+    matches: int = 0
+    total_ns: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.matches / self.evaluations if self.evaluations else 0.0
+
+    @property
+    def avg_ns(self) -> float:
+        return self.total_ns / self.evaluations if self.evaluations else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['hit_rate'] = round(self.hit_rate, 6)
+        data['avg_ns'] = round(self.avg_ns, 1)
+        return data
+
+
+class PatternProfiler:
+    """
+    Accumulates per-pattern evaluation/match/time counters across extractors.
+
+    Extractors hold an optional `profiler` attribute (None = profiling off) and
+    call begin() before and record() after each pattern evaluation, timing it
+    with time.perf_counter_ns(). Patterns are keyed by (pattern_type, label); the
+    pattern_libraries _id is kept when the extractor knows it.
+    """
+
+    def __init__(self):
+        self.stats: Dict[Tuple[str, str], PatternStats] = {}
+        self.started_at = time.time()
+
+    def begin(self, pattern_type: str, label: str) -> None:
+        """Announce a pattern evaluation; counters only change on record()."""
+
+    def record(self, pattern_type: str, label: str, elapsed_ns: int, matched: bool,
+               pattern_id: Any = None) -> None:
+        """Record one evaluation of a pattern."""
+        key = (pattern_type, label)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = PatternStats(pattern_type, label,
+                                                   str(pattern_id) if pattern_id is not None else None)
+        stats.evaluations += 1
+        stats.total_ns += elapsed_ns
+        if matched:
+            stats.matches += 1
+
+    def register(self, pattern_type: str, label: str, pattern_id: Any = None) -> None:
+        """Declare a loaded pattern so it is reported as dead even if never evaluated."""
+        key = (pattern_type, label)
+        if key not in self.stats:
+            self.stats[key] = PatternStats(pattern_type, label, str(pattern_id) if pattern_id is not None else None)
+
+    def merge(self, other: 'PatternProfiler') -> None:
+        """Add another profiler's counters (e.g. from a worker process)."""
+        for key, theirs in other.stats.items():
+            mine = self.stats.get(key)
+            if mine is None:
+                self.stats[key] = PatternStats(**asdict(theirs))
+                continue
+            mine.evaluations += theirs.evaluations
+            mine.matches += theirs.matches
+            mine.total_ns += theirs.total_ns
+            mine.pattern_id = mine.pattern_id or theirs.pattern_id
+
+    def reset(self) -> None:
+        self.stats.clear()
+        self.started_at = time.time()
+
+    def ranked(self) -> List[PatternStats]:
+        """All patterns ranked by match count, then by cost (cheapest first)."""
+        return sorted(self.stats.values(), key=lambda s: (-s.matches, s.total_ns, s.pattern_type, s.label))
+
+    def ranked_report(self, top: int = TOP_PATTERNS_LIMIT,
+                      expensive: int = EXPENSIVE_PATTERNS_LIMIT) -> Dict[str, Any]:
+        """
+        Build the ranked profile report.
+
+        Returns:
+            Dictionary with per-type totals, top patterns by hits, dead patterns
+            (never matched) and the most expensive patterns by cumulative time
+        """
+        ranked = self.ranked()
+        total_ns = sum(s.total_ns for s in ranked)
+
+        by_type: Dict[str, Dict[str, Any]] = {}
+        for s in ranked:
+            summary = by_type.setdefault(s.pattern_type, {'patterns': 0, 'evaluations': 0, 'matches': 0,
+                                                          'total_ns': 0, 'dead_patterns': 0})
+            summary['patterns'] += 1
+            summary['evaluations'] += s.evaluations
+            summary['matches'] += s.matches
+            summary['total_ns'] += s.total_ns
+            summary['dead_patterns'] += int(s.matches == 0)
+        for summary in by_type.values():
+            summary['time_share'] = summary['total_ns'] / total_ns if total_ns else 0.0
+
+        dead = [s for s in ranked if s.matches == 0]
+        dead.sort(key=lambda s: -s.total_ns)
+        costly = sorted(ranked, key=lambda s: -s.total_ns)[:expensive]
+
+        return {
+            'total_patterns': len(ranked),
+            'total_evaluations': sum(s.evaluations for s in ranked),
+            'total_matches': sum(s.matches for s in ranked),
+            'total_ns': total_ns,
+            'dead_pattern_count': len(dead),
+            'by_type': by_type,
+            'top_patterns': [s.to_dict() for s in ranked[:top]],
+            'most_expensive': [dict(s.to_dict(), time_share=s.total_ns / total_ns if total_ns else 0.0)
+                               for s in costly],
+            'dead_patterns': [s.to_dict() for s in dead],
+        }
+
+    def write_report(self, output_dir: Optional[str] = None, filename: str = "pattern_profile.json") -> str:
+        """Write the ranked report (JSON) to the organized output directory; returns the file path."""
+        if output_dir is None:
+            _project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+            if _project_root not in sys.path:
+                sys.path.append(_project_root)
+            from experiments import load_module
+            output_dir = load_module("output_directory_manager").create_organized_output_directory(
+                "pattern_profiler")
+
+        report = self.ranked_report()
+        report['all_patterns'] = [s.to_dict() for s in self.ranked()]
+        path = os.path.join(output_dir, filename)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+        logger.info(f"Pattern profile written: {path}")
+        return path
+
+
+def profile_updates(profiler: PatternProfiler, profiled_at: Any = None) -> List[Dict[str, Any]]:
+    """
+    PatternLibraryManager.bulk_update_patterns operations storing each pattern's profile.
+
+    Alias stats are stored with their pattern as profile.aliases ({label, matches}
+    per alias) rather than as a profile of their own.
+    """
+    from bson import ObjectId
+    ranked = [s for s in profiler.ranked() if not s.pattern_type.endswith(ALIAS_TYPE_SUFFIX)]
+    ranks = {key: rank for rank, key in enumerate((s.pattern_type, s.label) for s in ranked)}
+    profiles: Dict[str, Dict[str, Any]] = {}
+    for key, stats in profiler.stats.items():
+        if not stats.pattern_id or not ObjectId.is_valid(stats.pattern_id):
+            continue
+        profile = profiles.setdefault(stats.pattern_id, {})
+        if stats.pattern_type.endswith(ALIAS_TYPE_SUFFIX):
+            profile.setdefault("profile.aliases", []).append({"label": stats.label, "matches": stats.matches})
+            continue
+        profile.update({
+            "profile.evaluations": stats.evaluations,
+            "profile.matches": stats.matches,
+            "profile.total_ns": stats.total_ns,
+            "profile.hit_rate": stats.hit_rate,
+            "profile.avg_ns": stats.avg_ns,
+            "profile.rank": ranks[key] + 1,
+        })
+        if profiled_at is not None:
+            profile["profile.profiled_at"] = profiled_at
+    return [{"filter": {"_id": ObjectId(pattern_id)}, "update": {"$set": profile}}
+            for pattern_id, profile in profiles.items()]
+
+
+def attach_profiler(components: Dict[str, Any], profiler: Optional[PatternProfiler]) -> None:
+    """
+    Set (or clear, with None) the profiler on every component that supports profiling.
+
+    Components exposing profiled_patterns() have all their loaded patterns
+    registered up front, so patterns that are never reached still show as dead.
+    """
+    for component in components.values():
+        if not hasattr(component, 'profiler'):
+            continue
+        component.profiler = profiler
+        if profiler is not None and hasattr(component, 'profiled_patterns'):
+            for pattern_type, label, pattern_id in component.profiled_patterns():
+                profiler.register(pattern_type, label, pattern_id)
+
+
+def main():
+    import argparse
+
+    _project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _project_root not in sys.path:
+        sys.path.append(_project_root)
+    from experiments import load_module
+
+    parser = argparse.ArgumentParser(description="Profile per-pattern hits and cost over a markets_raw corpus run")
+    parser.add_argument("--limit", type=int, default=1000, help="Titles to process (0 = all)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--apply", action="store_true", help="Write profile stats back to pattern_libraries")
+    args = parser.parse_args()
+
+    orchestrator = load_module("pipeline_orchestrator").PipelineOrchestrator(profile_patterns=True)
+    profiler = orchestrator.pattern_profiler
+
+    titles = [doc['report_title_short'] for doc in orchestrator.fetchSourceDocuments(limit=args.limit)
+              if doc.get('report_title_short')]
+    start = time.perf_counter()
+    for offset in range(0, len(titles), args.batch_size):
+        orchestrator.processBatch(titles[offset:offset + args.batch_size])
+    elapsed = time.perf_counter() - start
+
+    report = profiler.ranked_report()
+    print(f"Profiled {len(titles)} titles in {elapsed:.1f}s: {report['total_patterns']} patterns, "
+          f"{report['dead_pattern_count']} never matched")
+    for pattern_type, summary in sorted(report['by_type'].items(), key=lambda item: -item[1]['total_ns']):
+        print(f"  {pattern_type}: {summary['patterns']} patterns, {summary['matches']} matches, "
+              f"{summary['dead_patterns']} dead, {summary['time_share']:.1%} of pattern time")
+    print(f"Report: {orchestrator.savePatternProfile(apply_feedback=args.apply)}")
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
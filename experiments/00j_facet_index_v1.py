@@ -0,0 +1,347 @@
+#!/usr/bin/env python3
+
+"""
+Facet Index v1.0
+Inverted index from extracted facet values (region, report type, forecast date
+range, topicName) to sorted arrays of title row IDs, built alongside
+processing. Row IDs are assigned in arrival order, so each batch only appends
+to the end of its posting lists and lists stay sorted without re-sorting.
+Faceted counts are numpy intersections/bincounts over those lists instead of
+scans over nested arrays in markets_processed. The index persists as one
+compressed .npz segment per flush next to the columnar results, so it is
+updated incrementally per batch and rebuilt by concatenating segments.
+Re-indexing a processing_id (a retried or slow-path title) appends a new row
+that supersedes the earlier one; superseded rows are excluded from every query.
+Created for Market Research Title Parser project.
+"""
+
+import os
+import sys
+import glob
+import logging
+from typing import Dict, List, Optional, Any, Iterable
+
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
+from experiments import load_module
+
+result_to_row = load_module("columnar_results_writer").result_to_row
+
+logger = logging.getLogger(__name__)
+
+# Facet name -> columnar row field
+FACET_FIELDS = {
+    'region': 'extracted_regions',
+    'report_type': 'extracted_report_type',
+    'date_range': 'extracted_forecast_date_range',
+    'topic': 'topicName',
+}
+# Facets holding one value per title; these also keep a per-row value code column for cross counts
+SINGLE_VALUED_FACETS = ('report_type', 'date_range', 'topic')
+
+SEGMENT_PATTERN = "facet_segment_{:05d}.npz"
+
+
+class FacetIndex:
+    """
+    Incrementally built inverted index of facet values to sorted row-ID arrays.
+
+    Rows are identified by their position in doc_ids (the processing_id of
+    each indexed result). Postings are stored as lists of uint32 chunks, one
+    per batch, and concatenated lazily on first read. When a processing_id is
+    indexed again its latest row wins; earlier rows are only kept in doc_ids.
+    """
+
+    def __init__(self):
+        self.doc_ids: List[str] = []
+        self._values: Dict[str, List[str]] = {facet: [] for facet in FACET_FIELDS}
+        self._value_codes: Dict[str, Dict[str, int]] = {facet: {} for facet in FACET_FIELDS}
+        self._postings: Dict[str, List[List[Any]]] = {facet: [] for facet in FACET_FIELDS}
+        self._row_codes: Dict[str, List[Any]] = {facet: [] for facet in SINGLE_VALUED_FACETS}
+        self._row_of: Dict[str, int] = {}
+        self._superseded: List[int] = []
+        self._superseded_array = None
+        self._flushed_rows = 0
+        self._segments_written = 0
+
+    def __len__(self) -> int:
+        """Number of live (not superseded) rows."""
+        return len(self.doc_ids) - len(self._superseded)
+
+    def _register_row(self, doc_id: str, row_id: int) -> None:
+        previous = self._row_of.get(doc_id)
+        if previous is not None:
+            self._superseded.append(previous)
+            self._superseded_array = None
+        self._row_of[doc_id] = row_id
+
+    def _code(self, facet: str, value: str) -> int:
+        code = self._value_codes[facet].get(value)
+        if code is None:
+            code = self._value_codes[facet][value] = len(self._values[facet])
+            self._values[facet].append(value)
+            self._postings[facet].append([])
+        return code
+
+    def add_batch(self, results: Iterable[Any]) -> int:
+        """
+        Index a batch of ProcessingResults (or saved documents / columnar rows).
+
+        Returns:
+            Number of rows added
+        """
+        import numpy as np
+
+        first_row = len(self.doc_ids)
+        batch_postings: Dict[str, Dict[int, List[int]]] = {facet: {} for facet in FACET_FIELDS}
+        batch_codes: Dict[str, List[int]] = {facet: [] for facet in SINGLE_VALUED_FACETS}
+
+        for result in results:
+            row = result_to_row(result)
+            row_id = len(self.doc_ids)
+            self.doc_ids.append(row['processing_id'])
+            self._register_row(row['processing_id'], row_id)
+
+            for facet, field in FACET_FIELDS.items():
+                value = row.get(field)
+                values = (value or []) if facet == 'region' else ([value] if value else [])
+                codes = [self._code(facet, v) for v in dict.fromkeys(values)]
+                for code in codes:
+                    batch_postings[facet].setdefault(code, []).append(row_id)
+                if facet in batch_codes:
+                    batch_codes[facet].append(codes[0] if codes else -1)
+
+        for facet, by_code in batch_postings.items():
+            for code, row_ids in by_code.items():
+                self._postings[facet][code].append(np.array(row_ids, dtype=np.uint32))
+        for facet, codes in batch_codes.items():
+            if codes:
+                self._row_codes[facet].append(np.array(codes, dtype=np.int32))
+
+        return len(self.doc_ids) - first_row
+
+    def _posting(self, facet: str, code: int):
+        """Sorted row IDs for one value code (chunks consolidated on first read)."""
+        import numpy as np
+
+        chunks = self._postings[facet][code]
+        if len(chunks) > 1:
+            chunks[:] = [np.concatenate(chunks)]
+        return chunks[0] if chunks else np.zeros(0, dtype=np.uint32)
+
+    def _row_code_column(self, facet: str):
+        import numpy as np
+
+        chunks = self._row_codes[facet]
+        if len(chunks) > 1:
+            chunks[:] = [np.concatenate(chunks)]
+        return chunks[0] if chunks else np.zeros(0, dtype=np.int32)
+
+    def _check_facet(self, facet: str) -> None:
+        if facet not in FACET_FIELDS:
+            raise ValueError(f"Unknown facet '{facet}' (expected one of {sorted(FACET_FIELDS)})")
+
+    def values(self, facet: str) -> List[str]:
+        """All indexed values of a facet, in first-seen order."""
+        self._check_facet(facet)
+        return list(self._values[facet])
+
+    def _live(self, row_ids):
+        """Drop superseded rows from sorted row IDs."""
+        import numpy as np
+
+        if not self._superseded:
+            return row_ids
+        if self._superseded_array is None:
+            self._superseded_array = np.array(sorted(self._superseded), dtype=np.uint32)
+        return row_ids[~np.isin(row_ids, self._superseded_array, assume_unique=True)]
+
+    def row_ids(self, **filters: str):
+        """
+        Sorted live row IDs matching every facet=value filter (all live rows when no filters).
+
+        Example:
+            index.row_ids(region="Europe", report_type="Market Report")
+        """
+        import numpy as np
+
+        matched = None
+        # Intersect smallest postings first
+        postings = []
+        for facet, value in filters.items():
+            self._check_facet(facet)
+            code = self._value_codes[facet].get(value)
+            if code is None:
+                return np.zeros(0, dtype=np.uint32)
+            postings.append(self._posting(facet, code))
+        for posting in sorted(postings, key=len):
+            matched = posting if matched is None else np.intersect1d(matched, posting, assume_unique=True)
+            if len(matched) == 0:
+                break
+        return self._live(np.arange(len(self.doc_ids), dtype=np.uint32) if matched is None else matched)
+
+    def count(self, **filters: str) -> int:
+        """Number of rows matching the filters."""
+        return int(len(self.row_ids(**filters)))
+
+    def drill_down(self, limit: Optional[int] = None, **filters: str) -> List[str]:
+        """processing_ids of the rows matching the filters (row order)."""
+        row_ids = self.row_ids(**filters)
+        if limit is not None:
+            row_ids = row_ids[:limit]
+        return [self.doc_ids[row_id] for row_id in row_ids.tolist()]
+
+    def facet_counts(self, facet: str, **filters: str) -> Dict[str, int]:
+        """
+        Count per value of `facet` among rows matching the filters, most frequent first.
+
+        Single-valued facets use one bincount over the per-row code column;
+        regions intersect each posting list with the filtered rows.
+        """
+        import numpy as np
+
+        self._check_facet(facet)
+        restricted = bool(filters or self._superseded)
+        if facet in SINGLE_VALUED_FACETS:
+            codes = self._row_code_column(facet)
+            if restricted:
+                codes = codes[self.row_ids(**filters)]
+            counts = np.bincount(codes[codes >= 0], minlength=len(self._values[facet]))
+        else:
+            if restricted:
+                matched = self.row_ids(**filters)
+                counts = np.array([len(np.intersect1d(self._posting(facet, code), matched, assume_unique=True))
+                                   for code in range(len(self._values[facet]))], dtype=np.int64)
+            else:
+                counts = np.array([len(self._posting(facet, code)) for code in range(len(self._values[facet]))],
+                                  dtype=np.int64)
+
+        order = np.argsort(-counts, kind='stable')
+        return {self._values[facet][code]: int(counts[code]) for code in order if counts[code] > 0}
+
+    def cross_counts(self, row_facet: str, column_facet: str, **filters: str) -> Dict[str, Dict[str, int]]:
+        """
+        Counts per (row_facet value, column_facet value), e.g. titles per region per report type.
+
+        column_facet must be single-valued; each row_facet posting is one
+        bincount over the column facet's code column.
+        """
+        import numpy as np
+
+        self._check_facet(row_facet)
+        if column_facet not in SINGLE_VALUED_FACETS:
+            raise ValueError(f"column_facet must be one of {SINGLE_VALUED_FACETS}")
+
+        codes = self._row_code_column(column_facet)
+        matched = self.row_ids(**filters) if filters or self._superseded else None
+        column_values = self._values[column_facet]
+        table = {}
+        for code, value in enumerate(self._values[row_facet]):
+            posting = self._posting(row_facet, code)
+            if matched is not None:
+                posting = np.intersect1d(posting, matched, assume_unique=True)
+            column_codes = codes[posting]
+            counts = np.bincount(column_codes[column_codes >= 0], minlength=len(column_values))
+            nonzero = np.flatnonzero(counts)
+            if len(nonzero):
+                table[value] = {column_values[c]: int(counts[c]) for c in nonzero}
+        return table
+
+    def flush(self, directory: str) -> Optional[str]:
+        """
+        Persist rows added since the last flush as a new segment.
+
+        Returns:
+            Segment file path, or None when there was nothing new
+        """
+        import numpy as np
+
+        start = self._flushed_rows
+        if start == len(self.doc_ids):
+            return None
+        os.makedirs(directory, exist_ok=True)
+        while os.path.exists(os.path.join(directory, SEGMENT_PATTERN.format(self._segments_written))):
+            self._segments_written += 1
+
+        arrays = {
+            'doc_ids': np.array(self.doc_ids[start:], dtype=np.str_),
+            'first_row': np.array([start], dtype=np.int64)
+        }
+        for facet in FACET_FIELDS:
+            # CSR layout: values, offsets into ids (rows >= start only)
+            tails = [posting[np.searchsorted(posting, start):]
+                     for posting in (self._posting(facet, code) for code in range(len(self._values[facet])))]
+            present = [code for code, tail in enumerate(tails) if len(tail)]
+            offsets = np.zeros(len(present) + 1, dtype=np.int64)
+            np.cumsum([len(tails[code]) for code in present], out=offsets[1:])
+            arrays[f"{facet}_values"] = np.array([self._values[facet][code] for code in present], dtype=np.str_)
+            arrays[f"{facet}_offsets"] = offsets
+            arrays[f"{facet}_ids"] = (np.concatenate([tails[code] for code in present]) if present
+                                      else np.zeros(0, dtype=np.uint32))
+
+        path = os.path.join(directory, SEGMENT_PATTERN.format(self._segments_written))
+        np.savez_compressed(path, **arrays)
+        self._segments_written += 1
+        self._flushed_rows = len(self.doc_ids)
+        logger.debug(f"Facet index segment written: {path} ({len(self.doc_ids) - start} rows)")
+        return path
+
+    @classmethod
+    def load(cls, directory: str) -> 'FacetIndex':
+        """Rebuild an index from its segments (in write order)."""
+        import numpy as np
+
+        index = cls()
+        segment_files = sorted(glob.glob(os.path.join(directory, "facet_segment_*.npz")))
+        for file_path in segment_files:
+            with np.load(file_path) as segment:
+                first_row = int(segment['first_row'][0])
+                if first_row != len(index.doc_ids):
+                    raise ValueError(f"Facet segment {file_path} starts at row {first_row}, "
+                                     f"expected {len(index.doc_ids)}")
+                doc_ids = segment['doc_ids'].tolist()
+                for row_id, doc_id in enumerate(doc_ids, start=len(index.doc_ids)):
+                    index._register_row(doc_id, row_id)
+                index.doc_ids.extend(doc_ids)
+                batch_codes = {facet: np.full(len(doc_ids), -1, dtype=np.int32) for facet in SINGLE_VALUED_FACETS}
+
+                for facet in FACET_FIELDS:
+                    offsets = segment[f"{facet}_offsets"]
+                    ids = segment[f"{facet}_ids"]
+                    for position, value in enumerate(segment[f"{facet}_values"].tolist()):
+                        code = index._code(facet, value)
+                        posting = ids[offsets[position]:offsets[position + 1]]
+                        index._postings[facet][code].append(posting)
+                        if facet in batch_codes:
+                            batch_codes[facet][posting - first_row] = code
+                for facet, codes in batch_codes.items():
+                    index._row_codes[facet].append(codes)
+
+        index._flushed_rows = len(index.doc_ids)
+        index._segments_written = len(segment_files)
+        logger.info(f"Loaded facet index: {len(index.doc_ids):,} rows from {len(segment_files)} segments")
+        return index
+
+    def compact(self, directory: str) -> str:
+        """Rewrite all segments in `directory` as a single segment holding every row."""
+        staging = directory.rstrip(os.sep) + "_compacting"
+        self._flushed_rows = 0
+        self._segments_written = 0
+        staged_path = self.flush(staging)
+
+        for file_path in glob.glob(os.path.join(directory, "facet_segment_*.npz")):
+            os.remove(file_path)
+        path = os.path.join(directory, SEGMENT_PATTERN.format(0))
+        os.replace(staged_path, path)
+        os.rmdir(staging)
+        self._segments_written = 1
+        return path
+
+    def summary(self) -> Dict[str, Any]:
+        """Live rows, superseded rows and distinct values per facet."""
+        return {
+            'rows': len(self),
+            'superseded_rows': len(self._superseded),
+            'facets': {facet: len(values) for facet, values in self._values.items()}
+        }
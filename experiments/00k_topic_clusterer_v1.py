@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+
+"""
+Topic Clusterer v1.0
+Corpus-level consolidation of near-duplicate topicName values. The Topic
+Extractor normalizes each title independently, so variants such as
+"antimicrobial-medical-textile" and "antimicrobial-medical-textiles" become
+separate topics. This stage shingles every distinct topic into character
+n-grams, buckets candidate pairs with MinHash LSH (banded signatures), verifies
+candidates with exact shingle Jaccard similarity and assigns each cluster a
+canonical topicName, keeping the work near-linear in the number of topics.
+Created for Market Research Title Parser project.
+"""
+
+import os
+import re
+import sys
+import zlib
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Any, Iterable
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+# MinHash/LSH defaults: 16 bands x 4 rows puts the candidate threshold near Jaccard 0.5, well
+# below the verification threshold (a 0.8-similar pair becomes a candidate with p > 0.999)
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+DEFAULT_SHINGLE_SIZE = 4
+DEFAULT_SIMILARITY_THRESHOLD = 0.8
+# Buckets larger than this are verified against their first member only (keeps candidates linear)
+MAX_BUCKET_PAIRWISE = 50
+SIGNATURE_CHUNK_SHINGLES = 200000
+
+_SEPARATOR_PATTERN = re.compile(r'[\s\-_/]+')
+# Tokens that tell otherwise near-identical topics apart ("class ii"/"class iii", "4g"/"5g")
+_NUMERIC_TOKEN_PATTERN = re.compile(r'\d')
+_ROMAN_NUMERAL_PATTERN = re.compile(r'^x{0,3}(ix|iv|v?i{0,3})$')
+# Negation prefixes ("inorganic"/"organic", "unmanned"/"manned"); standalone "non"/"anti" join the next token
+_NEGATION_PREFIXES = ('non', 'anti', 'un', 'in')
+_JOINED_PREFIX_TOKENS = {'non', 'anti'}
+_MIN_NEGATED_STEM = 3
+# Words whose trailing 's' is not a plural and whose singular is a different word ("news"/"new")
+_UNFOLDED_TOKENS = {'news', 'goods', 'means', 'arms', 'series', 'species'}
+
+
+def _fold_token(token: str) -> str:
+    """Fold simple English plurals so 'textiles'/'textile' shingle identically."""
+    if token in _UNFOLDED_TOKENS:
+        return token
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+
+def topic_key(topic: str) -> str:
+    """Comparison form of a topicName: lowercase, separators collapsed, plurals folded, 'non-'/'anti-' joined."""
+    tokens = [token for token in _SEPARATOR_PATTERN.split(topic.casefold().strip()) if token]
+    joined = []
+    for token in tokens:
+        if joined and joined[-1] in _JOINED_PREFIX_TOKENS:
+            token = joined.pop() + token
+        joined.append(token)
+    return ' '.join(_fold_token(token) for token in joined)
+
+
+def _is_negated(token: str, vocabulary: set) -> bool:
+    """True for a negation prefix plus another token of the vocabulary ('inorganic' when 'organic' occurs)."""
+    return any(token.startswith(prefix) and len(token) - len(prefix) >= _MIN_NEGATED_STEM
+               and token[len(prefix):] in vocabulary for prefix in _NEGATION_PREFIXES)
+
+
+def distinguishing_tokens(topic: str, vocabulary: Optional[set] = None) -> tuple:
+    """
+    Sorted tokens of the topic key that merged topics must agree on exactly.
+
+    Numeric and roman-numeral tokens always count; negated tokens count when
+    their stem is in the vocabulary (the corpus's topic key tokens), so plain
+    words that merely start with 'in'/'un' ('industrial') do not.
+    """
+    vocabulary = vocabulary or set()
+    return tuple(sorted(token for token in topic_key(topic).split()
+                        if _NUMERIC_TOKEN_PATTERN.search(token) or _ROMAN_NUMERAL_PATTERN.match(token)
+                        or _is_negated(token, vocabulary)))
+
+
+def character_shingles(topic: str, size: int = DEFAULT_SHINGLE_SIZE) -> set:
+    """Character n-grams of the padded topic key (short keys yield themselves)."""
+    padded = f" {topic_key(topic)} "
+    if len(padded) <= size:
+        return {padded}
+    return {padded[i:i + size] for i in range(len(padded) - size + 1)}
+
+
+def jaccard(first: set, second: set) -> float:
+    if not first and not second:
+        return 1.0
+    return len(first & second) / len(first | second)
+
+
+@dataclass
+class TopicCluster:
+    """Near-duplicate topicName values consolidated under one canonical topic."""
+    canonical_topic: str  # Most frequent member (ties: shortest, then alphabetical)
+    members: List[str] = field(default_factory=list)
+    title_count: int = 0  # Titles carrying any member topic
+
+    @property
+    def size(self) -> int:
+        return len(self.members)
+
+
+@dataclass
+class TopicClusteringStats:
+    """Statistics for a clustering pass."""
+    total_topics: int
+    canonical_topics: int
+    merged_topics: int  # Topics mapped onto another canonical topic
+    multi_member_clusters: int
+    candidate_pairs: int
+    verified_pairs: int
+    largest_cluster_size: int
+    elapsed_seconds: float
+
+
+class TopicClusteringResult:
+    """Output of TopicClusterer.cluster(): clusters plus the topicName -> canonical mapping."""
+
+    def __init__(self, clusters: List[TopicCluster], stats: TopicClusteringStats):
+        self.clusters = clusters
+        self.stats = stats
+        self.canonical_map: Dict[str, str] = {
+            member: cluster.canonical_topic for cluster in clusters for member in cluster.members
+        }
+
+    def canonical(self, topic: str) -> str:
+        """Canonical topicName for a topic (the topic itself when it was not clustered)."""
+        return self.canonical_map.get(topic, topic)
+
+    def build_bulk_operations(self, field_path: str = 'extracted_elements.canonicalTopicName') -> List[Any]:
+        """
+        Build updates tagging markets_processed documents with their canonical topic.
+
+        Only members of multi-topic clusters are written; consumers fall back to
+        topicName when the canonical field is absent.
+
+        Returns:
+            List of pymongo UpdateMany operations (one per merged topic)
+        """
+        from pymongo import UpdateMany
+
+        return [
+            UpdateMany({'extracted_elements.topicName': member}, {'$set': {field_path: cluster.canonical_topic}})
+            for cluster in self.clusters if cluster.size > 1
+            for member in cluster.members
+        ]
+
+    def get_report(self) -> str:
+        """Human-readable clustering summary."""
+        stats = self.stats
+        return (
+            f"Topic Clustering Summary\n"
+            f"{'=' * 40}\n"
+            f"  Distinct topics:      {stats.total_topics:,}\n"
+            f"  Canonical topics:     {stats.canonical_topics:,}\n"
+            f"  Merged topics:        {stats.merged_topics:,}\n"
+            f"  Multi-topic clusters: {stats.multi_member_clusters:,}\n"
+            f"  Candidate pairs:      {stats.candidate_pairs:,}\n"
+            f"  Verified pairs:       {stats.verified_pairs:,}\n"
+            f"  Largest cluster:      {stats.largest_cluster_size:,}\n"
+            f"  Elapsed:              {stats.elapsed_seconds:.2f}s\n"
+        )
+
+
+class TopicClusterer:
+    """
+    MinHash LSH clustering of topicName values.
+
+    Each topic's shingle set is summarized by a num_perm MinHash signature;
+    signatures are split into bands and topics sharing any band bucket become
+    candidate pairs. Candidates are confirmed with exact Jaccard similarity on
+    the shingle sets, plus identical numeric/roman-numeral and negated tokens
+    (a single changed digit or an 'in'/'un' prefix barely moves Jaccard on
+    long topics), and merged with
+    union-find. Since every merge requires identical tokens, chained merges
+    cannot join topics that differ in them either.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_SIMILARITY_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+                 bands: int = DEFAULT_BANDS, shingle_size: int = DEFAULT_SHINGLE_SIZE, seed: int = 1):
+        """
+        Initialize the Topic Clusterer.
+
+        Args:
+            threshold: Minimum shingle Jaccard similarity for two topics to merge
+            num_perm: MinHash signature length
+            bands: LSH bands (num_perm must be divisible by bands)
+            shingle_size: Character n-gram size
+            seed: Seed for the MinHash permutations
+        """
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        import numpy as np
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.shingle_size = shingle_size
+
+        # Multiply-shift hash family: odd 64-bit multipliers, arithmetic wraps mod 2^64
+        rng = np.random.default_rng(seed)
+        self._hash_a = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._hash_b = rng.integers(0, 1 << 63, size=num_perm, dtype=np.uint64)
+
+    def signatures(self, shingle_sets: List[set]):
+        """
+        MinHash signature matrix (topics x num_perm, uint32) for the shingle sets.
+
+        Shingles hash with CRC32 (stable across processes). Each distinct
+        shingle is permuted once with the multiply-shift family
+        ((a*x + b) mod 2^64) >> 32; topic signatures are then the per-topic
+        minimum over their shingles' rows (np.minimum.reduceat).
+        """
+        import numpy as np
+
+        signatures = np.empty((len(shingle_sets), self.num_perm), dtype=np.uint32)
+        if not shingle_sets:
+            return signatures
+
+        lengths = np.fromiter((len(shingles) for shingles in shingle_sets), dtype=np.int64, count=len(shingle_sets))
+        hashes = np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingles in shingle_sets for shingle in shingles),
+                             dtype=np.uint64, count=int(lengths.sum()))
+        distinct, shingle_ids = np.unique(hashes, return_inverse=True)
+        permuted = ((distinct[:, None] * self._hash_a + self._hash_b) >> np.uint64(32)).astype(np.uint32)
+
+        offsets = np.zeros(len(shingle_sets) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # Chunk topics so the gathered (shingles x num_perm) block stays bounded
+        start = 0
+        while start < len(shingle_sets):
+            end = int(np.searchsorted(offsets, offsets[start] + SIGNATURE_CHUNK_SHINGLES, side='right')) - 1
+            end = min(max(end, start + 1), len(shingle_sets))
+            block = permuted[shingle_ids[offsets[start]:offsets[end]]]
+            signatures[start:end] = np.minimum.reduceat(block, offsets[start:end] - offsets[start], axis=0)
+            start = end
+        return signatures
+
+    def candidate_pairs(self, signatures) -> set:
+        """Topic index pairs sharing at least one LSH band bucket."""
+        import numpy as np
+
+        rng = np.random.default_rng(len(signatures))
+        mixers = rng.integers(0, 1 << 63, size=self.rows_per_band, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        pairs = set()
+        for band in range(self.bands):
+            # One 64-bit bucket key per topic; rare key collisions only add candidates, which verification drops
+            band_rows = signatures[:, band * self.rows_per_band:(band + 1) * self.rows_per_band].astype(np.uint64)
+            keys = (band_rows * mixers).sum(axis=1)
+            order = np.argsort(keys, kind='stable')
+            same_as_previous = keys[order][1:] == keys[order][:-1]
+            if not same_as_previous.any():
+                continue
+            # Runs of equal keys: [run_start, run_end] in sorted positions
+            edges = np.flatnonzero(np.diff(np.concatenate(([0], same_as_previous.astype(np.int8), [0]))))
+            for run_start, run_end in zip(edges[0::2], edges[1::2]):
+                members = sorted(order[run_start:run_end + 1].tolist())
+                if len(members) <= MAX_BUCKET_PAIRWISE:
+                    pairs.update((members[i], members[j])
+                                 for i in range(len(members)) for j in range(i + 1, len(members)))
+                else:
+                    pairs.update((members[0], other) for other in members[1:])
+        return pairs
+
+    def cluster(self, topic_counts: Dict[str, int]) -> TopicClusteringResult:
+        """
+        Cluster topicName values.
+
+        Args:
+            topic_counts: Distinct topicName -> number of titles carrying it
+
+        Returns:
+            TopicClusteringResult (clusters ordered by title count)
+        """
+        import time
+        start_time = time.perf_counter()
+
+        topics = [topic for topic in topic_counts if topic]
+        shingle_sets = [character_shingles(topic, self.shingle_size) for topic in topics]
+        vocabulary = {token for topic in topics for token in topic_key(topic).split()}
+        discriminators = [distinguishing_tokens(topic, vocabulary) for topic in topics]
+
+        parents = list(range(len(topics)))
+
+        def find(index: int) -> int:
+            while parents[index] != index:
+                parents[index] = parents[parents[index]]
+                index = parents[index]
+            return index
+
+        def union(first: int, second: int) -> None:
+            root_first, root_second = find(first), find(second)
+            if root_first != root_second:
+                parents[max(root_first, root_second)] = min(root_first, root_second)
+
+        # Identical comparison keys merge without LSH
+        first_by_key: Dict[str, int] = {}
+        for index, topic in enumerate(topics):
+            union(first_by_key.setdefault(topic_key(topic), index), index)
+
+        candidates = self.candidate_pairs(self.signatures(shingle_sets)) if topics else set()
+        verified = 0
+        for first, second in candidates:
+            if find(first) == find(second):
+                continue
+            if (discriminators[first] == discriminators[second]
+                    and jaccard(shingle_sets[first], shingle_sets[second]) >= self.threshold):
+                union(first, second)
+                verified += 1
+
+        members_by_root: Dict[int, List[str]] = {}
+        for index, topic in enumerate(topics):
+            members_by_root.setdefault(find(index), []).append(topic)
+
+        clusters = []
+        for members in members_by_root.values():
+            canonical = min(members, key=lambda topic: (-topic_counts[topic], len(topic), topic))
+            members.sort(key=lambda topic: (-topic_counts[topic], topic))
+            clusters.append(TopicCluster(canonical, members, sum(topic_counts[topic] for topic in members)))
+        clusters.sort(key=lambda cluster: (-cluster.title_count, cluster.canonical_topic))
+
+        stats = TopicClusteringStats(
+            total_topics=len(topics),
+            canonical_topics=len(clusters),
+            merged_topics=len(topics) - len(clusters),
+            multi_member_clusters=sum(1 for cluster in clusters if cluster.size > 1),
+            candidate_pairs=len(candidates),
+            verified_pairs=verified,
+            largest_cluster_size=max((cluster.size for cluster in clusters), default=0),
+            elapsed_seconds=time.perf_counter() - start_time
+        )
+        logger.info(f"Topic clustering: {stats.total_topics:,} topics -> {stats.canonical_topics:,} canonical "
+                    f"({stats.candidate_pairs:,} candidate pairs, {stats.elapsed_seconds:.2f}s)")
+        return TopicClusteringResult(clusters, stats)
+
+    def cluster_topics(self, topics: Iterable[str]) -> TopicClusteringResult:
+        """Cluster a stream of topicName values (one per title)."""
+        return self.cluster(Counter(topic for topic in topics if topic))
+
+    def load_from_collection(self, collection, query: Optional[Dict[str, Any]] = None) -> TopicClusteringResult:
+        """
+        Cluster the topicName values stored in markets_processed.
+
+        Topic counts are computed server-side, so only distinct topics are transferred.
+
+        Args:
+            collection: pymongo Collection
+            query: Optional filter
+
+        Returns:
+            TopicClusteringResult
+        """
+        pipeline = [
+            {'$match': dict(query or {}, **{'extracted_elements.topicName': {'$nin': [None, '']}})},
+            {'$group': {'_id': '$extracted_elements.topicName', 'count': {'$sum': 1}}}
+        ]
+        topic_counts = {doc['_id']: doc['count'] for doc in collection.aggregate(pipeline, allowDiskUse=True)}
+        return self.cluster(topic_counts)
+
+
+def main():
+    import argparse
+
+    _project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if _project_root not in sys.path:
+        sys.path.append(_project_root)
+    from experiments import load_module
+
+    parser = argparse.ArgumentParser(description="Consolidate near-duplicate topicName values in markets_processed")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_SIMILARITY_THRESHOLD)
+    parser.add_argument("--apply", action="store_true", help="Write canonicalTopicName to markets_processed")
+    args = parser.parse_args()
+
+    client = load_module("mongodb_connection_manager").get_mongo_client(os.getenv('MONGODB_URI'))
+    collection = client['deathstar']['markets_processed']
+
+    result = TopicClusterer(threshold=args.threshold).load_from_collection(collection)
+    print(result.get_report())
+    for cluster in [c for c in result.clusters if c.size > 1][:20]:
+        print(f"  {cluster.canonical_topic} <- {', '.join(m for m in cluster.members if m != cluster.canonical_topic)}")
+
+    if args.apply:
+        operations = result.build_bulk_operations()
+        if operations:
+            outcome = collection.bulk_write(operations, ordered=False)
+            print(f"Tagged {outcome.modified_count:,} documents with canonicalTopicName")
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -7,42 +7,32 @@ Created for Market Research Title Parser project.
 """
 
 import re
+import time
 import logging
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime, timezone
-import pytz
 
-# Import Pattern Library Manager components
-import importlib.util
 import sys
 import os
 
-# Dynamic import of organized output directory manager
-_spec = importlib.util.spec_from_file_location("output_dir_manager", os.path.join(os.path.dirname(__file__), "00c_output_directory_manager_v1.py"))
-_output_module = importlib.util.module_from_spec(_spec)
-_spec.loader.exec_module(_output_module)
+# Cached pipeline module loader (each module executes once per process, from any working directory)
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
+from experiments import load_module
+
+# Organized output directory manager
+_output_module = load_module("output_directory_manager")
 create_organized_output_directory = _output_module.create_organized_output_directory
 create_output_file_header = _output_module.create_output_file_header
 
-# Dynamic import for pattern library manager (filename starts with numbers)
-try:
-    pattern_manager_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '00b_pattern_library_manager_v1.py')
-    spec = importlib.util.spec_from_file_location("pattern_library_manager_v1", pattern_manager_path)
-    pattern_module = importlib.util.module_from_spec(spec)
-    sys.modules["pattern_library_manager_v1"] = pattern_module
-    spec.loader.exec_module(pattern_module)
-    PatternLibraryManager = pattern_module.PatternLibraryManager
-    PatternType = pattern_module.PatternType
-except Exception as e:
-    raise ImportError(f"Could not import PatternLibraryManager: {e}") from e
+# Pattern library manager (filename starts with numbers)
+pattern_module = load_module("pattern_library_manager")
+PatternLibraryManager = pattern_module.PatternLibraryManager
+PatternType = pattern_module.PatternType
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 class MarketTermType(Enum):
@@ -104,7 +94,9 @@ class MarketTermClassifier:
             
         # Dynamic market term patterns loaded from database
         self.market_term_patterns = {}  # {term_name: pattern_regex}
+        self.market_term_pattern_ids = {}  # {term_name: pattern_libraries _id}
         self.available_market_types = set()  # Dynamic set of available types
+        self.profiler = None  # Optional PatternProfiler (00i); None = profiling off
         
         # Initialize statistics with standard and ambiguous, market terms added dynamically
         self.classification_stats = {
@@ -137,6 +129,7 @@ class MarketTermClassifier:
                     
                     # Store pattern with term name as key
                     self.market_term_patterns[term] = clean_pattern
+                    self.market_term_pattern_ids[term] = pattern.get('_id')
                     
                     # Create dynamic market type and add to available types
                     market_type = MarketTermType.create_dynamic_type(term)
@@ -160,6 +153,7 @@ class MarketTermClassifier:
     def _get_timestamps(self) -> tuple:
         """Generate PDT and UTC timestamps."""
         utc_now = datetime.now(timezone.utc)
+        import pytz
         pdt_tz = pytz.timezone('America/Los_Angeles')
         pdt_now = utc_now.astimezone(pdt_tz)
         
@@ -247,6 +241,10 @@ class MarketTermClassifier:
         
         return round(confidence, 3)
     
+    def profiled_patterns(self) -> List[Tuple[str, str, Any]]:
+        """(pattern_type, label, pattern_id) of every loaded pattern, for PatternProfiler registration."""
+        return [('market_term', term, self.market_term_pattern_ids.get(term)) for term in self.market_term_patterns]
+    
     def check_market_term_patterns(self, title: str) -> List[Tuple[str, str, float]]:
         """
         Check title against all loaded market term patterns.
@@ -259,9 +257,17 @@ class MarketTermClassifier:
         """
         matches = []
         processed_title, _ = self._preprocess_title(title)
+        profiler = self.profiler
         
         for term_name, pattern in self.market_term_patterns.items():
-            match = re.search(pattern, processed_title, re.IGNORECASE)
+            if profiler is None:
+                match = re.search(pattern, processed_title, re.IGNORECASE)
+            else:
+                profiler.begin('market_term', term_name)
+                start_ns = time.perf_counter_ns()
+                match = re.search(pattern, processed_title, re.IGNORECASE)
+                profiler.record('market_term', term_name, time.perf_counter_ns() - start_ns, match is not None,
+                                self.market_term_pattern_ids.get(term_name))
             if match:
                 market_type = MarketTermType.create_dynamic_type(term_name)
                 confidence = 0.95  # High confidence for exact pattern match
@@ -591,4 +597,8 @@ def demo_classification():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
     demo_classification()
\ No newline at end of file
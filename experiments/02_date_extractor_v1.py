@@ -8,40 +8,32 @@ Key Enhancement: For bracket patterns like [2023 Report], extracts "2023" but pr
 """
 
 import re
+import time
 import logging
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, List, Tuple, Any
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime
 import os
 import sys
-import importlib.util
 import json
 
-# Dynamic import for pattern library manager
-try:
-    pattern_manager_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '00b_pattern_library_manager_v1.py')
-    spec = importlib.util.spec_from_file_location("pattern_library_manager_v1", pattern_manager_path)
-    pattern_module = importlib.util.module_from_spec(spec)
-    sys.modules["pattern_library_manager_v1"] = pattern_module
-    spec.loader.exec_module(pattern_module)
-    PatternLibraryManager = pattern_module.PatternLibraryManager
-    PatternType = pattern_module.PatternType
-except Exception as e:
-    raise ImportError(f"Could not import PatternLibraryManager: {e}") from e
+# Cached pipeline module loader (each module executes once per process, from any working directory)
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
+from experiments import load_module
 
-# Dynamic import of organized output directory manager
-try:
-    _spec = importlib.util.spec_from_file_location("output_dir_manager", os.path.join(os.path.dirname(__file__), "00c_output_directory_manager_v1.py"))
-    _output_module = importlib.util.module_from_spec(_spec)
-    _spec.loader.exec_module(_output_module)
-    create_organized_output_directory = _output_module.create_organized_output_directory
-    create_output_file_header = _output_module.create_output_file_header
-except Exception as e:
-    logger.warning(f"Could not import output directory manager: {e}. Output functionality limited.")
+# Pattern library manager (filename starts with numbers)
+pattern_module = load_module("pattern_library_manager")
+PatternLibraryManager = pattern_module.PatternLibraryManager
+PatternType = pattern_module.PatternType
+
+# Organized output directory manager
+_output_module = load_module("output_directory_manager")
+create_organized_output_directory = _output_module.create_organized_output_directory
+create_output_file_header = _output_module.create_output_file_header
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class DateFormat(Enum):
@@ -94,6 +86,7 @@ class EnhancedDateExtractor:
         
         self.pattern_library_manager = pattern_library_manager
         self.date_patterns = self._load_date_patterns()
+        self.profiler = None  # Optional PatternProfiler (00i); None = profiling off
         
         # Numeric content patterns
         self.numeric_patterns = {
@@ -144,6 +137,15 @@ class EnhancedDateExtractor:
         
         return organized_patterns
     
+    def profiled_patterns(self) -> List[Tuple[str, str, Any]]:
+        """(pattern_type, label, pattern_id) of every loaded pattern, for PatternProfiler registration."""
+        return [('date_pattern', self._profile_label(format_type, pattern_data), pattern_data.get('_id'))
+                for format_type, patterns in self.date_patterns.items() for pattern_data in patterns]
+    
+    @staticmethod
+    def _profile_label(format_type: str, pattern_data: Dict) -> str:
+        return f"{format_type}: {pattern_data.get('term') or pattern_data['pattern']}"
+    
     def _analyze_numeric_content(self, title: str) -> Tuple[bool, List[str], Dict[str, bool]]:
         """
         Analyze numeric content in title to determine if dates might be present.
@@ -409,11 +411,19 @@ class EnhancedDateExtractor:
         # This mirrors the original date extractor logic
         # Try each pattern type in priority order
         
+        profiler = self.profiler
         for format_type, patterns in self.date_patterns.items():
             for pattern_data in patterns:
                 try:
-                    pattern = re.compile(pattern_data['pattern'])
-                    match = pattern.search(title)
+                    if profiler is None:
+                        match = re.compile(pattern_data['pattern']).search(title)
+                    else:
+                        label = self._profile_label(format_type, pattern_data)
+                        profiler.begin('date_pattern', label)
+                        start_ns = time.perf_counter_ns()
+                        match = re.compile(pattern_data['pattern']).search(title)
+                        profiler.record('date_pattern', label,
+                                        time.perf_counter_ns() - start_ns, match is not None, pattern_data.get('_id'))
                     
                     if match:
                         raw_match = match.group(0)
@@ -588,6 +598,8 @@ def demo_extraction_with_output_save():
         raise
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    
     # Test the enhanced extractor with bracket format preservation
     # For output file generation, use: demo_extraction_with_output_save()
     from dotenv import load_dotenv
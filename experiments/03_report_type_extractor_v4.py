@@ -27,24 +27,23 @@ import os
 import sys
 import logging
 import re
+import time
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple, Set, Union, Any
 from dataclasses import dataclass, field
 from enum import Enum
-import pytz
-from pymongo import MongoClient
-from pymongo.collection import Collection
 
-# Import organized output directory manager
-import importlib.util
-_spec = importlib.util.spec_from_file_location("output_dir_manager", os.path.join(os.path.dirname(__file__), "00c_output_directory_manager_v1.py"))
-_output_module = importlib.util.module_from_spec(_spec)
-_spec.loader.exec_module(_output_module)
+# Cached pipeline module loader (each module executes once per process, from any working directory)
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
+from experiments import load_module
+
+# Organized output directory manager
+_output_module = load_module("output_directory_manager")
 create_organized_output_directory = _output_module.create_organized_output_directory
 create_output_file_header = _output_module.create_output_file_header
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class ReportTypeFormat(Enum):
@@ -121,6 +120,8 @@ class PureDictionaryReportTypeExtractor:
         self.separators: List[str] = []
         self.boundary_markers: List[str] = []
         self.keyword_frequencies: Dict[str, int] = {}
+        self.keyword_ids: Dict[str, Any] = {}  # keyword -> pattern_libraries _id
+        self.profiler = None  # Optional PatternProfiler (00i); None = profiling off
         
         # Market boundary detection
         self.market_boundary_coverage = 0.0
@@ -157,6 +158,7 @@ class PureDictionaryReportTypeExtractor:
             for doc in primary_cursor:
                 self.primary_keywords.append(doc["term"])
                 self.keyword_frequencies[doc["term"]] = doc.get("frequency", 0)
+                self.keyword_ids[doc["term"]] = doc.get("_id")
                 
                 # Market boundary detection
                 if doc["term"] == "Market":
@@ -173,6 +175,7 @@ class PureDictionaryReportTypeExtractor:
             for doc in secondary_cursor:
                 self.secondary_keywords.append(doc["term"])
                 self.keyword_frequencies[doc["term"]] = doc.get("frequency", 0)
+                self.keyword_ids[doc["term"]] = doc.get("_id")
             
             # Combine all keywords for efficient lookup
             self.all_keywords = self.primary_keywords + self.secondary_keywords
@@ -207,6 +210,10 @@ class PureDictionaryReportTypeExtractor:
             logger.error(f"Failed to load dictionary from database: {e}")
             raise
     
+    def profiled_patterns(self) -> List[Tuple[str, str, Any]]:
+        """(pattern_type, label, pattern_id) of every loaded keyword, for PatternProfiler registration."""
+        return [('report_type_dictionary', keyword, self.keyword_ids.get(keyword)) for keyword in self.all_keywords]
+    
     def _find_keyword_positions(self, title: str) -> Dict[str, Dict]:
         """
         Find all keyword positions in title with comprehensive detection.
@@ -214,12 +221,20 @@ class PureDictionaryReportTypeExtractor:
         """
         keyword_positions = {}
         title_lower = title.lower()
+        profiler = self.profiler
         
         # Check each keyword from database
         for keyword in self.all_keywords:
             # Case-insensitive boundary detection
             pattern = rf'\b{re.escape(keyword)}\b'
-            matches = list(re.finditer(pattern, title, re.IGNORECASE))
+            if profiler is None:
+                matches = list(re.finditer(pattern, title, re.IGNORECASE))
+            else:
+                profiler.begin('report_type_dictionary', keyword)
+                start_ns = time.perf_counter_ns()
+                matches = list(re.finditer(pattern, title, re.IGNORECASE))
+                profiler.record('report_type_dictionary', keyword, time.perf_counter_ns() - start_ns,
+                                bool(matches), self.keyword_ids.get(keyword))
             
             if matches:
                 # Use first match (could be extended to handle multiple matches)
@@ -943,10 +958,11 @@ def main():
     # Initialize
     from dotenv import load_dotenv
     load_dotenv()
+    get_mongo_client = load_module("mongodb_connection_manager").get_mongo_client
     
     class MockPatternLibraryManager:
         def __init__(self):
-            client = MongoClient(os.getenv('MONGODB_URI'))
+            client = get_mongo_client(os.getenv('MONGODB_URI'))
             self.db = client['deathstar']
             self.collection = self.db['pattern_libraries']  # Fix attribute name
     
@@ -1023,4 +1039,5 @@ def main():
     print(f"✓ Test summary saved to: {results_file}")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     main()
\ No newline at end of file
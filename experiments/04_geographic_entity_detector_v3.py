@@ -16,6 +16,8 @@ Features:
 4. Multi-region extraction capabilities
 5. Enhanced separator word cleanup (Issue #33 fix)
 6. Consistent with Scripts 01-03 lean architecture
+7. Selectable matching engine: per-pattern regex scan (default) or a spaCy
+   PhraseMatcher prefilter over a blank tokenizer-only pipeline (no model needed)
 
 Processing Order: Run after report type extraction (03) to systematically remove geographic regions.
 """
@@ -24,43 +26,42 @@ import os
 import sys
 import re
 import json
+import time
 import logging
-import importlib.util
 from datetime import datetime
-from typing import List, Dict, Set, Tuple, Optional
+from typing import List, Dict, Set, Tuple, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
-from dotenv import load_dotenv
 
-# Import organized output directory manager
-_spec_output = importlib.util.spec_from_file_location("output_dir_manager", os.path.join(os.path.dirname(__file__), "00c_output_directory_manager_v1.py"))
-_output_module = importlib.util.module_from_spec(_spec_output)
-_spec_output.loader.exec_module(_output_module)
+# Cached pipeline module loader (each module executes once per process, from any working directory)
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
+from experiments import load_module
+
+# Organized output directory manager
+_output_module = load_module("output_directory_manager")
 create_organized_output_directory = _output_module.create_organized_output_directory
 create_output_file_header = _output_module.create_output_file_header
 
-# Dynamic import for pattern library manager
-try:
-    pattern_manager_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '00b_pattern_library_manager_v1.py')
-    spec = importlib.util.spec_from_file_location("pattern_library_manager_v1", pattern_manager_path)
-    pattern_module = importlib.util.module_from_spec(spec)
-    sys.modules["pattern_library_manager_v1"] = pattern_module
-    spec.loader.exec_module(pattern_module)
-    PatternLibraryManager = pattern_module.PatternLibraryManager
-    PatternType = pattern_module.PatternType
-except Exception as e:
-    raise ImportError(f"Could not import PatternLibraryManager: {e}") from e
-
-# Load environment variables
-load_dotenv()
-
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# Pattern library manager (filename starts with numbers)
+pattern_module = load_module("pattern_library_manager")
+PatternLibraryManager = pattern_module.PatternLibraryManager
+PatternType = pattern_module.PatternType
+
 logger = logging.getLogger(__name__)
 
+# Matching engines for GeographicEntityDetector
+GEOGRAPHIC_ENGINES = ("regex", "phrase_matcher")
+
+# PhraseMatcher prefilter text: runs of punctuation/whitespace become one space in titles and phrases
+# alike, so 'Japan&Europe', 'Canada;Mexico' or '(Europe|Canada)' tokenize to the words the regex \b rules see
+_MATCHER_SEPARATORS = re.compile(r"\W+")
+
+
+def _matcher_text(text: str) -> str:
+    return _MATCHER_SEPARATORS.sub(" ", text).strip()
+
 class GeographicExtractionResult:
     """Result object for geographic entity extraction."""
 
@@ -81,6 +82,7 @@ class GeographicPattern:
     active: bool
     success_count: int = 0
     failure_count: int = 0
+    pattern_id: Optional[Any] = None
 
 class GeographicEntityDetector:
     """
@@ -88,20 +90,33 @@ class GeographicEntityDetector:
     Fixes Git Issue #33: Better handles separator words between regional entities.
     """
 
-    def __init__(self, pattern_library_manager):
+    def __init__(self, pattern_library_manager, engine: str = "regex"):
         """
         Initialize with PatternLibraryManager (consistent with Scripts 01-03).
 
         Args:
             pattern_library_manager: PatternLibraryManager instance for pattern retrieval (REQUIRED)
+            engine: 'regex' scans every pattern per title; 'phrase_matcher' compiles all
+                    terms and aliases into one spaCy PhraseMatcher and runs the regex
+                    rules only for the patterns it finds (same priority and hyphen rules)
         """
         if not pattern_library_manager:
             raise ValueError("PatternLibraryManager is required")
+        if engine not in GEOGRAPHIC_ENGINES:
+            raise ValueError(f"Unsupported geographic engine '{engine}'. Available: {list(GEOGRAPHIC_ENGINES)}")
 
         self.pattern_library_manager = pattern_library_manager
+        self.engine = engine
         self.geographic_patterns: List[GeographicPattern] = []
+        self.profiler = None  # Optional PatternProfiler (00i); None = profiling off
         self.load_geographic_patterns()
 
+        self._nlp = None
+        self._phrase_matcher = None
+        self._match_id_to_pattern_index: Dict[int, int] = {}
+        if engine == "phrase_matcher":
+            self.build_phrase_matcher()
+
     def load_geographic_patterns(self) -> None:
         """Load geographic patterns from MongoDB with priority ordering."""
         try:
@@ -132,7 +147,8 @@ class GeographicEntityDetector:
                     pattern=pattern_regex,
                     active=pattern_doc.get('active', True),
                     success_count=pattern_doc.get('success_count', 0),
-                    failure_count=pattern_doc.get('failure_count', 0)
+                    failure_count=pattern_doc.get('failure_count', 0),
+                    pattern_id=pattern_doc.get('_id')
                 )
 
                 if geographic_pattern.active:
@@ -152,6 +168,80 @@ class GeographicEntityDetector:
             logger.error(f"Failed to load geographic patterns: {e}")
             raise
 
+    def profiled_patterns(self) -> List[Tuple[str, str, Any]]:
+        """(pattern_type, label, pattern_id) of every loaded pattern and alias, for PatternProfiler registration."""
+        profiled = []
+        for pattern in self.geographic_patterns:
+            profiled.append(('geographic_entity', pattern.term, pattern.pattern_id))
+            profiled.extend(('geographic_entity_alias', self._alias_label(pattern, alias), pattern.pattern_id)
+                            for alias in pattern.aliases)
+        return profiled
+
+    @staticmethod
+    def _alias_label(pattern: GeographicPattern, alias: str) -> str:
+        return f"{pattern.term}: {alias}"
+
+    def build_phrase_matcher(self) -> None:
+        """
+        Compile every active term and alias into one case-insensitive PhraseMatcher.
+
+        Uses a blank English pipeline (tokenizer only). Phrases and titles are both
+        matched with punctuation collapsed to single spaces (_matcher_text): the tokenizer
+        does not split on characters such as '&', ';', '+' or '|', and abbreviations
+        ('U.S' vs 'U.S.') tokenize differently in context, either of which would
+        hide a pattern the regex rules match.
+        """
+        import spacy
+        from spacy.matcher import PhraseMatcher
+
+        self._nlp = spacy.blank("en")
+        self._phrase_matcher = PhraseMatcher(self._nlp.vocab, attr="LOWER")
+        self._match_id_to_pattern_index = {}
+
+        phrase_count = 0
+        for pattern_index, pattern in enumerate(self.geographic_patterns):
+            phrases = {_matcher_text(phrase) for phrase in [pattern.term] + list(pattern.aliases)}
+            phrases.discard('')
+            if not phrases:
+                continue
+
+            match_key = f"geo_{pattern_index}"
+            self._phrase_matcher.add(match_key, list(self._nlp.tokenizer.pipe(sorted(phrases))))
+            self._match_id_to_pattern_index[self._nlp.vocab.strings[match_key]] = pattern_index
+            phrase_count += len(phrases)
+
+        logger.info(f"PhraseMatcher engine compiled {phrase_count} phrases "
+                    f"for {len(self._match_id_to_pattern_index)} patterns")
+
+    def _candidate_patterns(self, doc) -> List[GeographicPattern]:
+        """Patterns with at least one phrase match in doc, in priority order."""
+        pattern_indexes = {self._match_id_to_pattern_index[match_id]
+                           for match_id, _, _ in self._phrase_matcher(doc)}
+        return [self.geographic_patterns[index] for index in sorted(pattern_indexes)]
+
+    def extract_geographic_entities_batch(self, titles: List[str],
+                                          batch_size: int = 256) -> List[GeographicExtractionResult]:
+        """
+        Extract geographic entities from many titles.
+
+        The phrase_matcher engine tokenizes titles with nlp.pipe in batches; the
+        regex engine processes them one at a time.
+
+        Args:
+            titles: Titles after report type extraction
+            batch_size: nlp.pipe batch size (phrase_matcher engine)
+
+        Returns:
+            One GeographicExtractionResult per title, in input order
+        """
+        if self.engine != "phrase_matcher":
+            return [self.extract_geographic_entities(title) for title in titles]
+
+        docs = self._nlp.pipe((_matcher_text(title or "") for title in titles), batch_size=batch_size)
+        return [self._extract_with_patterns(title, self._candidate_patterns(doc)) if title
+                else self.extract_geographic_entities(title)
+                for title, doc in zip(titles, docs)]
+
     def extract_geographic_entities(self, title: str) -> GeographicExtractionResult:
         """
         Extract geographic entities from title with database patterns.
@@ -167,22 +257,38 @@ class GeographicEntityDetector:
         if not title:
             return GeographicExtractionResult([], "", 1.0, "Empty input")
 
+        if self.engine == "phrase_matcher":
+            patterns = self._candidate_patterns(self._nlp.make_doc(_matcher_text(title)))
+        else:
+            patterns = self.geographic_patterns
+        return self._extract_with_patterns(title, patterns)
+
+    def _extract_with_patterns(self, title: str, patterns: List[GeographicPattern]) -> GeographicExtractionResult:
+        """Priority-ordered regex extraction and cleanup over the given patterns."""
         logger.info(f"Processing text: {title[:100]}...")
 
         # Track extracted regions and processing notes
         extracted_regions = []
         processing_notes = []
         working_text = title
+        profiler = self.profiler
 
         # Process patterns by priority (prevents partial matches)
-        for pattern in self.geographic_patterns:
+        for pattern in patterns:
             if not pattern.active:
                 continue
 
             try:
                 # Find all matches for this pattern
                 pattern_matches = []
-                matches = list(re.finditer(pattern.pattern, working_text, re.IGNORECASE))
+                if profiler is None:
+                    matches = list(re.finditer(pattern.pattern, working_text, re.IGNORECASE))
+                else:
+                    profiler.begin('geographic_entity', pattern.term)
+                    start_ns = time.perf_counter_ns()
+                    matches = list(re.finditer(pattern.pattern, working_text, re.IGNORECASE))
+                    profiler.record('geographic_entity', pattern.term, time.perf_counter_ns() - start_ns,
+                                    bool(matches), pattern.pattern_id)
 
                 for match in matches:
                     matched_text = match.group().strip()
@@ -192,6 +298,12 @@ class GeographicEntityDetector:
                             logger.debug(f"Skipping '{matched_text}' - part of hyphenated word")
                             continue
                         pattern_matches.append((match, matched_text))
+                        if profiler is not None:
+                            # One combined regex per term; the match text tells which alias fired
+                            alias = self._matched_alias(matched_text, pattern)
+                            if alias is not None:
+                                profiler.record('geographic_entity_alias', self._alias_label(pattern, alias), 0,
+                                                True, pattern.pattern_id)
 
                 # Process matches for this pattern
                 if pattern_matches:
@@ -235,6 +347,11 @@ class GeographicEntityDetector:
 
         return result
 
+    def _matched_alias(self, matched_text: str, pattern: GeographicPattern) -> Optional[str]:
+        """The alias of pattern that matched_text is (case-insensitive), or None for the term itself."""
+        matched_lower = matched_text.lower()
+        return next((alias for alias in pattern.aliases if alias.lower() == matched_lower), None)
+
     def resolve_to_primary_term(self, matched_text: str, pattern: GeographicPattern) -> str:
         """Resolve alias to primary term for consistency."""
         # Check if matched text is an alias
@@ -583,4 +700,11 @@ def test_geographic_extraction(limit=50):
         raise
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
     test_geographic_extraction()
\ No newline at end of file
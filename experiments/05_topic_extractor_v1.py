@@ -8,32 +8,29 @@ Created for Market Research Title Parser project.
 """
 
 import re
+import time
 import logging
 import os
-import importlib.util
+import sys
 from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass
 from enum import Enum
 from datetime import datetime, timezone
-import pytz
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Cached pipeline module loader (each module executes once per process, from any working directory)
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
+from experiments import load_module
 
-# Dynamic import of organized output directory manager
-import importlib.util
-_spec = importlib.util.spec_from_file_location("output_manager", os.path.join(os.path.dirname(__file__), "00c_output_directory_manager_v1.py"))
-_output_module = importlib.util.module_from_spec(_spec)
-_spec.loader.exec_module(_output_module)
+# Organized output directory manager
+_output_module = load_module("output_directory_manager")
 create_organized_output_directory = _output_module.create_organized_output_directory
 create_output_file_header = _output_module.create_output_file_header
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# Regex linter applied to stored patterns at load time
+get_pattern_linter = load_module("regex_pattern_linter").get_pattern_linter
+
 logger = logging.getLogger(__name__)
 
 class TopicExtractionFormat(Enum):
@@ -96,6 +93,7 @@ class TopicExtractor:
             'market_in': 0,
             'failed_extractions': 0
         }
+        self.profiler = None  # Optional PatternProfiler (00i); None = profiling off
         
         # Load patterns from database
         self._load_database_patterns()
@@ -140,9 +138,12 @@ class TopicExtractor:
                 })
 
                 pattern_list = getattr(self, attr_name)
+                # Regexes failing the linter never reach the hot path
+                pattern_docs, _ = get_pattern_linter().filter_documents(list(cursor))
 
-                for pattern_doc in cursor:
+                for pattern_doc in pattern_docs:
                     pattern_list.append({
+                        'id': pattern_doc.get('_id'),
                         'pattern': pattern_doc['pattern'],
                         'replacement': pattern_doc.get('replacement', ''),
                         'description': pattern_doc.get('description', ''),
@@ -158,6 +159,38 @@ class TopicExtractor:
             logger.error(f"Failed to load database patterns: {e}")
             self._initialize_fallback_patterns()
 
+    def _profiled_pattern_lists(self) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        return [('topic_artifact_cleanup', self.topic_artifact_patterns),
+                ('date_artifact_cleanup', self.date_artifact_patterns),
+                ('systematic_removal', self.systematic_removal_patterns),
+                ('topic_name_creation', self.topic_name_creation_patterns),
+                ('topic_normalization', self.topic_normalization_patterns)]
+
+    @staticmethod
+    def _profile_label(pattern_info: Dict[str, Any]) -> str:
+        description = pattern_info.get('description')
+        return f"{description}: {pattern_info['pattern']}" if description else pattern_info['pattern']
+
+    def profiled_patterns(self) -> List[Tuple[str, str, Any]]:
+        """(pattern_type, label, pattern_id) of every loaded pattern, for PatternProfiler registration."""
+        return [(pattern_type, self._profile_label(pattern_info), pattern_info.get('id'))
+                for pattern_type, pattern_list in self._profiled_pattern_lists() for pattern_info in pattern_list]
+
+    def _sub(self, pattern_type: str, pattern_info: Dict[str, Any], text: str, flags: int = 0) -> str:
+        """Apply one database pattern with re.sub; recorded by the profiler when one is attached."""
+        pattern = pattern_info['pattern']
+        replacement = pattern_info.get('replacement', '')
+        if self.profiler is None:
+            return re.sub(pattern, replacement, text, flags=flags)
+
+        label = self._profile_label(pattern_info)
+        self.profiler.begin(pattern_type, label)
+        start_ns = time.perf_counter_ns()
+        result, count = re.subn(pattern, replacement, text, flags=flags)
+        self.profiler.record(pattern_type, label, time.perf_counter_ns() - start_ns, count > 0,
+                             pattern_info.get('id'))
+        return result
+
     def _initialize_fallback_patterns(self) -> None:
         """Initialize minimal fallback patterns if database is unavailable."""
         logger.warning("Using fallback patterns - database unavailable")
@@ -174,6 +207,7 @@ class TopicExtractor:
     def _get_timestamps(self) -> tuple:
         """Generate PDT and UTC timestamps."""
         utc_now = datetime.now(timezone.utc)
+        import pytz
         pdt_tz = pytz.timezone('America/Los_Angeles')
         pdt_now = utc_now.astimezone(pdt_tz)
         
@@ -594,10 +628,9 @@ class TopicExtractor:
         # Apply topic name creation patterns from database
         for pattern_info in self.topic_name_creation_patterns:
             pattern = pattern_info['pattern']
-            replacement = pattern_info.get('replacement', '')
 
             try:
-                topic_name = re.sub(pattern, replacement, topic_name)
+                topic_name = self._sub('topic_name_creation', pattern_info, topic_name)
                 processing_notes.append(f"Applied topic name pattern: {pattern_info['description']}")
             except re.error as e:
                 logger.warning(f"Invalid regex pattern in topic name creation: {pattern} - {e}")
@@ -626,10 +659,9 @@ class TopicExtractor:
         # Apply topic normalization patterns from database
         for pattern_info in self.topic_normalization_patterns:
             pattern = pattern_info['pattern']
-            replacement = pattern_info.get('replacement', '')
 
             try:
-                normalized = re.sub(pattern, replacement, normalized)
+                normalized = self._sub('topic_normalization', pattern_info, normalized)
                 processing_notes.append(f"Applied normalization pattern: {pattern_info['description']}")
             except re.error as e:
                 logger.warning(f"Invalid regex pattern in topic normalization: {pattern} - {e}")
@@ -650,9 +682,8 @@ class TopicExtractor:
         cleaned = text
         for pattern_info in self.systematic_removal_patterns:
             pattern = pattern_info['pattern']
-            replacement = pattern_info.get('replacement', '')
             before = cleaned
-            cleaned = re.sub(pattern, replacement, cleaned, flags=re.IGNORECASE)
+            cleaned = self._sub('systematic_removal', pattern_info, cleaned, re.IGNORECASE)
             if cleaned != before:
                 processing_notes.append(f"Applied systematic pattern '{pattern_info.get('description', pattern)}': '{cleaned}'")
 
@@ -666,9 +697,8 @@ class TopicExtractor:
         cleaned = text
         for pattern_info in self.date_artifact_patterns:
             pattern = pattern_info['pattern']
-            replacement = pattern_info.get('replacement', '')
             before = cleaned
-            cleaned = re.sub(pattern, replacement, cleaned, flags=re.IGNORECASE)
+            cleaned = self._sub('date_artifact_cleanup', pattern_info, cleaned, re.IGNORECASE)
             if cleaned != before:
                 processing_notes.append(f"Applied date artifact pattern '{pattern_info.get('description', pattern)}': '{cleaned}'")
 
@@ -681,9 +711,7 @@ class TopicExtractor:
 
         cleaned = text
         for pattern_info in self.topic_artifact_patterns:
-            pattern = pattern_info['pattern']
-            replacement = pattern_info.get('replacement', '')
-            cleaned = re.sub(pattern, replacement, cleaned)
+            cleaned = self._sub('topic_artifact_cleanup', pattern_info, cleaned)
 
         return cleaned.strip()
     
@@ -925,4 +953,11 @@ def demo_topic_extraction():
 
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
     demo_topic_extraction()
\ No newline at end of file
@@ -8,33 +8,53 @@ Created for Market Research Title Parser project.
 """
 
 import os
+import sys
 import re
+import random
 import logging
 import json
-import importlib.util
 from typing import Dict, List, Optional, Tuple, Any, Union
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from enum import Enum
 from datetime import datetime, timezone
-from collections import defaultdict, Counter
+from collections import defaultdict, Counter, deque
 import statistics
-import pytz
 
-# Dynamic import of organized output directory manager
-import importlib.util
-_spec = importlib.util.spec_from_file_location("output_manager", os.path.join(os.path.dirname(__file__), "00c_output_directory_manager_v1.py"))
-_output_module = importlib.util.module_from_spec(_spec)
-_spec.loader.exec_module(_output_module)
+# Cached pipeline module loader (each module executes once per process, from any working directory)
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
+from experiments import load_module
+
+# Organized output directory manager
+_output_module = load_module("output_directory_manager")
 create_organized_output_directory = _output_module.create_organized_output_directory
 create_output_file_header = _output_module.create_output_file_header
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Column order of the calculate_batch input arrays
+BATCH_COMPONENTS = ['market_classification', 'date_extraction', 'report_extraction',
+                    'geographic_detection', 'topic_extraction']
+BATCH_PRESENCE_FIELDS = ['date', 'report', 'regions', 'topic']
+BATCH_QUALITY_FLAGS = ['technical_compounds_preserved', 'proper_normalization', 'processing_errors']
+
+# Persisted time-bucket metrics (one document per granularity, bucket start and component)
+METRICS_COLLECTION = 'confidence_metrics'
+BUCKET_SECONDS = {'minute': 60, 'hour': 3600}
+OVERALL_COMPONENT = 'overall'
+# Histogram bins of get_confidence_distribution: h0 = [0.0, 0.2) ... h5 = [0.9, 1.0]
+HISTOGRAM_EDGES = [0.2, 0.4, 0.6, 0.8, 0.9]
+HISTOGRAM_BINS = ['0.0-0.2', '0.2-0.4', '0.4-0.6', '0.6-0.8', '0.8-0.9', '0.9-1.0']
+DEFAULT_METRICS_FLUSH_TITLES = 1000
+# In-memory history is bounded: the most recent analyses (trend analysis/distribution without
+# MongoDB) and the scores _calculate_trend_direction compares; totals are running aggregates
+CONFIDENCE_HISTORY_LIMIT = 10000
+TREND_WINDOW = 20
+# ConfidenceLevel values in np.digitize order of the level bin edges below
+LEVEL_EDGES = [0.4, 0.6, 0.8, 0.9]
+LEVEL_KEYS = ['very_low', 'low', 'medium', 'good', 'high']
+
 class ConfidenceLevel(Enum):
     """Confidence level classifications."""
     HIGH = "high"           # >= 0.9
@@ -111,6 +131,17 @@ class PerformanceMetrics:
     processing_speed_ms: float
     trend_direction: str
 
+@dataclass
+class BatchConfidenceResult:
+    """Vectorized confidence scoring result for a batch (one array entry per title)."""
+    overall_confidence: Any          # float ndarray (n,), rounded to 3 decimals
+    confidence_levels: List[ConfidenceLevel]
+    review_flags: List[ReviewFlag]
+    requires_review: Any             # bool ndarray (n,)
+    weighted_scores: Any             # float ndarray (n,), weighted component average
+    extraction_completeness: Any     # float ndarray (n,)
+    analyses: Optional[List[ConfidenceAnalysis]] = None
+
 @dataclass
 class ConfusionPattern:
     """Pattern confusion tracking."""
@@ -122,6 +153,21 @@ class ConfusionPattern:
     pattern_issue: str
     timestamp: datetime
 
+@dataclass
+class ConfusionAggregate:
+    """Aggregated confusion counters for one (component, pattern_issue) key."""
+    component: str
+    pattern_issue: str
+    count: int = 0
+    confidence_sum: float = 0.0
+    first_seen: Optional[datetime] = None
+    last_seen: Optional[datetime] = None
+    samples: List[ConfusionPattern] = field(default_factory=list)  # Reservoir sample of example titles
+
+    @property
+    def average_confidence(self) -> float:
+        return self.confidence_sum / self.count if self.count else 0.0
+
 class ConfidenceTracker:
     """
     Confidence Tracking System for market research title extraction pipeline.
@@ -131,26 +177,47 @@ class ConfidenceTracker:
     continuous system improvement.
     """
     
-    def __init__(self, pattern_library_manager=None, mongodb_client=None):
+    def __init__(self, pattern_library_manager=None, mongodb_client=None,
+                 metrics_granularity: str = 'minute', database_name: str = 'deathstar'):
         """
         Initialize the Confidence Tracker.
         
         Args:
             pattern_library_manager: Optional pattern library for confusion tracking
-            mongodb_client: Optional MongoDB client for metrics storage
+            mongodb_client: Optional MongoDB client for metrics storage (time-bucket documents)
+            metrics_granularity: Bucket size for persisted metrics ('minute' or 'hour')
+            database_name: Database holding the confidence_metrics collection
         """
+        if metrics_granularity not in BUCKET_SECONDS:
+            raise ValueError(f"Unsupported metrics granularity '{metrics_granularity}'. Available: {list(BUCKET_SECONDS)}")
+        
         self.pattern_library_manager = pattern_library_manager
         self.mongodb_client = mongodb_client
         
-        # Confidence tracking storage
-        self.confidence_history = []
-        self.confusion_patterns = []
+        # Persisted metrics: per-bucket increments are buffered and upserted in one bulk_write
+        self.metrics_granularity = metrics_granularity
+        self.metrics_collection = mongodb_client[database_name][METRICS_COLLECTION] if mongodb_client is not None else None
+        self.metrics_flush_titles = DEFAULT_METRICS_FLUSH_TITLES
+        self._pending_buckets: Dict[Tuple[datetime, str], Dict[str, Any]] = {}
+        self._pending_titles = 0
+        self._metrics_index_ready = False
+        
+        # Confidence tracking storage (most recent analyses only)
+        self.confidence_history = deque(maxlen=CONFIDENCE_HISTORY_LIMIT)
+        # Confusion tracking: constant memory, one aggregate per (component, pattern_issue)
+        self.confusion_patterns: Dict[Tuple[str, str], ConfusionAggregate] = {}
+        self.confusion_sample_size = 5
+        self._confusion_rng = random.Random(0)
+        # Running aggregates: constant memory however many titles are tracked
         self.performance_metrics = {
             'total_processed': 0,
-            'confidence_scores': [],
-            'extraction_completeness': [],
-            'component_success_rates': defaultdict(list),
-            'processing_times': [],
+            'confidence_sum': 0.0,
+            'confidence_levels': Counter(),  # LEVEL_KEYS -> titles
+            'recent_confidence_scores': deque(maxlen=TREND_WINDOW),
+            'extraction_completeness_sum': 0.0,
+            'component_success_rates': defaultdict(lambda: [0, 0]),  # component -> [scores >= 0.8, scores]
+            'processing_time_sum': 0.0,
+            'processing_time_count': 0,
             'review_flags': defaultdict(int)
         }
         
@@ -198,6 +265,7 @@ class ConfidenceTracker:
     def _get_timestamps(self) -> tuple:
         """Generate PDT and UTC timestamps."""
         utc_now = datetime.now(timezone.utc)
+        import pytz
         pdt_tz = pytz.timezone('America/Los_Angeles')
         pdt_now = utc_now.astimezone(pdt_tz)
         
@@ -313,6 +381,144 @@ class ConfidenceTracker:
         
         return total_weighted_sum / total_weights
     
+    def batch_arrays(self, extraction_results: List[ExtractionResults]) -> Tuple[Any, Any, Any]:
+        """
+        Convert extraction results to calculate_batch input arrays.
+        
+        Args:
+            extraction_results: Extraction results for a batch of titles
+            
+        Returns:
+            (component_scores (n, 5), presence (n, 4), flags (n, 3)) in BATCH_COMPONENTS,
+            BATCH_PRESENCE_FIELDS and BATCH_QUALITY_FLAGS column order
+        """
+        import numpy as np
+        
+        component_scores = np.array([
+            (r.market_classification_confidence, r.date_extraction_confidence, r.report_extraction_confidence,
+             r.geographic_detection_confidence, r.topic_extraction_confidence)
+            for r in extraction_results], dtype=np.float64).reshape(-1, len(BATCH_COMPONENTS))
+        presence = np.array([
+            (bool(r.extracted_forecast_date_range), bool(r.extracted_report_type),
+             bool(r.extracted_regions), bool(r.topic))
+            for r in extraction_results], dtype=bool).reshape(-1, len(BATCH_PRESENCE_FIELDS))
+        flags = np.array([
+            (bool(r.topic and re.search(r'\b[A-Z0-9]+\b', r.topic)),
+             bool(r.topic_name and re.match(r'^[a-z0-9-]+$', r.topic_name)),
+             bool(r.errors_encountered))
+            for r in extraction_results], dtype=bool).reshape(-1, len(BATCH_QUALITY_FLAGS))
+        return component_scores, presence, flags
+    
+    def calculate_batch(self, component_scores, presence, flags,
+                        extraction_results: Optional[List[ExtractionResults]] = None,
+                        processing_times_ms=None, return_analyses: bool = False,
+                        track: bool = True) -> BatchConfidenceResult:
+        """
+        Score a batch of titles with matrix operations (same result as calculateOverallConfidence).
+        
+        Args:
+            component_scores: (n, 5) component confidences in BATCH_COMPONENTS order
+            presence: (n, 4) bool mask of extracted date, report type, regions and topic
+            flags: (n, 3) bool quality flags in BATCH_QUALITY_FLAGS order
+            extraction_results: Optional source results, used for confusion tracking and analyses
+            processing_times_ms: Optional (n,) pipeline time per title
+            return_analyses: Also build a ConfidenceAnalysis per title (slow path)
+            track: Add the batch to the performance metrics
+            
+        Returns:
+            BatchConfidenceResult with per-title arrays (and analyses when requested)
+        """
+        import numpy as np
+        
+        component_scores = np.asarray(component_scores, dtype=np.float64)
+        presence = np.asarray(presence, dtype=bool)
+        flags = np.asarray(flags, dtype=bool)
+        
+        component_weights = np.array([self.component_weights[c] for c in BATCH_COMPONENTS])
+        missing_weights = np.array([self.completeness_weights[f"{field}_missing"] for field in BATCH_PRESENCE_FIELDS])
+        quality_weights = np.array([self.quality_indicators[flag] for flag in BATCH_QUALITY_FLAGS])
+        
+        weighted = component_scores @ component_weights
+        total_weight = component_weights.sum()
+        weighted = weighted / total_weight if total_weight else np.zeros(len(component_scores))
+        completeness = presence.sum(axis=1) * (1.0 / len(BATCH_PRESENCE_FIELDS))
+        completeness_adjustment = (~presence) @ missing_weights
+        quality_adjustment = flags @ quality_weights
+        overall = np.clip(weighted + completeness_adjustment + quality_adjustment, 0.0, 1.0)
+        
+        # Bin edges match _get_confidence_level / _determine_review_flag
+        level_order = [ConfidenceLevel.VERY_LOW, ConfidenceLevel.LOW, ConfidenceLevel.MEDIUM,
+                       ConfidenceLevel.GOOD, ConfidenceLevel.HIGH]
+        review_order = [ReviewFlag.CRITICAL_REVIEW, ReviewFlag.PRIORITY_REVIEW,
+                        ReviewFlag.STANDARD_REVIEW, ReviewFlag.NO_REVIEW]
+        level_codes = np.digitize(overall, [0.4, 0.6, 0.8, 0.9])
+        review_codes = np.digitize(overall, [self.critical_review_threshold, self.priority_review_threshold,
+                                             self.review_threshold])
+        requires_review = overall < self.review_threshold
+        rounded = np.round(overall, 3)
+        
+        result = BatchConfidenceResult(
+            overall_confidence=rounded,
+            confidence_levels=[level_order[code] for code in level_codes],
+            review_flags=[review_order[code] for code in review_codes],
+            requires_review=requires_review,
+            weighted_scores=weighted,
+            extraction_completeness=completeness
+        )
+        
+        # Confusion tracking only looks at titles with a low component
+        low_rows = np.flatnonzero((component_scores < 0.7).any(axis=1))
+        confusion = {}
+        if extraction_results is not None:
+            rows = range(len(extraction_results)) if return_analyses else low_rows
+            confusion = {int(row): self.trackConfusionPatterns(extraction_results[row].title, extraction_results[row])
+                         for row in rows}
+        
+        if return_analyses:
+            result.analyses = self._batch_analyses(result, component_scores, completeness_adjustment,
+                                                   quality_adjustment, extraction_results, processing_times_ms,
+                                                   confusion)
+        
+        if track:
+            self._track_batch_result(result, component_scores, processing_times_ms)
+        
+        return result
+    
+    def _batch_analyses(self, result: BatchConfidenceResult, component_scores, completeness_adjustment,
+                        quality_adjustment, extraction_results, processing_times_ms,
+                        confusion: Dict[int, List[str]]) -> List[ConfidenceAnalysis]:
+        """Per-title ConfidenceAnalysis objects for a scored batch."""
+        analyses = []
+        timestamp = datetime.now(timezone.utc)
+        for row in range(len(component_scores)):
+            scores = dict(zip(BATCH_COMPONENTS, component_scores[row].tolist()))
+            overall = float(result.overall_confidence[row])
+            processing_time = float(processing_times_ms[row]) if processing_times_ms is not None else (
+                extraction_results[row].processing_time_ms if extraction_results is not None else None)
+            analyses.append(ConfidenceAnalysis(
+                title=extraction_results[row].title if extraction_results is not None else "",
+                overall_confidence=overall,
+                confidence_level=result.confidence_levels[row],
+                review_flag=result.review_flags[row],
+                weighted_scores={c: score * self.component_weights[c] for c, score in scores.items()},
+                component_scores=scores,
+                extraction_completeness=float(result.extraction_completeness[row]),
+                confusion_patterns=confusion.get(row, []),
+                quality_indicators={
+                    'extraction_completeness': float(result.extraction_completeness[row]),
+                    'weighted_component_score': float(result.weighted_scores[row]),
+                    'completeness_adjustment': float(completeness_adjustment[row]),
+                    'quality_adjustment': float(quality_adjustment[row]),
+                    'component_breakdown': scores,
+                    'processing_time_ms': processing_time or 0
+                },
+                recommendation=self._generate_recommendation(
+                    overall, result.confidence_levels[row], result.review_flags[row],
+                    extraction_results[row] if extraction_results is not None else None),
+                processing_timestamp=timestamp
+            ))
+        return analyses
+    
     def shouldFlagForReview(self, confidence: float) -> bool:
         """
         Determine if a title should be flagged for human review.
@@ -352,18 +558,7 @@ class ConfidenceTracker:
                 pattern_issue = self._identify_pattern_issue(component, extraction_results)
                 if pattern_issue:
                     confusion_patterns.append(f"{component}: {pattern_issue}")
-                    
-                    # Store detailed confusion pattern
-                    confusion = ConfusionPattern(
-                        title=title,
-                        component=component,
-                        expected_result=None,  # Would need ground truth data
-                        actual_result=self._get_component_result(component, extraction_results),
-                        confidence_score=confidence,
-                        pattern_issue=pattern_issue,
-                        timestamp=datetime.now(timezone.utc)
-                    )
-                    self.confusion_patterns.append(confusion)
+                    self._record_confusion(title, component, pattern_issue, confidence, extraction_results)
         
         # Check for conflicting extractions
         conflicts = self._detect_extraction_conflicts(extraction_results)
@@ -371,6 +566,63 @@ class ConfidenceTracker:
         
         return confusion_patterns
     
+    def _record_confusion(self, title: str, component: str, pattern_issue: str, confidence: float,
+                          extraction_results: ExtractionResults) -> None:
+        """Count a confusion and keep it as an example with reservoir sampling (Algorithm R)."""
+        key = (component, pattern_issue)
+        aggregate = self.confusion_patterns.get(key)
+        if aggregate is None:
+            aggregate = self.confusion_patterns[key] = ConfusionAggregate(component, pattern_issue)
+        
+        now = datetime.now(timezone.utc)
+        aggregate.count += 1
+        aggregate.confidence_sum += confidence
+        aggregate.first_seen = aggregate.first_seen or now
+        aggregate.last_seen = now
+        
+        if len(aggregate.samples) < self.confusion_sample_size:
+            slot = len(aggregate.samples)
+        else:
+            slot = self._confusion_rng.randrange(aggregate.count)
+            if slot >= self.confusion_sample_size:
+                return
+        
+        # Only sampled examples are materialized
+        example = ConfusionPattern(
+            title=title,
+            component=component,
+            expected_result=None,  # Would need ground truth data
+            actual_result=self._get_component_result(component, extraction_results),
+            confidence_score=confidence,
+            pattern_issue=pattern_issue,
+            timestamp=now
+        )
+        if slot == len(aggregate.samples):
+            aggregate.samples.append(example)
+        else:
+            aggregate.samples[slot] = example
+    
+    def get_confusion_summary(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Aggregated confusion patterns, most frequent first.
+        
+        Args:
+            limit: Optional maximum number of (component, pattern_issue) keys
+            
+        Returns:
+            List of dicts with counts, average confidence and example titles
+        """
+        aggregates = sorted(self.confusion_patterns.values(), key=lambda a: (-a.count, a.component, a.pattern_issue))
+        return [{
+            'component': aggregate.component,
+            'pattern_issue': aggregate.pattern_issue,
+            'count': aggregate.count,
+            'average_confidence': round(aggregate.average_confidence, 3),
+            'first_seen': aggregate.first_seen.isoformat() if aggregate.first_seen else None,
+            'last_seen': aggregate.last_seen.isoformat() if aggregate.last_seen else None,
+            'example_titles': [sample.title for sample in aggregate.samples]
+        } for aggregate in aggregates[:limit]]
+    
     def getPerformanceMetrics(self) -> PerformanceMetrics:
         """
         Get comprehensive system performance statistics.
@@ -395,29 +647,21 @@ class ConfidenceTracker:
                 trend_direction="stable"
             )
         
-        confidence_scores = self.performance_metrics['confidence_scores']
-        
-        # Calculate confidence level counts
-        level_counts = {
-            'high': sum(1 for score in confidence_scores if score >= 0.9),
-            'good': sum(1 for score in confidence_scores if 0.8 <= score < 0.9),
-            'medium': sum(1 for score in confidence_scores if 0.6 <= score < 0.8),
-            'low': sum(1 for score in confidence_scores if 0.4 <= score < 0.6),
-            'very_low': sum(1 for score in confidence_scores if score < 0.4)
-        }
+        metrics = self.performance_metrics
+        level_counts = metrics['confidence_levels']
         
         # Calculate extraction success rates
         success_rates = {}
-        for component, scores in self.performance_metrics['component_success_rates'].items():
-            if scores:
-                success_rates[component] = sum(1 for score in scores if score >= 0.8) / len(scores)
+        for component, (successes, scored) in metrics['component_success_rates'].items():
+            if scored:
+                success_rates[component] = successes / scored
         
         # Calculate average processing speed
-        processing_times = self.performance_metrics['processing_times']
-        avg_speed = statistics.mean(processing_times) if processing_times else 0.0
+        processing_count = metrics['processing_time_count']
+        avg_speed = metrics['processing_time_sum'] / processing_count if processing_count else 0.0
         
         # Calculate trend direction
-        trend_direction = self._calculate_trend_direction(confidence_scores)
+        trend_direction = self._calculate_trend_direction(list(metrics['recent_confidence_scores']))
         
         return PerformanceMetrics(
             total_processed=total_processed,
@@ -427,7 +671,7 @@ class ConfidenceTracker:
             low_confidence_count=level_counts['low'],
             very_low_confidence_count=level_counts['very_low'],
             flagged_for_review=self.performance_metrics['review_flags'].get('flagged', 0),
-            average_confidence=round(statistics.mean(confidence_scores), 3) if confidence_scores else 0.0,
+            average_confidence=round(metrics['confidence_sum'] / total_processed, 3),
             extraction_success_rates=success_rates,
             processing_speed_ms=round(avg_speed, 2),
             trend_direction=trend_direction
@@ -595,24 +839,275 @@ class ConfidenceTracker:
     
     def _track_analysis_result(self, analysis: ConfidenceAnalysis, extraction_results: ExtractionResults) -> None:
         """Track analysis result for performance metrics."""
-        self.performance_metrics['total_processed'] += 1
-        self.performance_metrics['confidence_scores'].append(analysis.overall_confidence)
-        self.performance_metrics['extraction_completeness'].append(analysis.extraction_completeness)
+        metrics = self.performance_metrics
+        metrics['total_processed'] += 1
+        metrics['confidence_sum'] += analysis.overall_confidence
+        metrics['confidence_levels'][self._get_confidence_level(analysis.overall_confidence).value] += 1
+        metrics['recent_confidence_scores'].append(analysis.overall_confidence)
+        metrics['extraction_completeness_sum'] += analysis.extraction_completeness
         
         # Track component success rates
         for component, score in analysis.component_scores.items():
-            self.performance_metrics['component_success_rates'][component].append(score)
+            counts = metrics['component_success_rates'][component]
+            counts[0] += int(score >= 0.8)
+            counts[1] += 1
         
         # Track processing time
         if extraction_results.processing_time_ms:
-            self.performance_metrics['processing_times'].append(extraction_results.processing_time_ms)
+            metrics['processing_time_sum'] += extraction_results.processing_time_ms
+            metrics['processing_time_count'] += 1
         
         # Track review flags
         flag_key = 'flagged' if analysis.review_flag != ReviewFlag.NO_REVIEW else 'not_flagged'
-        self.performance_metrics['review_flags'][flag_key] += 1
+        metrics['review_flags'][flag_key] += 1
         
         # Store in history
         self.confidence_history.append(analysis)
+        
+        if self.metrics_collection is not None:
+            bucket_start = self._bucket_start(analysis.processing_timestamp)
+            self._add_to_bucket(bucket_start, OVERALL_COMPONENT, [analysis.overall_confidence], {
+                'flagged': int(analysis.review_flag != ReviewFlag.NO_REVIEW),
+                'completeness_sum': analysis.extraction_completeness,
+                'processing_ms_sum': extraction_results.processing_time_ms or 0.0,
+                'processing_count': int(bool(extraction_results.processing_time_ms)),
+                **self._histogram_increments([analysis.overall_confidence])
+            })
+            for component, score in analysis.component_scores.items():
+                self._add_to_bucket(bucket_start, component, [score], {'success': int(score >= 0.8)})
+            self._count_pending_titles(1)
+    
+    def _track_batch_result(self, result: BatchConfidenceResult, component_scores, processing_times_ms) -> None:
+        """Track a scored batch for performance metrics (history only holds built analyses)."""
+        import numpy as np
+        
+        metrics = self.performance_metrics
+        metrics['total_processed'] += len(component_scores)
+        metrics['confidence_sum'] += float(result.overall_confidence.sum())
+        level_counts = np.bincount(np.digitize(result.overall_confidence, LEVEL_EDGES), minlength=len(LEVEL_KEYS))
+        metrics['confidence_levels'].update(dict(zip(LEVEL_KEYS, level_counts.tolist())))
+        metrics['recent_confidence_scores'].extend(result.overall_confidence[-TREND_WINDOW:].tolist())
+        metrics['extraction_completeness_sum'] += float(result.extraction_completeness.sum())
+        
+        for column, component in enumerate(BATCH_COMPONENTS):
+            counts = metrics['component_success_rates'][component]
+            counts[0] += int((component_scores[:, column] >= 0.8).sum())
+            counts[1] += len(component_scores)
+        
+        if processing_times_ms is not None:
+            times = [t for t in processing_times_ms if t]
+            metrics['processing_time_sum'] += float(sum(times))
+            metrics['processing_time_count'] += len(times)
+        
+        flagged = int(result.requires_review.sum())
+        metrics['review_flags']['flagged'] += flagged
+        metrics['review_flags']['not_flagged'] += len(component_scores) - flagged
+        
+        if result.analyses:
+            self.confidence_history.extend(result.analyses)
+        
+        if self.metrics_collection is not None and len(component_scores):
+            bucket_start = self._bucket_start(datetime.now(timezone.utc))
+            times = [t for t in processing_times_ms if t] if processing_times_ms is not None else []
+            self._add_to_bucket(bucket_start, OVERALL_COMPONENT, result.overall_confidence, {
+                'flagged': flagged,
+                'completeness_sum': float(result.extraction_completeness.sum()),
+                'processing_ms_sum': float(sum(times)),
+                'processing_count': len(times),
+                **self._histogram_increments(result.overall_confidence)
+            })
+            for column, component in enumerate(BATCH_COMPONENTS):
+                scores = component_scores[:, column]
+                self._add_to_bucket(bucket_start, component, scores, {'success': int((scores >= 0.8).sum())})
+            self._count_pending_titles(len(component_scores))
+    
+    def _bucket_start(self, timestamp: datetime) -> datetime:
+        """Start of the metrics bucket containing timestamp (UTC)."""
+        seconds = BUCKET_SECONDS[self.metrics_granularity]
+        epoch = int(timestamp.timestamp()) // seconds * seconds
+        return datetime.fromtimestamp(epoch, tz=timezone.utc)
+    
+    @staticmethod
+    def _histogram_increments(scores) -> Dict[str, int]:
+        """Histogram bin counts ('histogram.h<i>') for a set of overall confidence scores."""
+        counts = [0] * len(HISTOGRAM_BINS)
+        for score in scores:
+            counts[sum(1 for edge in HISTOGRAM_EDGES if score >= edge)] += 1
+        return {f"histogram.h{index}": count for index, count in enumerate(counts) if count}
+    
+    def _add_to_bucket(self, bucket_start: datetime, component: str, scores, increments: Dict[str, Any]) -> None:
+        """Buffer count/sum/min/max and extra $inc fields for one bucket document."""
+        pending = self._pending_buckets.get((bucket_start, component))
+        if pending is None:
+            pending = self._pending_buckets[(bucket_start, component)] = {
+                'inc': defaultdict(float), 'min': None, 'max': None}
+        
+        scores = [float(score) for score in scores]
+        pending['inc']['count'] += len(scores)
+        pending['inc']['score_sum'] += sum(scores)
+        for field_name, value in increments.items():
+            pending['inc'][field_name] += value
+        low, high = min(scores), max(scores)
+        pending['min'] = low if pending['min'] is None else min(pending['min'], low)
+        pending['max'] = high if pending['max'] is None else max(pending['max'], high)
+    
+    def _count_pending_titles(self, count: int) -> None:
+        self._pending_titles += count
+        if self._pending_titles >= self.metrics_flush_titles:
+            self.flush_metrics()
+    
+    def _bucket_id(self, bucket_start: datetime, component: str) -> str:
+        return f"{self.metrics_granularity}|{bucket_start.strftime('%Y-%m-%dT%H:%M')}|{component}"
+    
+    def flush_metrics(self) -> int:
+        """
+        Upsert buffered bucket increments into the metrics collection with one bulk_write.
+        
+        $inc/$min/$max upserts commute, so concurrent workers and later runs
+        merge into the same bucket documents. $inc is not idempotent: after a
+        partial failure (BulkWriteError) only the operations the server
+        reported as failed stay buffered for the next flush.
+        
+        Returns:
+            Number of bucket documents written
+        """
+        if self.metrics_collection is None or not self._pending_buckets:
+            return 0
+        
+        from pymongo import UpdateOne, ASCENDING
+        from pymongo.errors import BulkWriteError
+        
+        if not self._metrics_index_ready:
+            self.metrics_collection.create_index([('granularity', ASCENDING), ('bucket_start', ASCENDING),
+                                                  ('component', ASCENDING)])
+            self._metrics_index_ready = True
+        
+        keys = list(self._pending_buckets)
+        operations = []
+        for bucket_start, component in keys:
+            pending = self._pending_buckets[(bucket_start, component)]
+            # *_sum fields are float totals, everything else is a count
+            increments = {name: float(value) if name.endswith('_sum') else int(value)
+                          for name, value in pending['inc'].items()}
+            operations.append(UpdateOne(
+                {'_id': self._bucket_id(bucket_start, component)},
+                {'$setOnInsert': {'granularity': self.metrics_granularity, 'bucket_start': bucket_start,
+                                  'component': component},
+                 '$inc': increments,
+                 '$min': {'min': pending['min']},
+                 '$max': {'max': pending['max']}},
+                upsert=True))
+        
+        try:
+            self.metrics_collection.bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # Unordered: every operation without a write error was applied; re-sending it would double count
+            failed = {error['index'] for error in e.details.get('writeErrors', [])}
+            self._pending_buckets = {keys[index]: self._pending_buckets[keys[index]] for index in sorted(failed)}
+            self._pending_titles = 0
+            logger.error(f"Persisted {len(operations) - len(failed)} of {len(operations)} confidence metric buckets; "
+                         f"{len(failed)} kept for the next flush: {e}")
+            return len(operations) - len(failed)
+        except Exception as e:
+            # Nothing was acknowledged; keep the increments buffered so the next flush retries them
+            logger.error(f"Failed to persist confidence metrics: {e}")
+            return 0
+        
+        self._pending_buckets.clear()
+        self._pending_titles = 0
+        logger.debug(f"Persisted {len(operations)} confidence metric buckets")
+        return len(operations)
+    
+    def clear_pending_metrics(self) -> None:
+        """Drop buffered increments without writing them (a forked worker inherits its parent's buffer)."""
+        self._pending_buckets.clear()
+        self._pending_titles = 0
+    
+    def _load_buckets(self, days: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Bucket documents (flushing this process first), oldest first."""
+        self.flush_metrics()
+        query: Dict[str, Any] = {'granularity': self.metrics_granularity}
+        if days is not None:
+            from datetime import timedelta
+            query['bucket_start'] = {'$gte': self._bucket_start(datetime.now(timezone.utc) - timedelta(days=days))}
+        return list(self.metrics_collection.find(query).sort('bucket_start', 1))
+    
+    def _trend_from_buckets(self, overall_buckets: List[Dict[str, Any]]) -> str:
+        """Compare the average of the newer half of the titles with the older half."""
+        total = sum(bucket['count'] for bucket in overall_buckets)
+        if total < 10 or len(overall_buckets) < 2:
+            return "insufficient_data" if total < 10 else "stable"
+        
+        seen = earlier_sum = earlier_count = 0
+        for index, bucket in enumerate(overall_buckets):
+            if seen >= total / 2 and index > 0:
+                break
+            seen += bucket['count']
+            earlier_sum += bucket['score_sum']
+            earlier_count += bucket['count']
+        recent_count = total - earlier_count
+        if recent_count == 0:
+            return "stable"
+        
+        recent_sum = sum(bucket['score_sum'] for bucket in overall_buckets) - earlier_sum
+        difference = recent_sum / recent_count - earlier_sum / earlier_count
+        if difference > 0.05:
+            return "improving"
+        elif difference < -0.05:
+            return "declining"
+        return "stable"
+    
+    def _trend_analysis_from_buckets(self, days: int) -> Dict[str, Any]:
+        """get_trend_analysis over persisted buckets (all workers and runs)."""
+        buckets = self._load_buckets(days)
+        overall = [bucket for bucket in buckets if bucket['component'] == OVERALL_COMPONENT]
+        total = sum(bucket['count'] for bucket in overall)
+        
+        if not total:
+            return {
+                'period_days': days,
+                'total_processed': 0,
+                'trend': 'no_data',
+                'confidence_distribution': {},
+                'improvement_areas': []
+            }
+        
+        histogram = [sum(bucket.get('histogram', {}).get(f"h{index}", 0) for bucket in overall)
+                     for index in range(len(HISTOGRAM_BINS))]
+        distribution = {
+            'high': histogram[5],
+            'good': histogram[4],
+            'medium': histogram[3],
+            'low': histogram[2],
+            'very_low': histogram[0] + histogram[1]
+        }
+        
+        component_totals = defaultdict(lambda: [0, 0.0])
+        for bucket in buckets:
+            if bucket['component'] != OVERALL_COMPONENT:
+                component_totals[bucket['component']][0] += bucket['count']
+                component_totals[bucket['component']][1] += bucket['score_sum']
+        
+        improvement_areas = []
+        for component, (count, score_sum) in component_totals.items():
+            avg_score = score_sum / count if count else 0.0
+            if avg_score < 0.8:
+                improvement_areas.append({
+                    'component': component,
+                    'average_confidence': round(avg_score, 3),
+                    'suggestion': f"Review {component} patterns and accuracy"
+                })
+        
+        return {
+            'period_days': days,
+            'total_processed': total,
+            'average_confidence': round(sum(bucket['score_sum'] for bucket in overall) / total, 3),
+            'trend': self._trend_from_buckets(overall),
+            'confidence_distribution': distribution,
+            'improvement_areas': improvement_areas,
+            'flagged_for_review': sum(bucket.get('flagged', 0) for bucket in overall),
+            'buckets': len(overall)
+        }
     
     def _calculate_trend_direction(self, confidence_scores: List[float]) -> str:
         """Calculate trend direction for confidence scores."""
@@ -642,12 +1137,19 @@ class ConfidenceTracker:
         """
         Get trend analysis for confidence scores over time.
         
+        With a MongoDB client the analysis reads the persisted time buckets,
+        so it covers every worker and run; otherwise this process's history
+        (the last CONFIDENCE_HISTORY_LIMIT analyses).
+        
         Args:
             days: Number of days to analyze
             
         Returns:
             Dictionary with trend analysis data
         """
+        if self.metrics_collection is not None:
+            return self._trend_analysis_from_buckets(days)
+        
         from datetime import timedelta
         cutoff_date = datetime.now(timezone.utc) - timedelta(days=days)
         
@@ -704,13 +1206,21 @@ class ConfidenceTracker:
                                     if analysis.review_flag != ReviewFlag.NO_REVIEW)
         }
     
-    def get_confidence_distribution(self) -> Dict[str, Any]:
+    def get_confidence_distribution(self, days: Optional[int] = None) -> Dict[str, Any]:
         """
         Get visualization helpers for confidence distribution.
         
+        Without a MongoDB client this covers the last CONFIDENCE_HISTORY_LIMIT analyses.
+        
+        Args:
+            days: Optional period for persisted buckets (all buckets when None)
+            
         Returns:
             Dictionary with data suitable for visualization
         """
+        if self.metrics_collection is not None:
+            return self._distribution_from_buckets(days)
+        
         if not self.confidence_history:
             return {'message': 'No confidence data available'}
         
@@ -743,6 +1253,41 @@ class ConfidenceTracker:
             }
         }
     
+    def _distribution_from_buckets(self, days: Optional[int] = None) -> Dict[str, Any]:
+        """get_confidence_distribution over persisted buckets; the median is interpolated from the histogram."""
+        overall = [bucket for bucket in self._load_buckets(days) if bucket['component'] == OVERALL_COMPONENT]
+        total = sum(bucket['count'] for bucket in overall)
+        if not total:
+            return {'message': 'No confidence data available'}
+        
+        bin_counts = [sum(bucket.get('histogram', {}).get(f"h{index}", 0) for bucket in overall)
+                      for index in range(len(HISTOGRAM_BINS))]
+        
+        edges = [0.0] + HISTOGRAM_EDGES + [1.0]
+        median, cumulative = 0.0, 0
+        for index, count in enumerate(bin_counts):
+            if count and cumulative + count >= total / 2:
+                median = edges[index] + (total / 2 - cumulative) / count * (edges[index + 1] - edges[index])
+                break
+            cumulative += count
+        
+        return {
+            'total_samples': total,
+            'average_confidence': round(sum(bucket['score_sum'] for bucket in overall) / total, 3),
+            'median_confidence': round(median, 3),
+            'confidence_histogram': {
+                'bins': list(HISTOGRAM_BINS),
+                'counts': bin_counts,
+                'percentages': [round((count / total) * 100, 1) for count in bin_counts]
+            },
+            'quality_breakdown': {
+                'high_quality': bin_counts[5],
+                'production_ready': bin_counts[4] + bin_counts[5],
+                'needs_review': sum(bin_counts[:4]),
+                'critical_review': bin_counts[0] + bin_counts[1]
+            }
+        }
+    
     def export_confidence_report(self, filename: Optional[str] = None) -> str:
         """
         Export comprehensive confidence tracking report.
@@ -795,14 +1340,19 @@ COMPONENT SUCCESS RATES:"""
         report += f"""
 
 PATTERN CONFUSION TRACKING:
-  Confusion Patterns Detected: {len(self.confusion_patterns):,}
+  Confusion Patterns Detected: {sum(a.count for a in self.confusion_patterns.values()):,}
   Most Common Issues:"""
         
-        # Analyze most common confusion patterns
+        # Most common confusion patterns straight from the aggregated counters
         if self.confusion_patterns:
-            issue_counts = Counter([pattern.pattern_issue for pattern in self.confusion_patterns])
+            issue_counts = Counter()
+            for aggregate in self.confusion_patterns.values():
+                issue_counts[aggregate.pattern_issue] += aggregate.count
             for issue, count in issue_counts.most_common(5):
                 report += f"\n    • {issue}: {count} occurrences"
+            for summary in self.get_confusion_summary(limit=5):
+                if summary['example_titles']:
+                    report += f"\n      e.g. {summary['component']}: {summary['example_titles'][0]}"
         else:
             report += "\n    • No significant confusion patterns detected"
         
@@ -990,4 +1540,8 @@ def demo_confidence_tracker():
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
     demo_confidence_tracker()
\ No newline at end of file
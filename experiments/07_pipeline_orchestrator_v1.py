@@ -10,35 +10,96 @@ Created for Market Research Title Parser project.
 import os
 import sys
 import logging
-import importlib.util
 from datetime import datetime, timezone
 from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass, asdict
-import pytz
+from dataclasses import dataclass, asdict, is_dataclass
 import json
 import time
+import random
+import asyncio
+import itertools
+import threading
 import traceback
+import multiprocessing
+from multiprocessing.connection import wait as wait_for_connections
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 
-# Dynamic import of organized output directory manager
-import importlib.util
-_spec = importlib.util.spec_from_file_location("output_manager", os.path.join(os.path.dirname(__file__), "00c_output_directory_manager_v1.py"))
-_output_module = importlib.util.module_from_spec(_spec)
-_spec.loader.exec_module(_output_module)
+# Cached pipeline module loader (each module executes once per process, from any working directory)
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
+from experiments import load_module
+
+# Organized output directory manager
+_output_module = load_module("output_directory_manager")
 create_organized_output_directory = _output_module.create_organized_output_directory
 create_output_file_header = _output_module.create_output_file_header
 
+# Pre-processing title deduplicator
+_dedup_module = load_module("title_deduplicator")
+TitleDeduplicator = _dedup_module.TitleDeduplicator
+DeduplicationResult = _dedup_module.DeduplicationResult
+
+# Columnar (Parquet/numpy) results writer
+_columnar_module = load_module("columnar_results_writer")
+ColumnarResultsWriter = _columnar_module.ColumnarResultsWriter
+
+# Per-pattern hit/cost profiler
+_profiler_module = load_module("pattern_profiler")
+PatternProfiler = _profiler_module.PatternProfiler
+attach_profiler = _profiler_module.attach_profiler
+profile_updates = _profiler_module.profile_updates
+
+# Inverted facet index (region / report type / date range / topicName)
+FacetIndex = load_module("facet_index").FacetIndex
+
+# Shared MongoDB connection manager
+_conn_module = load_module("mongodb_connection_manager")
+get_mongo_client = _conn_module.get_mongo_client
+find_projected = _conn_module.find_projected
+
 # MongoDB imports
-from pymongo import MongoClient
+from pymongo import ReplaceOne
 from pymongo.errors import PyMongoError
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
+# Pipeline stages in processing order (keys of ProcessingResult.stage_timings)
+PIPELINE_STAGES = [
+    'market_classification',
+    'date_extraction',
+    'report_extraction',
+    'geographic_detection',
+    'topic_extraction',
+    'confidence_analysis'
+]
+
+# Titles per detector nlp.pipe call when processBatch batches geographic detection (phrase_matcher engine)
+GEOGRAPHIC_PIPE_BATCH_SIZE = 256
+
+# Retry queue (processRetryQueue) and dead-letter collection
+RETRY_BACKOFF_BASE_SECONDS = 1.0
+DEAD_LETTER_COLLECTION = "markets_dead_letter"
+
+# Per-title time budgets (processBatchWithBudget)
+BUDGET_POLL_SECONDS = 0.02
+SLOW_PATH_BUDGET_MULTIPLIER = 4.0
+# Shared worker state: title index, title start, stage index, stage start, then (type index, ordinal)
+# of the last completed pattern and of the pattern being evaluated (-1 between evaluations)
+(_STATE_TITLE, _STATE_TITLE_START, _STATE_STAGE, _STATE_STAGE_START, _STATE_PATTERN_TYPE, _STATE_PATTERN,
+ _STATE_EXECUTING_TYPE, _STATE_EXECUTING, _STATE_SIZE) = range(9)
+
+def _encode_for_storage(value: Any) -> Any:
+    """Recursively convert enums to their values so results are JSON/BSON encodable."""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, dict):
+        return {key: _encode_for_storage(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode_for_storage(item) for item in value]
+    return value
+
 class ProcessingStatus(Enum):
     """Enumeration of processing status values."""
     PENDING = "pending"
@@ -72,6 +133,33 @@ class ProcessingResult:
     component_results: Optional[Dict[str, Any]] = None
     created_timestamp: Optional[str] = None
     flags: Optional[List[str]] = None
+    stage_timings: Optional[Dict[str, float]] = None  # Seconds per pipeline stage
+
+@dataclass
+class RetryEntry:
+    """A failed title waiting on the retry queue."""
+    title: str
+    batch_id: str
+    processing_id: str
+    attempt: int  # Attempts made so far (1 = the original run)
+    ready_at: float  # time.monotonic() after which the retry may run
+    last_error: Optional[str] = None
+    component_results: Optional[Dict[str, Any]] = None
+    failed_result: Optional[ProcessingResult] = None  # The result currently counted for this title
+
+# Report sections (generateReport): reservoir sample size and key per status, confidence bands
+REPORT_SAMPLE_SIZES = {
+    ProcessingStatus.COMPLETED: 10,
+    ProcessingStatus.FAILED: 5,
+    ProcessingStatus.REQUIRES_REVIEW: 5
+}
+REPORT_SAMPLE_KEYS = {
+    ProcessingStatus.COMPLETED: 'successful',
+    ProcessingStatus.FAILED: 'failed',
+    ProcessingStatus.REQUIRES_REVIEW: 'requires_review'
+}
+HIGH_CONFIDENCE_THRESHOLD = 0.8
+MEDIUM_CONFIDENCE_THRESHOLD = 0.5
 
 @dataclass
 class BatchProcessingStats:
@@ -87,6 +175,230 @@ class BatchProcessingStats:
     start_timestamp: str
     end_timestamp: str
 
+class ReportAccumulator:
+    """
+    Running report statistics, updated in O(1) as each result is produced.
+
+    Keeps status counters, processing/stage time sums and confidence bands
+    instead of the results themselves, plus a fixed-size reservoir sample
+    (Algorithm R) of results per status, so a report can be emitted at any
+    point of an arbitrarily long streamed run.
+    """
+
+    def __init__(self, sample_sizes: Dict[ProcessingStatus, int] = None, seed: int = 0):
+        self.sample_sizes = REPORT_SAMPLE_SIZES if sample_sizes is None else sample_sizes
+        self.total = 0
+        self.status_counts = {status: 0 for status in ProcessingStatus}
+        self.processing_time_total = 0.0
+        self.stage_time_totals = {stage: 0.0 for stage in PIPELINE_STAGES}
+        self.stage_counts = {stage: 0 for stage in PIPELINE_STAGES}
+        self.confidence_count = 0
+        self.confidence_total = 0.0
+        self.confidence_min = None
+        self.confidence_max = None
+        self.confidence_bands = {'high': 0, 'medium': 0, 'low': 0}
+        # Reservoirs hold (arrival index, result); documents are built only when a report is written
+        self._samples: Dict[ProcessingStatus, List[Tuple[int, ProcessingResult]]] = {
+            status: [] for status in self.sample_sizes}
+        self._rng = random.Random(seed)
+        self._arrivals = 0
+
+    def add(self, result: ProcessingResult) -> None:
+        """Fold one result into the running statistics."""
+        self.total += 1
+        self._fold(result, 1)
+        self._sample(result)
+
+    def replace(self, previous: ProcessingResult, result: ProcessingResult) -> None:
+        """
+        Swap a result already folded in (e.g. a failure later retried) for its new outcome.
+
+        Counters, sums and bands are adjusted exactly; the confidence min/max
+        keep every value ever seen.
+        """
+        self._fold(previous, -1)
+        reservoir = self._samples.get(previous.status)
+        if reservoir is not None:
+            reservoir[:] = [sample for sample in reservoir if sample[1] is not previous]
+        self._fold(result, 1)
+        self._sample(result)
+
+    def _fold(self, result: ProcessingResult, sign: int) -> None:
+        self.status_counts[result.status] += sign
+        self.processing_time_total += sign * result.processing_time_seconds
+
+        if result.stage_timings:
+            for stage, seconds in result.stage_timings.items():
+                if stage in self.stage_time_totals:
+                    self.stage_time_totals[stage] += sign * seconds
+                    self.stage_counts[stage] += sign
+
+        if result.confidence_analysis and 'overall_confidence' in result.confidence_analysis:
+            confidence = result.confidence_analysis['overall_confidence']
+            self.confidence_count += sign
+            self.confidence_total += sign * confidence
+            if sign > 0:
+                self.confidence_min = confidence if self.confidence_min is None else min(self.confidence_min, confidence)
+                self.confidence_max = confidence if self.confidence_max is None else max(self.confidence_max, confidence)
+            if confidence >= HIGH_CONFIDENCE_THRESHOLD:
+                self.confidence_bands['high'] += sign
+            elif confidence >= MEDIUM_CONFIDENCE_THRESHOLD:
+                self.confidence_bands['medium'] += sign
+            else:
+                self.confidence_bands['low'] += sign
+
+    def _sample(self, result: ProcessingResult) -> None:
+        """Algorithm R over the results of each status."""
+        reservoir = self._samples.get(result.status)
+        if reservoir is None:
+            return
+        self._arrivals += 1
+        size = self.sample_sizes[result.status]
+        if len(reservoir) < size:
+            reservoir.append((self._arrivals, result))
+        else:
+            slot = self._rng.randrange(self.status_counts[result.status])
+            if slot < size:
+                reservoir[slot] = (self._arrivals, result)
+
+    def add_many(self, results) -> 'ReportAccumulator':
+        """Fold an iterable of results; returns self for chaining."""
+        for result in results:
+            self.add(result)
+        return self
+
+    def average_stage_times_ms(self) -> Dict[str, float]:
+        """Average wall time per pipeline stage (milliseconds) over results that reached it."""
+        return {stage: self.stage_time_totals[stage] / self.stage_counts[stage] * 1000
+                for stage in PIPELINE_STAGES if self.stage_counts[stage]}
+
+    def confidence_distribution(self) -> Dict[str, Any]:
+        """Confidence score distribution (count, range, average and high/medium/low bands)."""
+        count = self.confidence_count
+        if not count:
+            return {'error': 'No confidence scores available'}
+
+        return {
+            'count': count,
+            'min': self.confidence_min,
+            'max': self.confidence_max,
+            'average': self.confidence_total / count,
+            'high_confidence': self.confidence_bands['high'],
+            'medium_confidence': self.confidence_bands['medium'],
+            'low_confidence': self.confidence_bands['low'],
+            'distribution': {
+                'high_percentage': self.confidence_bands['high'] / count * 100,
+                'medium_percentage': self.confidence_bands['medium'] / count * 100,
+                'low_percentage': self.confidence_bands['low'] / count * 100
+            }
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """The report's batch_summary section."""
+        total = self.total
+        completed = self.status_counts[ProcessingStatus.COMPLETED]
+        return {
+            'total_titles': total,
+            'completed': completed,
+            'failed': self.status_counts[ProcessingStatus.FAILED],
+            'requires_review': self.status_counts[ProcessingStatus.REQUIRES_REVIEW],
+            'success_rate': (completed / total) if total > 0 else 0,
+            'average_processing_time': self.processing_time_total / total if total > 0 else 0,
+            'average_stage_time_ms': self.average_stage_times_ms(),
+            'confidence_distribution': self.confidence_distribution()
+        }
+
+    def sample_results(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Sampled results per status as storage documents, in arrival order."""
+        return {
+            REPORT_SAMPLE_KEYS[status]: [_encode_for_storage(asdict(result))
+                                         for _, result in sorted(reservoir, key=lambda sample: sample[0])]
+            for status, reservoir in self._samples.items()
+        }
+
+class _BudgetTracer:
+    """
+    Worker-side progress recorder shared with the parent through a lock-free array.
+    
+    Installed as every extractor's profiler, so each pattern evaluation stores
+    which pattern (type index, ordinal in load order) is running on begin() and
+    which one just finished on record(); the parent reads the array to enforce
+    budgets and to name the stage and pattern that was executing when a title
+    is killed. Evaluations are forwarded to the
+    real PatternProfiler when pattern profiling is on.
+    """
+    
+    def __init__(self, state, pattern_ordinals: Dict[Tuple[str, str], Tuple[int, int]], profiler=None):
+        self.state = state
+        self.pattern_ordinals = pattern_ordinals
+        self.profiler = profiler
+    
+    def enter_title(self, index: int) -> None:
+        now = time.monotonic()
+        self.state[_STATE_TITLE] = index
+        self.state[_STATE_TITLE_START] = now
+        self.state[_STATE_STAGE] = -1
+        self.state[_STATE_STAGE_START] = now
+        self._clear_patterns()
+    
+    def enter_stage(self, stage_name: str) -> None:
+        self._clear_patterns()
+        self.state[_STATE_STAGE_START] = time.monotonic()
+        self.state[_STATE_STAGE] = PIPELINE_STAGES.index(stage_name)
+    
+    def _clear_patterns(self) -> None:
+        for slot in (_STATE_PATTERN_TYPE, _STATE_PATTERN, _STATE_EXECUTING_TYPE, _STATE_EXECUTING):
+            self.state[slot] = -1
+    
+    def begin(self, pattern_type: str, label: str) -> None:
+        # Patterns missing from the catalog still clear the slot, so a stale pattern is never blamed
+        self.state[_STATE_EXECUTING_TYPE], self.state[_STATE_EXECUTING] = (
+            self.pattern_ordinals.get((pattern_type, label), (-1, -1)))
+    
+    def record(self, pattern_type: str, label: str, elapsed_ns: int, matched: bool, pattern_id: Any = None) -> None:
+        self.state[_STATE_EXECUTING_TYPE] = self.state[_STATE_EXECUTING] = -1
+        position = self.pattern_ordinals.get((pattern_type, label))
+        if position is not None:
+            self.state[_STATE_PATTERN_TYPE], self.state[_STATE_PATTERN] = position
+        if self.profiler is not None:
+            self.profiler.record(pattern_type, label, elapsed_ns, matched, pattern_id)
+
+def _budget_worker_main(orchestrator: 'PipelineOrchestrator', connection, state,
+                        pattern_ordinals: Dict[Tuple[str, str], Tuple[int, int]]) -> None:
+    """
+    Forked worker loop: process titles sent by the parent until None arrives.
+    
+    The worker inherits the parent's loaded components; MongoDB clients are
+    re-created per process by the connection manager.
+    """
+    profiler = PatternProfiler() if orchestrator.pattern_profiler is not None else None
+    tracer = _BudgetTracer(state, pattern_ordinals, profiler)
+    for component in orchestrator.components.values():
+        if hasattr(component, 'profiler'):
+            component.profiler = tracer
+    orchestrator._stage_monitor = tracer
+    
+    tracker = orchestrator.components['confidence_tracker']
+    # The parent still owns (and flushes) any increments buffered before the fork
+    if hasattr(tracker, 'clear_pending_metrics'):
+        tracker.clear_pending_metrics()
+    metrics_collection = getattr(tracker, 'metrics_collection', None)
+    if metrics_collection is not None and orchestrator.mongodb_uri:
+        tracker.metrics_collection = get_mongo_client(orchestrator.mongodb_uri)[
+            metrics_collection.database.name][metrics_collection.name]
+    
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        index, title, batch_id, processing_id = message
+        tracer.enter_title(index)
+        connection.send(('result', index, orchestrator.processTitle(title, batch_id, processing_id)))
+    
+    tracker.flush_metrics()
+    connection.send(('exit', profiler))
+    connection.close()
+
 class PipelineOrchestrator:
     """
     Central orchestrator for the market research title processing pipeline.
@@ -101,7 +413,9 @@ class PipelineOrchestrator:
     """
     
     def __init__(self, mongodb_uri: str = None, batch_size: int = 100, 
-                 retry_attempts: int = 3, timeout_seconds: int = 30):
+                 retry_attempts: int = 3, timeout_seconds: int = 30,
+                 geographic_engine: str = "regex", profile_patterns: bool = False,
+                 output_dir: str = None):
         """
         Initialize the Pipeline Orchestrator.
         
@@ -110,10 +424,16 @@ class PipelineOrchestrator:
             batch_size: Number of titles to process in each batch
             retry_attempts: Number of retry attempts for failed processing
             timeout_seconds: Timeout for individual title processing
+            geographic_engine: GeographicEntityDetector engine ('regex' or 'phrase_matcher')
+            profile_patterns: Record per-pattern evaluation/match/time counters in every extractor
+            output_dir: Directory for reports, facet segments and exports (a new organized
+                        output directory per call if not provided)
         """
         self.batch_size = batch_size
         self.retry_attempts = retry_attempts
         self.timeout_seconds = timeout_seconds
+        self.geographic_engine = geographic_engine
+        self.output_dir = output_dir
         
         # Initialize MongoDB connection
         self.mongodb_uri = mongodb_uri or os.getenv('MONGODB_URI')
@@ -123,8 +443,36 @@ class PipelineOrchestrator:
         
         # Pipeline components
         self.components = {}
+        self.pattern_library_manager = None
         self._initialize_components()
         
+        # Time budgets enforced by processBatchWithBudget (stage budgets default to the title budget)
+        self.stage_timeout_seconds: Dict[str, float] = {}
+        self.slow_path_queue: List[Dict[str, Any]] = []
+        self._stage_monitor = None
+        
+        # Failed titles are retried after the main stream (processRetryQueue), not inline
+        self.retry_backoff_seconds = RETRY_BACKOFF_BASE_SECONDS
+        self.retry_queue: List[RetryEntry] = []
+        self.retry_results: List[ProcessingResult] = []
+        self.dead_letters: List[Dict[str, Any]] = []
+        self._retry_lock = threading.Lock()
+        # Deduplicated titles on the retry queue: processing_id -> its one-group DeduplicationResult,
+        # so saveRetriedResults fans the final result out to every source _id
+        self.dedup_retry_groups: Dict[str, DeduplicationResult] = {}
+        
+        # Optional facet index, updated and persisted per batch (enableFacetIndex)
+        self.facet_index = None
+        self.facet_index_dir = None
+        
+        # Run-wide report statistics, updated per result so generateReport never needs the results
+        self.report_accumulator = ReportAccumulator()
+        
+        # Optional per-pattern profiling (shared by all extractors)
+        self.pattern_profiler = PatternProfiler() if profile_patterns else None
+        if self.pattern_profiler is not None:
+            attach_profiler(self.components, self.pattern_profiler)
+        
         # Processing statistics
         self.processing_stats = {
             'batches_processed': 0,
@@ -132,22 +480,29 @@ class PipelineOrchestrator:
             'successful_extractions': 0,
             'failed_extractions': 0,
             'requires_review_count': 0,
-            'total_processing_time': 0.0
+            'total_processing_time': 0.0,
+            'retried_titles': 0,
+            'dead_lettered_titles': 0,
+            'stage_time_totals': {stage: 0.0 for stage in PIPELINE_STAGES}
         }
         
         logger.info("Pipeline Orchestrator initialized successfully")
     
+    def _output_directory(self, script_name: str) -> str:
+        """Configured output_dir, or a new organized output directory for script_name."""
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            return self.output_dir
+        return create_organized_output_directory(script_name)
+    
     def _connect_to_mongodb(self) -> None:
-        """Establish MongoDB connection."""
+        """Attach to the shared MongoDB client (connection test runs once per process)."""
         if not self.mongodb_uri:
             raise ValueError("MongoDB URI not provided and MONGODB_URI not set in environment")
         
         try:
-            self.client = MongoClient(self.mongodb_uri)
+            self.client = get_mongo_client(self.mongodb_uri)
             self.db = self.client['deathstar']
-            
-            # Test connection
-            self.db.admin.command('ping')
             logger.info("Connected to MongoDB successfully")
             
         except Exception as e:
@@ -156,73 +511,44 @@ class PipelineOrchestrator:
     
     def _get_pattern_library_manager(self):
         """Get PatternLibraryManager instance."""
-        spec = importlib.util.spec_from_file_location(
-            "pattern_library_manager", 
-            "00b_pattern_library_manager_v1.py"
-        )
-        pattern_manager_module = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(pattern_manager_module)
-        return pattern_manager_module.PatternLibraryManager(self.connection_string)
+        pattern_manager_module = load_module("pattern_library_manager")
+        # Same URI -> same shared client, no second connection pool
+        return pattern_manager_module.PatternLibraryManager(self.mongodb_uri)
     
     def _initialize_components(self) -> None:
         """Initialize all pipeline processing components."""
         try:
             # Create shared PatternLibraryManager instance
             pattern_lib_manager = self._get_pattern_library_manager()
+            self.pattern_library_manager = pattern_lib_manager
             
             # Import and initialize Market Term Classifier (01)
-            spec = importlib.util.spec_from_file_location(
-                "market_classifier", 
-                "01_market_term_classifier_v1.py"
-            )
-            market_classifier_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(market_classifier_module)
+            market_classifier_module = load_module("market_term_classifier")
             self.components['market_classifier'] = market_classifier_module.MarketTermClassifier(pattern_lib_manager)
             
             # Import and initialize Date Extractor (02)
-            spec = importlib.util.spec_from_file_location(
-                "date_extractor", 
-                "02_date_extractor_v1.py"
-            )
-            date_extractor_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(date_extractor_module)
+            date_extractor_module = load_module("date_extractor")
             self.components['date_extractor'] = date_extractor_module.EnhancedDateExtractor(pattern_lib_manager)
             
             # Import and initialize Report Type Extractor (03)
-            spec = importlib.util.spec_from_file_location(
-                "report_extractor", 
-                "03_report_type_extractor_v4.py"
-            )
-            report_extractor_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(report_extractor_module)
+            report_extractor_module = load_module("report_type_extractor")
             self.components['report_extractor'] = report_extractor_module.PureDictionaryReportTypeExtractor(pattern_lib_manager)
             
-            # Import Geographic Entity Detection functions (04)
-            spec = importlib.util.spec_from_file_location(
-                "geographic_detector", 
-                "04_geographic_entity_detector_v2.py"
-            )
-            geographic_detector_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(geographic_detector_module)
-            self.components['geographic_detector'] = geographic_detector_module
+            # Import and initialize Geographic Entity Detector v3 (04)
+            geographic_detector_module = load_module("geographic_entity_detector")
+            self.components['geographic_detector'] = geographic_detector_module.GeographicEntityDetector(
+                pattern_lib_manager, engine=self.geographic_engine)
             
             # Import and initialize Topic Extractor (05)
-            spec = importlib.util.spec_from_file_location(
-                "topic_extractor", 
-                "05_topic_extractor_v1.py"
-            )
-            topic_extractor_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(topic_extractor_module)
-            self.components['topic_extractor'] = topic_extractor_module.TopicExtractor()
+            topic_extractor_module = load_module("topic_extractor")
+            self.components['topic_extractor'] = topic_extractor_module.TopicExtractor(pattern_lib_manager)
             
             # Import and initialize Confidence Tracker (06)
-            spec = importlib.util.spec_from_file_location(
-                "confidence_tracker", 
-                "06_confidence_tracker_v1.py"
+            confidence_tracker_module = load_module("confidence_tracker")
+            self.components['confidence_tracker'] = confidence_tracker_module.ConfidenceTracker(
+                pattern_library_manager=pattern_lib_manager,
+                mongodb_client=self.client
             )
-            confidence_tracker_module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(confidence_tracker_module)
-            self.components['confidence_tracker'] = confidence_tracker_module.ConfidenceTracker()
             
             logger.info("All pipeline components initialized successfully")
             
@@ -233,6 +559,7 @@ class PipelineOrchestrator:
     def _get_timestamps(self) -> Tuple[str, str, datetime]:
         """Generate PDT and UTC timestamps."""
         utc_now = datetime.now(timezone.utc)
+        import pytz
         pdt_tz = pytz.timezone('America/Los_Angeles')
         pdt_now = utc_now.astimezone(pdt_tz)
         
@@ -254,6 +581,9 @@ class PipelineOrchestrator:
         """
         Process individual title through all pipeline extractors.
         
+        Each stage receives the text left by the previous stage (date, report type
+        and regions removed), matching test_harness_pipeline_01_02_03_04_05.
+        
         Args:
             title: Title to process
             batch_id: Batch identifier
@@ -262,6 +592,69 @@ class PipelineOrchestrator:
         Returns:
             ProcessingResult with complete extraction results
         """
+        steps = self._title_steps(title, batch_id, processing_id)
+        try:
+            next(steps)
+        except StopIteration as finished:
+            return finished.value  # Failed before geographic detection
+        return self._resume_title(steps, None)
+    
+    def _process_titles(self, items: List[Tuple[str, str]], batch_id: str) -> List[ProcessingResult]:
+        """
+        Process (title, processing_id) items, in order.
+        
+        With the phrase_matcher geographic engine every title is first run up to
+        geographic detection, the forward texts go through the detector's nlp.pipe
+        batch in one call, and each title then finishes on its own. Other engines
+        process title by title.
+        """
+        detector = self.components['geographic_detector']
+        if getattr(detector, 'engine', None) != 'phrase_matcher':
+            return [self.processTitle(title, batch_id, processing_id) for title, processing_id in items]
+        
+        results: List[Optional[ProcessingResult]] = [None] * len(items)
+        paused = []
+        for position, (title, processing_id) in enumerate(items):
+            steps = self._title_steps(title, batch_id, processing_id)
+            try:
+                paused.append((position, steps, next(steps)))
+            except StopIteration as finished:
+                results[position] = finished.value
+        if not paused:
+            return results
+        
+        stage_start = time.perf_counter()
+        try:
+            geographic_results = detector.extract_geographic_entities_batch(
+                [forward_text for _, _, forward_text in paused], batch_size=GEOGRAPHIC_PIPE_BATCH_SIZE)
+        except Exception as e:
+            # Each title reruns the stage on its own, so the error lands on the title that caused it
+            logger.warning(f"Batched geographic detection failed, detecting per title: {e}")
+            geographic_results = None
+        stage_seconds = (time.perf_counter() - stage_start) / len(paused)
+        
+        for index, (position, steps, _) in enumerate(paused):
+            batched = (geographic_results[index], stage_seconds) if geographic_results is not None else None
+            results[position] = self._resume_title(steps, batched)
+        return results
+    
+    def _resume_title(self, steps, geographic: Optional[Tuple[Any, float]]) -> ProcessingResult:
+        """Finish a title paused before geographic detection (geographic: batched (result, seconds), or None)."""
+        try:
+            steps.send(geographic)
+        except StopIteration as finished:
+            return finished.value
+        raise RuntimeError("Title steps yielded more than once")
+    
+    def _title_steps(self, title: str, batch_id: str, processing_id: str):
+        """
+        processTitle as a generator: yields the forward text before geographic detection.
+        
+        The caller sends back (geographic_result, stage_seconds) from a batched
+        detector call, or None to run the stage here; the ProcessingResult is the
+        generator's return value. Time spent paused is not counted in
+        processing_time_seconds.
+        """
         start_time = time.time()
         pdt_str, utc_str, _ = self._get_timestamps()
         
@@ -273,64 +666,90 @@ class PipelineOrchestrator:
             status=ProcessingStatus.PROCESSING,
             extracted_elements=ExtractedElements(),
             created_timestamp=pdt_str,
-            flags=[]
+            flags=[],
+            stage_timings={}
         )
         
         component_results = {}
+        stage_timings = result.stage_timings
         
         try:
+            if not title or not title.strip():
+                raise ValueError("Empty title")
+            
             logger.debug(f"Processing title: {title[:60]}...")
+            current_title = title
             
             # Step 1: Market Term Classification
             logger.debug("Step 1: Market term classification")
-            market_result = self.components['market_classifier'].classify(title)
-            component_results['market_classification'] = asdict(market_result)
-            result.extracted_elements.market_term_type = market_result.market_type.value
+            market_result = self._run_stage('market_classification', stage_timings,
+                                            self.components['market_classifier'].classify, title)
+            component_results['market_classification'] = self._component_to_dict(market_result)
+            market_term_type = market_result.market_type
+            result.extracted_elements.market_term_type = market_term_type
             
             # Step 2: Date Extraction
             logger.debug("Step 2: Date extraction")
-            date_result = self.components['date_extractor'].extract(title)
-            component_results['date_extraction'] = asdict(date_result)
-            result.extracted_elements.extracted_forecast_date_range = date_result.extracted_date
+            date_result = self._run_stage('date_extraction', stage_timings,
+                                          self.components['date_extractor'].extract, current_title)
+            component_results['date_extraction'] = self._component_to_dict(date_result)
+            result.extracted_elements.extracted_forecast_date_range = date_result.extracted_date_range
+            if date_result.extracted_date_range:
+                current_title = date_result.cleaned_title
             
             # Step 3: Report Type Extraction
             logger.debug("Step 3: Report type extraction")
-            report_result = self.components['report_extractor'].extract(
-                title, 
-                original_title=title,
-                date_extractor=self.components['date_extractor']
-            )
-            component_results['report_extraction'] = asdict(report_result)
+            report_result = self._run_stage('report_extraction', stage_timings,
+                                            self.components['report_extractor'].extract,
+                                            current_title, market_term_type)
+            component_results['report_extraction'] = self._component_to_dict(report_result)
             result.extracted_elements.extracted_report_type = report_result.extracted_report_type
+            if report_result.extracted_report_type:
+                current_title = report_result.title  # title contains the pipeline forward text
             
             # Step 4: Geographic Entity Detection
             logger.debug("Step 4: Geographic entity detection")
-            # Note: Geographic detector uses functional approach, need to adapt
-            geographic_result = self._process_geographic_entities(title)
-            component_results['geographic_detection'] = geographic_result
-            result.extracted_elements.extracted_regions = geographic_result.get('extracted_regions', [])
+            paused_at = time.time()
+            batched = yield current_title
+            if batched is None:
+                start_time += time.time() - paused_at
+                geographic_result = self._run_stage('geographic_detection', stage_timings,
+                                                    self._process_geographic_entities, current_title)
+            else:
+                geographic_result, stage_timings['geographic_detection'] = batched
+                start_time += time.time() - paused_at - stage_timings['geographic_detection']
+            component_results['geographic_detection'] = self._component_to_dict(geographic_result)
+            result.extracted_elements.extracted_regions = list(geographic_result.extracted_regions or [])
+            if geographic_result.extracted_regions:
+                current_title = geographic_result.title
             
             # Step 5: Topic Extraction
             logger.debug("Step 5: Topic extraction")
             extracted_elements_dict = {
-                'market_term_type': result.extracted_elements.market_term_type,
-                'extracted_forecast_date_range': result.extracted_elements.extracted_forecast_date_range,
-                'extracted_report_type': result.extracted_elements.extracted_report_type,
-                'extracted_regions': result.extracted_elements.extracted_regions or []
+                'market_term_type': market_term_type,
+                'extracted_forecast_date_range': result.extracted_elements.extracted_forecast_date_range or '',
+                'extracted_report_type': result.extracted_elements.extracted_report_type or '',
+                'extracted_regions': result.extracted_elements.extracted_regions
             }
             
-            topic_result = self.components['topic_extractor'].extract(title, extracted_elements_dict)
-            component_results['topic_extraction'] = asdict(topic_result)
+            topic_result = self._run_stage('topic_extraction', stage_timings,
+                                           self.components['topic_extractor'].extract,
+                                           title, current_title, extracted_elements_dict)
+            component_results['topic_extraction'] = self._component_to_dict(topic_result)
             result.extracted_elements.topic = topic_result.extracted_topic
             result.extracted_elements.topicName = topic_result.normalized_topic_name
             
             # Step 6: Confidence Analysis
             logger.debug("Step 6: Confidence analysis")
-            # Create ExtractionResults object for confidence tracker
-            extraction_results = self._create_extraction_results(component_results, result.extracted_elements)
-            confidence_analysis = self.components['confidence_tracker'].calculateOverallConfidence(extraction_results)
-            result.confidence_analysis = asdict(confidence_analysis)
-            component_results['confidence_analysis'] = asdict(confidence_analysis)
+            extraction_results = self._create_extraction_results(
+                title, market_result, date_result, report_result, geographic_result, topic_result,
+                processing_time_ms=(time.time() - start_time) * 1000
+            )
+            confidence_analysis = self._run_stage('confidence_analysis', stage_timings,
+                                                  self.components['confidence_tracker'].calculateOverallConfidence,
+                                                  extraction_results)
+            result.confidence_analysis = self._component_to_dict(confidence_analysis)
+            component_results['confidence_analysis'] = result.confidence_analysis
             
             # Determine final status and flags
             if confidence_analysis.overall_confidence < 0.8:
@@ -366,78 +785,93 @@ class PipelineOrchestrator:
             result.flags.append("processing_error")
             
             return result
+        
+        finally:
+            for stage_name, stage_seconds in stage_timings.items():
+                self.processing_stats['stage_time_totals'][stage_name] = (
+                    self.processing_stats['stage_time_totals'].get(stage_name, 0.0) + stage_seconds
+                )
     
-    def _process_geographic_entities(self, title: str) -> Dict[str, Any]:
+    def _run_stage(self, stage_name: str, stage_timings: Dict[str, float], stage_function, *args):
+        """Run one pipeline stage and record its wall time (seconds) in stage_timings."""
+        if self._stage_monitor is not None:
+            self._stage_monitor.enter_stage(stage_name)
+        stage_start = time.perf_counter()
+        try:
+            return stage_function(*args)
+        finally:
+            stage_timings[stage_name] = time.perf_counter() - stage_start
+    
+    def _process_geographic_entities(self, title: str):
         """
-        Process geographic entities using the functional geographic detector.
+        Run Geographic Entity Detector v3 on the text left by report type extraction.
         
         Args:
-            title: Title to process
+            title: Pipeline forward text (date and report type removed)
             
         Returns:
-            Dictionary with geographic detection results
+            GeographicExtractionResult with extracted_regions and the remaining title
         """
-        try:
-            # The geographic detector uses functional approach
-            # We need to adapt it for single title processing
-            
-            # For now, return a simple structure
-            # In production, this would integrate with the geographic detection functions
-            return {
-                'extracted_regions': [],
-                'confidence': 0.0,
-                'processing_method': 'placeholder',
-                'notes': 'Geographic detection needs integration with functional approach'
-            }
-            
-        except Exception as e:
-            logger.warning(f"Geographic entity detection failed: {e}")
-            return {
-                'extracted_regions': [],
-                'confidence': 0.0,
-                'error': str(e)
-            }
+        return self.components['geographic_detector'].extract_geographic_entities(title)
     
-    def _create_extraction_results(self, component_results: Dict, extracted_elements: ExtractedElements):
+    def _component_to_dict(self, component_result: Any) -> Dict[str, Any]:
+        """Convert a component result (dataclass or plain result object) to a storable dict."""
+        if is_dataclass(component_result):
+            data = asdict(component_result)
+        else:
+            data = {key: value for key, value in vars(component_result).items() if not key.startswith('_')}
+        return _encode_for_storage(data)
+    
+    def _create_extraction_results(self, title: str, market_result, date_result, report_result,
+                                   geographic_result, topic_result, processing_time_ms: float = None):
         """
         Create ExtractionResults object for confidence tracker.
         
         Args:
-            component_results: Raw component results
-            extracted_elements: Extracted elements container
+            title: Original title
+            market_result: Market term classification result (01)
+            date_result: Date extraction result (02)
+            report_result: Report type extraction result (03)
+            geographic_result: Geographic extraction result (04)
+            topic_result: Topic extraction result (05)
+            processing_time_ms: Elapsed pipeline time before confidence analysis
             
         Returns:
-            ExtractionResults object compatible with confidence tracker
-        """
-        # Import the ExtractionResults class from confidence tracker
-        ExtractionResults = self.components['confidence_tracker'].__class__.__module__
-        
-        # Create a simple dictionary structure that matches expected format
-        extraction_results = type('ExtractionResults', (), {
-            'market_classification': component_results.get('market_classification', {}),
-            'date_extraction': component_results.get('date_extraction', {}),
-            'report_type_extraction': component_results.get('report_extraction', {}),
-            'geographic_detection': component_results.get('geographic_detection', {}),
-            'topic_extraction': component_results.get('topic_extraction', {}),
-            'extracted_elements': {
-                'market_term_type': extracted_elements.market_term_type,
-                'extracted_forecast_date_range': extracted_elements.extracted_forecast_date_range,
-                'extracted_report_type': extracted_elements.extracted_report_type,
-                'extracted_regions': extracted_elements.extracted_regions,
-                'topic': extracted_elements.topic,
-                'topicName': extracted_elements.topicName
-            }
-        })()
+            ExtractionResults compatible with ConfidenceTracker.calculateOverallConfidence
+        """
+        ExtractionResults = load_module("confidence_tracker").ExtractionResults
         
-        return extraction_results
+        return ExtractionResults(
+            title=title,
+            original_title=title,
+            market_term_type=market_result.market_type,
+            market_classification_confidence=market_result.confidence,
+            extracted_forecast_date_range=date_result.extracted_date_range,
+            date_extraction_confidence=date_result.confidence,
+            extracted_report_type=report_result.extracted_report_type,
+            report_extraction_confidence=report_result.confidence,
+            extracted_regions=list(geographic_result.extracted_regions or []),
+            geographic_detection_confidence=geographic_result.confidence,
+            topic=topic_result.extracted_topic,
+            topic_name=topic_result.normalized_topic_name,
+            topic_extraction_confidence=topic_result.confidence,
+            processing_time_ms=processing_time_ms,
+            errors_encountered=[]
+        )
     
-    def processBatch(self, titles: List[str], batch_id: str = None) -> List[ProcessingResult]:
+    def processBatch(self, titles: List[str], batch_id: str = None,
+                     result_sink: Optional[ColumnarResultsWriter] = None,
+                     index_facets: bool = True) -> List[ProcessingResult]:
         """
         Process a batch of titles through the complete pipeline.
         
         Args:
             titles: List of titles to process
             batch_id: Optional batch identifier (auto-generated if not provided)
+            result_sink: Optional ColumnarResultsWriter that receives each result as it is produced
+                         (pass it to processRetryQueue as well to append the retried results)
+            index_facets: Add the results to the facet index (False when the caller indexes
+                          other rows for them, as processDeduplicated does)
             
         Returns:
             List of ProcessingResult objects
@@ -451,27 +885,38 @@ class PipelineOrchestrator:
         logger.info(f"Starting batch processing: {batch_id} ({len(titles)} titles)")
         
         results = []
+        batch_report = ReportAccumulator(sample_sizes={})
+        items = [(title, self._generate_processing_id(batch_id, i)) for i, title in enumerate(titles)]
+        chunk_results = []
         for i, title in enumerate(titles):
-            processing_id = self._generate_processing_id(batch_id, i)
-            
             # Progress tracking
             if i % 10 == 0 and i > 0:
                 self.trackProgress(i, len(titles), batch_id)
             
-            # Process individual title
-            result = self.processTitle(title, batch_id, processing_id)
+            # Process titles (geographic detection batched per chunk where the engine supports it)
+            if i % GEOGRAPHIC_PIPE_BATCH_SIZE == 0:
+                chunk_results = self._process_titles(items[i:i + GEOGRAPHIC_PIPE_BATCH_SIZE], batch_id)
+            result = chunk_results[i % GEOGRAPHIC_PIPE_BATCH_SIZE]
             results.append(result)
+            if result_sink is not None:
+                result_sink.write(result)
             
             # Update statistics
-            if result.status == ProcessingStatus.COMPLETED:
-                self.processing_stats['successful_extractions'] += 1
-            elif result.status == ProcessingStatus.FAILED:
-                self.processing_stats['failed_extractions'] += 1
-            elif result.status == ProcessingStatus.REQUIRES_REVIEW:
-                self.processing_stats['requires_review_count'] += 1
+            self._count_result_status(result)
+            batch_report.add(result)
+            self.report_accumulator.add(result)
+            
+            # Processing errors are retried after the main stream instead of blocking it
+            if result.status == ProcessingStatus.FAILED and 'processing_error' in result.flags:
+                self.handleErrors(title, result.error_message, 1, result)
         
         # Final progress update
         self.trackProgress(len(titles), len(titles), batch_id)
+        if index_facets:
+            self._index_facets(results)
+        
+        # Persist this batch's time-bucket confidence metrics
+        self.components['confidence_tracker'].flush_metrics()
         
         end_time = time.time()
         processing_time = end_time - start_time
@@ -486,11 +931,11 @@ class PipelineOrchestrator:
         batch_stats = BatchProcessingStats(
             batch_id=batch_id,
             total_titles=len(titles),
-            completed=sum(1 for r in results if r.status == ProcessingStatus.COMPLETED),
-            failed=sum(1 for r in results if r.status == ProcessingStatus.FAILED),
-            requires_review=sum(1 for r in results if r.status == ProcessingStatus.REQUIRES_REVIEW),
+            completed=batch_report.status_counts[ProcessingStatus.COMPLETED],
+            failed=batch_report.status_counts[ProcessingStatus.FAILED],
+            requires_review=batch_report.status_counts[ProcessingStatus.REQUIRES_REVIEW],
             processing_time_seconds=processing_time,
-            success_rate=(sum(1 for r in results if r.status == ProcessingStatus.COMPLETED) / len(titles)) if titles else 0,
+            success_rate=(batch_report.status_counts[ProcessingStatus.COMPLETED] / len(titles)) if titles else 0,
             titles_per_second=len(titles) / processing_time if processing_time > 0 else 0,
             start_timestamp=pdt_start,
             end_timestamp=pdt_end
@@ -505,6 +950,508 @@ class PipelineOrchestrator:
         
         return results
     
+    def _count_result_status(self, result: ProcessingResult, delta: int = 1) -> None:
+        """Add one result to (or with delta=-1, take it out of) the status counters."""
+        if result.status == ProcessingStatus.COMPLETED:
+            self.processing_stats['successful_extractions'] += delta
+        elif result.status == ProcessingStatus.FAILED:
+            self.processing_stats['failed_extractions'] += delta
+        elif result.status == ProcessingStatus.REQUIRES_REVIEW:
+            self.processing_stats['requires_review_count'] += delta
+    
+    def _replace_result(self, previous: ProcessingResult, result: ProcessingResult) -> None:
+        """Count a reprocessed title's new result in place of the one counted before."""
+        with self._retry_lock:
+            self._count_result_status(previous, -1)
+            self._count_result_status(result)
+            self.report_accumulator.replace(previous, result)
+    
+    def enableFacetIndex(self, directory: str = None) -> 'FacetIndex':
+        """
+        Build a facet index alongside processing, persisted as one segment per batch.
+        
+        Args:
+            directory: Segment directory; existing segments are loaded and extended
+                       (organized output directory if not provided)
+            
+        Returns:
+            The FacetIndex receiving every processed batch
+        """
+        if not directory:
+            directory = os.path.join(self._output_directory("script07_facet_index"), "facet_index")
+        self.facet_index_dir = directory
+        self.facet_index = FacetIndex.load(directory) if os.path.isdir(directory) else FacetIndex()
+        return self.facet_index
+    
+    def _index_facets(self, results: List[Any]) -> None:
+        """Add a finished batch (results or stored documents) to the facet index and persist it as a new segment."""
+        if self.facet_index is None or not results:
+            return
+        self.facet_index.add_batch(results)
+        if self.facet_index_dir:
+            self.facet_index.flush(self.facet_index_dir)
+    
+    def processBatchWithBudget(self, titles: List[str], batch_id: str = None, workers: int = 2,
+                               title_timeout: float = None, stage_timeouts: Dict[str, float] = None,
+                               result_sink: Optional[ColumnarResultsWriter] = None) -> List[ProcessingResult]:
+        """
+        Process a batch in forked worker processes with per-title and per-stage time budgets.
+        
+        A regex stuck in backtracking cannot be interrupted inside its process, so
+        each title runs in a worker the parent can kill. Titles over budget are
+        marked FAILED with a 'timeout' flag, diagnostics naming the stage and the
+        pattern that was executing, and are queued on slow_path_queue for
+        processSlowPath(); the killed worker is replaced and the batch goes on.
+        
+        Args:
+            titles: List of titles to process
+            batch_id: Optional batch identifier (auto-generated if not provided)
+            workers: Number of worker processes
+            title_timeout: Budget per title in seconds (default: timeout_seconds)
+            stage_timeouts: Budget per stage in seconds (default: stage_timeout_seconds, else the title budget)
+            result_sink: Optional ColumnarResultsWriter that receives each result
+                         (pass it to processSlowPath as well to append the slow-path results)
+            
+        Returns:
+            List of ProcessingResult objects in title order
+        """
+        if not batch_id:
+            batch_id = self._generate_batch_id()
+        
+        start_time = time.time()
+        logger.info(f"Starting budgeted batch processing: {batch_id} ({len(titles)} titles, {workers} workers)")
+        
+        items = [(title, self._generate_processing_id(batch_id, i)) for i, title in enumerate(titles)]
+        results = self._run_with_budget(items, batch_id, workers, title_timeout or self.timeout_seconds,
+                                        stage_timeouts if stage_timeouts is not None else self.stage_timeout_seconds)
+        
+        for result in results:
+            if result_sink is not None:
+                result_sink.write(result)
+            self._count_result_status(result)
+            self.report_accumulator.add(result)
+            if result.flags and 'timeout' in result.flags:
+                self.slow_path_queue.append({'title': result.title, 'batch_id': batch_id,
+                                             'processing_id': result.processing_id,
+                                             **result.component_results['timeout'],
+                                             'failed_result': result})
+        
+        processing_time = time.time() - start_time
+        self.processing_stats['batches_processed'] += 1
+        self.processing_stats['total_titles_processed'] += len(titles)
+        self.processing_stats['total_processing_time'] += processing_time
+        self.trackProgress(len(titles), len(titles), batch_id)
+        self._index_facets(results)
+        
+        timeouts = sum(1 for result in results if result.flags and 'timeout' in result.flags)
+        logger.info(f"Budgeted batch complete: {batch_id} ({timeouts} timeouts routed to the slow path, "
+                    f"{len(titles) / processing_time if processing_time > 0 else 0:.2f} titles/second)")
+        return results
+    
+    def processSlowPath(self, budget_multiplier: float = SLOW_PATH_BUDGET_MULTIPLIER, workers: int = 1,
+                        result_sink: Optional[ColumnarResultsWriter] = None) -> List[ProcessingResult]:
+        """
+        Retry the titles queued by processBatchWithBudget with budgets multiplied by budget_multiplier.
+        
+        Titles that time out again stay FAILED with their timeout diagnostics and
+        are not re-queued.
+        
+        Args:
+            budget_multiplier: Factor applied to the title and stage budgets
+            workers: Number of worker processes
+            result_sink: Optional ColumnarResultsWriter receiving the slow-path results; each
+                         supersedes the timed-out row written under the same processing_id
+        
+        Returns:
+            List of ProcessingResult objects (flagged 'slow_path')
+        """
+        queued, self.slow_path_queue = self.slow_path_queue, []
+        if not queued:
+            return []
+        
+        stage_timeouts = {stage: seconds * budget_multiplier for stage, seconds in self.stage_timeout_seconds.items()}
+        results = []
+        for batch_id in dict.fromkeys(entry['batch_id'] for entry in queued):
+            entries = [entry for entry in queued if entry['batch_id'] == batch_id]
+            items = [(entry['title'], entry['processing_id']) for entry in entries]
+            batch_results = self._run_with_budget(items, batch_id, workers,
+                                                  self.timeout_seconds * budget_multiplier, stage_timeouts)
+            for entry, result in zip(entries, batch_results):
+                result.flags = (result.flags or []) + ['slow_path']
+                # Replaces the timed-out result in the counters and report
+                self._replace_result(entry['failed_result'], result)
+            results.extend(batch_results)
+        
+        # Re-indexing (and re-writing) a processing_id supersedes its timed-out row
+        self._index_facets(results)
+        if result_sink is not None:
+            result_sink.write_many(results)
+        
+        logger.info(f"Slow path processed {len(results)} titles "
+                    f"({sum(1 for r in results if 'timeout' in r.flags)} timed out again)")
+        return results
+    
+    def _pattern_catalog(self) -> Tuple[List[str], List[List[str]], Dict[Tuple[str, str], Tuple[int, int]]]:
+        """Pattern labels of every component in load order: (types, labels per type, (type, label) -> position)."""
+        types: List[str] = []
+        labels: List[List[str]] = []
+        positions: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        for component in self.components.values():
+            if not callable(getattr(type(component), 'profiled_patterns', None)):
+                continue
+            for pattern_type, label, _ in component.profiled_patterns():
+                if pattern_type not in types:
+                    types.append(pattern_type)
+                    labels.append([])
+                type_index = types.index(pattern_type)
+                positions.setdefault((pattern_type, label), (type_index, len(labels[type_index])))
+                labels[type_index].append(label)
+        return types, labels, positions
+    
+    def _run_with_budget(self, items: List[Tuple[str, str]], batch_id: str, workers: int,
+                         title_timeout: float, stage_timeouts: Dict[str, float]) -> List[ProcessingResult]:
+        """Run (title, processing_id) items in killable forked workers; results in item order."""
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            logger.warning("Worker time budgets need the 'fork' start method - processing serially without budgets")
+            return [self.processTitle(title, batch_id, processing_id) for title, processing_id in items]
+        
+        context = multiprocessing.get_context('fork')
+        pattern_types, pattern_labels, pattern_positions = self._pattern_catalog()
+        # Flush before forking; workers also drop whatever is still buffered (e.g. after a failed flush)
+        self.components['confidence_tracker'].flush_metrics()
+        
+        def start_worker():
+            parent_end, child_end = context.Pipe()
+            # -1 until the worker's first enter_title, so a slow fork is not timed against a zero start
+            state = context.Array('d', [-1.0] * _STATE_SIZE, lock=False)
+            process = context.Process(target=_budget_worker_main,
+                                      args=(self, child_end, state, pattern_positions), daemon=True)
+            process.start()
+            child_end.close()
+            return {'process': process, 'connection': parent_end, 'state': state, 'index': None}
+        
+        results: List[Optional[ProcessingResult]] = [None] * len(items)
+        next_item = 0
+        pool = [start_worker() for _ in range(max(1, min(workers, len(items))))]
+        
+        def dispatch(worker) -> None:
+            nonlocal next_item
+            if next_item < len(items):
+                title, processing_id = items[next_item]
+                worker['index'] = next_item
+                worker['sent_at'] = time.monotonic()
+                worker['connection'].send((next_item, title, batch_id, processing_id))
+                next_item += 1
+            else:
+                worker['index'] = None
+        
+        for worker in pool:
+            dispatch(worker)
+        
+        while any(worker['index'] is not None for worker in pool):
+            ready = wait_for_connections([w['connection'] for w in pool if w['index'] is not None],
+                                         timeout=BUDGET_POLL_SECONDS)
+            for worker in pool:
+                if worker['connection'] not in ready:
+                    continue
+                try:
+                    kind, index, result = worker['connection'].recv()
+                except (EOFError, OSError):
+                    # Worker died without a result (e.g. out of memory)
+                    index = worker['index']
+                    results[index] = self._budget_failure(items[index], batch_id, worker, pattern_types,
+                                                          pattern_labels, None, "worker_crash")
+                    self._replace_worker(pool, worker, start_worker)
+                    dispatch(pool[-1])
+                    continue
+                results[index] = result
+                if result.stage_timings:
+                    for stage_name, stage_seconds in result.stage_timings.items():
+                        self.processing_stats['stage_time_totals'][stage_name] = (
+                            self.processing_stats['stage_time_totals'].get(stage_name, 0.0) + stage_seconds)
+                dispatch(worker)
+            
+            now = time.monotonic()
+            for worker in list(pool):
+                if worker['index'] is None:
+                    continue
+                state = worker['state']
+                if state[_STATE_TITLE] != worker['index']:
+                    # Title not picked up yet; measure from dispatch
+                    title_elapsed = now - worker['sent_at']
+                    stage_name, stage_elapsed = None, 0.0
+                else:
+                    title_elapsed = now - state[_STATE_TITLE_START]
+                    stage_name = PIPELINE_STAGES[int(state[_STATE_STAGE])] if state[_STATE_STAGE] >= 0 else None
+                    stage_elapsed = now - state[_STATE_STAGE_START]
+                stage_budget = stage_timeouts.get(stage_name, title_timeout) if stage_name else title_timeout
+                
+                if title_elapsed > title_timeout:
+                    budget = ('title', title_timeout)
+                elif stage_name and stage_elapsed > stage_budget:
+                    budget = ('stage', stage_budget)
+                else:
+                    continue
+                
+                index = worker['index']
+                worker['process'].kill()
+                worker['process'].join()
+                results[index] = self._budget_failure(items[index], batch_id, worker, pattern_types,
+                                                      pattern_labels, budget, "timeout")
+                logger.warning(f"Title timed out ({results[index].error_message}): {items[index][0][:60]}...")
+                self._replace_worker(pool, worker, start_worker)
+                dispatch(pool[-1])
+        
+        profilers = []
+        for worker in pool:
+            worker['connection'].send(None)
+        for worker in pool:
+            try:
+                kind, profiler = worker['connection'].recv()
+                if kind == 'exit' and profiler is not None:
+                    profilers.append(profiler)
+            except (EOFError, OSError):
+                pass
+            worker['process'].join()
+            worker['connection'].close()
+        
+        if self.pattern_profiler is not None:
+            for profiler in profilers:
+                self.pattern_profiler.merge(profiler)
+        
+        return results
+    
+    def _replace_worker(self, pool: List[Dict[str, Any]], worker: Dict[str, Any], start_worker) -> None:
+        """Swap a killed or crashed worker for a fresh fork (appended to the pool)."""
+        worker['connection'].close()
+        if worker['process'].is_alive():
+            worker['process'].kill()
+        worker['process'].join()
+        pool.remove(worker)
+        pool.append(start_worker())
+    
+    def _budget_failure(self, item: Tuple[str, str], batch_id: str, worker: Dict[str, Any],
+                        pattern_types: List[str], pattern_labels: List[List[str]],
+                        budget: Optional[Tuple[str, float]], flag: str) -> ProcessingResult:
+        """FAILED result for a killed title, with the stage and pattern that was executing."""
+        title, processing_id = item
+        state = worker['state']
+        now = time.monotonic()
+        started = state[_STATE_TITLE] == worker['index']
+        stage = PIPELINE_STAGES[int(state[_STATE_STAGE])] if started and state[_STATE_STAGE] >= 0 else None
+        
+        def pattern_at(type_slot: int, ordinal_slot: int) -> Tuple[Optional[str], Optional[str]]:
+            if not started or state[type_slot] < 0:
+                return None, None
+            type_index = int(state[type_slot])
+            return pattern_types[type_index], pattern_labels[type_index][int(state[ordinal_slot])]
+        
+        # No executing pattern = killed between evaluations (e.g. in hard-coded, unprofiled code)
+        pattern_type, executing = pattern_at(_STATE_EXECUTING_TYPE, _STATE_EXECUTING)
+        completed_type, last_completed = pattern_at(_STATE_PATTERN_TYPE, _STATE_PATTERN)
+        pattern_type = pattern_type or completed_type
+        
+        diagnostics = {
+            'reason': flag,
+            'stage': stage,
+            'pattern_type': pattern_type,
+            'pattern': executing,
+            'last_completed_pattern': last_completed,
+            'elapsed_seconds': round(now - (state[_STATE_TITLE_START] if started else worker['sent_at']), 3),
+            'stage_elapsed_seconds': round(now - state[_STATE_STAGE_START], 3) if stage else None,
+            'budget': budget[0] if budget else None,
+            'budget_seconds': budget[1] if budget else None
+        }
+        
+        if flag == 'timeout':
+            where = f"{stage or 'startup'}"
+            if executing:
+                where += f", pattern '{executing}'"
+            elif last_completed:
+                where += f", after pattern '{last_completed}'"
+            message = f"Timed out after {diagnostics['elapsed_seconds']:.2f}s ({budget[0]} budget {budget[1]}s) in {where}"
+        else:
+            message = f"Worker process exited while processing stage {stage or 'startup'}"
+        
+        return ProcessingResult(
+            title=title,
+            original_title=title,
+            batch_id=batch_id,
+            processing_id=processing_id,
+            status=ProcessingStatus.FAILED,
+            extracted_elements=ExtractedElements(),
+            processing_time_seconds=diagnostics['elapsed_seconds'],
+            error_message=message,
+            component_results={flag: diagnostics},
+            created_timestamp=self._get_timestamps()[0],
+            flags=[flag],
+            stage_timings={}
+        )
+    
+    def fetchSourceDocuments(self, query: Dict[str, Any] = None, limit: int = 0,
+                             collection_name: str = "markets_raw"):
+        """
+        Stream source documents with only the title field projected.
+        
+        Args:
+            query: Optional filter
+            limit: Maximum number of documents (0 = no limit)
+            collection_name: Source collection name
+            
+        Returns:
+            Cursor over {_id, report_title_short} documents
+        """
+        return find_projected(self.db[collection_name], query, projection='title', limit=limit)
+    
+    def processDeduplicated(self, source_documents, batch_id: str = None,
+                            title_field: str = 'report_title_short') -> Tuple[List[ProcessingResult], DeduplicationResult]:
+        """
+        Deduplicate source documents by normalized title and process each unique title once.
+        
+        Args:
+            source_documents: Iterable of markets_raw documents (cursor, list or JSON export)
+            batch_id: Optional batch identifier (auto-generated if not provided)
+            title_field: Document field holding the title
+            
+        Returns:
+            Tuple of (results aligned with dedup_result.groups, dedup_result)
+        """
+        dedup_result = TitleDeduplicator(title_field=title_field).group_documents(source_documents)
+        stats = dedup_result.stats
+        
+        logger.info(f"Deduplication: {stats.total_documents} documents -> {stats.unique_titles} unique titles "
+                    f"(ratio {stats.dedup_ratio:.4f}x, {stats.duplicate_documents} duplicates skipped)")
+        
+        results = self.processBatch(dedup_result.unique_titles(), batch_id, index_facets=False)
+        # Facet rows are keyed by source _id like the stored documents, so counts include every duplicate
+        if self.facet_index is not None:
+            self._index_facets(list(dedup_result.fan_out([self._result_to_document(result) for result in results])))
+        self.processing_stats['deduplicated_documents'] = (
+            self.processing_stats.get('deduplicated_documents', 0) + stats.duplicate_documents
+        )
+        with self._retry_lock:
+            for group, result in zip(dedup_result.groups, results):
+                if result.status == ProcessingStatus.FAILED:
+                    self.dedup_retry_groups[result.processing_id] = DeduplicationResult([group], stats)
+        
+        return results, dedup_result
+    
+    def runAsyncPipeline(self, query: Dict[str, Any] = None, limit: int = 0,
+                         source_collection: str = "markets_raw",
+                         output_collection: str = "markets_processed",
+                         max_pending_batches: int = 2) -> Dict[str, Any]:
+        """
+        Stream markets_raw through the pipeline with reads, processing and writes overlapped.
+        
+        An asyncio loop drives three stages connected by bounded queues: the
+        reader prefetches the next batch_size documents, the processor runs
+        processBatch on a dedicated executor thread, and the writer saves the
+        previous batch's results. Blocking pymongo calls run on an I/O executor,
+        so Atlas round-trips overlap with extraction; a full queue stalls the
+        stage feeding it (backpressure), bounding memory to max_pending_batches
+        per queue. Failed titles whose retry backoff has elapsed are retried on
+        the processing thread between batches (the rest once the stream ends),
+        and their final results replace the stored failures.
+        
+        Args:
+            query: Optional filter on the source collection
+            limit: Maximum number of documents (0 = no limit)
+            source_collection: Collection to read titles from
+            output_collection: Collection passed to saveResults
+            max_pending_batches: Queue depth between stages
+            
+        Returns:
+            Dictionary of run statistics (batches, titles, retried titles, per-stage busy seconds, wall time)
+        """
+        return asyncio.run(self._run_async_pipeline(query, limit, source_collection, output_collection,
+                                                    max_pending_batches))
+    
+    async def _run_async_pipeline(self, query: Optional[Dict[str, Any]], limit: int, source_collection: str,
+                                  output_collection: str, max_pending_batches: int) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        read_queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending_batches)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending_batches)
+        documents = iter(self.fetchSourceDocuments(query, limit, source_collection))
+        run_stats = {
+            'batches': 0,
+            'titles': 0,
+            'saved_batches': 0,
+            'retried_titles': 0,
+            'failed_writes': 0,
+            'read_seconds': 0.0,
+            'process_seconds': 0.0,
+            'write_seconds': 0.0,
+            'wall_seconds': 0.0
+        }
+        start_time = time.perf_counter()
+        
+        # Reads and writes share the I/O pool; extraction components are not thread-safe, so one CPU thread
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="pipeline-io") as io_pool, \
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix="pipeline-cpu") as cpu_pool:
+            
+            async def read_batches():
+                while True:
+                    stage_start = time.perf_counter()
+                    batch = await loop.run_in_executor(
+                        io_pool, lambda: list(itertools.islice(documents, self.batch_size)))
+                    run_stats['read_seconds'] += time.perf_counter() - stage_start
+                    if not batch:
+                        break
+                    await read_queue.put(batch)
+                await read_queue.put(None)
+            
+            async def process_batches():
+                while True:
+                    batch = await read_queue.get()
+                    if batch is None:
+                        break
+                    titles = [doc.get('report_title_short') for doc in batch if doc.get('report_title_short')]
+                    stage_start = time.perf_counter()
+                    results = await loop.run_in_executor(cpu_pool, self.processBatch, titles)
+                    # Retries whose backoff has elapsed run between batches on the same thread
+                    retried = await loop.run_in_executor(cpu_pool, self._drain_retry_queue, False)
+                    run_stats['process_seconds'] += time.perf_counter() - stage_start
+                    run_stats['batches'] += 1
+                    run_stats['titles'] += len(titles)
+                    await write_queue.put((self.saveResults, results))
+                    if retried:
+                        await write_queue.put((self.saveRetriedResults, retried))
+                
+                # Remaining retries wait out their backoff once the stream is done
+                stage_start = time.perf_counter()
+                retried = await loop.run_in_executor(cpu_pool, self._drain_retry_queue, True)
+                run_stats['process_seconds'] += time.perf_counter() - stage_start
+                if retried:
+                    await write_queue.put((self.saveRetriedResults, retried))
+                await write_queue.put(None)
+            
+            async def write_batches():
+                # Batches are written in order, so a retried result always replaces its stored failure
+                while True:
+                    item = await write_queue.get()
+                    if item is None:
+                        break
+                    save, results = item
+                    stage_start = time.perf_counter()
+                    saved = await loop.run_in_executor(io_pool, save, results, output_collection)
+                    run_stats['write_seconds'] += time.perf_counter() - stage_start
+                    if save == self.saveRetriedResults:
+                        run_stats['retried_titles'] += len(results)
+                        if not saved:
+                            run_stats['failed_writes'] += 1
+                    else:
+                        run_stats['saved_batches' if saved else 'failed_writes'] += 1
+            
+            await asyncio.gather(read_batches(), process_batches(), write_batches())
+        
+        run_stats['wall_seconds'] = time.perf_counter() - start_time
+        busy = run_stats['read_seconds'] + run_stats['process_seconds'] + run_stats['write_seconds']
+        logger.info(f"Async pipeline complete: {run_stats['titles']} titles in {run_stats['batches']} batches, "
+                    f"{run_stats['wall_seconds']:.2f}s wall vs {busy:.2f}s serial "
+                    f"(read {run_stats['read_seconds']:.2f}s, process {run_stats['process_seconds']:.2f}s, "
+                    f"write {run_stats['write_seconds']:.2f}s)")
+        return run_stats
+    
     def trackProgress(self, current: int, total: int, batch_id: str) -> None:
         """
         Update processing progress.
@@ -517,28 +1464,156 @@ class PipelineOrchestrator:
         percentage = (current / total * 100) if total > 0 else 0
         logger.info(f"Progress [{batch_id}]: {current}/{total} ({percentage:.1f}%)")
     
-    def handleErrors(self, title: str, error: Exception, attempt: int) -> bool:
+    def handleErrors(self, title: str, error: Exception, attempt: int,
+                     result: Optional[ProcessingResult] = None) -> bool:
         """
         Manage processing errors with retry logic.
         
+        Never sleeps: with a failed result, the title is scheduled on the retry
+        queue with exponential backoff (1, 2, 4... x retry_backoff_seconds) or,
+        once retries are exhausted, written to the dead-letter collection.
+        
         Args:
             title: Title that failed processing
-            error: Exception that occurred
+            error: Exception (or error message) that occurred
             attempt: Current attempt number (1-based)
+            result: Failed ProcessingResult to queue or dead-letter
             
         Returns:
             True if should retry, False otherwise
         """
         logger.warning(f"Processing error (attempt {attempt}/{self.retry_attempts}): {title[:50]}... - {str(error)}")
         
-        if attempt < self.retry_attempts:
-            # Exponential backoff for retries
-            wait_time = 2 ** (attempt - 1)  # 1, 2, 4 seconds
-            time.sleep(wait_time)
-            return True
-        else:
+        should_retry = attempt < self.retry_attempts
+        if not should_retry:
             logger.error(f"Max retries exceeded for title: {title[:50]}...")
-            return False
+        
+        if result is not None:
+            entry = RetryEntry(
+                title=title,
+                batch_id=result.batch_id,
+                processing_id=result.processing_id,
+                attempt=attempt,
+                ready_at=time.monotonic() + self.retry_backoff_seconds * 2 ** (attempt - 1),
+                last_error=str(error),
+                component_results=result.component_results,
+                failed_result=result
+            )
+            if should_retry:
+                with self._retry_lock:
+                    self.retry_queue.append(entry)
+            else:
+                self._dead_letter(entry)
+        
+        return should_retry
+    
+    def processRetryQueue(self, collection_name: Optional[str] = "markets_processed",
+                          result_sink: Optional[ColumnarResultsWriter] = None) -> List[ProcessingResult]:
+        """
+        Reprocess queued failures with backoff until each succeeds or exhausts its retries.
+        
+        Meant to run after the main stream, on the thread that processes titles
+        (extraction components are not thread-safe): backoff waits happen here,
+        never in processBatch. runAsyncPipeline drains ready entries between
+        batches instead.
+        
+        Args:
+            collection_name: Collection the final results are upserted into under their
+                             original processing_id (None to skip saving)
+            result_sink: Optional ColumnarResultsWriter receiving the final results; each
+                         supersedes the failed row written under the same processing_id
+            
+        Returns:
+            The final ProcessingResult per retried title
+        """
+        final_results = self._drain_retry_queue()
+        if result_sink is not None:
+            result_sink.write_many(final_results)
+        if collection_name and final_results:
+            self.saveRetriedResults(final_results, collection_name)
+        return final_results
+    
+    def _drain_retry_queue(self, wait: bool = True) -> List[ProcessingResult]:
+        """
+        Run retry entries earliest-ready first, requeueing or dead-lettering failures.
+        
+        Each attempt's result replaces the title's previously counted result in
+        processing_stats and report_accumulator. With wait=False only entries
+        whose backoff has already elapsed run, and the call returns without sleeping.
+        """
+        final_results = []
+        while True:
+            with self._retry_lock:
+                if not self.retry_queue:
+                    break
+                entry = min(self.retry_queue, key=lambda queued: queued.ready_at)
+                delay = entry.ready_at - time.monotonic()
+                if delay > 0 and not wait:
+                    break
+                self.retry_queue.remove(entry)
+            
+            if delay > 0:
+                time.sleep(delay)
+            
+            attempt = entry.attempt + 1
+            result = self.processTitle(entry.title, entry.batch_id, entry.processing_id)
+            if entry.failed_result is not None:
+                self._replace_result(entry.failed_result, result)
+            if result.status == ProcessingStatus.FAILED:
+                if self.handleErrors(entry.title, result.error_message, attempt, result):
+                    continue
+                result.flags.append('dead_letter')
+            else:
+                with self._retry_lock:
+                    self.processing_stats['retried_titles'] += 1
+            
+            result.flags.append('retried')
+            final_results.append(result)
+            with self._retry_lock:
+                self.retry_results.append(result)
+        
+        # Re-indexing a processing_id supersedes its failed facet row(s)
+        self._index_facets(self._facet_rows(final_results))
+        if final_results:
+            logger.info(f"Retry queue drained: {len(final_results)} titles "
+                        f"({sum(1 for r in final_results if 'dead_letter' in r.flags)} dead-lettered)")
+        return final_results
+    
+    def _facet_rows(self, results: List[ProcessingResult]) -> List[Any]:
+        """Facet index rows for retried results; deduplicated titles fan out to their source _ids."""
+        rows = []
+        for result in results:
+            with self._retry_lock:
+                dedup_group = self.dedup_retry_groups.get(result.processing_id)
+            if dedup_group is None:
+                rows.append(result)
+            else:
+                rows.extend(dedup_group.fan_out([self._result_to_document(result)]))
+        return rows
+    
+    def _dead_letter(self, entry: RetryEntry) -> None:
+        """Persist a title that exhausted its retries, with its partial component_results."""
+        pdt_str, utc_str, _ = self._get_timestamps()
+        document = _encode_for_storage({
+            '_id': entry.processing_id,
+            'title': entry.title,
+            'batch_id': entry.batch_id,
+            'attempts': entry.attempt,
+            'last_error': entry.last_error,
+            'component_results': entry.component_results or {},
+            'dead_lettered_timestamp': pdt_str,
+            'dead_lettered_utc': utc_str
+        })
+        with self._retry_lock:
+            self.dead_letters.append(document)
+            self.processing_stats['dead_lettered_titles'] += 1
+        
+        if self.db is None:
+            return
+        try:
+            self.db[DEAD_LETTER_COLLECTION].replace_one({'_id': entry.processing_id}, document, upsert=True)
+        except PyMongoError as e:
+            logger.error(f"Failed to write dead letter for {entry.processing_id}: {e}")
     
     def saveResults(self, results: List[ProcessingResult], collection_name: str = "markets_processed") -> bool:
         """
@@ -561,7 +1636,7 @@ class PipelineOrchestrator:
             # Convert results to dictionaries
             documents = []
             for result in results:
-                doc = asdict(result)
+                doc = self._result_to_document(result)
                 doc['_id'] = result.processing_id  # Use processing_id as MongoDB _id
                 documents.append(doc)
             
@@ -578,13 +1653,116 @@ class PipelineOrchestrator:
             logger.error(f"Unexpected error saving results: {e}")
             return False
     
+    def saveRetriedResults(self, results: List[ProcessingResult], collection_name: str = "markets_processed") -> bool:
+        """
+        Replace the stored documents of retried titles with their final results.
+        
+        Titles from processDeduplicated are fanned out to every source _id again,
+        replacing the failed documents saveDeduplicatedResults wrote; other
+        results are keyed by their processing_id as in saveResults.
+        
+        Args:
+            results: Final results from the retry queue
+            collection_name: MongoDB collection name
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not results:
+            return True
+        
+        try:
+            operations = []
+            for result in results:
+                doc = self._result_to_document(result)
+                with self._retry_lock:
+                    dedup_group = self.dedup_retry_groups.pop(result.processing_id, None)
+                if dedup_group is not None:
+                    operations.extend(dedup_group.build_bulk_operations([doc]))
+                    continue
+                doc['_id'] = result.processing_id
+                operations.append(ReplaceOne({'_id': result.processing_id}, doc, upsert=True))
+            
+            write_result = self.db[collection_name].bulk_write(operations, ordered=False)
+            logger.info(f"Saved {len(operations)} retried results to {collection_name} "
+                        f"(upserted: {write_result.upserted_count}, modified: {write_result.modified_count})")
+            return True
+            
+        except PyMongoError as e:
+            logger.error(f"Failed to save retried results to MongoDB: {e}")
+            return False
+    
+    def saveDeduplicatedResults(self, results: List[ProcessingResult], dedup_result: DeduplicationResult,
+                                collection_name: str = "markets_processed") -> bool:
+        """
+        Fan results for unique titles back out to every source _id in a single bulk write.
+        
+        Args:
+            results: Results aligned with dedup_result.groups (from processDeduplicated)
+            dedup_result: Deduplication result that produced the processed titles
+            collection_name: MongoDB collection name
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not results:
+            logger.warning("No results to save")
+            return True
+        
+        try:
+            collection = self.db[collection_name]
+            
+            documents = [self._result_to_document(result) for result in results]
+            operations = dedup_result.build_bulk_operations(documents)
+            
+            write_result = collection.bulk_write(operations, ordered=False)
+            
+            logger.info(f"Fanned out {len(results)} unique results to {len(operations)} source documents "
+                        f"in {collection_name} (upserted: {write_result.upserted_count}, "
+                        f"modified: {write_result.modified_count})")
+            return True
+            
+        except PyMongoError as e:
+            logger.error(f"Failed to save deduplicated results to MongoDB: {e}")
+            return False
+        except Exception as e:
+            logger.error(f"Unexpected error saving deduplicated results: {e}")
+            return False
+    
+    def _result_to_document(self, result: ProcessingResult) -> Dict[str, Any]:
+        """Convert a ProcessingResult to a BSON-encodable document (enums stored as values)."""
+        return _encode_for_storage(asdict(result))
+    
+    def exportResultsColumnar(self, results: List[ProcessingResult], output_path: str = None,
+                              row_group_size: int = 50000) -> str:
+        """
+        Export results to a columnar file (Parquet via pyarrow, numpy .npz fallback).
+        
+        Args:
+            results: List of processing results to export
+            output_path: Target path without extension (organized output directory if not provided)
+            row_group_size: Rows per row group
+            
+        Returns:
+            Path of the written Parquet file or numpy column directory
+        """
+        if not output_path:
+            output_dir = self._output_directory("script07_pipeline_results_columnar")
+            output_path = os.path.join(output_dir, "processed_results")
+        
+        with ColumnarResultsWriter(output_path, row_group_size=row_group_size) as writer:
+            writer.write_many(results)
+        
+        return writer.path
+    
     def generateReport(self, batch_id: str, results: List[ProcessingResult] = None) -> str:
         """
         Generate processing summary report.
         
         Args:
             batch_id: Batch identifier
-            results: Optional list of results (fetched from DB if not provided)
+            results: Optional list of results to summarize (the run-wide
+                     report_accumulator if not provided)
             
         Returns:
             Report filename
@@ -593,7 +1771,7 @@ class PipelineOrchestrator:
         
         try:
             # Create organized output directory
-            output_dir = create_organized_output_directory("script07_pipeline_orchestrator")
+            output_dir = self._output_directory("script07_pipeline_orchestrator")
             filename = os.path.join(output_dir, f"processing_report_{batch_id}.json")
             
             # Generate report data with organized metadata
@@ -613,33 +1791,13 @@ class PipelineOrchestrator:
                 'sample_results': []
             }
             
-            if results:
-                # Batch-specific statistics
-                total = len(results)
-                completed = sum(1 for r in results if r.status == ProcessingStatus.COMPLETED)
-                failed = sum(1 for r in results if r.status == ProcessingStatus.FAILED)
-                requires_review = sum(1 for r in results if r.status == ProcessingStatus.REQUIRES_REVIEW)
+            # One pass over explicit results; streamed runs report from the running accumulator
+            report = ReportAccumulator().add_many(results) if results is not None else self.report_accumulator
+            if report.total:
+                report_data['batch_summary'] = report.summary()
                 
-                report_data['batch_summary'] = {
-                    'total_titles': total,
-                    'completed': completed,
-                    'failed': failed,
-                    'requires_review': requires_review,
-                    'success_rate': (completed / total) if total > 0 else 0,
-                    'average_processing_time': sum(r.processing_time_seconds for r in results) / total if total > 0 else 0,
-                    'confidence_distribution': self._analyze_confidence_distribution(results)
-                }
-                
-                # Sample results (first 10 successful, first 5 failed, first 5 requiring review)
-                successful_samples = [asdict(r) for r in results if r.status == ProcessingStatus.COMPLETED][:10]
-                failed_samples = [asdict(r) for r in results if r.status == ProcessingStatus.FAILED][:5]
-                review_samples = [asdict(r) for r in results if r.status == ProcessingStatus.REQUIRES_REVIEW][:5]
-                
-                report_data['sample_results'] = {
-                    'successful': successful_samples,
-                    'failed': failed_samples,
-                    'requires_review': review_samples
-                }
+                # Reservoir samples (up to 10 successful, 5 failed, 5 requiring review)
+                report_data['sample_results'] = report.sample_results()
             
             # Write report file
             with open(filename, 'w', encoding='utf-8') as f:
@@ -662,32 +1820,49 @@ class PipelineOrchestrator:
         Returns:
             Dictionary with confidence distribution analysis
         """
-        confidences = []
-        for result in results:
-            if result.confidence_analysis and 'overall_confidence' in result.confidence_analysis:
-                confidences.append(result.confidence_analysis['overall_confidence'])
+        return ReportAccumulator(sample_sizes={}).add_many(results).confidence_distribution()
+    
+    def _average_stage_times_ms(self, results: List[ProcessingResult]) -> Dict[str, float]:
+        """Average wall time per pipeline stage (milliseconds) over results that reached it."""
+        return ReportAccumulator(sample_sizes={}).add_many(results).average_stage_times_ms()
+    
+    def savePatternProfile(self, apply_feedback: bool = False) -> str:
+        """
+        Write the ranked per-pattern profile and optionally store it on pattern_libraries.
         
-        if not confidences:
-            return {'error': 'No confidence scores available'}
+        Args:
+            apply_feedback: Write each pattern's profile back with a single bulk update
+            
+        Returns:
+            Report filename ("" when profiling is off)
+        """
+        if self.pattern_profiler is None:
+            logger.warning("Pattern profiling is off - create the orchestrator with profile_patterns=True")
+            return ""
         
-        return {
-            'count': len(confidences),
-            'min': min(confidences),
-            'max': max(confidences),
-            'average': sum(confidences) / len(confidences),
-            'high_confidence': sum(1 for c in confidences if c >= 0.8),
-            'medium_confidence': sum(1 for c in confidences if 0.5 <= c < 0.8),
-            'low_confidence': sum(1 for c in confidences if c < 0.5),
-            'distribution': {
-                'high_percentage': (sum(1 for c in confidences if c >= 0.8) / len(confidences)) * 100,
-                'medium_percentage': (sum(1 for c in confidences if 0.5 <= c < 0.8) / len(confidences)) * 100,
-                'low_percentage': (sum(1 for c in confidences if c < 0.5) / len(confidences)) * 100
-            }
-        }
+        filename = self.pattern_profiler.write_report(
+            self._output_directory("script07_pipeline_orchestrator"))
+        
+        if apply_feedback:
+            _, _, utc_now = self._get_timestamps()
+            updates = profile_updates(self.pattern_profiler, profiled_at=utc_now)
+            if updates:
+                updated = self.pattern_library_manager.bulk_update_patterns(updates)
+                logger.info(f"Stored pattern profiles on {updated} of {len(updates)} patterns")
+        
+        return filename
     
     def get_processing_statistics(self) -> Dict[str, Any]:
         """Get overall processing statistics."""
         stats = self.processing_stats.copy()
+        stats['stage_time_totals'] = dict(stats['stage_time_totals'])
+        
+        # Share of total stage time per stage (where the pipeline spends its time)
+        total_stage_time = sum(stats['stage_time_totals'].values())
+        if total_stage_time > 0:
+            stats['stage_time_share'] = {
+                stage: seconds / total_stage_time for stage, seconds in stats['stage_time_totals'].items()
+            }
         
         if stats['total_titles_processed'] > 0:
             stats['overall_success_rate'] = (stats['successful_extractions'] / stats['total_titles_processed'])
@@ -733,6 +1908,7 @@ def demo_pipeline_orchestrator():
             print(f"Market Type: {result.extracted_elements.market_term_type or 'N/A'}")
             print(f"Date Range: {result.extracted_elements.extracted_forecast_date_range or 'N/A'}")
             print(f"Report Type: {result.extracted_elements.extracted_report_type or 'N/A'}")
+            print(f"Regions: {', '.join(result.extracted_elements.extracted_regions or []) or 'N/A'}")
             
             if result.confidence_analysis:
                 confidence = result.confidence_analysis.get('overall_confidence', 0)
@@ -754,6 +1930,9 @@ def demo_pipeline_orchestrator():
         print(f"  Total Processed: {stats['total_titles_processed']}")
         print(f"  Success Rate: {stats.get('overall_success_rate', 0):.1%}")
         print(f"  Review Rate: {stats.get('overall_review_rate', 0):.1%}")
+        print(f"\nStage Time Share:")
+        for stage, share in stats.get('stage_time_share', {}).items():
+            print(f"  {stage}: {share:.1%} ({stats['stage_time_totals'][stage]:.3f}s)")
         
         return True
         
@@ -764,6 +1943,11 @@ def demo_pipeline_orchestrator():
         return False
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s'
+    )
+    
     print("Starting Pipeline Orchestrator Demo...")
     success = demo_pipeline_orchestrator()
     
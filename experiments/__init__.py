@@ -0,0 +1,94 @@
+"""
+Market Research Title Parser - experiments package.
+
+The numbered pipeline modules (01_market_term_classifier_v1.py, ...) are not
+valid Python identifiers, so they are exposed here under stable aliases. Each
+module is executed at most once per process, from its absolute path, the first
+time it is requested; every later request returns the cached module.
+
+Usage:
+    from experiments import load_module
+    classifier_module = load_module("market_term_classifier")
+
+    import experiments.date_extractor
+    experiments.date_extractor.EnhancedDateExtractor
+"""
+
+import os
+import sys
+import importlib
+import importlib.abc
+import importlib.util
+from types import ModuleType
+from typing import Dict
+
+EXPERIMENTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Alias -> module file (relative to experiments/)
+MODULE_FILES: Dict[str, str] = {
+    'pattern_discovery': "00_pattern_discovery_for_review_v1.py",
+    'mongodb_setup': "00a_mongodb_setup_v1.py",
+    'pattern_library_manager': "00b_pattern_library_manager_v1.py",
+    'output_directory_manager': "00c_output_directory_manager_v1.py",
+    'title_deduplicator': "00d_title_deduplicator_v1.py",
+    'mongodb_connection_manager': "00e_mongodb_connection_manager_v1.py",
+    'columnar_results_writer': "00f_columnar_results_writer_v1.py",
+    'html_description_cleaner': "00g_html_description_cleaner_v1.py",
+    'regex_pattern_linter': "00h_regex_pattern_linter_v1.py",
+    'pattern_profiler': "00i_pattern_profiler_v1.py",
+    'facet_index': "00j_facet_index_v1.py",
+    'topic_clusterer': "00k_topic_clusterer_v1.py",
+    'market_term_classifier': "01_market_term_classifier_v1.py",
+    'date_extractor': "02_date_extractor_v1.py",
+    'report_type_extractor': "03_report_type_extractor_v4.py",
+    'geographic_entity_detector': "04_geographic_entity_detector_v3.py",
+    'topic_extractor': "05_topic_extractor_v1.py",
+    'confidence_tracker': "06_confidence_tracker_v1.py",
+    'pipeline_orchestrator': "07_pipeline_orchestrator_v1.py",
+}
+
+_FILE_ALIASES = {file_name: alias for alias, file_name in MODULE_FILES.items()}
+
+
+class _PipelineModuleFinder(importlib.abc.MetaPathFinder):
+    """Resolves 'experiments.<alias>' imports to the numbered module files."""
+
+    def find_spec(self, fullname, path=None, target=None):
+        package, _, alias = fullname.rpartition('.')
+        if package != __name__ or alias not in MODULE_FILES:
+            return None
+        return importlib.util.spec_from_file_location(fullname, os.path.join(EXPERIMENTS_DIR, MODULE_FILES[alias]))
+
+
+if not any(isinstance(finder, _PipelineModuleFinder) for finder in sys.meta_path):
+    sys.meta_path.append(_PipelineModuleFinder())
+
+
+def load_module(name: str) -> ModuleType:
+    """
+    Load a pipeline module by alias or file name (cached per process).
+
+    Equivalent to 'import experiments.<alias>', so the module also resolves by
+    name when pickled results are loaded in spawned worker processes.
+
+    Args:
+        name: Alias from MODULE_FILES (e.g. 'date_extractor') or its file name
+              (e.g. '02_date_extractor_v1.py')
+
+    Returns:
+        The executed module, registered in sys.modules as 'experiments.<alias>'
+    """
+    alias = _FILE_ALIASES.get(name, name)
+    if alias not in MODULE_FILES:
+        raise ValueError(f"Unknown pipeline module '{name}'. Available: {sorted(MODULE_FILES)}")
+    return importlib.import_module(f"{__name__}.{alias}")
+
+
+def __getattr__(name: str) -> ModuleType:
+    """Lazy attribute access: experiments.<alias> loads the module on first use."""
+    if name in MODULE_FILES:
+        return load_module(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['EXPERIMENTS_DIR', 'MODULE_FILES', 'load_module']
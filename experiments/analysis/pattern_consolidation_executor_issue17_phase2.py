@@ -4,17 +4,25 @@ GitHub Issue #17 Phase 2: Pattern Consolidation Executor
 Implements evidence-based database consolidation operations
 
 Executes Category C (REMOVE) and Category B (CONSOLIDATE) operations based on analysis results.
+All operations are planned first, touched documents are streamed to a JSONL rollback
+file, and changes are applied as ordered bulk_write batches.
+
+Usage:
+    python3 pattern_consolidation_executor_issue17_phase2.py [--plan-file PATH] [--batch-size N] [--dry-run] [--transaction]
+    python3 pattern_consolidation_executor_issue17_phase2.py --rollback OUTPUT_DIR/consolidation_rollback.jsonl
 """
 
 import os
 import sys
 import json
 import logging
+import argparse
 from datetime import datetime
 import pytz
-from typing import Dict, List, Any, Optional
-from pymongo import MongoClient
-from bson import ObjectId
+from typing import Dict, List, Any, Optional, Iterator
+from pymongo import DeleteOne, UpdateOne, ReplaceOne
+from pymongo.errors import BulkWriteError
+from bson import ObjectId, json_util
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -23,127 +31,197 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Operations per bulk_write round-trip (and ids per $in backup query)
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_PLAN_FILE = "../outputs/20250827_214431_issue17_phase2_pattern_consolidation/consolidation_plan.json"
+
 def load_consolidation_plan(plan_file: str) -> Dict:
     """Load the consolidation plan from analysis results."""
     with open(plan_file, 'r') as f:
         return json.load(f)
 
-def execute_category_c_removals(collection, c_remove_patterns: List[Dict]) -> Dict:
+def _sorted_by_creation(documents: List[Dict]) -> List[Dict]:
+    """Oldest (most established) first; documents without a date sort first."""
+    return sorted(documents, key=lambda x: str(x.get("created_date") or ""))
+
+def plan_category_c_removals(c_remove_patterns: List[Dict]) -> List[Dict]:
     """
-    Execute Category C (REMOVE) operations - safest operation first.
-    Remove exact duplicate entries, keeping one canonical entry.
+    Plan Category C (REMOVE) operations - safest operation first.
+    Remove exact duplicate entries, keeping the oldest canonical entry.
     """
-    results = {
-        "patterns_processed": 0,
-        "documents_removed": 0,
-        "errors": []
-    }
-    
+    operations = []
     for pattern_analysis in c_remove_patterns:
-        try:
-            pattern_regex = pattern_analysis["pattern"]
-            documents = pattern_analysis["documents"]
-            
-            logger.info(f"Processing Category C pattern: {pattern_regex}")
-            logger.info(f"Found {len(documents)} duplicate documents")
-            
-            # Sort documents by creation date to keep the oldest (most established)
-            sorted_docs = sorted(documents, key=lambda x: x.get("created_date", datetime.min))
-            keep_doc = sorted_docs[0]  # Keep the oldest
-            remove_docs = sorted_docs[1:]  # Remove the rest
-            
-            logger.info(f"Keeping document: {keep_doc['id']} (term: '{keep_doc['term']}')")
-            
-            # Remove duplicate documents
-            for doc_to_remove in remove_docs:
-                doc_id = ObjectId(doc_to_remove["id"])
-                result = collection.delete_one({"_id": doc_id})
-                
-                if result.deleted_count == 1:
-                    logger.info(f"✅ Removed duplicate: {doc_id} (term: '{doc_to_remove['term']}')")
-                    results["documents_removed"] += 1
-                else:
-                    error_msg = f"Failed to remove document {doc_id}"
-                    logger.error(error_msg)
-                    results["errors"].append(error_msg)
-            
-            results["patterns_processed"] += 1
-            
-        except Exception as e:
-            error_msg = f"Error processing Category C pattern {pattern_regex}: {str(e)}"
-            logger.error(error_msg)
-            results["errors"].append(error_msg)
-    
-    return results
+        pattern_regex = pattern_analysis["pattern"]
+        sorted_docs = _sorted_by_creation(pattern_analysis["documents"])
+        keep_doc = sorted_docs[0]
+
+        logger.info(f"Category C pattern: {pattern_regex} - keeping {keep_doc['id']} (term: '{keep_doc['term']}'), "
+                    f"removing {len(sorted_docs) - 1}")
+        for doc_to_remove in sorted_docs[1:]:
+            operations.append({"category": "C", "pattern": pattern_regex, "op": "delete",
+                               "id": doc_to_remove["id"], "term": doc_to_remove["term"]})
+    return operations
+
+def plan_category_b_consolidations(b_consolidate_patterns: List[Dict], timestamp: datetime) -> List[Dict]:
+    """
+    Plan Category B (CONSOLIDATE) operations.
+    Merge similar patterns with priority resolution (lowest priority wins, oldest breaks ties).
+    The kept document is updated before the others are removed.
+    """
+    operations = []
+    for pattern_analysis in b_consolidate_patterns:
+        pattern_regex = pattern_analysis["pattern"]
+        documents = pattern_analysis["documents"]
+        target_priority = min(pattern_analysis["unique_priorities"])
+
+        keep_doc = _sorted_by_creation([doc for doc in documents if doc["priority"] == target_priority])[0]
+        logger.info(f"Category B pattern: {pattern_regex} - consolidating {len(documents)} documents to "
+                    f"{keep_doc['id']} (priority: {target_priority}, term: '{keep_doc['term']}')")
+
+        operations.append({"category": "B", "pattern": pattern_regex, "op": "update",
+                           "id": keep_doc["id"], "term": keep_doc["term"],
+                           "set": {
+                               "priority": target_priority,
+                               "active": True,  # Consolidated patterns should be active
+                               "last_updated": timestamp,
+                               "notes": f"Consolidated from {len(documents)} duplicate entries - GitHub Issue #17 Phase 2"
+                           }})
+        for doc_to_remove in documents:
+            if doc_to_remove["id"] != keep_doc["id"]:
+                operations.append({"category": "B", "pattern": pattern_regex, "op": "delete",
+                                   "id": doc_to_remove["id"], "term": doc_to_remove["term"]})
+    return operations
+
+def plan_consolidation(consolidation_plan: Dict, timestamp: Optional[datetime] = None) -> List[Dict]:
+    """All planned operations in execution order: Category C removals, then Category B consolidations."""
+    timestamp = timestamp or datetime.utcnow()
+    actions = consolidation_plan["actions"]
+    return (plan_category_c_removals(actions.get("C_REMOVE") or []) +
+            plan_category_b_consolidations(actions.get("B_CONSOLIDATE") or [], timestamp))
 
-def execute_category_b_consolidations(collection, b_consolidate_patterns: List[Dict]) -> Dict:
+def _chunks(items: List[Any], size: int) -> Iterator[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def write_rollback_file(collection, operations: List[Dict], rollback_file: str,
+                        batch_size: int = DEFAULT_BATCH_SIZE) -> Dict:
     """
-    Execute Category B (CONSOLIDATE) operations.
-    Merge similar patterns with priority resolution (lowest priority wins).
+    Stream the current state of every document the plan touches to a JSONL rollback file.
+
+    Documents are read with one $in query per chunk and written one Extended JSON
+    line at a time, so only touched documents are saved and never held in memory at once.
+
+    Returns:
+        Dict with 'documents_saved' and 'missing_ids' (planned ids not found)
+    """
+    planned_ids = list(dict.fromkeys(op["id"] for op in operations))
+    found = set()
+    with open(rollback_file, 'w') as f:
+        for id_chunk in _chunks(planned_ids, batch_size):
+            cursor = collection.find({"_id": {"$in": [ObjectId(doc_id) for doc_id in id_chunk]}},
+                                     batch_size=batch_size)
+            for document in cursor:
+                f.write(json_util.dumps(document) + "\n")
+                found.add(str(document["_id"]))
+
+    missing_ids = [doc_id for doc_id in planned_ids if doc_id not in found]
+    logger.info(f"Rollback file: {len(found)} documents saved to {rollback_file}")
+    return {"documents_saved": len(found), "missing_ids": missing_ids}
+
+def _to_write(operation: Dict):
+    doc_id = ObjectId(operation["id"])
+    if operation["op"] == "delete":
+        return DeleteOne({"_id": doc_id})
+    return UpdateOne({"_id": doc_id}, {"$set": operation["set"]})
+
+def apply_consolidation(collection, operations: List[Dict], batch_size: int = DEFAULT_BATCH_SIZE,
+                        session=None) -> Dict:
+    """
+    Apply planned operations as ordered bulk_write batches.
+
+    Ordered batches keep each kept-document update ahead of the deletes planned
+    after it; the first failing batch stops execution, and only the operations
+    ahead of its first write error count as applied. With a session the
+    BulkWriteError is re-raised so the surrounding transaction aborts.
+
+    Returns:
+        Dict with per-category counts, 'batches' and 'errors'
     """
     results = {
-        "patterns_processed": 0,
-        "documents_consolidated": 0,
+        "batches": 0,
+        "documents_updated": 0,
+        "documents_deleted": 0,
+        "deleted_by_category": {"C": 0, "B": 0},
         "errors": []
     }
-    
-    for pattern_analysis in b_consolidate_patterns:
+
+    for batch in _chunks(operations, batch_size):
+        failed = False
+        applied_ops = batch
         try:
-            pattern_regex = pattern_analysis["pattern"]
-            documents = pattern_analysis["documents"]
-            
-            logger.info(f"Processing Category B pattern: {pattern_regex}")
-            logger.info(f"Found {len(documents)} documents to consolidate")
-            
-            # Determine consolidation strategy
-            unique_priorities = pattern_analysis["unique_priorities"]
-            target_priority = min(unique_priorities)  # Lowest priority wins
-            
-            # Find the document with lowest priority (or oldest if tied)
-            target_docs = [doc for doc in documents if doc["priority"] == target_priority]
-            if len(target_docs) > 1:
-                # If multiple docs with same lowest priority, keep oldest
-                target_docs = sorted(target_docs, key=lambda x: x.get("created_date", datetime.min))
-            
-            keep_doc = target_docs[0]
-            remove_docs = [doc for doc in documents if doc["id"] != keep_doc["id"]]
-            
-            logger.info(f"Consolidating to: {keep_doc['id']} (priority: {target_priority}, term: '{keep_doc['term']}')")
-            
-            # Update the kept document to ensure it has the consolidated properties
-            keep_doc_id = ObjectId(keep_doc["id"])
-            update_data = {
-                "priority": target_priority,
-                "active": True,  # Consolidated patterns should be active
-                "last_updated": datetime.utcnow(),
-                "notes": f"Consolidated from {len(documents)} duplicate entries - GitHub Issue #17 Phase 2"
-            }
-            
-            collection.update_one({"_id": keep_doc_id}, {"$set": update_data})
-            logger.info(f"✅ Updated consolidated document with priority {target_priority}")
-            
-            # Remove the other documents
-            for doc_to_remove in remove_docs:
-                doc_id = ObjectId(doc_to_remove["id"])
-                result = collection.delete_one({"_id": doc_id})
-                
-                if result.deleted_count == 1:
-                    logger.info(f"✅ Removed duplicate: {doc_id} (priority: {doc_to_remove['priority']}, term: '{doc_to_remove['term']}')")
-                    results["documents_consolidated"] += 1
-                else:
-                    error_msg = f"Failed to remove document {doc_id}"
-                    logger.error(error_msg)
-                    results["errors"].append(error_msg)
-            
-            results["patterns_processed"] += 1
-            
-        except Exception as e:
-            error_msg = f"Error processing Category B pattern {pattern_regex}: {str(e)}"
-            logger.error(error_msg)
-            results["errors"].append(error_msg)
-    
+            result = collection.bulk_write([_to_write(op) for op in batch], ordered=True, session=session)
+            bulk_result = result.bulk_api_result
+        except BulkWriteError as e:
+            if session is not None:
+                raise
+            failed = True
+            bulk_result = e.details
+            write_errors = e.details.get("writeErrors", [])
+            for error in write_errors:
+                failed_op = batch[error["index"]]
+                results["errors"].append(f"Failed to {failed_op['op']} document {failed_op['id']}: {error.get('errmsg')}")
+            # An ordered batch stops at its first error; everything before it was executed
+            applied_ops = batch[:min(error["index"] for error in write_errors)] if write_errors else []
+
+        results["batches"] += 1
+        results["documents_updated"] += bulk_result.get("nModified", 0)
+        results["documents_deleted"] += bulk_result.get("nRemoved", 0)
+        planned_deletes = [op for op in applied_ops if op["op"] == "delete"]
+        if bulk_result.get("nRemoved", 0) == len(planned_deletes):
+            for op in planned_deletes:
+                results["deleted_by_category"][op["category"]] += 1
+        else:
+            results["errors"].append(f"Batch {results['batches']}: removed {bulk_result.get('nRemoved', 0)} "
+                                     f"of {len(planned_deletes)} planned documents")
+        if failed:
+            break
+
+    logger.info(f"Applied {len(operations)} operations in {results['batches']} bulk_write batches: "
+                f"{results['documents_updated']} updated, {results['documents_deleted']} deleted")
     return results
 
+def summarize_category_results(operations: List[Dict], applied: Dict, missing_ids: List[str]) -> Dict:
+    """Per-category results in the shape of the execution report."""
+    missing = set(missing_ids)
+    summaries = {}
+    for category, removed_key in (("C", "documents_removed"), ("B", "documents_consolidated")):
+        category_ops = [op for op in operations if op["category"] == category]
+        summaries[category] = {
+            "patterns_processed": len({op["pattern"] for op in category_ops}),
+            removed_key: applied["deleted_by_category"][category],
+            "errors": [f"Failed to remove document {op['id']}" for op in category_ops
+                       if op["op"] == "delete" and op["id"] in missing]
+        }
+    return summaries
+
+def rollback_consolidation(collection, rollback_file: str, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Restore every document in a rollback file (re-insert deleted, replace updated) in bulk batches."""
+    restored = 0
+    with open(rollback_file, 'r') as f:
+        batch = []
+        for line in f:
+            document = json_util.loads(line)
+            batch.append(ReplaceOne({"_id": document["_id"]}, document, upsert=True))
+            if len(batch) >= batch_size:
+                result = collection.bulk_write(batch, ordered=False)
+                restored += result.upserted_count + result.matched_count
+                batch = []
+        if batch:
+            result = collection.bulk_write(batch, ordered=False)
+            restored += result.upserted_count + result.matched_count
+    logger.info(f"Restored {restored} documents from {rollback_file}")
+    return restored
+
 def validate_consolidation(collection) -> Dict:
     """Validate that consolidation was successful by checking for remaining duplicates."""
     pipeline = [
@@ -173,20 +251,29 @@ def create_output_directory(script_name: str) -> str:
     os.makedirs(output_dir, exist_ok=True)
     return output_dir
 
-def export_backup_to_directory(collection, backup_collection_name: str, export_dir: str) -> bool:
-    """Export the backup collection to JSON file in specified directory."""
+def export_backup_to_directory(collection, backup_collection_name: str, export_dir: str,
+                               batch_size: int = DEFAULT_BATCH_SIZE) -> bool:
+    """Stream the backup collection to a JSONL file (one Extended JSON document per line) in specified directory."""
     try:
         db = collection.database
         backup_collection = db[backup_collection_name]
-        
-        # Export to JSON file
-        backup_docs = list(backup_collection.find({}))
-        export_file = os.path.join(export_dir, f"{backup_collection_name}.json")
-        
+        os.makedirs(export_dir, exist_ok=True)
+        export_file = os.path.join(export_dir, f"{backup_collection_name}.jsonl")
+
+        exported = 0
         with open(export_file, 'w') as f:
-            json.dump(backup_docs, f, indent=2, default=str)
-        
-        logger.info(f"✅ Backup exported to: {export_file}")
+            lines = []
+            for document in backup_collection.find({}, batch_size=batch_size):
+                lines.append(json_util.dumps(document))
+                if len(lines) >= batch_size:
+                    f.write("\n".join(lines) + "\n")
+                    exported += len(lines)
+                    lines = []
+            if lines:
+                f.write("\n".join(lines) + "\n")
+                exported += len(lines)
+
+        logger.info(f"✅ Backup exported to: {export_file} ({exported} documents)")
         logger.info(f"📁 Backup location: {os.path.abspath(export_file)}")
         return True
         
@@ -196,12 +283,25 @@ def export_backup_to_directory(collection, backup_collection_name: str, export_d
 
 def main():
     """Execute GitHub Issue #17 Phase 2 pattern consolidation operations."""
+    parser = argparse.ArgumentParser(description="Execute Issue #17 Phase 2 pattern consolidation")
+    parser.add_argument("--plan-file", default=DEFAULT_PLAN_FILE, help="consolidation_plan.json from the analysis")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Operations per bulk_write")
+    parser.add_argument("--dry-run", action="store_true", help="Plan and write the rollback file without applying")
+    parser.add_argument("--transaction", action="store_true", help="Apply all batches in one transaction")
+    parser.add_argument("--rollback", metavar="ROLLBACK_FILE", help="Restore documents from a rollback file and exit")
+    args = parser.parse_args()
     
     logger.info("Starting GitHub Issue #17 Phase 2: Pattern Consolidation Executor")
     
-    # Connect to MongoDB
+    # Connect to MongoDB through the shared connection manager
+    _project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    if _project_root not in sys.path:
+        sys.path.append(_project_root)
+    from experiments import load_module
+    connection_manager = load_module("mongodb_connection_manager")
+
     try:
-        client = MongoClient(os.getenv('MONGODB_URI'))
+        client = connection_manager.get_mongo_client(os.getenv('MONGODB_URI'))
         db = client['deathstar']
         collection = db['pattern_libraries']
         logger.info("Connected to MongoDB successfully")
@@ -209,12 +309,17 @@ def main():
         logger.error(f"Failed to connect to MongoDB: {e}")
         return
     
+    if args.rollback:
+        rollback_consolidation(collection, args.rollback, batch_size=args.batch_size)
+        connection_manager.close_all_clients()
+        return
+    
     # Create output directory
     output_dir = create_output_directory("issue17_phase2_consolidation_execution")
     logger.info(f"Output directory: {output_dir}")
     
     # Load consolidation plan from analysis results
-    plan_file = "../outputs/20250827_214431_issue17_phase2_pattern_consolidation/consolidation_plan.json"
+    plan_file = args.plan_file
     
     if not os.path.exists(plan_file):
         logger.error(f"Consolidation plan file not found: {plan_file}")
@@ -240,37 +345,53 @@ def main():
         "overall_success": True
     }
     
-    # Execute Category C (REMOVE) operations first - safest
+    # Plan every Category C (REMOVE, safest first) and Category B (CONSOLIDATE) operation up front
     logger.info("\n" + "="*60)
-    logger.info("EXECUTING CATEGORY C (REMOVE) OPERATIONS")
+    logger.info("PLANNING CATEGORY C (REMOVE) AND CATEGORY B (CONSOLIDATE) OPERATIONS")
     logger.info("="*60)
     
-    c_remove_patterns = consolidation_plan["actions"]["C_REMOVE"]
-    if c_remove_patterns:
-        c_results = execute_category_c_removals(collection, c_remove_patterns)
-        execution_results["category_c_results"] = c_results
-        logger.info(f"Category C Results: {c_results['patterns_processed']} patterns, {c_results['documents_removed']} documents removed")
-        if c_results["errors"]:
-            execution_results["overall_success"] = False
-    else:
-        logger.info("No Category C patterns to process")
-        execution_results["category_c_results"] = {"patterns_processed": 0, "documents_removed": 0, "errors": []}
+    operations = plan_consolidation(consolidation_plan)
+    logger.info(f"Planned {len(operations)} operations")
+    
+    # Save the touched documents before any write
+    rollback_file = os.path.join(output_dir, "consolidation_rollback.jsonl")
+    rollback_info = write_rollback_file(collection, operations, rollback_file, batch_size=args.batch_size)
+    execution_results["rollback_file"] = rollback_file
+    missing_ids = set(rollback_info["missing_ids"])
+    operations = [op for op in operations if op["id"] not in missing_ids]
     
-    # Execute Category B (CONSOLIDATE) operations
     logger.info("\n" + "="*60)
-    logger.info("EXECUTING CATEGORY B (CONSOLIDATE) OPERATIONS") 
+    logger.info("APPLYING CONSOLIDATION AS ORDERED BULK WRITES")
     logger.info("="*60)
     
-    b_consolidate_patterns = consolidation_plan["actions"]["B_CONSOLIDATE"]
-    if b_consolidate_patterns:
-        b_results = execute_category_b_consolidations(collection, b_consolidate_patterns)
-        execution_results["category_b_results"] = b_results
-        logger.info(f"Category B Results: {b_results['patterns_processed']} patterns, {b_results['documents_consolidated']} documents consolidated")
-        if b_results["errors"]:
-            execution_results["overall_success"] = False
+    if args.dry_run:
+        logger.info("Dry run - no changes applied")
+        applied = {"batches": 0, "documents_updated": 0, "documents_deleted": 0,
+                   "deleted_by_category": {"C": 0, "B": 0}, "errors": []}
+    elif args.transaction:
+        # All batches commit or abort together (requires a replica set)
+        with client.start_session() as session:
+            try:
+                applied = session.with_transaction(
+                    lambda txn_session: apply_consolidation(collection, operations, batch_size=args.batch_size,
+                                                            session=txn_session))
+            except BulkWriteError as e:
+                logger.error(f"Transaction aborted, no changes applied: {e}")
+                applied = {"batches": 0, "documents_updated": 0, "documents_deleted": 0,
+                           "deleted_by_category": {"C": 0, "B": 0},
+                           "errors": [f"Transaction aborted: {error.get('errmsg')}"
+                                      for error in e.details.get("writeErrors", [])] or [str(e)]}
     else:
-        logger.info("No Category B patterns to process")
-        execution_results["category_b_results"] = {"patterns_processed": 0, "documents_consolidated": 0, "errors": []}
+        applied = apply_consolidation(collection, operations, batch_size=args.batch_size)
+    execution_results["bulk_write_results"] = applied
+    
+    category_results = summarize_category_results(plan_consolidation(consolidation_plan), applied, missing_ids)
+    execution_results["category_c_results"] = category_results["C"]
+    execution_results["category_b_results"] = category_results["B"]
+    if applied["errors"] or category_results["C"]["errors"] or category_results["B"]["errors"]:
+        execution_results["overall_success"] = False
+    logger.info(f"Category C Results: {category_results['C']['patterns_processed']} patterns, {category_results['C']['documents_removed']} documents removed")
+    logger.info(f"Category B Results: {category_results['B']['patterns_processed']} patterns, {category_results['B']['documents_consolidated']} documents consolidated")
     
     # Export backup to @backups/database directory
     logger.info("\n" + "="*60)
@@ -371,7 +492,7 @@ The remaining {validation_results["remaining_duplicate_patterns"]} duplicate pat
     logger.info(f"Overall Success: {'✅ YES' if execution_results['overall_success'] else '❌ NO'}")
     logger.info(f"Output Directory: {output_dir}")
     
-    client.close()
+    connection_manager.close_all_clients()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
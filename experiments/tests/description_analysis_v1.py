@@ -8,6 +8,14 @@ Strategy:
 2. Use spaCy LG model on descriptions (longer text = better context)
 3. Cross-reference discovered entities with titles
 4. Identify high-confidence patterns for library enhancement
+
+Sharded mode (--shards N) splits the markets_raw _id range into N shards, runs
+each shard as a streamed nlp.pipe job in a worker process, persists per-shard
+partial counters (so interrupted runs resume with --resume-dir) and merges them.
+
+Usage:
+    python3 description_analysis_v1.py [--sample-size N]
+    python3 description_analysis_v1.py --shards 8 --workers 4 [--batch-size 32] [--resume-dir DIR]
 """
 
 import os
@@ -24,10 +32,32 @@ from dotenv import load_dotenv
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure
 import html
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Load environment variables
 load_dotenv()
 
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+
+_conn_module = load_module("mongodb_connection_manager")
+_output_module = load_module("output_directory_manager")
+
+DESCRIPTION_MODEL = "en_core_web_lg"
+MIN_DESCRIPTION_LENGTH = 50
+MAX_DESCRIPTION_CHARS = 10000  # Limit to 10k chars for performance
+DESCRIPTION_QUERY = {
+    "report_title_short": {"$exists": True, "$ne": ""},
+    "report_description_full": {"$exists": True, "$ne": ""}
+}
+DESCRIPTION_PROJECTION = {
+    "report_title_short": 1,
+    "report_description_full": 1,
+    "publisherID": 1
+}
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -112,24 +142,15 @@ def get_existing_patterns(patterns_collection):
         logger.error(f"Error loading geographic patterns: {e}")
         return set(), {}
 
-def analyze_description_for_entities(nlp, description: str, title: str) -> Dict:
-    """
-    Analyze a description for geographic entities and check if they appear in the title.
-    """
-    # Clean the description
+def prepare_description(description: str) -> str:
+    """Cleaned, truncated description text; empty when too short to analyze."""
     clean_desc = clean_html(description)
-    
-    if not clean_desc or len(clean_desc) < 50:
-        return {
-            'entities_found': [],
-            'entities_in_title': [],
-            'unique_entities': []
-        }
-    
-    # Process description with spaCy
-    doc = nlp(clean_desc[:10000])  # Limit to 10k chars for performance
-    
-    # Extract geographic entities
+    if not clean_desc or len(clean_desc) < MIN_DESCRIPTION_LENGTH:
+        return ""
+    return clean_desc[:MAX_DESCRIPTION_CHARS]
+
+def entities_from_doc(doc, title: str) -> Dict:
+    """Geographic entities of a processed description and the ones that appear in the title."""
     entities_found = []
     for ent in doc.ents:
         if ent.label_ in ['GPE', 'LOC']:
@@ -140,13 +161,15 @@ def analyze_description_for_entities(nlp, description: str, title: str) -> Dict:
                 'end': ent.end_char
             })
     
-    # Check which entities appear in the title
-    entities_in_title = []
+    # Check which entities appear in the title (each distinct entity text checked once)
     title_lower = title.lower()
-    
+    in_title = {}
+    entities_in_title = []
     for entity in entities_found:
         entity_text = entity['text']
-        if entity_text.lower() in title_lower:
+        if entity_text not in in_title:
+            in_title[entity_text] = entity_text.lower() in title_lower
+        if in_title[entity_text]:
             entities_in_title.append(entity_text)
     
     return {
@@ -155,40 +178,24 @@ def analyze_description_for_entities(nlp, description: str, title: str) -> Dict:
         'unique_entities': list(set(e['text'] for e in entities_found))
     }
 
-def batch_analyze_descriptions(markets_collection, patterns_collection, sample_size: int = 500):
+def analyze_description_for_entities(nlp, description: str, title: str) -> Dict:
     """
-    Analyze report descriptions to discover geographic entities.
-    Focus on entities that appear in both description and title.
+    Analyze a description for geographic entities and check if they appear in the title.
     """
-    timestamp = get_timestamp()
-    
-    logger.info(f"Starting description analysis with sample size: {sample_size}")
-    
-    # Load spaCy model (use LG for better accuracy on longer text)
-    logger.info("Loading spaCy en_core_web_lg model...")
-    nlp = spacy.load("en_core_web_lg", disable=["tagger", "parser", "attribute_ruler", "lemmatizer"])
+    clean_desc = prepare_description(description)
     
-    # Load existing patterns
-    existing_patterns, pattern_map = get_existing_patterns(patterns_collection)
-    
-    # Query documents with both title and description
-    logger.info("Querying documents with descriptions...")
-    cursor = markets_collection.find(
-        {
-            "report_title_short": {"$exists": True, "$ne": ""},
-            "report_description_full": {"$exists": True, "$ne": ""}
-        },
-        {
-            "report_title_short": 1,
-            "report_description_full": 1,
-            "publisherID": 1
+    if not clean_desc:
+        return {
+            'entities_found': [],
+            'entities_in_title': [],
+            'unique_entities': []
         }
-    ).limit(sample_size)
     
-    # Process documents
-    results = {
-        'timestamp_pst': timestamp['pst'],
-        'timestamp_utc': timestamp['utc'],
+    return entities_from_doc(nlp(clean_desc), title)
+
+def new_partial_results() -> Dict:
+    """Empty mergeable counters for one run or one shard."""
+    return {
         'total_documents': 0,
         'documents_with_entities': 0,
         'documents_with_title_entities': 0,
@@ -199,51 +206,64 @@ def batch_analyze_descriptions(markets_collection, patterns_collection, sample_s
             'total': 0,
             'with_entities': 0,
             'with_title_entities': 0
-        }),
-        'high_confidence_patterns': [],
-        'processing_time': 0
+        })
     }
+
+def accumulate_analysis(partial: Dict, analysis: Dict, publisher: str, existing_patterns: Set[str]) -> None:
+    """Add one document's analysis to partial counters."""
+    partial['total_documents'] += 1
     
-    start_time = time.time()
+    # Update publisher stats
+    partial['publisher_breakdown'][publisher]['total'] += 1
     
-    logger.info("Processing documents...")
-    for doc in cursor:
-        results['total_documents'] += 1
+    if analysis['unique_entities']:
+        partial['documents_with_entities'] += 1
+        partial['publisher_breakdown'][publisher]['with_entities'] += 1
         
-        title = doc.get('report_title_short', '')
-        description = doc.get('report_description_full', '')
-        publisher = doc.get('publisherID', 'unknown')
-        
-        # Analyze description
-        analysis = analyze_description_for_entities(nlp, description, title)
-        
-        # Update publisher stats
-        results['publisher_breakdown'][publisher]['total'] += 1
-        
-        if analysis['unique_entities']:
-            results['documents_with_entities'] += 1
-            results['publisher_breakdown'][publisher]['with_entities'] += 1
+        # Count all entities found in descriptions
+        for entity in analysis['unique_entities']:
+            partial['all_entities'][entity] += 1
             
-            # Count all entities found in descriptions
-            for entity in analysis['unique_entities']:
-                results['all_entities'][entity] += 1
-                
-                # Check if it's a new discovery
-                if entity.lower() not in existing_patterns:
-                    results['new_discoveries'][entity] += 1
-        
-        if analysis['entities_in_title']:
-            results['documents_with_title_entities'] += 1
-            results['publisher_breakdown'][publisher]['with_title_entities'] += 1
-            
-            # Count entities that appear in titles
-            for entity in analysis['entities_in_title']:
-                results['title_entities'][entity] += 1
-        
-        if results['total_documents'] % 50 == 0:
-            logger.info(f"Processed {results['total_documents']} documents...")
+            # Check if it's a new discovery
+            if entity.lower() not in existing_patterns:
+                partial['new_discoveries'][entity] += 1
     
-    results['processing_time'] = time.time() - start_time
+    if analysis['entities_in_title']:
+        partial['documents_with_title_entities'] += 1
+        partial['publisher_breakdown'][publisher]['with_title_entities'] += 1
+        
+        # Count entities that appear in titles
+        for entity in analysis['entities_in_title']:
+            partial['title_entities'][entity] += 1
+
+def merge_partial_results(partials: List[Dict]) -> Dict:
+    """Sum partial counters (from shards or saved JSON) into one partial."""
+    merged = new_partial_results()
+    for partial in partials:
+        for key in ('total_documents', 'documents_with_entities', 'documents_with_title_entities'):
+            merged[key] += partial[key]
+        for key in ('all_entities', 'title_entities', 'new_discoveries'):
+            merged[key].update(partial[key])
+        for publisher, stats in partial['publisher_breakdown'].items():
+            for stat, value in stats.items():
+                merged['publisher_breakdown'][publisher][stat] += value
+    return merged
+
+def finalize_results(partial: Dict, timestamp: Dict, processing_time: float, existing_patterns: Set[str]) -> Dict:
+    """Turn (merged) partial counters into the analysis results document."""
+    results = {
+        'timestamp_pst': timestamp['pst'],
+        'timestamp_utc': timestamp['utc'],
+        'total_documents': partial['total_documents'],
+        'documents_with_entities': partial['documents_with_entities'],
+        'documents_with_title_entities': partial['documents_with_title_entities'],
+        'all_entities': partial['all_entities'],
+        'title_entities': partial['title_entities'],
+        'new_discoveries': partial['new_discoveries'],
+        'publisher_breakdown': partial['publisher_breakdown'],
+        'high_confidence_patterns': [],
+        'processing_time': processing_time
+    }
     
     # Identify high-confidence patterns (appear in multiple title-description pairs)
     for entity, count in results['title_entities'].items():
@@ -272,6 +292,194 @@ def batch_analyze_descriptions(markets_collection, patterns_collection, sample_s
     
     return results
 
+def batch_analyze_descriptions(markets_collection, patterns_collection, sample_size: int = 500):
+    """
+    Analyze report descriptions to discover geographic entities.
+    Focus on entities that appear in both description and title.
+    """
+    timestamp = get_timestamp()
+    
+    logger.info(f"Starting description analysis with sample size: {sample_size}")
+    
+    # Load spaCy model (use LG for better accuracy on longer text)
+    logger.info("Loading spaCy en_core_web_lg model...")
+    nlp = spacy.load(DESCRIPTION_MODEL, disable=["tagger", "parser", "attribute_ruler", "lemmatizer"])
+    
+    # Load existing patterns
+    existing_patterns, pattern_map = get_existing_patterns(patterns_collection)
+    
+    # Query documents with both title and description
+    logger.info("Querying documents with descriptions...")
+    cursor = markets_collection.find(DESCRIPTION_QUERY, DESCRIPTION_PROJECTION).limit(sample_size)
+    
+    partial = new_partial_results()
+    start_time = time.time()
+    
+    logger.info("Processing documents...")
+    for doc in cursor:
+        title = doc.get('report_title_short', '')
+        description = doc.get('report_description_full', '')
+        publisher = doc.get('publisherID', 'unknown')
+        
+        # Analyze description
+        analysis = analyze_description_for_entities(nlp, description, title)
+        accumulate_analysis(partial, analysis, publisher, existing_patterns)
+        
+        if partial['total_documents'] % 50 == 0:
+            logger.info(f"Processed {partial['total_documents']} documents...")
+    
+    return finalize_results(partial, timestamp, time.time() - start_time, existing_patterns)
+
+def compute_id_shards(markets_collection, shard_count: int) -> List[Dict]:
+    """
+    Split the _id range of documents with descriptions into contiguous shards.
+    
+    Returns:
+        One {'min': ..., 'max': ..., 'last': bool} range per shard ($bucketAuto
+        boundaries; max is exclusive except for the last shard)
+    """
+    buckets = list(markets_collection.aggregate([
+        {"$match": DESCRIPTION_QUERY},
+        {"$project": {"_id": 1}},
+        {"$bucketAuto": {"groupBy": "$_id", "buckets": shard_count}}
+    ], allowDiskUse=True))
+    return [{'min': bucket['_id']['min'], 'max': bucket['_id']['max'], 'last': index == len(buckets) - 1}
+            for index, bucket in enumerate(buckets)]
+
+def shard_query(id_range: Dict) -> Dict:
+    """markets_raw filter for one shard."""
+    upper_operator = "$lte" if id_range['last'] else "$lt"
+    return dict(DESCRIPTION_QUERY, _id={"$gte": id_range['min'], upper_operator: id_range['max']})
+
+def _partial_to_json(partial: Dict) -> Dict:
+    return {key: dict(value) if isinstance(value, (Counter, defaultdict)) else value
+            for key, value in partial.items()}
+
+def _partial_from_json(data: Dict) -> Dict:
+    partial = new_partial_results()
+    for key in ('total_documents', 'documents_with_entities', 'documents_with_title_entities'):
+        partial[key] = data[key]
+    for key in ('all_entities', 'title_entities', 'new_discoveries'):
+        partial[key] = Counter(data[key])
+    for publisher, stats in data['publisher_breakdown'].items():
+        partial['publisher_breakdown'][publisher].update(stats)
+    return partial
+
+def analyze_shard(shard_index: int, id_range: Dict, mongodb_uri: str, existing_patterns: List[str],
+                  shard_path: str, model_name: str = DESCRIPTION_MODEL, batch_size: int = 32,
+                  sample_size: int = 0) -> str:
+    """
+    Worker: stream one _id shard through nlp.pipe and save its partial counters.
+    
+    Returns:
+        Path of the saved shard partial (JSON)
+    """
+    start_time = time.time()
+    existing = set(existing_patterns)
+    nlp = load_module("pattern_discovery").load_ner_model(model_name)
+    
+    db = _conn_module.get_database(connection_string=mongodb_uri)
+    cursor = _conn_module.find_projected(db['markets_raw'], shard_query(id_range), DESCRIPTION_PROJECTION,
+                                         sort=[("_id", 1)], limit=sample_size)
+    partial = new_partial_results()
+    
+    def descriptions():
+        for doc in cursor:
+            title = doc.get('report_title_short', '')
+            publisher = doc.get('publisherID', 'unknown')
+            clean_desc = prepare_description(doc.get('report_description_full', ''))
+            if clean_desc:
+                yield clean_desc, (title, publisher)
+            else:
+                accumulate_analysis(partial, {'unique_entities': [], 'entities_in_title': []}, publisher, existing)
+    
+    for doc, (title, publisher) in nlp.pipe(descriptions(), as_tuples=True, batch_size=batch_size):
+        accumulate_analysis(partial, entities_from_doc(doc, title), publisher, existing)
+    
+    shard_data = _partial_to_json(partial)
+    shard_data['shard_index'] = shard_index
+    shard_data['processing_time'] = time.time() - start_time
+    temp_path = f"{shard_path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(shard_data, f, default=str)
+    os.replace(temp_path, shard_path)
+    
+    logger.info(f"Shard {shard_index}: {partial['total_documents']} documents in {shard_data['processing_time']:.1f}s")
+    return shard_path
+
+def _store_id(value):
+    """JSON form of a shard boundary (ObjectId boundaries round-trip via their hex string)."""
+    from bson import ObjectId
+    return {'$oid': str(value)} if isinstance(value, ObjectId) else value
+
+def _restore_id(value):
+    from bson import ObjectId
+    return ObjectId(value['$oid']) if isinstance(value, dict) and '$oid' in value else value
+
+def sharded_analyze_descriptions(markets_collection, patterns_collection, mongodb_uri: str,
+                                 shard_count: int = 8, workers: int = 4, batch_size: int = 32,
+                                 shard_dir: str = None, sample_size: int = 0,
+                                 model_name: str = DESCRIPTION_MODEL) -> Dict:
+    """
+    Analyze all descriptions in parallel _id-range shards and merge the partials.
+    
+    Shards whose partial already exists in shard_dir are not recomputed, so a run
+    can be resumed by passing the same directory.
+    
+    Args:
+        markets_collection: markets_raw collection
+        patterns_collection: pattern_libraries collection
+        mongodb_uri: Connection string for the worker processes
+        shard_count: Number of _id-range shards
+        workers: Worker processes
+        batch_size: nlp.pipe batch size per worker
+        shard_dir: Directory for per-shard partials (new organized output directory if None)
+        sample_size: Maximum documents per shard (0 = all)
+        model_name: spaCy model (NER only)
+    """
+    timestamp = get_timestamp()
+    start_time = time.time()
+    
+    existing_patterns, pattern_map = get_existing_patterns(patterns_collection)
+    shard_dir = shard_dir or _output_module.create_organized_output_directory("description_analysis_shards")
+    os.makedirs(shard_dir, exist_ok=True)
+    
+    id_ranges_path = os.path.join(shard_dir, "id_ranges.json")
+    if os.path.exists(id_ranges_path):
+        # Resume with the original boundaries so saved partials stay valid
+        with open(id_ranges_path, 'r', encoding='utf-8') as f:
+            id_ranges = [dict(r, min=_restore_id(r['min']), max=_restore_id(r['max'])) for r in json.load(f)]
+    else:
+        id_ranges = compute_id_shards(markets_collection, shard_count)
+        with open(id_ranges_path, 'w', encoding='utf-8') as f:
+            json.dump([dict(r, min=_store_id(r['min']), max=_store_id(r['max'])) for r in id_ranges], f)
+    
+    shard_paths = [os.path.join(shard_dir, f"shard_{index:03d}.json") for index in range(len(id_ranges))]
+    pending = [index for index, path in enumerate(shard_paths) if not os.path.exists(path)]
+    logger.info(f"Description analysis: {len(id_ranges)} shards ({len(id_ranges) - len(pending)} already done), "
+                f"{workers} workers, batch size {batch_size} -> {shard_dir}")
+    
+    if pending:
+        with ProcessPoolExecutor(max_workers=max(1, min(workers, len(pending)))) as executor:
+            futures = {executor.submit(analyze_shard, index, id_ranges[index], mongodb_uri,
+                                       sorted(existing_patterns), shard_paths[index], model_name,
+                                       batch_size, sample_size): index
+                       for index in pending}
+            for future in as_completed(futures):
+                future.result()
+                logger.info(f"Shard {futures[future]} complete")
+    
+    partials = []
+    for path in shard_paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            partials.append(_partial_from_json(json.load(f)))
+    
+    results = finalize_results(merge_partial_results(partials), timestamp, time.time() - start_time,
+                               existing_patterns)
+    results['shard_count'] = len(id_ranges)
+    results['shard_dir'] = shard_dir
+    return results
+
 def generate_pattern_enhancement_report(results: Dict, filename: str):
     """Generate a report with pattern enhancement recommendations."""
     with open(filename, 'w') as f:
@@ -322,6 +530,15 @@ def generate_pattern_enhancement_report(results: Dict, filename: str):
 
 def main():
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Description-to-title geographic entity analysis")
+    parser.add_argument("--sample-size", type=int, default=None,
+                        help="Documents to analyze (serial mode, default 500) or per shard (sharded mode, default all)")
+    parser.add_argument("--shards", type=int, default=0, help="_id-range shards (0 = serial mode)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (sharded mode)")
+    parser.add_argument("--batch-size", type=int, default=32, help="nlp.pipe batch size (sharded mode)")
+    parser.add_argument("--resume-dir", help="Shard directory of an earlier run to resume and merge")
+    args = parser.parse_args()
+    
     logger.info("Starting description analysis for geographic entity discovery")
     
     # Connect to MongoDB
@@ -332,7 +549,14 @@ def main():
     
     try:
         # Run analysis
-        results = batch_analyze_descriptions(markets_collection, patterns_collection, sample_size=500)
+        if args.shards or args.resume_dir:
+            results = sharded_analyze_descriptions(markets_collection, patterns_collection, os.getenv('MONGODB_URI'),
+                                                   shard_count=args.shards or 8, workers=args.workers,
+                                                   batch_size=args.batch_size, shard_dir=args.resume_dir,
+                                                   sample_size=args.sample_size or 0)
+        else:
+            results = batch_analyze_descriptions(markets_collection, patterns_collection,
+                                                 sample_size=args.sample_size or 500)
         
         # Generate timestamp for filenames
         timestamp = get_timestamp()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Geographic Engine Benchmark v1
+Compares the regex and PhraseMatcher engines of GeographicEntityDetector v3
+for throughput and parity (regions, remaining title and confidence) on the
+full markets_raw title set.
+
+Usage:
+    python3 geographic_engine_benchmark_v1.py [--limit N] [--batch-size N]
+                                              [--titles-file PATH] [--patterns-file PATH]
+
+    Titles come from markets_raw and patterns from pattern_libraries unless
+    JSON exports are given (e.g. resources/deathstar.markets_raw.json and
+    resources/geographic_pattern_libraries_20250820_224347.json).
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from typing import Dict, List, Any
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+
+geographic_module = load_module("geographic_entity_detector")
+GeographicEntityDetector = geographic_module.GeographicEntityDetector
+_output_module = load_module("output_directory_manager")
+_conn_module = load_module("mongodb_connection_manager")
+
+logger = logging.getLogger(__name__)
+
+
+class StaticPatternSource:
+    """Minimal PatternLibraryManager stand-in serving patterns from a JSON export."""
+
+    def __init__(self, patterns: List[Dict[str, Any]]):
+        self.patterns = patterns
+
+    def get_patterns(self, pattern_type, active_only: bool = True, use_cache: bool = True) -> List[Dict[str, Any]]:
+        return [p for p in self.patterns
+                if p.get('type', 'geographic_entity') == pattern_type.value and (p.get('active', True) or not active_only)]
+
+
+def load_titles(titles_file: str = None, limit: int = 0) -> List[str]:
+    """Titles from a markets_raw JSON export or from MongoDB."""
+    if titles_file:
+        with open(titles_file, 'r', encoding='utf-8') as f:
+            titles = [doc.get('report_title_short', '') for doc in json.load(f)]
+    else:
+        db = _conn_module.get_database(connection_string=os.getenv('MONGODB_URI'))
+        cursor = _conn_module.find_projected(db['markets_raw'], {'report_title_short': {'$exists': True}},
+                                             projection='title', limit=limit)
+        titles = [doc.get('report_title_short', '') for doc in cursor]
+    titles = [title for title in titles if title]
+    return titles[:limit] if limit else titles
+
+
+def load_pattern_source(patterns_file: str = None):
+    """PatternLibraryManager, or a static source when a pattern_libraries export is given."""
+    if patterns_file:
+        with open(patterns_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        patterns = data.get('pattern_libraries_entries', data) if isinstance(data, dict) else data
+        return StaticPatternSource(patterns)
+    pattern_module = load_module("pattern_library_manager")
+    return pattern_module.PatternLibraryManager(os.getenv('MONGODB_URI'))
+
+
+def result_signature(result) -> tuple:
+    return (tuple(result.extracted_regions), result.title, round(result.confidence, 6))
+
+
+def run_engine(pattern_source, engine: str, titles: List[str], batch_size: int) -> Dict[str, Any]:
+    """Build one engine and time extraction over all titles."""
+    build_start = time.perf_counter()
+    detector = GeographicEntityDetector(pattern_source, engine=engine)
+    build_seconds = time.perf_counter() - build_start
+
+    start = time.perf_counter()
+    results = detector.extract_geographic_entities_batch(titles, batch_size=batch_size)
+    seconds = time.perf_counter() - start
+
+    logger.info(f"{engine}: {len(titles)} titles in {seconds:.2f}s "
+                f"({len(titles) / seconds if seconds else 0:,.0f} titles/s, build {build_seconds:.2f}s)")
+    return {
+        'results': results,
+        'seconds': seconds,
+        'build_seconds': build_seconds,
+        'titles_per_second': len(titles) / seconds if seconds else 0.0
+    }
+
+
+def benchmark_engines(titles: List[str], pattern_source, batch_size: int = 256) -> Dict[str, Any]:
+    """Run both engines and compare every result."""
+    regex_run = run_engine(pattern_source, "regex", titles, batch_size)
+    phrase_run = run_engine(pattern_source, "phrase_matcher", titles, batch_size)
+
+    mismatches = []
+    for title, regex_result, phrase_result in zip(titles, regex_run['results'], phrase_run['results']):
+        if result_signature(regex_result) != result_signature(phrase_result):
+            mismatches.append({
+                'title': title,
+                'regex_regions': regex_result.extracted_regions,
+                'phrase_matcher_regions': phrase_result.extracted_regions,
+                'regex_title': regex_result.title,
+                'phrase_matcher_title': phrase_result.title
+            })
+
+    return {
+        'total_titles': len(titles),
+        'batch_size': batch_size,
+        'engines': {
+            name: {key: value for key, value in run.items() if key != 'results'}
+            for name, run in (('regex', regex_run), ('phrase_matcher', phrase_run))
+        },
+        'speedup': regex_run['seconds'] / phrase_run['seconds'] if phrase_run['seconds'] else 0.0,
+        'titles_with_regions': sum(1 for result in regex_run['results'] if result.extracted_regions),
+        'parity_rate': 1 - len(mismatches) / len(titles) if titles else 1.0,
+        'mismatches': mismatches
+    }
+
+
+def write_report(report: Dict[str, Any]) -> str:
+    """Save the JSON report and a readable summary to the organized output directory."""
+    output_dir = _output_module.create_organized_output_directory("geographic_engine_benchmark")
+    with open(os.path.join(output_dir, "benchmark_results.json"), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    header = _output_module.create_output_file_header("geographic_engine_benchmark_v1",
+                                                      "Regex vs PhraseMatcher geographic engine")
+    with open(os.path.join(output_dir, "benchmark_summary.md"), 'w', encoding='utf-8') as f:
+        f.write(header)
+        f.write(f"**Titles:** {report['total_titles']:,} (nlp.pipe batch size {report['batch_size']})\n\n")
+        f.write("| Engine | Build (s) | Extract (s) | Titles/s |\n|---|---|---|---|\n")
+        for name, stats in report['engines'].items():
+            f.write(f"| {name} | {stats['build_seconds']:.2f} | {stats['seconds']:.2f} | "
+                    f"{stats['titles_per_second']:,.0f} |\n")
+        f.write(f"\n**Speedup:** {report['speedup']:.1f}x\n")
+        f.write(f"**Parity:** {report['parity_rate']:.4%} ({len(report['mismatches'])} mismatches)\n")
+        for mismatch in report['mismatches'][:50]:
+            f.write(f"- {mismatch['title']}: regex {mismatch['regex_regions']} -> '{mismatch['regex_title']}', "
+                    f"phrase_matcher {mismatch['phrase_matcher_regions']} -> '{mismatch['phrase_matcher_title']}'\n")
+    return output_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark geographic detection engines")
+    parser.add_argument("--limit", type=int, default=0, help="Maximum titles (0 = all)")
+    parser.add_argument("--batch-size", type=int, default=256, help="nlp.pipe batch size")
+    parser.add_argument("--titles-file", help="markets_raw JSON export instead of MongoDB")
+    parser.add_argument("--patterns-file", help="pattern_libraries JSON export instead of MongoDB")
+    args = parser.parse_args()
+
+    titles = load_titles(args.titles_file, args.limit)
+    pattern_source = load_pattern_source(args.patterns_file)
+    logger.info(f"Benchmarking {len(titles):,} titles")
+
+    report = benchmark_engines(titles, pattern_source, batch_size=args.batch_size)
+    output_dir = write_report(report)
+
+    print(f"\nregex:          {report['engines']['regex']['titles_per_second']:,.0f} titles/s")
+    print(f"phrase_matcher: {report['engines']['phrase_matcher']['titles_per_second']:,.0f} titles/s")
+    print(f"speedup:        {report['speedup']:.1f}x")
+    print(f"parity:         {report['parity_rate']:.4%} ({len(report['mismatches'])} mismatches)")
+    print(f"report:         {output_dir}")
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    # Extraction logs every title at INFO
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger.setLevel(logging.INFO)
+    main()
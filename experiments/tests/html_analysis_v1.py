@@ -19,7 +19,12 @@ from collections import Counter
 from dotenv import load_dotenv
 from pymongo import MongoClient
 from pymongo.errors import ConnectionFailure
-from bs4 import BeautifulSoup
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+
+_cleaner_module = load_module("html_description_cleaner")
 
 # Load environment variables
 load_dotenv()
@@ -71,71 +76,10 @@ def connect_to_mongodb():
 def enhanced_html_cleaning(html_content: str) -> Dict[str, str]:
     """
     Enhanced HTML processing with proper block separation and table extraction.
+    Uses the shared single-pass cleaner and its on-disk cache.
     """
-    if not html_content:
-        return {"body_text": "", "table_text": "", "combined_text": ""}
-    
-    try:
-        # Parse HTML with BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
-        # Extract table content specifically
-        tables = soup.find_all(['table', 'tbody', 'thead'])
-        table_texts = []
-        
-        for table in tables:
-            # Extract all text from table cells, preserving row/cell boundaries
-            rows = table.find_all(['tr', 'td', 'th'])
-            for row in rows:
-                cell_text = row.get_text(separator=' | ', strip=True)
-                if cell_text and len(cell_text) > 3:  # Filter out empty/tiny cells
-                    table_texts.append(cell_text)
-        
-        table_text = " ; ".join(table_texts)
-        
-        # Remove tables from soup for body processing
-        for table in soup.find_all(['table', 'tbody', 'thead']):
-            table.decompose()
-        
-        # Process body content with block-level awareness
-        block_elements = ['div', 'p', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 
-                         'section', 'article', 'blockquote', 'pre']
-        
-        # Add line breaks before block elements
-        for tag_name in block_elements:
-            for tag in soup.find_all(tag_name):
-                if tag.string:
-                    tag.string.replace_with(f"\n{tag.string}\n")
-        
-        # Extract text with preserved line breaks
-        body_text = soup.get_text(separator='\n', strip=True)
-        
-        # Clean up the text
-        body_text = html.unescape(body_text)
-        body_text = re.sub(r'\n+', ' ; ', body_text)  # Convert line breaks to separators
-        body_text = re.sub(r'\s+', ' ', body_text)    # Normalize whitespace
-        body_text = body_text.strip()
-        
-        # Combine both sources
-        combined_text = f"{body_text} ; {table_text}".strip()
-        
-        return {
-            "body_text": body_text,
-            "table_text": table_text,
-            "combined_text": combined_text
-        }
-        
-    except Exception as e:
-        logger.warning(f"HTML parsing error: {e}")
-        # Fallback to simple cleaning
-        clean_text = html.unescape(html_content)
-        clean_text = re.sub(r'<[^>]+>', ' ; ', clean_text)
-        clean_text = re.sub(r'\s+', ' ', clean_text)
-        return {
-            "body_text": clean_text,
-            "table_text": "",
-            "combined_text": clean_text
-        }
+    return _cleaner_module.clean_description_html_cached(html_content)
+
 
 def load_existing_patterns(patterns_collection) -> Set[str]:
     """Load existing geographic patterns."""
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+
+"""
+Shared fixture for the PipelineOrchestrator tests
+Builds an orchestrator with MongoDB and component initialization patched out
+and lightweight stub components, so each test only overrides the components
+it exercises. Reports and exports go to a temporary directory, never the repo.
+"""
+
+import os
+import sys
+import shutil
+import weakref
+import tempfile
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+from experiments import load_module
+
+orchestrator_module = load_module("pipeline_orchestrator")
+
+
+def default_components():
+    """Stub components that complete every title as a 'Widget' market report."""
+    return {
+        'market_classifier': SimpleNamespace(
+            classify=lambda title: SimpleNamespace(market_type="standard", confidence=0.95)),
+        'date_extractor': SimpleNamespace(
+            extract=lambda title: SimpleNamespace(extracted_date_range=None, cleaned_title=title, confidence=0.5)),
+        'report_extractor': SimpleNamespace(
+            extract=lambda title, market_type: SimpleNamespace(extracted_report_type="Market", title=title,
+                                                               confidence=0.9)),
+        'geographic_detector': SimpleNamespace(
+            extract_geographic_entities=lambda title: SimpleNamespace(extracted_regions=[], title=title,
+                                                                      confidence=0.9, notes="")),
+        'topic_extractor': SimpleNamespace(
+            extract=lambda original, title, elements: SimpleNamespace(extracted_topic="Widget",
+                                                                      normalized_topic_name="widget",
+                                                                      confidence=0.9)),
+        'confidence_tracker': SimpleNamespace(
+            calculateOverallConfidence=lambda extraction: SimpleNamespace(overall_confidence=0.9),
+            flush_metrics=lambda: 0),
+    }
+
+
+def create_orchestrator(components=None, output_dir=None, **kwargs):
+    """
+    PipelineOrchestrator with MongoDB patched out and stub components.
+
+    Args:
+        components: Replacements for individual entries of default_components()
+        output_dir: Report/export directory (a temporary directory removed with the
+                    orchestrator if not provided)
+        **kwargs: PipelineOrchestrator constructor arguments
+    """
+    orchestrator_module._conn_module.close_all_clients()
+    temporary_dir = None if output_dir else tempfile.mkdtemp(prefix="orchestrator_test_")
+    with patch('pymongo.MongoClient', return_value=MagicMock()):
+        with patch.object(orchestrator_module.PipelineOrchestrator, '_initialize_components'):
+            orchestrator = orchestrator_module.PipelineOrchestrator(mongodb_uri="mongodb://test",
+                                                                    output_dir=output_dir or temporary_dir,
+                                                                    **kwargs)
+    if temporary_dir:
+        weakref.finalize(orchestrator, shutil.rmtree, temporary_dir, ignore_errors=True)
+
+    orchestrator.components = {**default_components(), **(components or {})}
+    return orchestrator
@@ -13,12 +13,16 @@ from typing import Dict, List, Tuple
 import pytz
 import json
 from dotenv import load_dotenv
-from pymongo import MongoClient
 import random
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Shared MongoDB client (the connection factory every component uses)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from experiments import load_module
+get_mongo_client = load_module("mongodb_connection_manager").get_mongo_client
+
 import importlib.util
 
 # Setup logging
@@ -117,7 +121,7 @@ class RegressionTester:
         self.report_extractor = script03.PureDictionaryReportTypeExtractor(self.pattern_lib_manager)
 
         # Get sample titles from database
-        self.client = MongoClient(os.getenv('MONGODB_URI'))
+        self.client = get_mongo_client(os.getenv('MONGODB_URI'))
         self.db = self.client['deathstar']
         self.sample_size = sample_size
         self.titles = self._load_sample_titles()
@@ -34,8 +34,12 @@ create_organized_output_directory = _output_module.create_organized_output_direc
 create_output_file_header = _output_module.create_output_file_header
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Shared MongoDB client (the connection factory every component uses)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from experiments import load_module
+get_mongo_client = load_module("mongodb_connection_manager").get_mongo_client
+
 from dotenv import load_dotenv
-from pymongo import MongoClient
 
 load_dotenv()
 
@@ -122,7 +126,7 @@ def test_lean_pipeline(test_quantity: int = 9):
     geo_detector = script04.GeographicEntityDetector(pattern_lib_manager)  # Script 04 v3 with Issue #33 fix
     
     # Query real database titles for testing
-    client = MongoClient(os.getenv('MONGODB_URI'))
+    client = get_mongo_client(os.getenv('MONGODB_URI'))
     db = client['deathstar']
     
     # Get sample titles from database - using correct field name 'report_title_short'
@@ -142,8 +146,6 @@ def test_lean_pipeline(test_quantity: int = 9):
     for i, title in enumerate(test_cases, 1):
         logger.info(f"  {i}. {title}")
     
-    client.close()  # Close the direct MongoDB connection
-    
     results = []
     timestamp = get_timestamp()
     
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+"""
+Test script for PipelineOrchestrator.runAsyncPipeline
+Validates that markets_raw reads, batch processing and result writes overlap
+(wall time below the serial sum), that every title is saved in batch order,
+and that the bounded queues keep the reader from running ahead of the writer.
+"""
+
+import os
+import sys
+import time
+import logging
+import threading
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+import orchestrator_test_helpers
+
+orchestrator_module = load_module("pipeline_orchestrator")
+PipelineOrchestrator = orchestrator_module.PipelineOrchestrator
+
+# Configure logging for tests
+logging.basicConfig(level=logging.CRITICAL)
+
+ROUND_TRIP_SECONDS = 0.05
+PROCESS_SECONDS_PER_TITLE = 0.01
+
+
+class SlowCursor:
+    """Cursor that pays one round trip per batch_size documents."""
+
+    def __init__(self, documents, counters):
+        self.documents = documents
+        self.counters = counters
+        self.fetch_size = 10
+
+    def batch_size(self, size):
+        return self
+
+    def __iter__(self):
+        for index, document in enumerate(self.documents):
+            if index % self.fetch_size == 0:
+                time.sleep(ROUND_TRIP_SECONDS)
+                self.counters['fetched'] += 1
+                self.counters['max_ahead'] = max(self.counters['max_ahead'],
+                                                 self.counters['fetched'] - self.counters['written'])
+            yield document
+
+
+class SlowDatabase(dict):
+    """markets_raw / markets_processed with network latency on every call."""
+
+    def __init__(self, count):
+        super().__init__()
+        self.counters = {'fetched': 0, 'written': 0, 'max_ahead': 0}
+        self.saved = []
+        source = MagicMock()
+        source.find.side_effect = lambda query, projection, **kwargs: SlowCursor(
+            [{'_id': i, 'report_title_short': f"Widget {i} Market"} for i in range(count)], self.counters)
+        self.replaced = []
+        output = MagicMock()
+        output.insert_many.side_effect = self._insert_many
+        output.bulk_write.side_effect = self._bulk_write
+        self['markets_raw'] = source
+        self['markets_processed'] = output
+        self.lock = threading.Lock()
+
+    def _insert_many(self, documents, ordered=False):
+        time.sleep(ROUND_TRIP_SECONDS)
+        with self.lock:
+            self.saved.extend(doc['title'] for doc in documents)
+            self.counters['written'] += 1
+
+    def _bulk_write(self, operations, ordered=False):
+        time.sleep(ROUND_TRIP_SECONDS)
+        with self.lock:
+            # Saved titles so far, so tests can check a replacement lands after its original insert
+            self.replaced.extend((op._doc['title'], op._doc['status'], len(self.saved)) for op in operations)
+        return SimpleNamespace(upserted_count=0, modified_count=len(operations))
+
+
+def slow_classify(title):
+    time.sleep(PROCESS_SECONDS_PER_TITLE)
+    return SimpleNamespace(market_type="standard", confidence=0.95)
+
+
+def create_orchestrator(count):
+    orchestrator = orchestrator_test_helpers.create_orchestrator(
+        components={'market_classifier': SimpleNamespace(classify=slow_classify)}, batch_size=10)
+    orchestrator.db = SlowDatabase(count)
+    return orchestrator
+
+
+def test_stages_overlap():
+    """Reads and writes hide behind processing; all titles saved in order."""
+    orchestrator = create_orchestrator(80)
+    stats = orchestrator.runAsyncPipeline()
+
+    assert (stats['batches'], stats['titles'], stats['saved_batches'], stats['failed_writes']) == (8, 80, 8, 0)
+    assert orchestrator.db.saved == [f"Widget {i} Market" for i in range(80)]
+    serial = stats['read_seconds'] + stats['process_seconds'] + stats['write_seconds']
+    assert stats['wall_seconds'] < 0.8 * serial, stats
+    assert orchestrator.processing_stats['total_titles_processed'] == 80
+
+
+def test_failed_title_retried_between_batches():
+    """A transient failure is retried on the processing thread and its saved failure replaced."""
+    orchestrator = create_orchestrator(30)
+    orchestrator.retry_backoff_seconds = 0.0
+    failures = {"Widget 3 Market": 1}
+
+    def flaky_extract(title):
+        if failures.get(title):
+            failures[title] -= 1
+            raise RuntimeError("date pattern cache unavailable")
+        return SimpleNamespace(extracted_date_range=None, cleaned_title=title, confidence=0.5)
+
+    orchestrator.components['date_extractor'] = SimpleNamespace(extract=flaky_extract)
+    stats = orchestrator.runAsyncPipeline()
+
+    assert stats['retried_titles'] == 1 and stats['failed_writes'] == 0
+    title, status, saved_before = orchestrator.db.replaced[0]
+    assert (title, status) == ("Widget 3 Market", "completed")
+    assert saved_before >= 10  # the batch holding the original failure was inserted first
+    assert orchestrator.processing_stats['failed_extractions'] == 0
+    assert orchestrator.report_accumulator.summary()['completed'] == 30
+
+
+def test_backpressure_bounds_prefetch():
+    """With one-batch queues the reader stays a bounded number of batches ahead of the writer."""
+    orchestrator = create_orchestrator(100)
+    orchestrator.runAsyncPipeline(max_pending_batches=1)
+    # read_queue + write_queue + one batch in each of the three stages
+    assert orchestrator.db.counters['max_ahead'] <= 5
+    assert len(orchestrator.db.saved) == 100
+
+
+if __name__ == "__main__":
+    print("Async Pipeline Runner Tests")
+    print("=" * 50)
+
+    tests = [
+        test_stages_overlap,
+        test_failed_title_retried_between_batches,
+        test_backpressure_bounds_prefetch,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+"""
+Test script for Columnar Results Writer v1.0
+Validates row flattening and round-trips through the numpy and Parquet backends.
+"""
+
+import os
+import sys
+import logging
+import tempfile
+
+# Import Columnar Results Writer using importlib
+import importlib.util
+experiments_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location("columnar_results_writer",
+                                              os.path.join(experiments_dir, "00f_columnar_results_writer_v1.py"))
+columnar_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(columnar_module)
+
+ColumnarResultsWriter = columnar_module.ColumnarResultsWriter
+read_columnar_results = columnar_module.read_columnar_results
+result_to_row = columnar_module.result_to_row
+
+# Configure logging for tests
+logging.basicConfig(level=logging.WARNING)
+
+SAMPLE_RESULTS = [
+    {
+        'processing_id': 'p1',
+        'original_title': "APAC & Europe Personal Protective Equipment Market Report, 2024-2030",
+        'status': 'success',
+        'extracted_elements': {
+            'market_term_type': 'standard',
+            'extracted_forecast_date_range': '2024-2030',
+            'extracted_report_type': 'Market Report',
+            'extracted_regions': ['APAC', 'Europe'],
+            'topic': 'Personal Protective Equipment',
+            'topicName': 'personal-protective-equipment'
+        },
+        'confidence_analysis': {'overall_confidence': 0.92}
+    },
+    {
+        'processing_id': 'p2',
+        'original_title': "Artificial Intelligence Market Size Report",
+        'status': 'review_required',
+        'extracted_elements': {
+            'market_term_type': 'standard',
+            'extracted_forecast_date_range': None,
+            'extracted_report_type': 'Market Size Report',
+            'extracted_regions': [],
+            'topic': 'Artificial Intelligence',
+            'topicName': 'artificial-intelligence'
+        },
+        'confidence_analysis': {'overall_confidence': 0.61}
+    },
+    {
+        'processing_id': 'p3',
+        'original_title': "U.S. Ammunition Market, 2030",
+        'status': 'success',
+        'extracted_elements': {
+            'market_term_type': 'standard',
+            'extracted_forecast_date_range': '2030',
+            'extracted_report_type': 'Market',
+            'extracted_regions': ['U.S.'],
+            'topic': 'Ammunition',
+            'topicName': 'ammunition'
+        },
+        'confidence_analysis': {}
+    },
+]
+
+
+def test_result_to_row():
+    """Date ranges are parsed to year bounds and missing confidence stays None."""
+    row = result_to_row(SAMPLE_RESULTS[0])
+    assert row['date_range_start'] == 2024
+    assert row['date_range_end'] == 2030
+    assert row['extracted_regions'] == ['APAC', 'Europe']
+
+    row = result_to_row(SAMPLE_RESULTS[2])
+    assert row['date_range_start'] == 2030 and row['date_range_end'] == 2030
+    assert row['confidence'] is None
+
+    row = result_to_row(SAMPLE_RESULTS[1])
+    assert row['date_range_start'] is None
+    assert row['extracted_forecast_date_range'] == ''
+
+
+def test_numpy_round_trip():
+    """Row groups concatenate and list offsets are rebased across groups."""
+    import numpy as np
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with ColumnarResultsWriter(os.path.join(temp_dir, "results"), row_group_size=2,
+                                   backend="numpy") as writer:
+            writer.write_many(SAMPLE_RESULTS)
+
+        assert writer.rows_written == 3
+        assert writer.row_groups_written == 2
+
+        columns = read_columnar_results(writer.path)
+        assert list(columns['processing_id']) == ['p1', 'p2', 'p3']
+        assert list(columns['date_range_start']) == [2024, -1, 2030]
+        assert np.isnan(columns['confidence'][2])
+
+        offsets = columns['extracted_regions_offsets']
+        values = columns['extracted_regions_values']
+        assert list(offsets) == [0, 2, 2, 3]
+        assert list(values[offsets[2]:offsets[3]]) == ['U.S.']
+
+
+def test_latest_only_drops_superseded_rows():
+    """A processing_id written again replaces its earlier row, list offsets included."""
+    retried = dict(SAMPLE_RESULTS[0], status='failed', extracted_elements={'extracted_regions': ['Asia']})
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with ColumnarResultsWriter(os.path.join(temp_dir, "results"), row_group_size=2,
+                                   backend="numpy") as writer:
+            writer.write_many([retried] + SAMPLE_RESULTS)
+
+        columns = read_columnar_results(writer.path, columns=['status', 'extracted_regions'], latest_only=True)
+        assert list(columns['processing_id']) == ['p1', 'p2', 'p3']
+        assert list(columns['status']) == [SAMPLE_RESULTS[0]['status'], SAMPLE_RESULTS[1]['status'],
+                                           SAMPLE_RESULTS[2]['status']]
+        assert list(columns['extracted_regions_offsets']) == [0, 2, 2, 3]
+        assert list(columns['extracted_regions_values']) == ['APAC', 'Europe', 'U.S.']
+        assert len(read_columnar_results(writer.path)['processing_id']) == 4
+
+
+def test_parquet_round_trip():
+    """Parquet export keeps typed columns and list regions (skipped without pyarrow)."""
+    if not columnar_module._pyarrow_available():
+        print("  pyarrow not installed - skipping")
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with ColumnarResultsWriter(os.path.join(temp_dir, "results"), row_group_size=2,
+                                   backend="parquet") as writer:
+            writer.write_many(SAMPLE_RESULTS)
+
+        table = read_columnar_results(writer.path, columns=['processing_id', 'date_range_end',
+                                                             'extracted_regions'])
+        assert table.num_rows == 3
+        assert table.column('date_range_end').to_pylist() == [2030, None, 2030]
+        assert table.column('extracted_regions').to_pylist() == [['APAC', 'Europe'], [], ['U.S.']]
+
+
+if __name__ == "__main__":
+    print("Columnar Results Writer Tests")
+    print("=" * 50)
+
+    tests = [
+        test_result_to_row,
+        test_numpy_round_trip,
+        test_latest_only_drops_superseded_rows,
+        test_parquet_round_trip,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+
+"""
+Test script for ConfidenceTracker.calculate_batch
+Validates that vectorized batch scoring matches calculateOverallConfidence
+title for title (confidence, level, review flag, analyses) and that batch
+results feed the performance metrics.
+"""
+
+import os
+import sys
+import random
+import logging
+
+import numpy as np
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+
+confidence_module = load_module("confidence_tracker")
+ConfidenceTracker = confidence_module.ConfidenceTracker
+ExtractionResults = confidence_module.ExtractionResults
+ReviewFlag = confidence_module.ReviewFlag
+
+# Configure logging for tests
+logging.basicConfig(level=logging.WARNING)
+
+TOPICS = [None, "", "Artificial Intelligence", "5G Chipsets", "solar inverters"]
+TOPIC_NAMES = [None, "artificial-intelligence", "5G Chipsets"]
+
+
+def random_extractions(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    extractions = []
+    for index in range(count):
+        topic = rng.choice(TOPICS)
+        extractions.append(ExtractionResults(
+            title=f"Title {index} Europe Market Report 2030",
+            original_title=f"Title {index}",
+            market_term_type="standard",
+            market_classification_confidence=rng.random(),
+            extracted_forecast_date_range=rng.choice([None, "2030"]),
+            date_extraction_confidence=rng.random(),
+            extracted_report_type=rng.choice([None, "Market Report"]),
+            report_extraction_confidence=rng.random(),
+            extracted_regions=rng.choice([[], ["Europe"]]),
+            geographic_detection_confidence=rng.random(),
+            topic=topic,
+            topic_name=rng.choice(TOPIC_NAMES),
+            topic_extraction_confidence=rng.random(),
+            processing_time_ms=rng.choice([None, 12.5]),
+            errors_encountered=rng.choice([[], ["Pattern matching failed"]])
+        ))
+    return extractions
+
+
+def test_batch_matches_scalar():
+    """Overall confidence, level and review flag agree with the per-title path."""
+    extractions = random_extractions(300)
+    scalar_tracker = ConfidenceTracker()
+    expected = [scalar_tracker.calculateOverallConfidence(extraction) for extraction in extractions]
+
+    tracker = ConfidenceTracker()
+    result = tracker.calculate_batch(*tracker.batch_arrays(extractions))
+    assert result.analyses is None
+    assert np.allclose(result.overall_confidence, [a.overall_confidence for a in expected])
+    assert result.confidence_levels == [a.confidence_level for a in expected]
+    assert result.review_flags == [a.review_flag for a in expected]
+    assert result.requires_review.tolist() == [a.review_flag != ReviewFlag.NO_REVIEW for a in expected]
+    assert result.extraction_completeness.tolist() == [a.extraction_completeness for a in expected]
+
+
+def test_analyses_on_request():
+    """return_analyses builds the same ConfidenceAnalysis content as the scalar path."""
+    extractions = random_extractions(20, seed=3)
+    expected = [ConfidenceTracker().calculateOverallConfidence(extraction) for extraction in extractions]
+
+    tracker = ConfidenceTracker()
+    arrays = tracker.batch_arrays(extractions)
+    result = tracker.calculate_batch(*arrays, extraction_results=extractions, return_analyses=True)
+    for analysis, reference in zip(result.analyses, expected):
+        assert analysis.title == reference.title
+        assert analysis.recommendation == reference.recommendation
+        assert analysis.confusion_patterns == reference.confusion_patterns
+        assert np.isclose(analysis.quality_indicators['quality_adjustment'],
+                          reference.quality_indicators['quality_adjustment'])
+    assert len(tracker.confidence_history) == 20
+
+
+def test_batch_metrics():
+    """Batch scoring feeds getPerformanceMetrics like the per-title path."""
+    extractions = random_extractions(50, seed=11)
+    scalar_tracker = ConfidenceTracker()
+    for extraction in extractions:
+        scalar_tracker.calculateOverallConfidence(extraction)
+
+    tracker = ConfidenceTracker()
+    tracker.calculate_batch(*tracker.batch_arrays(extractions),
+                            processing_times_ms=[e.processing_time_ms for e in extractions])
+    batch_metrics = tracker.getPerformanceMetrics()
+    scalar_metrics = scalar_tracker.getPerformanceMetrics()
+    assert batch_metrics.total_processed == scalar_metrics.total_processed
+    assert batch_metrics.flagged_for_review == scalar_metrics.flagged_for_review
+    assert batch_metrics.high_confidence_count == scalar_metrics.high_confidence_count
+    assert batch_metrics.extraction_success_rates == scalar_metrics.extraction_success_rates
+    assert batch_metrics.processing_speed_ms == scalar_metrics.processing_speed_ms
+
+    empty = tracker.calculate_batch(np.zeros((0, 5)), np.zeros((0, 4), dtype=bool), np.zeros((0, 3), dtype=bool))
+    assert empty.overall_confidence.shape == (0,)
+
+
+def test_metrics_memory_is_bounded():
+    """Performance metrics are running aggregates; history keeps only the most recent analyses."""
+    from collections import deque
+
+    extractions = random_extractions(300, seed=5)
+    tracker = ConfidenceTracker()
+    tracker.confidence_history = deque(maxlen=100)
+    analyses = [tracker.calculateOverallConfidence(extraction) for extraction in extractions]
+    tracker.calculate_batch(*tracker.batch_arrays(extractions))
+
+    scores = [analysis.overall_confidence for analysis in analyses] * 2
+    metrics = tracker.getPerformanceMetrics()
+    assert metrics.total_processed == 600
+    assert metrics.average_confidence == round(sum(scores) / len(scores), 3)
+    assert metrics.high_confidence_count == sum(1 for score in scores if score >= 0.9)
+    assert metrics.very_low_confidence_count == sum(1 for score in scores if score < 0.4)
+
+    assert len(tracker.confidence_history) == 100
+    assert tracker.confidence_history[-1].title == extractions[-1].title
+    assert len(tracker.performance_metrics['recent_confidence_scores']) == confidence_module.TREND_WINDOW
+    assert not any(isinstance(value, list) for value in tracker.performance_metrics.values())
+
+
+if __name__ == "__main__":
+    print("Confidence Batch Scoring Tests")
+    print("=" * 50)
+
+    tests = [
+        test_batch_matches_scalar,
+        test_analyses_on_request,
+        test_batch_metrics,
+        test_metrics_memory_is_bounded,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
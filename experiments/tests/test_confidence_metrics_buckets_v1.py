@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+
+"""
+Test script for persisted time-bucket confidence metrics
+Validates buffered $inc/$min/$max bucket upserts, merging of several trackers
+(workers/runs) into the same documents, and trend/distribution queries read
+from the buckets, against an in-memory collection.
+"""
+
+import os
+import sys
+import logging
+from datetime import datetime, timezone, timedelta
+
+import numpy as np
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+
+confidence_module = load_module("confidence_tracker")
+ConfidenceTracker = confidence_module.ConfidenceTracker
+ExtractionResults = confidence_module.ExtractionResults
+
+# Configure logging for tests
+logging.basicConfig(level=logging.WARNING)
+
+
+class FakeCursor(list):
+    def sort(self, key, direction):
+        return FakeCursor(sorted(self, key=lambda doc: doc[key], reverse=direction < 0))
+
+
+class FakeCollection:
+    """In-memory stand-in for upserting bulk_write, find and create_index."""
+
+    def __init__(self):
+        self.documents = {}
+        self.bulk_calls = 0
+
+    def create_index(self, keys):
+        return "index"
+
+    def bulk_write(self, requests, ordered=True):
+        self.bulk_calls += 1
+        for request in requests:
+            assert isinstance(request, UpdateOne) and request._upsert
+            doc_id = request._filter['_id']
+            update = request._doc
+            doc = self.documents.get(doc_id)
+            if doc is None:
+                doc = self.documents[doc_id] = {'_id': doc_id, **update['$setOnInsert']}
+            for name, value in update['$inc'].items():
+                target = doc
+                *parents, leaf = name.split('.')
+                for parent in parents:
+                    target = target.setdefault(parent, {})
+                target[leaf] = target.get(leaf, 0) + value
+            for name, value in update['$min'].items():
+                doc[name] = min(doc.get(name, value), value)
+            for name, value in update['$max'].items():
+                doc[name] = max(doc.get(name, value), value)
+
+    def find(self, query):
+        cutoff = query.get('bucket_start', {}).get('$gte')
+        return FakeCursor(doc for doc in self.documents.values()
+                          if doc['granularity'] == query['granularity']
+                          and (cutoff is None or doc['bucket_start'] >= cutoff))
+
+
+class PartiallyFailingCollection(FakeCollection):
+    """Unordered bulk_write that applies every operation except those for `failing_component`, once."""
+
+    def __init__(self, failing_component):
+        super().__init__()
+        self.failing_component = failing_component
+
+    def bulk_write(self, requests, ordered=True):
+        failing = [index for index, request in enumerate(requests)
+                   if request._doc['$setOnInsert']['component'] == self.failing_component]
+        super().bulk_write([request for index, request in enumerate(requests) if index not in failing], ordered)
+        if failing and self.failing_component:
+            self.failing_component = None
+            raise BulkWriteError({'writeErrors': [{'index': index, 'code': 11000, 'errmsg': 'E11000'}
+                                                  for index in failing]})
+
+
+class FakeClient(dict):
+    def __init__(self, collection):
+        super().__init__(deathstar={'confidence_metrics': collection})
+
+
+def extraction(confidence: float, index: int = 0) -> ExtractionResults:
+    return ExtractionResults(
+        title=f"Widget {index} Market Report, 2030",
+        original_title=f"Widget {index} Market Report, 2030",
+        market_term_type="standard",
+        market_classification_confidence=confidence,
+        extracted_forecast_date_range="2030",
+        date_extraction_confidence=confidence,
+        extracted_report_type="Market Report",
+        report_extraction_confidence=confidence,
+        extracted_regions=["Global"],
+        geographic_detection_confidence=confidence,
+        topic="Widget",
+        topic_name="widget",
+        topic_extraction_confidence=confidence,
+        processing_time_ms=10.0,
+        errors_encountered=[]
+    )
+
+
+def test_buffered_bucket_upserts():
+    """Increments are buffered per bucket/component and written in one bulk_write."""
+    collection = FakeCollection()
+    tracker = ConfidenceTracker(mongodb_client=FakeClient(collection))
+    for index in range(4):
+        tracker.calculateOverallConfidence(extraction(0.95 if index % 2 else 0.5, index))
+    assert collection.bulk_calls == 0
+
+    assert tracker.flush_metrics() == 6
+    assert collection.bulk_calls == 1
+    overall = [doc for doc in collection.documents.values() if doc['component'] == 'overall']
+    assert len(overall) == 1
+    bucket = overall[0]
+    assert bucket['count'] == 4 and bucket['flagged'] == 2
+    assert bucket['processing_count'] == 4 and bucket['processing_ms_sum'] == 40.0
+    assert sum(bucket['histogram'].values()) == 4
+    assert bucket['bucket_start'].second == 0
+    date_bucket = [doc for doc in collection.documents.values() if doc['component'] == 'date_extraction'][0]
+    assert (date_bucket['count'], date_bucket['success'], date_bucket['min'], date_bucket['max']) == (4, 2, 0.5, 0.95)
+    assert tracker.flush_metrics() == 0
+
+
+def test_workers_merge_and_trend():
+    """Two trackers writing to the same buckets merge; trend and distribution read the buckets."""
+    collection = FakeCollection()
+    worker_a = ConfidenceTracker(mongodb_client=FakeClient(collection))
+    worker_b = ConfidenceTracker(mongodb_client=FakeClient(collection))
+
+    # Older bucket with low confidence, newer bucket with high confidence
+    earlier = worker_a._bucket_start(datetime.now(timezone.utc) - timedelta(hours=2))
+    worker_a._add_to_bucket(earlier, 'overall', [0.3] * 10, {'flagged': 10, **worker_a._histogram_increments([0.3] * 10)})
+    worker_a.flush_metrics()
+    for index in range(6):
+        worker_a.calculateOverallConfidence(extraction(0.99, index))
+    worker_a.flush_metrics()  # e.g. end of worker A's batch
+    worker_b.calculate_batch(*worker_b.batch_arrays([extraction(0.99, index) for index in range(4)]))
+
+    trend = worker_b.get_trend_analysis(days=1)
+    assert trend['total_processed'] == 20
+    assert trend['flagged_for_review'] == 10
+    assert trend['trend'] == 'improving'
+    assert trend['confidence_distribution']['very_low'] == 10
+    assert trend['confidence_distribution']['high'] == 10
+
+    distribution = worker_a.get_confidence_distribution()
+    assert distribution['total_samples'] == 20
+    assert distribution['confidence_histogram']['counts'] == [0, 10, 0, 0, 0, 10]
+    assert distribution['quality_breakdown']['production_ready'] == 10
+    assert 0.2 <= distribution['median_confidence'] <= 0.4
+
+
+def test_partial_bulk_failure_is_not_double_counted():
+    """After a BulkWriteError only the failed buckets are re-sent, so every bucket counts each title once."""
+    collection = PartiallyFailingCollection('date_extraction')
+    tracker = ConfidenceTracker(mongodb_client=FakeClient(collection))
+    for index in range(3):
+        tracker.calculateOverallConfidence(extraction(0.9, index))
+
+    assert tracker.flush_metrics() == 5
+    assert [component for _, component in tracker._pending_buckets] == ['date_extraction']
+    assert tracker.flush_metrics() == 1
+    assert tracker._pending_buckets == {}
+    assert sorted(doc['count'] for doc in collection.documents.values()) == [3] * 6
+
+    # A forked worker drops the inherited buffer instead of flushing its copy
+    tracker.calculateOverallConfidence(extraction(0.9, 4))
+    tracker.clear_pending_metrics()
+    assert tracker.flush_metrics() == 0
+
+
+def test_without_client_uses_history():
+    """No MongoDB client: metrics stay in process and nothing is buffered."""
+    tracker = ConfidenceTracker()
+    tracker.calculateOverallConfidence(extraction(0.9))
+    tracker.calculate_batch(np.full((2, 5), 0.9), np.ones((2, 4), dtype=bool), np.zeros((2, 3), dtype=bool))
+    assert tracker._pending_buckets == {}
+    assert tracker.flush_metrics() == 0
+    assert tracker.get_trend_analysis()['total_processed'] == 1
+
+
+if __name__ == "__main__":
+    print("Confidence Metrics Bucket Tests")
+    print("=" * 50)
+
+    tests = [
+        test_buffered_bucket_upserts,
+        test_workers_merge_and_trend,
+        test_partial_bulk_failure_is_not_double_counted,
+        test_without_client_uses_history,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+"""
+Test script for aggregated confusion pattern tracking in ConfidenceTracker
+Validates (component, pattern_issue) counters, the bounded reservoir of
+example titles and the confusion section of the confidence report.
+"""
+
+import os
+import sys
+import logging
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+
+confidence_module = load_module("confidence_tracker")
+ConfidenceTracker = confidence_module.ConfidenceTracker
+ExtractionResults = confidence_module.ExtractionResults
+
+# Configure logging for tests
+logging.basicConfig(level=logging.WARNING)
+
+
+def missed_date_extraction(index: int) -> ExtractionResults:
+    """Low-confidence result with a date and no topic: two confusion keys per title."""
+    return ExtractionResults(
+        title=f"Widget {index} Market, 2030",
+        original_title=f"Widget {index} Market, 2030",
+        market_term_type="standard",
+        market_classification_confidence=0.95,
+        extracted_forecast_date_range=None,
+        date_extraction_confidence=0.3,
+        extracted_report_type="Market",
+        report_extraction_confidence=0.9,
+        extracted_regions=["Global"],
+        geographic_detection_confidence=0.9,
+        topic=None,
+        topic_name=None,
+        topic_extraction_confidence=0.2,
+        errors_encountered=[]
+    )
+
+
+def test_counters_and_reservoir():
+    """Counts are exact per key while examples stay bounded by the sample size."""
+    tracker = ConfidenceTracker()
+    for index in range(1000):
+        patterns = tracker.trackConfusionPatterns(f"Widget {index}", missed_date_extraction(index))
+        assert patterns == ["date_extraction: Date pattern present but not extracted",
+                            "topic_extraction: No topic extracted from title"]
+
+    assert set(tracker.confusion_patterns) == {
+        ("date_extraction", "Date pattern present but not extracted"),
+        ("topic_extraction", "No topic extracted from title"),
+    }
+    date_aggregate = tracker.confusion_patterns[("date_extraction", "Date pattern present but not extracted")]
+    assert date_aggregate.count == 1000
+    assert abs(date_aggregate.average_confidence - 0.3) < 1e-9
+    assert len(date_aggregate.samples) == tracker.confusion_sample_size
+    sampled = [sample.title for sample in date_aggregate.samples]
+    assert len(set(sampled)) == len(sampled)
+    # Reservoir keeps later titles too, not just the first ones seen
+    assert any(int(title.split()[1]) >= tracker.confusion_sample_size for title in sampled)
+
+
+def test_summary_and_report():
+    """Summary is ordered by frequency; the report reads counts from the aggregates."""
+    tracker = ConfidenceTracker()
+    for index in range(3):
+        tracker.calculateOverallConfidence(missed_date_extraction(index))
+    tracker.trackConfusionPatterns("Widget", missed_date_extraction(9))
+
+    summary = tracker.get_confusion_summary()
+    assert [entry['count'] for entry in summary] == [4, 4]
+    assert summary[0]['example_titles'][0] == "Widget 0 Market, 2030"
+
+    report = tracker.export_confidence_report()
+    assert "Confusion Patterns Detected: 8" in report
+    assert "Date pattern present but not extracted: 4 occurrences" in report
+
+
+if __name__ == "__main__":
+    print("Confusion Aggregation Tests")
+    print("=" * 50)
+
+    tests = [
+        test_counters_and_reservoir,
+        test_summary_and_report,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
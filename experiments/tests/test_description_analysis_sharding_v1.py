@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+
+"""
+Test script for sharded description analysis
+Validates that per-shard nlp.pipe partials, saved to disk and merged, give the
+same counters as the serial per-document analysis, using a blank spaCy
+pipeline with an entity ruler and in-memory documents in place of markets_raw.
+"""
+
+import os
+import sys
+import json
+import logging
+import tempfile
+import importlib.util
+from unittest.mock import patch
+
+experiments_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location("description_analysis",
+                                              os.path.join(experiments_dir, "tests", "description_analysis_v1.py"))
+description_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(description_module)
+
+# Configure logging for tests
+logging.basicConfig(level=logging.WARNING)
+
+FILLER = " The report covers market size, share, growth drivers and competitive landscape in detail."
+DOCUMENTS = [
+    {'_id': 1, 'publisherID': 'p1', 'report_title_short': "Europe Solar Inverter Market",
+     'report_description_full': "<p>Demand in <b>Europe</b> and Asia Pacific is rising.</p>" + FILLER},
+    {'_id': 2, 'publisherID': 'p1', 'report_title_short': "Smart Meter Market",
+     'report_description_full': "North America accounts for the largest share." + FILLER},
+    {'_id': 3, 'publisherID': 'p2', 'report_title_short': "Latin America Cement Market",
+     'report_description_full': "Too short"},
+    {'_id': 4, 'publisherID': 'p2', 'report_title_short': "Asia Pacific Robotics Market",
+     'report_description_full': "Asia Pacific ; Latin America ; Europe ; Asia Pacific leads." + FILLER},
+    {'_id': 5, 'publisherID': 'p3', 'report_title_short': "Nordics Dairy Market",
+     'report_description_full': "Nordics and Europe dairy consumption." + FILLER},
+]
+EXISTING_PATTERNS = {'europe', 'north america'}
+
+
+def build_test_model(path: str) -> str:
+    """Save a blank English pipeline whose entity ruler tags a few regions."""
+    import spacy
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([{"label": "GPE" if region == "Europe" else "LOC", "pattern": region}
+                        for region in ["Europe", "Asia Pacific", "North America", "Latin America", "Nordics"]])
+    nlp.to_disk(path)
+    return path
+
+
+def serial_partial(nlp, documents) -> dict:
+    """Reference result: the serial per-document analysis."""
+    partial = description_module.new_partial_results()
+    for doc in documents:
+        analysis = description_module.analyze_description_for_entities(
+            nlp, doc['report_description_full'], doc['report_title_short'])
+        description_module.accumulate_analysis(partial, analysis, doc['publisherID'], EXISTING_PATTERNS)
+    return partial
+
+
+def run_shard(model_path: str, documents, shard_path: str) -> dict:
+    """Run analyze_shard over in-memory documents and load its saved partial."""
+    with patch.object(description_module._conn_module, 'get_database', return_value={'markets_raw': None}), \
+            patch.object(description_module._conn_module, 'find_projected', return_value=iter(documents)):
+        description_module.analyze_shard(0, {'min': 1, 'max': 5, 'last': True}, "mongodb://test",
+                                         sorted(EXISTING_PATTERNS), shard_path, model_name=model_path,
+                                         batch_size=2)
+    with open(shard_path, 'r', encoding='utf-8') as f:
+        return description_module._partial_from_json(json.load(f))
+
+
+def comparable(partial: dict) -> dict:
+    return {key: dict(value) if hasattr(value, 'items') else value for key, value in partial.items()}
+
+
+def test_shards_merge_to_serial_result():
+    """Saved shard partials merge to the serial counters."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model_path = build_test_model(os.path.join(temp_dir, "regions"))
+        nlp = description_module.load_module("pattern_discovery").load_ner_model(model_path)
+
+        expected = serial_partial(nlp, DOCUMENTS)
+        shards = [run_shard(model_path, DOCUMENTS[:2], os.path.join(temp_dir, "shard_000.json")),
+                  run_shard(model_path, DOCUMENTS[2:], os.path.join(temp_dir, "shard_001.json"))]
+        merged = description_module.merge_partial_results(shards)
+
+        assert comparable(merged) == comparable(expected), comparable(merged)
+        assert merged['total_documents'] == 5
+        assert merged['title_entities']['Asia Pacific'] == 2
+        assert merged['new_discoveries']['Nordics'] == 1
+        assert merged['publisher_breakdown']['p2'] == {'total': 2, 'with_entities': 1, 'with_title_entities': 1}
+
+
+def test_finalize_results():
+    """Finalized results rank high-confidence patterns from the full merged counters."""
+    partial = description_module.new_partial_results()
+    for _ in range(3):
+        description_module.accumulate_analysis(
+            partial, {'unique_entities': ['Nordics'], 'entities_in_title': ['Nordics']}, 'p1', EXISTING_PATTERNS)
+    results = description_module.finalize_results(partial, {'pst': 'pst', 'utc': 'utc'}, 1.0, EXISTING_PATTERNS)
+
+    assert results['high_confidence_patterns'][0]['entity'] == 'Nordics'
+    assert results['high_confidence_patterns'][0]['confidence'] == 1.0
+    assert results['all_entities'] == {'Nordics': 3}
+
+
+def test_shard_query_bounds():
+    """Shard upper bounds are exclusive except for the last shard."""
+    query = description_module.shard_query({'min': 10, 'max': 20, 'last': False})
+    assert query['_id'] == {'$gte': 10, '$lt': 20}
+    assert query['report_description_full'] == {'$exists': True, '$ne': ''}
+
+    query = description_module.shard_query({'min': 20, 'max': 30, 'last': True})
+    assert query['_id'] == {'$gte': 20, '$lte': 30}
+
+
+if __name__ == "__main__":
+    print("Description Analysis Sharding Tests")
+    print("=" * 50)
+
+    tests = [
+        test_shards_merge_to_serial_result,
+        test_finalize_results,
+        test_shard_query_bounds,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
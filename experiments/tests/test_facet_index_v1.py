@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+
+"""
+Test script for Facet Index v1.0
+Validates facet counts, cross counts and drill-downs against brute force over
+the same documents, incremental per-batch segments and their reload/compaction,
+and millisecond-scale counts on a 100k-title index.
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import tempfile
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+
+facet_module = load_module("facet_index")
+FacetIndex = facet_module.FacetIndex
+
+# Configure logging for tests
+logging.basicConfig(level=logging.WARNING)
+
+REGIONS = ["Europe", "Asia Pacific", "North America", "Germany", "Japan"]
+REPORT_TYPES = ["Market Report", "Market Size Report", "Market Analysis", None]
+DATE_RANGES = ["2030", "2024-2030", "2025-2035", None]
+TOPICS = [f"topic-{i}" for i in range(40)]
+
+
+def saved_documents(count, seed=5, start=0):
+    """Documents shaped like saveResults output."""
+    rng = random.Random(seed)
+    return [{
+        '_id': f"proc_{start + i:06d}",
+        'processing_id': f"proc_{start + i:06d}",
+        'title': f"Title {start + i}",
+        'status': 'completed',
+        'extracted_elements': {
+            'extracted_regions': rng.sample(REGIONS, rng.randint(0, 2)),
+            'extracted_report_type': rng.choice(REPORT_TYPES),
+            'extracted_forecast_date_range': rng.choice(DATE_RANGES),
+            'topicName': rng.choice(TOPICS),
+        }
+    } for i in range(count)]
+
+
+def brute_force(documents, **filters):
+    fields = {'region': 'extracted_regions', 'report_type': 'extracted_report_type',
+              'date_range': 'extracted_forecast_date_range', 'topic': 'topicName'}
+    matched = []
+    for document in documents:
+        elements = document['extracted_elements']
+        ok = True
+        for facet, value in filters.items():
+            field_value = elements[fields[facet]]
+            ok = ok and (value in field_value if facet == 'region' else field_value == value)
+        if ok:
+            matched.append(document['processing_id'])
+    return matched
+
+
+def test_counts_match_brute_force():
+    """Counts, facet counts, cross counts and drill-downs agree with scanning the documents."""
+    documents = saved_documents(3000)
+    index = FacetIndex()
+    for offset in range(0, len(documents), 500):
+        assert index.add_batch(documents[offset:offset + 500]) == 500
+
+    assert index.count() == 3000
+    assert index.drill_down(region="Europe", report_type="Market Report") == \
+        brute_force(documents, region="Europe", report_type="Market Report")
+    assert index.count(topic="topic-7", date_range="2030") == len(brute_force(documents, topic="topic-7", date_range="2030"))
+    assert index.count(region="Atlantis") == 0
+
+    region_counts = index.facet_counts('region', report_type="Market Analysis")
+    for region in REGIONS:
+        assert region_counts.get(region, 0) == len(brute_force(documents, region=region, report_type="Market Analysis"))
+    assert list(region_counts.values()) == sorted(region_counts.values(), reverse=True)
+    assert sum(index.facet_counts('report_type').values()) == sum(
+        1 for document in documents if document['extracted_elements']['extracted_report_type'])
+
+    table = index.cross_counts('region', 'report_type')
+    assert table['Japan']['Market Size Report'] == len(brute_force(documents, region="Japan",
+                                                                   report_type="Market Size Report"))
+    try:
+        index.cross_counts('report_type', 'region')
+        assert False, "multi-valued column facet accepted"
+    except ValueError:
+        pass
+
+
+def test_incremental_segments_reload_and_compact():
+    """Each flush writes only the new rows; loading the segments rebuilds the same index."""
+    documents = saved_documents(900)
+    index = FacetIndex()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = os.path.join(temp_dir, "facet_index")
+        for offset in range(0, 900, 300):
+            index.add_batch(documents[offset:offset + 300])
+            assert index.flush(directory).endswith(f"facet_segment_{offset // 300:05d}.npz")
+        assert index.flush(directory) is None
+
+        reloaded = FacetIndex.load(directory)
+        assert reloaded.doc_ids == index.doc_ids
+        for facet in facet_module.FACET_FIELDS:
+            assert reloaded.facet_counts(facet) == index.facet_counts(facet)
+        assert reloaded.cross_counts('region', 'topic') == index.cross_counts('region', 'topic')
+
+        # Appending after a reload continues the segment sequence
+        reloaded.add_batch(saved_documents(100, seed=9, start=900))
+        assert reloaded.flush(directory).endswith("facet_segment_00003.npz")
+        reloaded.compact(directory)
+        assert sorted(os.listdir(directory)) == ["facet_segment_00000.npz"]
+        assert FacetIndex.load(directory).count() == 1000
+
+
+def test_reindexed_title_supersedes_earlier_row():
+    """Indexing a processing_id again replaces its row in every query, also after a reload."""
+    documents = saved_documents(200)
+    index = FacetIndex()
+    index.add_batch(documents)
+    retried = dict(documents[5], extracted_elements={'extracted_regions': ["Atlantis"],
+                                                     'extracted_report_type': "Market Report",
+                                                     'extracted_forecast_date_range': "2030",
+                                                     'topicName': "topic-new"})
+    index.add_batch([retried])
+    current = documents[:5] + [retried] + documents[6:]
+
+    assert len(index) == 200 and index.summary()['superseded_rows'] == 1
+    assert index.count() == 200
+    assert index.drill_down(region="Atlantis") == [retried['processing_id']]
+    for region in REGIONS:
+        assert index.count(region=region) == len(brute_force(current, region=region))
+    assert sum(index.facet_counts('topic').values()) == 200
+    assert index.facet_counts('topic')['topic-new'] == 1
+    assert index.cross_counts('region', 'topic')['Atlantis'] == {'topic-new': 1}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index.flush(temp_dir)
+        reloaded = FacetIndex.load(temp_dir)
+        assert len(reloaded) == 200
+        assert reloaded.facet_counts('region') == index.facet_counts('region')
+
+
+def test_large_index_counts_are_fast():
+    """Faceted counts and drill-downs on 100k titles take milliseconds."""
+    index = FacetIndex()
+    documents = saved_documents(100000, seed=1)
+    for offset in range(0, len(documents), 10000):
+        index.add_batch(documents[offset:offset + 10000])
+    index.facet_counts('region')  # consolidate posting chunks once
+
+    start = time.perf_counter()
+    index.facet_counts('report_type', region="Europe")
+    index.cross_counts('region', 'report_type')
+    index.drill_down(limit=100, region="Japan", topic="topic-3")
+    elapsed = time.perf_counter() - start
+    assert elapsed < 0.1, f"{elapsed * 1000:.1f} ms"
+
+
+def test_orchestrator_persists_per_batch():
+    """enableFacetIndex makes processBatch add and persist every batch."""
+    from types import SimpleNamespace
+    import orchestrator_test_helpers
+
+    orchestrator = orchestrator_test_helpers.create_orchestrator(components={
+        'date_extractor': SimpleNamespace(
+            extract=lambda t: SimpleNamespace(extracted_date_range="2030", cleaned_title=t, confidence=1)),
+        'geographic_detector': SimpleNamespace(
+            extract_geographic_entities=lambda t: SimpleNamespace(extracted_regions=["Europe"], title=t,
+                                                                  confidence=1, notes="")),
+        'topic_extractor': SimpleNamespace(
+            extract=lambda o, t, e: SimpleNamespace(extracted_topic="Widgets", normalized_topic_name="widgets",
+                                                    confidence=1)),
+    })
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = os.path.join(temp_dir, "facet_index")
+        orchestrator.enableFacetIndex(directory)
+        orchestrator.processBatch(["Europe Widgets Market Report, 2030"] * 3, batch_id="b1")
+        orchestrator.processBatch(["Europe Widgets Market Report, 2030"] * 2, batch_id="b2")
+        assert len(os.listdir(directory)) == 2
+        assert orchestrator.facet_index.count(region="Europe", topic="widgets", date_range="2030") == 5
+        # A new run resumes from the persisted segments
+        reloaded = orchestrator.enableFacetIndex(directory)
+        assert reloaded.drill_down(limit=2) == ["b1_title_0000", "b1_title_0001"]
+        assert len(reloaded) == 5
+
+
+def test_deduplicated_rows_keyed_by_source_id():
+    """processDeduplicated indexes one row per source _id; a retried group supersedes all of them."""
+    from types import SimpleNamespace
+    import orchestrator_test_helpers
+
+    failures = {"Flaky Widget Market": 1}
+
+    def extract(title):
+        if failures.get(title):
+            failures[title] -= 1
+            raise RuntimeError("date pattern cache unavailable")
+        return SimpleNamespace(extracted_date_range="2030", cleaned_title=title, confidence=1)
+
+    orchestrator = orchestrator_test_helpers.create_orchestrator(
+        components={'date_extractor': SimpleNamespace(extract=extract)})
+    orchestrator.retry_backoff_seconds = 0
+    orchestrator.facet_index = FacetIndex()
+    source_documents = [
+        {'_id': 'raw_1', 'report_title_short': "Flaky Widget Market"},
+        {'_id': 'raw_2', 'report_title_short': "flaky widget  market"},
+        {'_id': 'raw_3', 'report_title_short': "Widget Market"},
+        {'_id': 'raw_4', 'report_title_short': "WIDGET MARKET"},
+        {'_id': 'raw_5', 'report_title_short': "Widget Market"},
+    ]
+    orchestrator.processDeduplicated(source_documents, "dedup_facets")
+    assert len(orchestrator.facet_index) == 5
+    assert orchestrator.facet_index.drill_down(date_range="2030") == ['raw_3', 'raw_4', 'raw_5']
+
+    orchestrator.processRetryQueue(collection_name=None)
+    assert len(orchestrator.facet_index) == 5
+    assert orchestrator.facet_index.count(date_range="2030") == 5
+    assert orchestrator.facet_index.facet_counts('topic') == {'widget': 5}
+
+
+if __name__ == "__main__":
+    print("Facet Index Tests")
+    print("=" * 50)
+
+    tests = [
+        test_counts_match_brute_force,
+        test_incremental_segments_reload_and_compact,
+        test_reindexed_title_supersedes_earlier_row,
+        test_large_index_counts_are_fast,
+        test_orchestrator_persists_per_batch,
+        test_deduplicated_rows_keyed_by_source_id,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
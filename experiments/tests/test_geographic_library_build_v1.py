@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+
+"""
+Test script for Geographic Library Builder v1
+Validates that the vectorized merge and conflict resolution reproduce
+merge_geographic_entities_v1.py on the resources files, and that the
+pattern_libraries diff only inserts new terms and adds missing aliases.
+"""
+
+import os
+import io
+import sys
+import logging
+import contextlib
+import importlib.util
+
+experiments_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+project_root = os.path.dirname(experiments_dir)
+
+
+def _load_utility(module_name: str, file_name: str):
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(experiments_dir, "utilities", file_name))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+builder_module = _load_utility("build_geographic_library", "build_geographic_library_v1.py")
+legacy_module = _load_utility("merge_geographic_entities", "merge_geographic_entities_v1.py")
+
+# Configure logging for tests
+logging.basicConfig(level=logging.WARNING)
+
+RESOURCES_DIR = os.path.join(project_root, "resources")
+
+
+def legacy_library() -> dict:
+    """Reference result: the loop-based merge and conflict resolution."""
+    regions = legacy_module.load_json_file(os.path.join(RESOURCES_DIR, "regions.json"))
+    candidates = legacy_module.load_json_file(os.path.join(RESOURCES_DIR, "region-candidates.json"))
+    with contextlib.redirect_stdout(io.StringIO()):
+        entities, _ = legacy_module.collect_all_entities(regions, candidates)
+        conflicts = legacy_module.detect_term_alias_conflicts(entities)
+        entities = legacy_module.resolve_conflicts(entities, conflicts)
+    return entities
+
+
+def test_matches_legacy_merge():
+    """Terms, types, sources, aliases (in order) and priorities match the legacy merger."""
+    expected = legacy_library()
+    build = builder_module.build_geographic_library(RESOURCES_DIR, include_mappings=False)
+    library = build['library']
+
+    assert list(library['norm_term']) == list(expected.keys())
+    for row in library.itertuples(index=False):
+        entity = expected[row.norm_term]
+        assert row.term == entity['term'], row.term
+        assert row.type == entity['type'], row.term
+        assert list(row.sources) == entity['sources'], row.term
+        assert list(row.aliases) == entity['aliases'], (row.term, row.aliases, entity['aliases'])
+        assert row.priority == legacy_module.get_priority_for_type(entity['type']), row.term
+
+
+def test_mapping_overlay():
+    """Mapping variants are cleaned and unioned; new standardized terms become entries."""
+    import pandas as pd
+    library = pd.DataFrame({'norm_term': ['north america'], 'term': ['North America'], 'type': ['multi_regional'],
+                            'term_order': [0], 'sources': [['regions.json']]})
+    aliases = pd.DataFrame({'norm_term': ['north america'], 'alias': ['NA'], 'norm_alias': ['na'],
+                            'term_order': [0], 'order': [0], 'position': [0]})
+    mappings = pd.DataFrame({
+        'standardized': ['North America', 'Middle East and Africa'],
+        'variants': [['North America', 'NA', 'N. America', 'NorthAmerica', 'North American'],
+                     ['MEA', 'M.E.A.', 'Middle East & Africa']]
+    })
+
+    library, aliases = builder_module.apply_mappings(library, aliases, mappings)
+    by_term = aliases.groupby('norm_term', sort=False)['alias'].agg(list)
+
+    assert by_term['north america'] == ['NA', 'North American']
+    assert by_term['middle east and africa'] == ['MEA', 'Middle East & Africa']
+    new_entry = library[library['norm_term'] == 'middle east and africa'].iloc[0]
+    assert new_entry['type'] == 'unknown' and new_entry['mapping_priority'] == 1
+
+
+def test_plan_library_diff():
+    """Existing documents gain only new aliases; aliases owned elsewhere are skipped."""
+    import pandas as pd
+    from pymongo import InsertOne, UpdateOne
+    library = pd.DataFrame({
+        'norm_term': ['france', 'georgia', 'new region'],
+        'term': ['France', 'Georgia', 'New Region'],
+        'type': ['country', 'us_state', 'sub_regional'],
+        'priority': [10, 9, 2],
+        'sources': [['regions.json'], ['regions.json'], ['candidates:test']],
+        'aliases': [['French Republic', 'FR'], ['GA'], ['NR', 'Gallia']]
+    })
+    existing = [
+        {'_id': 'a', 'term': 'France', 'aliases': ['FR'], 'entity_type': 'country', 'source_files': ['regions.json']},
+        {'_id': 'b', 'term': 'Georgia', 'aliases': ['GA'], 'entity_type': 'us_state', 'source_files': ['regions.json']},
+        {'_id': 'c', 'term': 'Gaul', 'aliases': ['Gallia'], 'source_files': []},
+    ]
+
+    diff = builder_module.plan_library_diff(library, existing, "2025-01-01 00:00:00 UTC")
+    operations = diff['operations']
+
+    assert [type(op) for op in operations] == [InsertOne, UpdateOne]
+    assert diff['inserts'] == [{'term': 'New Region', 'aliases': ['NR'], 'priority': 2}]
+    assert diff['updates'][0]['term'] == 'France'
+    assert diff['updates'][0]['added_aliases'] == ['French Republic']
+    assert diff['skipped_aliases'] == [{'norm_term': 'new region', 'alias': 'Gallia', 'owner': 'gaul'}]
+
+
+if __name__ == "__main__":
+    print("Geographic Library Builder Tests")
+    print("=" * 50)
+
+    tests = [
+        test_matches_legacy_merge,
+        test_mapping_overlay,
+        test_plan_library_diff,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the PhraseMatcher engine of Geographic Entity Detector v3
+Validates that the blank-pipeline PhraseMatcher engine returns the same regions,
+remaining title and confidence as the regex engine (priority, alias and hyphen
+rules and punctuation separators included), without a MongoDB connection or
+spaCy model, and that the orchestrator batches the stage through nlp.pipe.
+"""
+
+import os
+import sys
+import logging
+from types import SimpleNamespace
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+import orchestrator_test_helpers
+
+geographic_module = load_module("geographic_entity_detector")
+GeographicEntityDetector = geographic_module.GeographicEntityDetector
+
+# Configure logging for tests
+logging.basicConfig(level=logging.WARNING)
+
+PATTERNS = [
+    {'term': 'Middle East and Africa', 'aliases': ['MEA', 'Middle East & Africa'], 'priority': 1},
+    {'term': 'Asia Pacific', 'aliases': ['APAC', 'Asia-Pacific', 'AsiaPac'], 'priority': 1},
+    {'term': 'North America', 'aliases': [], 'priority': 1},
+    {'term': 'Latin America', 'aliases': ['LATAM'], 'priority': 1},
+    {'term': 'United States', 'aliases': ['U.S.', 'US', 'U.S', 'USA'], 'priority': 2},
+    {'term': 'Europe', 'aliases': ['European'], 'priority': 2},
+    {'term': 'Middle East', 'aliases': [], 'priority': 2},
+    {'term': 'Canada', 'aliases': [], 'priority': 3},
+    {'term': 'Mexico', 'aliases': [], 'priority': 3},
+    {'term': 'Delaware', 'aliases': ['DE'], 'priority': 4},
+    {'term': 'Colorado', 'aliases': ['CO'], 'priority': 4},
+    {'term': 'Inactive Region', 'aliases': [], 'priority': 1, 'active': False},
+]
+
+TITLES = [
+    "U.S. And Europe Digital Pathology",
+    "APAC Personal Protective Equipment",
+    "North America Europe Automotive Technology",
+    "Middle East & Africa Healthcare Systems",
+    "Asia Pacific and Latin America Energy Solutions",
+    "Europe, Middle East and Africa Financial Services",
+    "Global Semiconductor Manufacturing",
+    "United States Canada Mexico Trade",
+    "Latin America Plus Asia Pacific Services",
+    "De-identified Health Data In US",
+    "Co-operative Banking For Asia-Pacific",
+    "US-based Cloud Services in the USA",
+    "European Union (EU) Carbon Credits In Europe's Industry",
+    "Inactive Region Widgets",
+    "Japan&Europe Widget",
+    "Canada;Mexico Widget",
+    "Europe+Canada Widget",
+    "Widgets (Europe|Canada)",
+    "U.S.-Canada Trade",
+    "",
+]
+
+
+class FakePatternLibraryManager:
+    """Serves PATTERNS like PatternLibraryManager.get_patterns."""
+
+    def get_patterns(self, pattern_type, active_only: bool = True, use_cache: bool = True):
+        return [dict(pattern) for pattern in PATTERNS]
+
+
+def signature(result) -> tuple:
+    return (result.extracted_regions, result.title, result.confidence)
+
+
+def test_engines_agree():
+    """PhraseMatcher engine (single and batched) matches the regex engine title for title."""
+    regex_detector = GeographicEntityDetector(FakePatternLibraryManager())
+    phrase_detector = GeographicEntityDetector(FakePatternLibraryManager(), engine="phrase_matcher")
+
+    batched = phrase_detector.extract_geographic_entities_batch(TITLES, batch_size=4)
+    assert len(batched) == len(TITLES)
+    for title, batch_result in zip(TITLES, batched):
+        expected = signature(regex_detector.extract_geographic_entities(title))
+        assert signature(phrase_detector.extract_geographic_entities(title)) == expected, title
+        assert signature(batch_result) == expected, title
+
+
+def test_phrase_matcher_rules():
+    """Aliases resolve to the primary term and hyphenated fragments are skipped."""
+    detector = GeographicEntityDetector(FakePatternLibraryManager(), engine="phrase_matcher")
+
+    result = detector.extract_geographic_entities("APAC Personal Protective Equipment")
+    assert result.extracted_regions == ['Asia Pacific']
+    assert result.title == "Personal Protective Equipment"
+
+    result = detector.extract_geographic_entities("De-identified Health Data")
+    assert result.extracted_regions == []
+
+    result = detector.extract_geographic_entities("Inactive Region Widgets")
+    assert result.extracted_regions == []
+
+
+def test_orchestrator_batches_geographic_stage():
+    """processBatch sends a whole chunk through one nlp.pipe call with the same results as per-title processing."""
+    detector = GeographicEntityDetector(FakePatternLibraryManager(), engine="phrase_matcher")
+    batch_calls = []
+    detect_batch = detector.extract_geographic_entities_batch
+    detector.extract_geographic_entities_batch = lambda titles, **kwargs: batch_calls.append(len(titles)) or \
+        detect_batch(titles, **kwargs)
+    orchestrator = orchestrator_test_helpers.create_orchestrator(components={
+        'report_extractor': SimpleNamespace(
+            extract=lambda t, m: SimpleNamespace(extracted_report_type=None, title=t, confidence=1)),
+        'geographic_detector': detector,
+        'topic_extractor': SimpleNamespace(
+            extract=lambda o, t, e: SimpleNamespace(extracted_topic=t, normalized_topic_name=t, confidence=1)),
+    })
+
+    results = orchestrator.processBatch(TITLES, batch_id="geo")
+    assert batch_calls == [len(TITLES) - 1]  # the empty title fails before geographic detection
+    for title, result in zip(TITLES, results):
+        expected = orchestrator.processTitle(title, "geo", result.processing_id)
+        assert result.status == expected.status, title
+        assert result.extracted_elements == expected.extracted_elements, title
+        if title:
+            assert result.stage_timings['geographic_detection'] > 0
+    assert results[-1].status == orchestrator_test_helpers.orchestrator_module.ProcessingStatus.FAILED
+
+
+def test_unknown_engine():
+    """Unsupported engines fail loudly."""
+    try:
+        GeographicEntityDetector(FakePatternLibraryManager(), engine="fuzzy")
+    except ValueError:
+        return
+    raise AssertionError("Expected ValueError for unknown engine")
+
+
+if __name__ == "__main__":
+    print("Geographic PhraseMatcher Engine Tests")
+    print("=" * 50)
+
+    tests = [
+        test_engines_agree,
+        test_phrase_matcher_rules,
+        test_orchestrator_batches_geographic_stage,
+        test_unknown_engine,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
@@ -35,7 +35,11 @@ create_output_file_header = _output_module.create_output_file_header
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from dotenv import load_dotenv
-from pymongo import MongoClient
+
+# Same connection manager module (and client registry) the extractors get from load_module
+sys.path.insert(0, os.path.dirname(experiments_dir))
+from experiments import load_module
+get_database = load_module("mongodb_connection_manager").get_database
 
 load_dotenv()
 
@@ -126,9 +130,8 @@ def test_full_pipeline(test_quantity: int = 9):
     geo_detector = script04.GeographicEntityDetector(pattern_lib_manager)
     topic_extractor = script05.TopicExtractor(pattern_lib_manager)  # DATABASE-FIRST Script 05
 
-    # Query real database titles for testing
-    client = MongoClient(os.getenv('MONGODB_URI'))
-    db = client['deathstar']
+    # Query real database titles for testing (shared client from the connection manager)
+    db = get_database()
 
     # Get sample titles from database - using correct field name 'report_title_short'
     sample_size = max(test_quantity + 5, 20)  # Get a few extra to ensure we have enough
@@ -147,8 +150,6 @@ def test_full_pipeline(test_quantity: int = 9):
     for i, title in enumerate(test_cases, 1):
         logger.info(f"  {i}. {title}")
 
-    client.close()  # Close the direct MongoDB connection
-
     results = []
     timestamp = get_timestamp()
 
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+
+"""
+Test script for HTML Description Cleaner v1.0
+Validates body/table separation of the single-pass cleaner and the
+content-hash keyed on-disk cache.
+"""
+
+import os
+import sys
+import logging
+import tempfile
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+
+cleaner_module = load_module("html_description_cleaner")
+clean_description_html = cleaner_module.clean_description_html
+CleanedDescriptionCache = cleaner_module.CleanedDescriptionCache
+
+# Configure logging for tests
+logging.basicConfig(level=logging.WARNING)
+
+SAMPLE_HTML = (
+    "<div><h2>Regional Outlook</h2>"
+    "<p>North America &amp; Europe lead demand.<!-- editor note --></p>"
+    "<script>var region = 'Hidden';</script>"
+    "<table><thead><tr><th>Region</th><th>Share</th></tr></thead>"
+    "<tbody><tr><td>Asia Pacific</td><td>34%</td></tr><tr><td>-</td></tr></tbody></table>"
+    "<ul><li>Latin America</li><li>Middle <b>East</b> &amp; Africa</li></ul></div>"
+)
+
+
+def test_body_and_table_text():
+    """Tables leave the body; each row becomes one ' | '-joined entry."""
+    result = clean_description_html(SAMPLE_HTML)
+
+    assert result['body_text'] == ("Regional Outlook ; North America & Europe lead demand. ; "
+                                   "Latin America ; Middle ; East ; & Africa"), result['body_text']
+    assert result['table_text'] == "Region | Share ; Asia Pacific | 34%", result['table_text']
+    assert result['combined_text'] == f"{result['body_text']} ; {result['table_text']}"
+    assert 'Hidden' not in result['combined_text']
+    assert 'editor note' not in result['combined_text']
+
+
+def test_nested_tables_and_plain_text():
+    """Nested table rows are emitted separately; untagged text is kept as body."""
+    nested = ("<table><tr><td>Outer Region<table><tr><td>Inner Region</td></tr></table></td></tr></table>")
+    result = clean_description_html(nested)
+    assert result['table_text'] == "Inner Region ; Outer Region", result['table_text']
+    assert result['body_text'] == ""
+
+    result = clean_description_html("Plain description for Germany")
+    assert result['body_text'] == "Plain description for Germany"
+    assert result['table_text'] == ""
+
+
+def test_empty_and_fallback():
+    """Empty input is empty; unparseable markup falls back to the regex strip."""
+    assert clean_description_html("") == {"body_text": "", "table_text": "", "combined_text": ""}
+
+    result = clean_description_html("<!-- only a comment -->")
+    assert result['table_text'] == ""
+    assert 'body_text' in result and 'combined_text' in result
+
+
+def test_cache_round_trip():
+    """Second lookup of the same content is served from disk by content hash."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = CleanedDescriptionCache(cache_dir=temp_dir)
+        first = cache.clean(SAMPLE_HTML)
+        second = cache.clean(SAMPLE_HTML)
+        assert first == second
+        assert cache.hits == 1 and cache.misses == 1
+
+        # A fresh instance (next run) reuses the stored entry
+        next_run = CleanedDescriptionCache(cache_dir=temp_dir)
+        assert next_run.clean(SAMPLE_HTML) == first
+        assert next_run.get_statistics()['hit_rate'] == 1.0
+
+        # Different content never collides
+        assert next_run.get(SAMPLE_HTML + " ") is None
+        assert CleanedDescriptionCache.content_key(SAMPLE_HTML) != \
+            CleanedDescriptionCache.content_key(SAMPLE_HTML + " ")
+
+
+if __name__ == "__main__":
+    print("HTML Description Cleaner Tests")
+    print("=" * 50)
+
+    tests = [
+        test_body_and_table_text,
+        test_nested_tables_and_plain_text,
+        test_empty_and_fallback,
+        test_cache_round_trip,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
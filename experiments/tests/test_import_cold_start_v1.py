@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+
+"""
+Test script for pipeline module cold-start budget
+Imports each pipeline module in a fresh interpreter and checks import time,
+that heavy optional dependencies stay unloaded and that importing a module
+does not configure logging. Run directly for a timing table.
+
+Budget defaults to 1.0s per module (override with COLD_START_BUDGET_SECONDS).
+"""
+
+import os
+import sys
+import json
+import subprocess
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+import experiments
+
+COLD_START_BUDGET_SECONDS = float(os.getenv('COLD_START_BUDGET_SECONDS', '1.0'))
+
+# Modules a worker process or CLI needs before processing its first title
+BUDGETED_MODULES = [
+    'market_term_classifier',
+    'date_extractor',
+    'report_type_extractor',
+    'geographic_entity_detector',
+    'topic_extractor',
+    'confidence_tracker',
+    'pipeline_orchestrator',
+    'pattern_discovery',
+]
+
+# Must only be imported by the code paths that use them
+HEAVY_DEPENDENCIES = ['spacy', 'pandas', 'bs4']
+
+_PROBE = """
+import json, logging, sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import experiments.{alias}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    'seconds': elapsed,
+    'heavy_loaded': [name for name in {heavy!r} if name in sys.modules],
+    'root_handlers': len(logging.getLogger().handlers)
+}}))
+"""
+
+
+def measure_cold_start(alias: str) -> dict:
+    """Import one pipeline module in a fresh interpreter and report its cost."""
+    probe = _PROBE.format(root=project_root, alias=alias, heavy=HEAVY_DEPENDENCIES)
+    completed = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True, cwd=project_root)
+    if completed.returncode != 0:
+        raise RuntimeError(f"Import of {alias} failed:\n{completed.stderr}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def test_cold_start_budget():
+    """Every pipeline module imports within budget without heavy deps or logging setup."""
+    for alias in BUDGETED_MODULES:
+        result = measure_cold_start(alias)
+        assert result['seconds'] < COLD_START_BUDGET_SECONDS, \
+            f"{alias} took {result['seconds']:.3f}s (budget {COLD_START_BUDGET_SECONDS}s)"
+        assert not result['heavy_loaded'], f"{alias} imported {result['heavy_loaded']} at import time"
+        assert result['root_handlers'] == 0, f"{alias} configured logging at import time"
+
+
+def test_modules_loaded_once():
+    """Stages share one cached copy of their dependencies."""
+    classifier_module = experiments.load_module("market_term_classifier")
+    date_module = experiments.load_module("02_date_extractor_v1.py")
+
+    assert classifier_module.pattern_module is date_module.pattern_module
+    assert classifier_module.pattern_module is experiments.pattern_library_manager
+    assert sys.modules['experiments.date_extractor'] is date_module
+
+
+def test_unknown_module():
+    """Unknown aliases fail loudly."""
+    try:
+        experiments.load_module("not_a_stage")
+    except ValueError:
+        return
+    raise AssertionError("Expected ValueError for unknown module")
+
+
+if __name__ == "__main__":
+    print("Pipeline Module Cold-Start Budget")
+    print("=" * 50)
+    print(f"Budget: {COLD_START_BUDGET_SECONDS:.2f}s per module\n")
+
+    failures = 0
+    for alias in BUDGETED_MODULES:
+        try:
+            result = measure_cold_start(alias)
+        except RuntimeError as e:
+            failures += 1
+            print(f"❌ {alias}: {e}")
+            continue
+        within_budget = result['seconds'] < COLD_START_BUDGET_SECONDS and not result['heavy_loaded']
+        failures += 0 if within_budget else 1
+        heavy = f"  heavy: {', '.join(result['heavy_loaded'])}" if result['heavy_loaded'] else ""
+        print(f"{'✅' if within_budget else '❌'} {alias:<28} {result['seconds'] * 1000:8.1f} ms{heavy}")
+
+    print(f"\n{len(BUDGETED_MODULES) - failures}/{len(BUDGETED_MODULES)} modules within budget")
+    sys.exit(1 if failures else 0)
@@ -10,12 +10,16 @@ from datetime import datetime
 import pytz
 import json
 from typing import List, Dict
-from pymongo import MongoClient
 import random
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Shared MongoDB client (the connection factory every component uses)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from experiments import load_module
+get_mongo_client = load_module("mongodb_connection_manager").get_mongo_client
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -73,7 +77,7 @@ def test_250_documents():
     report_extractor = script03.PureDictionaryReportTypeExtractor(pattern_lib_manager)
 
     # Connect to MongoDB to fetch test documents
-    client = MongoClient(os.getenv('MONGODB_URI'))
+    client = get_mongo_client(os.getenv('MONGODB_URI'))
     db = client['deathstar']
     collection = db['markets_raw']
 
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+"""
+Test Suite for MongoDB Connection Manager v1.0
+Validates process-wide client reuse, environment settings, projections and
+fork-safe client re-creation using a mocked MongoClient.
+"""
+
+import os
+import sys
+import unittest
+from unittest.mock import Mock, patch
+
+# Import MongoDB Connection Manager using importlib
+import importlib.util
+experiments_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location("mongodb_connection_manager",
+                                              os.path.join(experiments_dir, "00e_mongodb_connection_manager_v1.py"))
+connection_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(connection_module)
+
+MongoConnectionSettings = connection_module.MongoConnectionSettings
+
+
+class TestMongoConnectionManager(unittest.TestCase):
+    """Test suite for the shared MongoDB connection factory."""
+
+    def setUp(self):
+        """Start every test with an empty client registry."""
+        connection_module._reset_after_fork()
+
+    def test_client_reused_for_same_uri(self):
+        """Repeated lookups share one client and one handshake."""
+        with patch('pymongo.MongoClient') as mock_client:
+            mock_client.return_value = Mock()
+
+            first = connection_module.get_mongo_client("mongodb://test")
+            second = connection_module.get_mongo_client("mongodb://test")
+
+            self.assertIs(first, second)
+            mock_client.assert_called_once()
+            first.admin.command.assert_called_once_with('ping')
+
+    def test_client_options_applied(self):
+        """Pool size and compression settings are passed to MongoClient."""
+        settings = MongoConnectionSettings(max_pool_size=8, compressors="zlib")
+
+        with patch('pymongo.MongoClient') as mock_client:
+            connection_module.get_mongo_client("mongodb://test", settings=settings)
+
+            kwargs = mock_client.call_args[1]
+            self.assertEqual(kwargs['maxPoolSize'], 8)
+            self.assertEqual(kwargs['compressors'], "zlib")
+
+    def test_new_client_after_fork(self):
+        """A child process never reuses the parent's client."""
+        with patch('pymongo.MongoClient') as mock_client:
+            mock_client.side_effect = [Mock(), Mock()]
+
+            parent_client = connection_module.get_mongo_client("mongodb://test")
+            with patch.object(connection_module, '_clients_pid', -1):
+                child_client = connection_module.get_mongo_client("mongodb://test")
+
+            self.assertIsNot(parent_client, child_client)
+            self.assertEqual(mock_client.call_count, 2)
+
+    def test_settings_from_env(self):
+        """MONGODB_* variables override defaults."""
+        env = {'MONGODB_MAX_POOL_SIZE': '200', 'MONGODB_BATCH_SIZE': '5000', 'MONGODB_COMPRESSORS': 'zlib'}
+        with patch.dict(os.environ, env):
+            settings = MongoConnectionSettings.from_env()
+
+        self.assertEqual(settings.max_pool_size, 200)
+        self.assertEqual(settings.batch_size, 5000)
+        self.assertEqual(settings.compressors, 'zlib')
+
+    def test_find_projected(self):
+        """Named projections and batch size are applied to the cursor."""
+        collection = Mock()
+
+        connection_module.find_projected(collection, {'active': True}, projection='title', batch_size=250)
+
+        collection.find.assert_called_once_with({'active': True}, {'report_title_short': 1})
+        collection.find.return_value.batch_size.assert_called_once_with(250)
+
+    def test_resolve_projection(self):
+        """Projection argument forms normalize to a pymongo projection dict."""
+        self.assertIsNone(connection_module.resolve_projection(None))
+        self.assertEqual(connection_module.resolve_projection(['term', 'aliases']), {'term': 1, 'aliases': 1})
+        with self.assertRaises(ValueError):
+            connection_module.resolve_projection('unknown_projection')
+
+    def test_get_patterns_uses_pattern_projection(self):
+        """PatternLibraryManager.get_patterns reads only the shared 'pattern' projection fields."""
+        sys.path.insert(0, os.path.dirname(experiments_dir))
+        from experiments import load_module
+        pattern_module = load_module("pattern_library_manager")
+
+        with patch.object(pattern_module.PatternLibraryManager, '_connect'):
+            manager = pattern_module.PatternLibraryManager("mongodb://test", lint_patterns=False)
+        manager.collection = Mock()
+        manager.collection.find.return_value.sort.return_value = [{'_id': 1, 'term': 'Europe'}]
+
+        patterns = manager.get_patterns(pattern_module.PatternType.GEOGRAPHIC_ENTITY, use_cache=False)
+        self.assertEqual(patterns, [{'_id': 1, 'term': 'Europe'}])
+        query, projection = manager.collection.find.call_args.args
+        self.assertEqual(query, {'type': 'geographic_entity', 'active': True})
+        self.assertEqual(projection, connection_module.PROJECTIONS['pattern'])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the bulk pattern consolidation executor (Issue #17 Phase 2)
+Validates planning order, the JSONL rollback file, ordered bulk_write batches
+and rollback against an in-memory collection.
+"""
+
+import os
+import sys
+import logging
+import tempfile
+import importlib.util
+from datetime import datetime
+
+from bson import ObjectId
+from pymongo import DeleteOne, UpdateOne, ReplaceOne
+from pymongo.errors import BulkWriteError
+from pymongo.results import BulkWriteResult
+
+experiments_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location(
+    "pattern_consolidation_executor",
+    os.path.join(experiments_dir, "analysis", "pattern_consolidation_executor_issue17_phase2.py"))
+executor_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(executor_module)
+
+# Configure logging for tests
+logging.basicConfig(level=logging.WARNING)
+
+IDS = [ObjectId() for _ in range(6)]
+
+
+class FakeCollection:
+    """In-memory stand-in for find({_id: {$in}}) and bulk_write."""
+
+    def __init__(self, documents):
+        self.documents = {doc["_id"]: dict(doc) for doc in documents}
+        self.bulk_calls = []
+
+    def find(self, query, batch_size=None):
+        wanted = query.get("_id", {}).get("$in")
+        return [dict(doc) for doc_id, doc in self.documents.items() if wanted is None or doc_id in wanted]
+
+    def bulk_write(self, requests, ordered=True, session=None):
+        self.bulk_calls.append(len(requests))
+        removed = modified = matched = upserted = 0
+        for request in requests:
+            doc_id = request._filter["_id"]
+            if isinstance(request, DeleteOne):
+                removed += int(self.documents.pop(doc_id, None) is not None)
+            elif isinstance(request, UpdateOne):
+                if doc_id in self.documents:
+                    self.documents[doc_id].update(request._doc["$set"])
+                    modified += 1
+            elif isinstance(request, ReplaceOne):
+                matched += int(doc_id in self.documents)
+                upserted += int(doc_id not in self.documents)
+                self.documents[doc_id] = dict(request._doc)
+        return BulkWriteResult({"nRemoved": removed, "nModified": modified, "nMatched": matched,
+                                "nUpserted": upserted, "upserted": [{}] * upserted}, True)
+
+
+def pattern_doc(index: int, priority: int, created: str) -> dict:
+    return {"_id": IDS[index], "type": "report_type", "term": f"Term {index}", "pattern": "p",
+            "priority": priority, "created_date": created, "active": index % 2 == 0}
+
+
+def plan_entry(index: int, priority: int, created: str) -> dict:
+    return {"id": str(IDS[index]), "term": f"Term {index}", "priority": priority, "created_date": created}
+
+
+CONSOLIDATION_PLAN = {
+    "summary": {"total_duplicates": 2},
+    "actions": {
+        "C_REMOVE": [{"pattern": "\\bMarket Report\\b",
+                      "documents": [plan_entry(1, 2, "2025-02-01"), plan_entry(0, 2, "2025-01-01")]}],
+        "B_CONSOLIDATE": [{"pattern": "\\bMarket Analysis\\b", "unique_priorities": [3, 1],
+                           "documents": [plan_entry(2, 3, "2025-01-01"), plan_entry(3, 1, "2025-03-01"),
+                                         plan_entry(4, 1, "2025-02-01")]}]
+    }
+}
+ORIGINAL_DOCS = [pattern_doc(0, 2, "2025-01-01"), pattern_doc(1, 2, "2025-02-01"), pattern_doc(2, 3, "2025-01-01"),
+                 pattern_doc(3, 1, "2025-03-01"), pattern_doc(4, 1, "2025-02-01"), pattern_doc(5, 1, "2025-01-01")]
+
+
+def test_plan_order():
+    """C removals keep the oldest; B keeps the oldest lowest priority and updates it before deletes."""
+    operations = executor_module.plan_consolidation(CONSOLIDATION_PLAN, timestamp=datetime(2025, 1, 1))
+    assert [(op["category"], op["op"], op["id"]) for op in operations] == [
+        ("C", "delete", str(IDS[1])),
+        ("B", "update", str(IDS[4])),
+        ("B", "delete", str(IDS[2])),
+        ("B", "delete", str(IDS[3])),
+    ]
+    assert operations[1]["set"]["priority"] == 1 and operations[1]["set"]["active"] is True
+
+
+def test_apply_and_rollback():
+    """Batches apply in order; the rollback file restores the touched documents exactly."""
+    collection = FakeCollection(ORIGINAL_DOCS)
+    operations = executor_module.plan_consolidation(CONSOLIDATION_PLAN)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        rollback_file = os.path.join(temp_dir, "rollback.jsonl")
+        info = executor_module.write_rollback_file(collection, operations, rollback_file, batch_size=2)
+        assert info == {"documents_saved": 4, "missing_ids": []}
+
+        applied = executor_module.apply_consolidation(collection, operations, batch_size=3)
+        assert collection.bulk_calls == [3, 1]
+        assert applied["errors"] == []
+        assert applied["deleted_by_category"] == {"C": 1, "B": 2}
+        assert set(collection.documents) == {IDS[0], IDS[4], IDS[5]}
+        assert collection.documents[IDS[4]]["notes"].startswith("Consolidated from 3")
+
+        restored = executor_module.rollback_consolidation(collection, rollback_file, batch_size=3)
+        assert restored == 4
+        assert collection.documents == {doc["_id"]: doc for doc in ORIGINAL_DOCS}
+
+
+def test_missing_documents_reported():
+    """Planned ids that no longer exist are reported per category."""
+    collection = FakeCollection([doc for doc in ORIGINAL_DOCS if doc["_id"] != IDS[3]])
+    operations = executor_module.plan_consolidation(CONSOLIDATION_PLAN)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        info = executor_module.write_rollback_file(collection, operations, os.path.join(temp_dir, "rollback.jsonl"))
+    assert info["missing_ids"] == [str(IDS[3])]
+
+    remaining = [op for op in operations if op["id"] not in info["missing_ids"]]
+    applied = executor_module.apply_consolidation(collection, remaining)
+    summary = executor_module.summarize_category_results(operations, applied, info["missing_ids"])
+    assert summary["C"] == {"patterns_processed": 1, "documents_removed": 1, "errors": []}
+    assert summary["B"]["documents_consolidated"] == 1
+    assert summary["B"]["errors"] == [f"Failed to remove document {IDS[3]}"]
+
+
+class FailingCollection(FakeCollection):
+    """Ordered bulk_write that executes the requests before fail_index, then rejects that one."""
+
+    def __init__(self, documents, fail_index=0):
+        super().__init__(documents)
+        self.fail_index = fail_index
+
+    def bulk_write(self, requests, ordered=True, session=None):
+        executed = super().bulk_write(requests[:self.fail_index], ordered, session).bulk_api_result
+        self.bulk_calls[-1] = len(requests)
+        raise BulkWriteError({"writeErrors": [{"index": self.fail_index, "errmsg": "rejected"}],
+                              "nRemoved": executed["nRemoved"], "nModified": executed["nModified"]})
+
+
+def test_bulk_error_aborts_transaction():
+    """Inside a transaction the BulkWriteError propagates; without one it is recorded and stops."""
+    operations = executor_module.plan_consolidation(CONSOLIDATION_PLAN)
+
+    applied = executor_module.apply_consolidation(FailingCollection(ORIGINAL_DOCS), operations, batch_size=2)
+    assert applied["batches"] == 1
+    assert applied["errors"][0] == f"Failed to delete document {IDS[1]}: rejected"
+
+    collection = FailingCollection(ORIGINAL_DOCS)
+    try:
+        executor_module.apply_consolidation(collection, operations, batch_size=2, session=object())
+        raised = False
+    except BulkWriteError:
+        raised = True
+    assert raised, "with_transaction must see the failure to abort"
+    assert collection.bulk_calls == [2]
+
+
+def test_partial_batch_deletes_credited():
+    """Deletes executed ahead of the first write error count toward their category."""
+    operations = executor_module.plan_consolidation(CONSOLIDATION_PLAN)
+    collection = FailingCollection(ORIGINAL_DOCS, fail_index=3)
+
+    applied = executor_module.apply_consolidation(collection, operations, batch_size=4)
+    assert applied["documents_deleted"] == 2
+    assert applied["deleted_by_category"] == {"C": 1, "B": 1}
+    assert applied["errors"] == [f"Failed to delete document {IDS[3]}: rejected"]
+    assert IDS[3] in collection.documents and IDS[2] not in collection.documents
+
+
+if __name__ == "__main__":
+    print("Pattern Consolidation Bulk Executor Tests")
+    print("=" * 50)
+
+    tests = [
+        test_plan_order,
+        test_apply_and_rollback,
+        test_missing_documents_reported,
+        test_bulk_error_aborts_transaction,
+        test_partial_batch_deletes_credited,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
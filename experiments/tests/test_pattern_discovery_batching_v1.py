@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+
+"""
+Test script for batched pattern discovery NER
+Validates that streaming nlp.pipe counting (in-process and across worker
+processes) matches per-document extraction, using a blank spaCy pipeline with
+an entity ruler in place of the en_core_web_* models, and that indexed
+classification matches the original substring scan.
+"""
+
+import os
+import sys
+import logging
+import tempfile
+from collections import Counter
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+
+from experiments import load_module
+
+discovery_module = load_module("pattern_discovery")
+
+# Configure logging for tests
+logging.basicConfig(level=logging.WARNING)
+
+TEXTS = [
+    "Demand in Europe and Asia Pacific is rising ; Europe leads adoption",
+    "North America accounts for the largest share of the market",
+    "short",
+    "Asia Pacific ; Latin America ; Middle East and Africa ; Europe",
+] * 5
+
+
+def build_test_model(path: str) -> str:
+    """Save a blank English pipeline whose entity ruler tags a few regions."""
+    import spacy
+    nlp = spacy.blank("en")
+    ruler = nlp.add_pipe("entity_ruler")
+    ruler.add_patterns([
+        {"label": "LOC", "pattern": region}
+        for region in ["Europe", "Asia Pacific", "North America", "Latin America", "Middle East and Africa"]
+    ] + [{"label": "ORG", "pattern": "market"}])
+    nlp.to_disk(path)
+    return path
+
+
+def expected_counts(nlp) -> Counter:
+    """Reference result: the original per-document extraction."""
+    counts = Counter()
+    for text in TEXTS:
+        result = discovery_module.extract_geographic_entities_with_context(nlp, text, 'description')
+        counts.update(result['entity_counts'])
+    return counts
+
+
+def test_streaming_matches_per_document():
+    """In-process nlp.pipe batching yields the same counts as one nlp() call per text."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model_path = build_test_model(os.path.join(temp_dir, "regions"))
+        nlp = discovery_module.load_ner_model(model_path)
+
+        totals = discovery_module.count_entities_streaming(iter(TEXTS), {model_path: nlp},
+                                                           batch_size=4, n_process=1, chunk_size=3)
+
+        assert totals[model_path] == expected_counts(nlp)
+        assert totals[model_path]['Europe'] == 15
+
+
+def test_worker_processes_merge_counters():
+    """Counters from worker processes merge to the single-process result."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        model_path = build_test_model(os.path.join(temp_dir, "regions"))
+        nlp = discovery_module.load_ner_model(model_path)
+
+        totals = discovery_module.count_entities_streaming(iter(TEXTS), [model_path],
+                                                           batch_size=2, n_process=2, chunk_size=3)
+
+        assert totals[model_path] == expected_counts(nlp)
+
+
+def test_clean_description():
+    """Plain descriptions are unescaped and stripped of tags; empty documents are skipped."""
+    text, from_html = discovery_module.clean_description({'report_description_full': "A&amp;B <b>Europe</b>"})
+    assert text == "A&B ; Europe ; "
+    assert from_html is False
+    assert discovery_module.clean_description({}) == ("", False)
+
+
+def naive_classification(discovered_entities, existing_patterns, existing_terms) -> dict:
+    """Reference result: the original nested substring scan."""
+    classification = {'existing_patterns': [], 'potential_aliases': [], 'other': []}
+    for entity in discovered_entities:
+        entity_lower = entity.lower()
+        if entity_lower in existing_terms:
+            classification['existing_patterns'].append(entity)
+        elif any(entity_lower in existing_pattern['term'].lower() or
+                 any(entity_lower in alias.lower() for alias in existing_pattern['aliases'])
+                 for existing_pattern in existing_patterns.values()):
+            classification['potential_aliases'].append(entity)
+        else:
+            classification['other'].append(entity)
+    return classification
+
+
+def test_indexed_classification_matches_scan():
+    """The n-gram index classifies exactly like scanning every term and alias."""
+    import random
+    rng = random.Random(7)
+
+    existing_patterns = {
+        'north america': {'term': 'North America', 'aliases': ['NA', 'N. America']},
+        'asia pacific': {'term': 'Asia Pacific', 'aliases': ['APAC', 'Asia-Pacific', 'AsiaPac']},
+        'middle east and africa': {'term': 'Middle East and Africa', 'aliases': ['MEA', 'ME&A']},
+        'u.s.': {'term': 'U.S.', 'aliases': ['USA', 'United States', 'US']},
+    }
+    existing_terms = set(existing_patterns)
+    for pattern in existing_patterns.values():
+        existing_terms.update(alias.lower() for alias in pattern['aliases'])
+
+    # Exact hits, short and long substrings, near misses and random noise
+    entities = ['APAC', 'America', 'Pac', 'ac', 'S', '', 'Middle East', 'East and', 'ME&', 'A.', 'Nordics',
+                'Asia Pacific Region', 'United', 'states', 'Eas tand', 'ia-P']
+    alphabet = 'aceinrstuAPSM .&-'
+    entities += [''.join(rng.choice(alphabet) for _ in range(rng.randint(1, 6))) for _ in range(500)]
+    discovered = {entity: rng.randint(1, 12) for entity in entities}
+
+    expected = naive_classification(discovered, existing_patterns, existing_terms)
+    result = discovery_module.classify_potential_patterns(discovered, existing_patterns, existing_terms)
+
+    assert [item['entity'] for item in result['existing_patterns']] == expected['existing_patterns']
+    assert [item['entity'] for item in result['potential_aliases']] == expected['potential_aliases']
+    assert sorted(item['entity'] for item in result['new_terms'] + result['noise_candidates']) == \
+        sorted(expected['other'])
+    assert 'America' in expected['potential_aliases'] and 'Nordics' in expected['other']
+
+    empty_index = discovery_module.PatternSubstringIndex({})
+    assert not empty_index.contains_substring('') and not empty_index.contains_substring('Europe')
+
+
+if __name__ == "__main__":
+    print("Pattern Discovery Batching Tests")
+    print("=" * 50)
+
+    tests = [
+        test_streaming_matches_per_document,
+        test_worker_processes_merge_counters,
+        test_clean_description,
+        test_indexed_classification_matches_scan,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
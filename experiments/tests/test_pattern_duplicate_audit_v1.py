@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the Pattern Library Manager duplicate audit
+Validates the server-side grouping pipeline, the client-side near-duplicate
+pass and the single-term check used on pattern changes, without MongoDB.
+"""
+
+import os
+import re
+import sys
+import logging
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+
+pattern_module = load_module("pattern_library_manager")
+PatternLibraryManager = pattern_module.PatternLibraryManager
+PatternType = pattern_module.PatternType
+
+# Configure logging for tests
+logging.basicConfig(level=logging.WARNING)
+
+
+def server_group(pattern_type, subtype, term, ids, terms):
+    return {"_id": {"type": pattern_type, "subtype": subtype, "term": term},
+            "count": len(ids), "ids": ids, "terms": terms}
+
+
+class FakeCollection:
+    """Evaluates the find_term_duplicates query ($regex with 'i') over in-memory documents."""
+
+    def __init__(self, documents):
+        self.documents = documents
+
+    def find(self, query, projection=None):
+        term_regex = re.compile(query["term"]["$regex"], re.IGNORECASE)
+        return [doc for doc in self.documents
+                if doc["type"] == query["type"] and term_regex.search(doc["term"])]
+
+
+def test_pipeline_shape():
+    """Grouping key is type, subtype fallback chain and trimmed lowercase term; only IDs are pushed."""
+    pipeline = pattern_module.duplicate_group_pipeline({"type": "report_type"})
+    assert pipeline[0] == {"$match": {"type": "report_type"}}
+    group = pipeline[2]["$group"]
+    assert group["_id"]["term"] == {"$trim": {"input": {"$toLower": {"$ifNull": ["$term", ""]}}}}
+    assert group["_id"]["subtype"] == {"$ifNull": ["$format_type", {"$ifNull": ["$entity_type",
+                                                    {"$ifNull": ["$processing_type", None]}]}]}
+    assert group["ids"] == {"$push": "$_id"}
+
+    pipeline = pattern_module.duplicate_group_pipeline(group_by_subtype=False)
+    assert "subtype" not in pipeline[1]["$group"]["_id"]
+
+
+def test_exact_and_near_duplicates():
+    """Same normalized term is exact; punctuation/spacing/& variants are near duplicates."""
+    groups = [
+        server_group("report_type", "terminal", "market report", [1, 2], ["Market Report", "market report"]),
+        server_group("report_type", "terminal", "market-report", [3], ["Market-Report"]),
+        server_group("report_type", "embedded", "market report", [4], ["Market Report"]),
+        server_group("geographic_entity", "country", "trinidad & tobago", [5], ["Trinidad & Tobago"]),
+        server_group("geographic_entity", "country", "trinidad and tobago", [6], ["Trinidad and Tobago"]),
+        server_group("geographic_entity", "country", "tobago", [7], ["Tobago"]),
+    ]
+    audit = pattern_module.merge_duplicate_groups(groups)
+
+    assert [group["ids"] for group in audit["exact_duplicates"]] == [[1, 2]]
+    assert [(group["canonical_term"], group["ids"]) for group in audit["near_duplicates"]] == [
+        ("market report", [1, 2, 3]),
+        ("trinidad and tobago", [5, 6]),
+    ]
+    assert [group["ids"] for group in audit["duplicate_groups"]] == [[1, 2, 3], [5, 6]]
+    assert audit["total_duplicate_terms"] == 2
+    assert audit["total_duplicate_documents"] == 5
+
+
+def test_term_duplicates_for_change():
+    """Single-term check finds case, spacing and punctuation variants of the same type only."""
+    manager = object.__new__(PatternLibraryManager)
+    manager.collection = FakeCollection([
+        {"_id": 1, "type": "report_type", "term": "Market Size Report"},
+        {"_id": 2, "type": "report_type", "term": "market  size-report "},
+        {"_id": 3, "type": "report_type", "term": "Market Size Reports"},
+        {"_id": 4, "type": "geographic_entity", "term": "Market Size Report"},
+        {"_id": 5, "type": "report_type", "term": "Oil & Gas"},
+    ])
+
+    duplicates = manager.find_term_duplicates(PatternType.REPORT_TYPE, "MARKET SIZE REPORT")
+    assert [doc["_id"] for doc in duplicates] == [1, 2]
+    assert [doc["_id"] for doc in manager.find_term_duplicates(PatternType.REPORT_TYPE, "Oil and Gas")] == [5]
+    assert manager.find_term_duplicates(PatternType.REPORT_TYPE, " - ") == []
+
+
+if __name__ == "__main__":
+    print("Pattern Duplicate Audit Tests")
+    print("=" * 50)
+
+    tests = [
+        test_pipeline_shape,
+        test_exact_and_near_duplicates,
+        test_term_duplicates_for_change,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
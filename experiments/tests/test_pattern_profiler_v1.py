@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+
+"""
+Test script for Pattern Profiler v1.0
+Validates per-pattern evaluation/match/time counters, the ranked report (hits,
+dead and expensive patterns), extractor hooks and the bulk profile update
+operations, without MongoDB.
+"""
+
+import os
+import sys
+import json
+import logging
+import tempfile
+
+from bson import ObjectId
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+
+profiler_module = load_module("pattern_profiler")
+PatternProfiler = profiler_module.PatternProfiler
+GeographicEntityDetector = load_module("geographic_entity_detector").GeographicEntityDetector
+
+# Configure logging for tests
+logging.basicConfig(level=logging.ERROR)
+
+EUROPE_ID, ASIA_ID, AFRICA_ID = ObjectId(), ObjectId(), ObjectId()
+
+
+class FakePatternSource:
+    """Serves geographic_entity documents the way PatternLibraryManager.get_patterns does."""
+
+    def get_patterns(self, pattern_type, active_only: bool = True, use_cache: bool = True):
+        return [
+            {'_id': EUROPE_ID, 'term': 'Europe', 'aliases': ['European'], 'priority': 1, 'active': True},
+            {'_id': ASIA_ID, 'term': 'Asia', 'aliases': [], 'priority': 2, 'active': True},
+            {'_id': AFRICA_ID, 'term': 'Africa', 'aliases': [], 'priority': 3, 'active': True},
+        ]
+
+
+def test_record_and_ranked_report():
+    """Counters accumulate per (type, label); ranking is by hits, dead patterns listed by cost."""
+    profiler = PatternProfiler()
+    for _ in range(3):
+        profiler.record('date_pattern', 'terminal_comma: year', 100, True)
+    profiler.record('date_pattern', 'range_format: range', 500, False)
+    profiler.record('report_type_dictionary', 'Market', 50, True)
+    profiler.register('report_type_dictionary', 'Industy')
+
+    report = profiler.ranked_report()
+    assert [p['label'] for p in report['top_patterns']] == [
+        'terminal_comma: year', 'Market', 'Industy', 'range_format: range']
+    top = report['top_patterns'][0]
+    assert (top['evaluations'], top['matches'], top['total_ns'], top['hit_rate']) == (3, 3, 300, 1.0)
+    assert [p['label'] for p in report['dead_patterns']] == ['range_format: range', 'Industy']
+    assert report['most_expensive'][0]['label'] == 'range_format: range'
+    assert report['by_type']['date_pattern']['dead_patterns'] == 1
+    assert report['by_type']['date_pattern']['time_share'] == 800 / 850
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = profiler.write_report(temp_dir)
+        with open(path, 'r', encoding='utf-8') as f:
+            assert len(json.load(f)['all_patterns']) == 4
+
+
+def test_extractor_hooks():
+    """Attached profiler sees every evaluated pattern; detaching restores the unprofiled path."""
+    detector = GeographicEntityDetector(FakePatternSource())
+    profiler = PatternProfiler()
+    profiler_module.attach_profiler({'geographic_detector': detector, 'other': object()}, profiler)
+    assert detector.profiler is profiler
+    assert len(profiler.stats) == 4
+
+    result = detector.extract_geographic_entities("European Solar Inverter Market")
+    assert result.extracted_regions == ['Europe']
+    europe = profiler.stats[('geographic_entity', 'Europe')]
+    asia = profiler.stats[('geographic_entity', 'Asia')]
+    assert (europe.evaluations, europe.matches, europe.pattern_id) == (1, 1, str(EUROPE_ID))
+    assert (asia.evaluations, asia.matches) == (1, 0)
+    assert europe.total_ns > 0
+    # The matched alias is counted under its own label and the term's _id
+    alias = profiler.stats[('geographic_entity_alias', 'Europe: European')]
+    assert (alias.matches, alias.pattern_id) == (1, str(EUROPE_ID))
+
+    detector.extract_geographic_entities("Europe Solar Inverter Market")
+    assert profiler.stats[('geographic_entity', 'Europe')].matches == 2
+    assert profiler.stats[('geographic_entity_alias', 'Europe: European')].matches == 1
+
+    profiler_module.attach_profiler({'geographic_detector': detector}, None)
+    detector.extract_geographic_entities("Asia Pacific Market")
+    assert profiler.stats[('geographic_entity', 'Asia')].evaluations == 2
+
+
+def test_topic_extractor_hooks():
+    """Topic cleanup rules are recorded as fired only when the substitution changed something."""
+    topic_extractor = load_module("topic_extractor").TopicExtractor()
+    profiler = PatternProfiler()
+    profiler_module.attach_profiler({'topic_extractor': topic_extractor}, profiler)
+
+    assert topic_extractor._clean_artifacts("Smart Meters,") == "Smart Meters"
+    comma = profiler.stats[('topic_artifact_cleanup', r'Trailing commas: \s*,\s*$')]
+    spaces = profiler.stats[('topic_artifact_cleanup', r'Multiple spaces: \s{2,}')]
+    assert (comma.evaluations, comma.matches) == (1, 1)
+    assert (spaces.evaluations, spaces.matches) == (1, 0)
+
+
+def test_profile_updates():
+    """Only patterns with a pattern_libraries _id become $set profile.* updates, with their rank."""
+    profiler = PatternProfiler()
+    profiler.record('geographic_entity', 'Europe', 200, True, EUROPE_ID)
+    profiler.record('geographic_entity', 'Asia', 100, False, ASIA_ID)
+    profiler.record('topic_artifact_cleanup', 'fallback', 10, True)
+
+    updates = profiler_module.profile_updates(profiler, profiled_at='2025-01-01')
+    assert [update['filter'] for update in updates] == [{'_id': EUROPE_ID}, {'_id': ASIA_ID}]
+    assert updates[0]['update'] == {'$set': {
+        'profile.evaluations': 1, 'profile.matches': 1, 'profile.total_ns': 200, 'profile.hit_rate': 1.0,
+        'profile.avg_ns': 200.0, 'profile.rank': 2, 'profile.profiled_at': '2025-01-01'}}
+    assert updates[1]['update']['$set']['profile.rank'] == 3
+
+    # Alias stats join their term's update instead of overwriting its profile
+    profiler.record('geographic_entity_alias', 'Europe: European', 0, True, EUROPE_ID)
+    profiler.register('geographic_entity_alias', 'Asia: APAC', ASIA_ID)
+    updates = profiler_module.profile_updates(profiler)
+    assert [update['filter'] for update in updates] == [{'_id': EUROPE_ID}, {'_id': ASIA_ID}]
+    assert updates[0]['update']['$set']['profile.aliases'] == [{'label': 'Europe: European', 'matches': 1}]
+    assert updates[0]['update']['$set']['profile.rank'] == 2
+    assert updates[1]['update']['$set']['profile.aliases'] == [{'label': 'Asia: APAC', 'matches': 0}]
+
+
+if __name__ == "__main__":
+    print("Pattern Profiler Tests")
+    print("=" * 50)
+
+    tests = [
+        test_record_and_ranked_report,
+        test_extractor_hooks,
+        test_topic_extractor_hooks,
+        test_profile_updates,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
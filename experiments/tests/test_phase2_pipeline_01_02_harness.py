@@ -20,8 +20,10 @@ from collections import Counter, defaultdict
 # Add parent directory to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# MongoDB imports
-from pymongo import MongoClient
+# Shared MongoDB client (the connection factory every component uses)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from experiments import load_module
+get_mongo_client = load_module("mongodb_connection_manager").get_mongo_client
 from dotenv import load_dotenv
 
 # Import the modules to test
@@ -101,7 +103,7 @@ class Phase2PipelineTestHarness:
         if not mongodb_uri:
             raise ValueError("MONGODB_URI environment variable not set")
         
-        self.client = MongoClient(mongodb_uri)
+        self.client = get_mongo_client(mongodb_uri)
         self.db = self.client['deathstar']
         self.collection = self.db['markets_raw']
         
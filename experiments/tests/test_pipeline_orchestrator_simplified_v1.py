@@ -8,6 +8,8 @@ Tests core functionality with simplified mocking approach.
 import sys
 import os
 import logging
+from types import SimpleNamespace
+from unittest.mock import Mock
 
 # Add parent directory to path to import the orchestrator module
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -120,16 +122,15 @@ def test_pipeline_orchestrator_core():
         
         test_results.append("✅ Error handling logic")
         
-        # Test 7: Test geographic entities processing placeholder
+        # Test 7: Test geographic entities processing (v3 detector)
         print("\n7. Testing geographic entities processing...")
         
         geo_result = orchestrator._process_geographic_entities("Global Market Report")
         
-        print(f"   Geographic result: {geo_result}")
+        print(f"   Geographic result: {geo_result.extracted_regions}")
         
-        assert isinstance(geo_result, dict), "Geographic result should be dict"
-        assert 'extracted_regions' in geo_result, "Should have extracted_regions key"
-        assert isinstance(geo_result['extracted_regions'], list), "Extracted regions should be list"
+        assert geo_result.extracted_regions == ['Global'], "Should return detector regions"
+        assert geo_result.title == "Market Report", "Should return remaining title"
         
         test_results.append("✅ Geographic entities processing")
         
@@ -247,8 +248,15 @@ def create_mock_orchestrator():
                 'successful_extractions': 0,
                 'failed_extractions': 0,
                 'requires_review_count': 0,
-                'total_processing_time': 0.0
+                'total_processing_time': 0.0,
+                'stage_time_totals': {stage: 0.0 for stage in pipeline_orchestrator_module.PIPELINE_STAGES}
             }
+            
+            # Stand-in for GeographicEntityDetector v3
+            geographic_detector = Mock()
+            geographic_detector.extract_geographic_entities.return_value = SimpleNamespace(
+                extracted_regions=['Global'], title="Market Report", confidence=0.9, notes="")
+            self.components = {'geographic_detector': geographic_detector}
         
         def _get_timestamps(self):
             return PipelineOrchestrator._get_timestamps(self)
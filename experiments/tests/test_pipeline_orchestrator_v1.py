@@ -10,6 +10,7 @@ import sys
 import os
 import unittest
 from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
 import tempfile
 import json
 import shutil
@@ -35,10 +36,13 @@ class TestPipelineOrchestrator(unittest.TestCase):
     def setUp(self):
         """Set up test fixtures."""
         # Mock MongoDB connection
-        self.mock_mongo_client = Mock()
-        self.mock_db = Mock()
+        self.mock_mongo_client = MagicMock()
+        self.mock_db = MagicMock()
         self.mock_mongo_client.__getitem__.return_value = self.mock_db
         
+        # Drop shared clients cached by earlier tests
+        pipeline_orchestrator_module._conn_module.close_all_clients()
+        
         # Create temporary directory for outputs
         self.temp_dir = tempfile.mkdtemp()
         self.original_cwd = os.getcwd()
@@ -63,6 +67,7 @@ class TestPipelineOrchestrator(unittest.TestCase):
             with patch.object(PipelineOrchestrator, '_initialize_components'):
                 orchestrator = PipelineOrchestrator(
                     mongodb_uri="mongodb://test", 
+                    output_dir=self.temp_dir,
                     **kwargs
                 )
                 
@@ -72,46 +77,44 @@ class TestPipelineOrchestrator(unittest.TestCase):
                 return orchestrator
     
     def _create_mock_components(self):
-        """Create mock pipeline components."""
+        """Create mock pipeline components returning results shaped like the real extractors."""
         components = {}
         
         # Mock Market Term Classifier
-        mock_market_result = Mock()
-        mock_market_result.market_type.value = "standard"
         mock_market_classifier = Mock()
-        mock_market_classifier.classify.return_value = mock_market_result
+        mock_market_classifier.classify.return_value = SimpleNamespace(
+            market_type="standard", confidence=0.95)
         components['market_classifier'] = mock_market_classifier
         
         # Mock Date Extractor
-        mock_date_result = Mock()
-        mock_date_result.extracted_date = "2030"
         mock_date_extractor = Mock()
-        mock_date_extractor.extract.return_value = mock_date_result
+        mock_date_extractor.extract.return_value = SimpleNamespace(
+            extracted_date_range="2030", cleaned_title="Global Artificial Intelligence Market Report",
+            confidence=0.98)
         components['date_extractor'] = mock_date_extractor
         
         # Mock Report Type Extractor
-        mock_report_result = Mock()
-        mock_report_result.extracted_report_type = "Market Report"
         mock_report_extractor = Mock()
-        mock_report_extractor.extract.return_value = mock_report_result
+        mock_report_extractor.extract.return_value = SimpleNamespace(
+            extracted_report_type="Market Report", title="Global Artificial Intelligence", confidence=0.9)
         components['report_extractor'] = mock_report_extractor
         
-        # Mock Geographic Detector (functional)
-        components['geographic_detector'] = Mock()
+        # Mock Geographic Entity Detector
+        mock_geographic_detector = Mock()
+        mock_geographic_detector.extract_geographic_entities.return_value = SimpleNamespace(
+            extracted_regions=["Global"], title="Artificial Intelligence", confidence=0.9, notes="")
+        components['geographic_detector'] = mock_geographic_detector
         
         # Mock Topic Extractor
-        mock_topic_result = Mock()
-        mock_topic_result.extracted_topic = "Artificial Intelligence"
-        mock_topic_result.normalized_topic_name = "artificial-intelligence"
         mock_topic_extractor = Mock()
-        mock_topic_extractor.extract.return_value = mock_topic_result
+        mock_topic_extractor.extract.return_value = SimpleNamespace(
+            extracted_topic="Artificial Intelligence", normalized_topic_name="artificial-intelligence",
+            confidence=0.9)
         components['topic_extractor'] = mock_topic_extractor
         
         # Mock Confidence Tracker
-        mock_confidence_result = Mock()
-        mock_confidence_result.overall_confidence = 0.85
         mock_confidence_tracker = Mock()
-        mock_confidence_tracker.calculateOverallConfidence.return_value = mock_confidence_result
+        mock_confidence_tracker.calculateOverallConfidence.return_value = SimpleNamespace(overall_confidence=0.85)
         components['confidence_tracker'] = mock_confidence_tracker
         
         return components
@@ -175,8 +178,7 @@ class TestPipelineOrchestrator(unittest.TestCase):
         orchestrator = self.create_mock_orchestrator()
         
         # Set up low confidence result
-        mock_confidence_result = Mock()
-        mock_confidence_result.overall_confidence = 0.6  # Below 0.8 threshold
+        mock_confidence_result = SimpleNamespace(overall_confidence=0.6)  # Below 0.8 threshold
         orchestrator.components['confidence_tracker'].calculateOverallConfidence.return_value = mock_confidence_result
         
         title = "Ambiguous Market Title"
@@ -320,7 +322,33 @@ class TestPipelineOrchestrator(unittest.TestCase):
         
         success = orchestrator.saveResults(results)
         self.assertFalse(success)
-    
+
+    def test_process_and_save_deduplicated(self):
+        """Test that duplicate titles are processed once and fanned out to every source _id."""
+        orchestrator = self.create_mock_orchestrator()
+
+        source_documents = [
+            {'_id': 'raw_1', 'report_title_short': "Global AI Market Report, 2030"},
+            {'_id': 'raw_2', 'report_title_short': "global ai  market report, 2030"},
+            {'_id': 'raw_3', 'report_title_short': "IoT Device Management Market"}
+        ]
+
+        results, dedup_result = orchestrator.processDeduplicated(source_documents, "dedup_batch")
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(orchestrator.components['market_classifier'].classify.call_count, 2)
+        self.assertEqual(dedup_result.stats.duplicate_documents, 1)
+
+        mock_collection = Mock()
+        self.mock_db.__getitem__.return_value = mock_collection
+
+        success = orchestrator.saveDeduplicatedResults(results, dedup_result)
+
+        self.assertTrue(success)
+        mock_collection.bulk_write.assert_called_once()
+        operations = mock_collection.bulk_write.call_args[0][0]
+        self.assertEqual(len(operations), 3)
+
     def test_generate_report_with_results(self):
         """Test report generation with provided results."""
         orchestrator = self.create_mock_orchestrator()
@@ -471,16 +499,45 @@ class TestPipelineOrchestrator(unittest.TestCase):
         self.assertEqual(id3, "test_batch_title_0099")
     
     def test_geographic_entities_processing(self):
-        """Test geographic entities processing placeholder."""
+        """Test geographic stage delegates to the v3 detector."""
         orchestrator = self.create_mock_orchestrator()
         
-        result = orchestrator._process_geographic_entities("Global Market Report")
+        result = orchestrator._process_geographic_entities("Global Market")
         
-        # Verify placeholder structure
-        self.assertIsInstance(result, dict)
-        self.assertIn('extracted_regions', result)
-        self.assertIn('confidence', result)
-        self.assertIsInstance(result['extracted_regions'], list)
+        orchestrator.components['geographic_detector'].extract_geographic_entities.assert_called_once_with("Global Market")
+        self.assertEqual(result.extracted_regions, ["Global"])
+    
+    def test_pipeline_forward_text(self):
+        """Each stage receives the text left by the previous stage."""
+        orchestrator = self.create_mock_orchestrator()
+        components = orchestrator.components
+        
+        title = "Global Artificial Intelligence Market Report, 2030"
+        result = orchestrator.processTitle(title, "forward_test", "fwd_001")
+        
+        components['report_extractor'].extract.assert_called_once_with(
+            "Global Artificial Intelligence Market Report", "standard")
+        components['geographic_detector'].extract_geographic_entities.assert_called_once_with(
+            "Global Artificial Intelligence")
+        topic_args = components['topic_extractor'].extract.call_args[0]
+        self.assertEqual(topic_args[0], title)
+        self.assertEqual(topic_args[1], "Artificial Intelligence")
+        self.assertEqual(topic_args[2]['extracted_regions'], ["Global"])
+        
+        self.assertEqual(result.extracted_elements.extracted_regions, ["Global"])
+        extraction_results = components['confidence_tracker'].calculateOverallConfidence.call_args[0][0]
+        self.assertEqual(extraction_results.geographic_detection_confidence, 0.9)
+    
+    def test_stage_timings(self):
+        """Every stage is timed and accumulated in processing statistics."""
+        orchestrator = self.create_mock_orchestrator()
+        
+        result = orchestrator.processTitle("Global AI Market Report, 2030", "timing_test", "tm_001")
+        
+        self.assertEqual(list(result.stage_timings), pipeline_orchestrator_module.PIPELINE_STAGES)
+        stats = orchestrator.get_processing_statistics()
+        self.assertGreater(stats['stage_time_totals']['geographic_detection'], 0)
+        self.assertAlmostEqual(sum(stats['stage_time_share'].values()), 1.0)
     
     def test_integration_with_all_components(self):
         """Test end-to-end integration with all pipeline components."""
@@ -509,9 +566,10 @@ class TestPipelineOrchestratorEdgeCases(unittest.TestCase):
     
     def setUp(self):
         """Set up test fixtures."""
-        self.mock_mongo_client = Mock()
-        self.mock_db = Mock()
+        self.mock_mongo_client = MagicMock()
+        self.mock_db = MagicMock()
         self.mock_mongo_client.__getitem__.return_value = self.mock_db
+        pipeline_orchestrator_module._conn_module.close_all_clients()
         
     def create_mock_orchestrator(self):
         """Create a mock orchestrator for edge case testing."""
@@ -565,9 +623,9 @@ class TestPipelineOrchestratorEdgeCases(unittest.TestCase):
             mock_client.return_value = self.mock_mongo_client
             self.mock_db.admin.command.return_value = True
             
-            # Mock importlib to fail
-            with patch('importlib.util.spec_from_file_location') as mock_spec:
-                mock_spec.return_value = None
+            # Mock module loading to fail
+            with patch.object(pipeline_orchestrator_module, 'load_module') as mock_load:
+                mock_load.side_effect = ImportError("Module not found")
                 
                 with self.assertRaises(Exception):
                     PipelineOrchestrator(mongodb_uri="mongodb://test")
@@ -601,27 +659,25 @@ class TestPipelineOrchestratorEdgeCases(unittest.TestCase):
         components = {}
         
         # Each component returns minimal valid results
-        for component_name in ['market_classifier', 'date_extractor', 'report_extractor', 
-                              'topic_extractor', 'confidence_tracker']:
+        market_classifier = Mock()
+        market_classifier.classify.return_value = SimpleNamespace(market_type="standard", confidence=0.5)
+        components['market_classifier'] = market_classifier
+        
+        for component_name in ['date_extractor', 'report_extractor', 'topic_extractor']:
             mock_component = Mock()
-            
-            if component_name == 'market_classifier':
-                mock_result = Mock()
-                mock_result.market_type.value = "standard"
-                mock_component.classify.return_value = mock_result
-            elif component_name == 'confidence_tracker':
-                mock_result = Mock()
-                mock_result.overall_confidence = 0.5
-                mock_component.calculateOverallConfidence.return_value = mock_result
-            else:
-                mock_result = Mock()
-                for attr in ['extracted_date', 'extracted_report_type', 'extracted_topic', 'normalized_topic_name']:
-                    setattr(mock_result, attr, None)
-                mock_component.extract.return_value = mock_result
-            
+            mock_component.extract.return_value = SimpleNamespace(
+                extracted_date_range=None, extracted_report_type=None, extracted_topic=None,
+                normalized_topic_name=None, confidence=0.0)
             components[component_name] = mock_component
         
-        components['geographic_detector'] = Mock()
+        geographic_detector = Mock()
+        geographic_detector.extract_geographic_entities.return_value = SimpleNamespace(
+            extracted_regions=[], title="", confidence=0.0, notes="")
+        components['geographic_detector'] = geographic_detector
+        
+        confidence_tracker = Mock()
+        confidence_tracker.calculateOverallConfidence.return_value = SimpleNamespace(overall_confidence=0.5)
+        components['confidence_tracker'] = confidence_tracker
         
         return components
     
@@ -634,22 +690,20 @@ class TestPipelineOrchestratorEdgeCases(unittest.TestCase):
             
             def conditional_method(title, *args, **kwargs):
                 if success_keyword in title:
-                    mock_result = Mock()
                     if component_type == 'classify':
-                        mock_result.market_type.value = "standard"
-                    elif component_type == 'confidence':
-                        mock_result.overall_confidence = 0.8
-                    else:
-                        for attr in ['extracted_date', 'extracted_report_type', 'extracted_topic', 'normalized_topic_name']:
-                            setattr(mock_result, attr, f"mock_{attr}")
-                    return mock_result
+                        return SimpleNamespace(market_type="standard", confidence=0.9)
+                    return SimpleNamespace(
+                        extracted_date_range="mock_date", cleaned_title=title,
+                        extracted_report_type="mock_report_type", title=title,
+                        extracted_regions=[], extracted_topic="mock_topic",
+                        normalized_topic_name="mock-topic", confidence=0.9)
                 else:
                     raise Exception("Component failure")
             
             if component_type == 'classify':
                 mock_component.classify.side_effect = conditional_method
-            elif component_type == 'confidence':
-                mock_component.calculateOverallConfidence.side_effect = conditional_method
+            elif component_type == 'geographic':
+                mock_component.extract_geographic_entities.side_effect = conditional_method
             else:
                 mock_component.extract.side_effect = conditional_method
             
@@ -658,9 +712,12 @@ class TestPipelineOrchestratorEdgeCases(unittest.TestCase):
         components['market_classifier'] = create_conditional_component("Success", 'classify')
         components['date_extractor'] = create_conditional_component("Success", 'extract')
         components['report_extractor'] = create_conditional_component("Success", 'extract')
+        components['geographic_detector'] = create_conditional_component("Success", 'geographic')
         components['topic_extractor'] = create_conditional_component("Success", 'extract')
-        components['confidence_tracker'] = create_conditional_component("Success", 'confidence')
-        components['geographic_detector'] = Mock()
+        
+        confidence_tracker = Mock()
+        confidence_tracker.calculateOverallConfidence.return_value = SimpleNamespace(overall_confidence=0.8)
+        components['confidence_tracker'] = confidence_tracker
         
         return components
 
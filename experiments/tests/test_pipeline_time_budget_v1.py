@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+
+"""
+Test script for per-title/per-stage time budgets in PipelineOrchestrator
+Validates that a title stuck in catastrophic regex backtracking is killed in
+its worker process, marked FAILED with a timeout flag and diagnostics naming
+the stage and pattern, routed to the slow-path queue, and that the rest of the
+batch still completes.
+"""
+
+import os
+import re
+import sys
+import time
+import logging
+from types import SimpleNamespace
+from unittest.mock import patch
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+import orchestrator_test_helpers
+
+orchestrator_module = load_module("pipeline_orchestrator")
+PipelineOrchestrator = orchestrator_module.PipelineOrchestrator
+ProcessingStatus = orchestrator_module.ProcessingStatus
+
+# Configure logging for tests
+logging.basicConfig(level=logging.CRITICAL)
+
+# Second pattern backtracks exponentially on long runs of 'a' without a trailing match
+GEOGRAPHIC_PATTERNS = [
+    ('Europe', re.compile(r'\bEurope\b')),
+    ('Nested Quantifier', re.compile(r'(a+)+$')),
+    ('Asia', re.compile(r'\bAsia\b')),
+]
+HANGING_TITLE = "Widget " + "a" * 40 + "! Market"
+
+
+class FakeGeographicDetector:
+    """Pattern loop instrumented like GeographicEntityDetector."""
+
+    def __init__(self):
+        self.profiler = None
+
+    def profiled_patterns(self):
+        return [('geographic_entity', label, None) for label, _ in GEOGRAPHIC_PATTERNS]
+
+    def extract_geographic_entities(self, title):
+        if title.startswith("Slow"):
+            time.sleep(0.8)
+        regions = []
+        for label, pattern in GEOGRAPHIC_PATTERNS:
+            if self.profiler is not None:
+                self.profiler.begin('geographic_entity', label)
+            matched = pattern.search(title) is not None
+            if self.profiler is not None:
+                self.profiler.record('geographic_entity', label, 0, matched)
+            if title.startswith("Stuck") and label == 'Europe':
+                time.sleep(5)  # Unprofiled work between two pattern evaluations
+            if matched:
+                regions.append(label)
+        return SimpleNamespace(extracted_regions=regions, title=title, confidence=0.9, notes="")
+
+
+class FakeConfidenceTracker:
+    def calculateOverallConfidence(self, extraction_results):
+        return SimpleNamespace(overall_confidence=0.9)
+
+    def flush_metrics(self):
+        return 0
+
+
+def create_orchestrator(**kwargs):
+    """Shared orchestrator fixture with the instrumented geographic detector."""
+    return orchestrator_test_helpers.create_orchestrator(
+        components={'geographic_detector': FakeGeographicDetector(),
+                    'confidence_tracker': FakeConfidenceTracker()}, **kwargs)
+
+
+def test_timeout_routed_to_slow_path():
+    """The hanging title fails with stage/pattern diagnostics; the other titles complete."""
+    orchestrator = create_orchestrator(timeout_seconds=1)
+    titles = ["Europe Widget Market", HANGING_TITLE, "Asia Widget Market", "Widget Market"]
+    results = orchestrator.processBatchWithBudget(titles, batch_id="budget_test", workers=2)
+
+    assert [result.title for result in results] == titles
+    hung = results[1]
+    assert hung.status == ProcessingStatus.FAILED
+    assert hung.flags == ['timeout']
+    diagnostics = hung.component_results['timeout']
+    assert diagnostics['stage'] == 'geographic_detection'
+    assert diagnostics['pattern'] == 'Nested Quantifier'
+    assert diagnostics['last_completed_pattern'] == 'Europe'
+    assert diagnostics['budget'] == 'title' and diagnostics['elapsed_seconds'] >= 1
+    assert 'geographic_detection' in hung.error_message and 'Nested Quantifier' in hung.error_message
+
+    assert all(result.status == ProcessingStatus.COMPLETED for i, result in enumerate(results) if i != 1)
+    assert results[0].extracted_elements.extracted_regions == ['Europe']
+    assert orchestrator.processing_stats['failed_extractions'] == 1
+    assert orchestrator.processing_stats['successful_extractions'] == 3
+    assert orchestrator.processing_stats['stage_time_totals']['geographic_detection'] > 0
+
+    assert [(entry['title'], entry['stage'], entry['pattern']) for entry in orchestrator.slow_path_queue] == [
+        (HANGING_TITLE, 'geographic_detection', 'Nested Quantifier')]
+    assert orchestrator.slow_path_queue[0]['processing_id'] == hung.processing_id
+
+
+def test_stage_budget_and_slow_path_retry():
+    """A stage budget fires before the title budget; slow-path retries are flagged and not re-queued."""
+    orchestrator = create_orchestrator(timeout_seconds=30)
+    orchestrator.stage_timeout_seconds = {'geographic_detection': 0.5}
+    results = orchestrator.processBatchWithBudget([HANGING_TITLE], batch_id="stage_budget", workers=1)
+    assert results[0].component_results['timeout']['budget'] == 'stage'
+    assert results[0].component_results['timeout']['budget_seconds'] == 0.5
+
+    retried = orchestrator.processSlowPath(budget_multiplier=1.0)
+    assert len(retried) == 1
+    assert retried[0].flags == ['timeout', 'slow_path']
+    assert retried[0].processing_id == results[0].processing_id
+    assert orchestrator.slow_path_queue == []
+    assert orchestrator.processSlowPath() == []
+
+    # The retry replaces the original failure in the counters instead of adding to them
+    stats = orchestrator.processing_stats
+    assert stats['total_titles_processed'] == 1
+    assert stats['failed_extractions'] + stats['successful_extractions'] + stats['requires_review_count'] == 1
+
+
+def test_slow_path_result_replaces_timeout():
+    """A title recovered on the slow path replaces its timeout in the counters, report and facet index."""
+    orchestrator = create_orchestrator(timeout_seconds=30)
+    orchestrator.stage_timeout_seconds = {'geographic_detection': 0.4}
+    orchestrator.facet_index = orchestrator_module.FacetIndex()
+    results = orchestrator.processBatchWithBudget(["Slow Europe Widget Market", "Asia Widget Market"],
+                                                  batch_id="slow_path", workers=2)
+    assert results[0].flags == ['timeout']
+    assert orchestrator.facet_index.count(region="Europe") == 0
+
+    retried = orchestrator.processSlowPath(budget_multiplier=5.0)
+    assert retried[0].status == ProcessingStatus.COMPLETED and retried[0].flags == ['slow_path']
+
+    assert orchestrator.processing_stats['failed_extractions'] == 0
+    assert orchestrator.processing_stats['successful_extractions'] == 2
+    summary = orchestrator.report_accumulator.summary()
+    assert (summary['total_titles'], summary['completed'], summary['failed']) == (2, 2, 0)
+    assert len(orchestrator.facet_index) == 2
+    assert orchestrator.facet_index.drill_down(region="Europe") == [results[0].processing_id]
+    assert orchestrator.facet_index.facet_counts('topic') == {'widget': 2}
+
+
+def test_timeout_between_patterns_names_no_pattern():
+    """A title killed between evaluations blames no pattern, only the last one that completed."""
+    orchestrator = create_orchestrator(timeout_seconds=0.5)
+    results = orchestrator.processBatchWithBudget(["Stuck Europe Widget Market"], batch_id="between", workers=1)
+
+    diagnostics = results[0].component_results['timeout']
+    assert diagnostics['stage'] == 'geographic_detection'
+    assert diagnostics['pattern'] is None
+    assert diagnostics['last_completed_pattern'] == 'Europe'
+    assert "after pattern 'Europe'" in results[0].error_message
+    assert 'Nested Quantifier' not in results[0].error_message
+
+
+def test_slow_worker_startup_is_not_a_timeout():
+    """A worker that takes several poll ticks to start does not time out its first title."""
+    orchestrator = create_orchestrator(timeout_seconds=5)
+    tracer_init = orchestrator_module._BudgetTracer.__init__
+
+    def slow_init(self, *args, **kwargs):
+        time.sleep(10 * orchestrator_module.BUDGET_POLL_SECONDS)
+        tracer_init(self, *args, **kwargs)
+
+    with patch.object(orchestrator_module._BudgetTracer, '__init__', slow_init):
+        results = orchestrator.processBatchWithBudget(["Europe Widget Market", "Asia Widget Market"],
+                                                      batch_id="slow_start", workers=2)
+
+    assert [result.status for result in results] == [ProcessingStatus.COMPLETED] * 2, \
+        [result.error_message for result in results]
+    assert orchestrator.slow_path_queue == []
+
+
+if __name__ == "__main__":
+    print("Pipeline Time Budget Tests")
+    print("=" * 50)
+
+    tests = [
+        test_timeout_routed_to_slow_path,
+        test_stage_budget_and_slow_path_retry,
+        test_slow_path_result_replaces_timeout,
+        test_timeout_between_patterns_names_no_pattern,
+        test_slow_worker_startup_is_not_a_timeout,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
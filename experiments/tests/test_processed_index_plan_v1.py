@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the markets_processed index plan in MongoDB Setup (00a)
+Validates that the query-shaped indexes replace the stale ones, that every
+index field exists in the documents saveResults writes, and that explain()
+verification accepts index-only/indexed plans and rejects collection scans,
+using a small prefix-matching planner in place of a server.
+"""
+
+import os
+import sys
+import logging
+from dataclasses import asdict
+from unittest.mock import MagicMock
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+
+mongodb_setup_module = load_module("mongodb_setup")
+orchestrator_module = load_module("pipeline_orchestrator")
+
+# Configure logging for tests
+logging.basicConfig(level=logging.CRITICAL)
+
+MULTIKEY_FIELDS = {"extracted_elements.extracted_regions"}
+
+
+class PlanningCollection:
+    """Picks the index whose leading keys match the filter, like the server planner for these shapes."""
+
+    def __init__(self, indexes=None):
+        self.indexes = dict(indexes or {"_id_": [("_id", 1)]})
+        self.dropped = []
+        self.sbe = False
+
+    def index_information(self):
+        return {name: {"key": keys} for name, keys in self.indexes.items()}
+
+    def drop_index(self, name):
+        self.dropped.append(name)
+        del self.indexes[name]
+
+    def create_indexes(self, models):
+        for model in models:
+            document = model.document
+            self.indexes[document["name"]] = list(document["key"].items())
+        return [model.document["name"] for model in models]
+
+    def find(self, query, projection=None):
+        cursor = MagicMock()
+        cursor.sort.return_value = cursor
+        cursor.explain.side_effect = lambda: self._explain(query, projection, cursor.sort.call_args)
+        return cursor
+
+    def _explain(self, query, projection, sort_call):
+        sort_fields = [field for field, _ in sort_call.args[0]] if sort_call else []
+        best = None
+        for name, keys in self.indexes.items():
+            fields = [field for field, _ in keys]
+            prefix = 0
+            while prefix < len(fields) and fields[prefix] in query:
+                prefix += 1
+            if prefix and (best is None or prefix > best[1]):
+                best = (name, prefix, fields)
+
+        if best is None:
+            plan = {"stage": "COLLSCAN"}
+        else:
+            name, prefix, fields = best
+            plan = {"stage": "IXSCAN", "indexName": name}
+            wanted = [field for field, include in (projection or {}).items() if include]
+            if projection is not None and projection.get("_id", 1):
+                wanted.append("_id")
+            covered = (projection is not None and set(wanted) <= set(fields)
+                       and not MULTIKEY_FIELDS & set(fields))
+            if not covered:
+                plan = {"stage": "FETCH", "inputStage": plan}
+            if projection is not None:
+                plan = {"stage": "PROJECTION_COVERED" if covered else "PROJECTION_SIMPLE", "inputStage": plan}
+            if sort_fields and fields[prefix - 1:prefix] != sort_fields[:1] and fields[prefix:prefix + 1] != sort_fields[:1]:
+                plan = {"stage": "SORT", "inputStage": plan}
+        if sort_fields and best is None:
+            plan = {"stage": "SORT", "inputStage": plan}
+
+        winning_plan = {"queryPlan": plan} if self.sbe else plan
+        return {"queryPlanner": {"winningPlan": winning_plan}}
+
+
+def test_indexes_match_saved_document_schema():
+    """Every indexed field is present in a saveResults document; stale indexes are dropped."""
+    result = orchestrator_module.ProcessingResult(
+        title="t", original_title="t", batch_id="b", processing_id="p",
+        status=orchestrator_module.ProcessingStatus.REQUIRES_REVIEW,
+        extracted_elements=orchestrator_module.ExtractedElements(extracted_regions=["Europe"], topicName="t"),
+        confidence_analysis={"overall_confidence": 0.5})
+    document = orchestrator_module._encode_for_storage(asdict(result))
+    document["_id"] = result.processing_id
+
+    def has_path(doc, path):
+        for part in path.split("."):
+            if not isinstance(doc, dict) or part not in doc:
+                return False
+            doc = doc[part]
+        return True
+
+    for spec in mongodb_setup_module.PROCESSED_INDEXES:
+        for field, _ in spec["keys"]:
+            assert has_path(document, field), field
+    assert document["status"] == mongodb_setup_module.PROCESSED_QUERY_SHAPES["review_queue"]["filter"]["status"]
+
+    collection = PlanningCollection({"_id_": [("_id", 1)], "processing_date_-1": [("processing_date", -1)],
+                                     "confidence_score_-1": [("confidence_score", -1)]})
+    created = mongodb_setup_module.ensure_processed_indexes({"markets_processed": collection})
+    assert created == [spec["name"] for spec in mongodb_setup_module.PROCESSED_INDEXES]
+    assert collection.dropped == ["processing_date_-1", "confidence_score_-1"]
+
+
+def test_explain_verification():
+    """Before indexing the shapes collection-scan and fail; afterwards each uses its index."""
+    collection = PlanningCollection()
+    db = {"markets_processed": collection}
+    before = mongodb_setup_module.verify_processed_indexes(db)
+    assert not any(summary["ok"] for summary in before.values())
+    assert before["review_queue"]["collection_scan"]
+
+    mongodb_setup_module.ensure_processed_indexes(db)
+    collection.sbe = True
+    after = mongodb_setup_module.verify_processed_indexes(db)
+    assert all(summary["ok"] for summary in after.values()), after
+    assert after["review_queue"]["covered"] and after["batch_status"]["covered"]
+    assert not after["region_topic"]["covered"]
+    assert after["review_queue"]["stages"] == ["PROJECTION_COVERED", "IXSCAN"]
+
+
+if __name__ == "__main__":
+    print("Processed Index Plan Tests")
+    print("=" * 50)
+
+    tests = [
+        test_indexes_match_saved_document_schema,
+        test_explain_verification,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
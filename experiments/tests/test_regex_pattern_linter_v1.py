@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+"""
+Test script for Regex Pattern Linter v1.0
+Validates static nested-quantifier detection, timing-based quarantine of
+catastrophic and slow patterns, storage artifact warnings, duplicates and
+load-time filtering of pattern documents.
+"""
+
+import os
+import sys
+import time
+import logging
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+
+linter_module = load_module("regex_pattern_linter")
+RegexPatternLinter = linter_module.RegexPatternLinter
+
+# Configure logging for tests
+logging.basicConfig(level=logging.ERROR)
+
+SAFE_PATTERNS = [
+    r'\b(19|20)\d{2}\b',
+    r',\s*(20\d{2})\s*$',
+    r'\[(20\d{2})\]',
+    r'^\s*the\s+',
+    r'\b(Market)\s+(?:Size|Share)\b',
+]
+
+
+def test_safe_patterns_pass():
+    """Typical date and cleanup patterns are neither flagged nor quarantined."""
+    linter = RegexPatternLinter(corpus=["Global Solar Inverter Market, 2024-2030", "Smart Meter Market Report 2025"])
+    for pattern in SAFE_PATTERNS:
+        result = linter.lint_pattern(pattern)
+        assert result.issues == [], (pattern, result.issues, result.details)
+        assert result.corpus_ms is not None
+
+
+def test_catastrophic_patterns_quarantined():
+    """Ambiguous nested quantifiers are quarantined; unambiguous ones are only reported."""
+    linter = RegexPatternLinter()
+    for pattern in [r'(a+)+b', r'(\s*\w+)+,', r'^(\d+)*$']:
+        result = linter.lint_pattern(pattern)
+        assert 'nested_quantifier' in result.issues, pattern
+        assert 'catastrophic_backtracking' in result.issues, (pattern, result.details)
+        assert result.quarantined
+
+    result = linter.lint_pattern(r'(?:\w+\s)+Market')
+    assert result.issues == ['nested_quantifier'], result.details
+    assert not result.quarantined
+
+    static_only = RegexPatternLinter(dynamic=False).lint_pattern(r'(\w+\s*)*$')
+    assert static_only.quarantined
+
+
+def test_slow_and_broken_patterns():
+    """Compile errors and searches over budget are quarantined; storage artifacts are warnings."""
+    linter = RegexPatternLinter(time_budget_ms=5.0)
+    assert linter.lint_pattern(r'(').issues == ['compile_error']
+
+    result = linter.lint_pattern(r'.*.*.*=.*')
+    assert 'slow_match' in result.issues and result.quarantined, result.details
+
+    result = linter.lint_pattern('\\\\bMarket  Report')
+    assert result.issues == ['double_escaped', 'double_space']
+    assert not result.quarantined
+
+
+class PausedSearch:
+    """Compiled-pattern stand-in whose first `pauses` searches stall, like a GC pause."""
+
+    def __init__(self, pauses, pause_ms=40.0):
+        self.pauses = pauses
+        self.pause_ms = pause_ms
+
+    def search(self, text):
+        if self.pauses > 0:
+            self.pauses -= 1
+            time.sleep(self.pause_ms / 1000)
+        return None
+
+
+def test_single_slow_sample_not_quarantined():
+    """One stalled search is outvoted by the best-of-N timing; a consistently slow one is not."""
+    assert linter_module._time_search(PausedSearch(pauses=1), "Widgets Market") < 20.0
+    assert linter_module._time_search(PausedSearch(pauses=3), "Widgets Market") > 20.0
+
+    linter = RegexPatternLinter(corpus=["Widgets Market", "Smart Meter Market"], time_budget_ms=20.0)
+    result = linter_module.PatternLintResult(pattern='Market')
+    linter._time_corpus(PausedSearch(pauses=1), result)
+    assert result.issues == [], result.details
+
+    result = linter_module.PatternLintResult(pattern='Market')
+    linter._time_corpus(PausedSearch(pauses=10), result)
+    assert result.issues == ['slow_match'] and result.quarantined
+
+
+def test_filter_documents():
+    """Offenders are removed from loaded documents; duplicates and regex-less documents stay."""
+    documents = [
+        {'_id': 1, 'type': 'date_pattern', 'term': 'year', 'pattern': r'\b(20\d{2})\b'},
+        {'_id': 2, 'type': 'date_pattern', 'term': 'year copy', 'pattern': r'\b(20\d{2})\b'},
+        {'_id': 3, 'type': 'topic_artifact_cleanup', 'term': 'bad', 'pattern': r'^(\d+)*$'},
+        {'_id': 4, 'type': 'geographic_entity', 'term': 'Europe', 'aliases': []},
+    ]
+    linter = RegexPatternLinter()
+    results = linter.lint_documents(documents)
+    assert [result.issues for result in results if result.pattern_id == '2'] == [['duplicate']]
+
+    safe, quarantined = linter.filter_documents(documents)
+    assert [doc['_id'] for doc in safe] == [1, 2, 4]
+    assert [result.pattern_id for result in quarantined] == ['3']
+
+
+def test_load_time_linter_is_static():
+    """Pattern loads never time regexes; they drop static offenders and CLI-quarantined documents."""
+    linter = linter_module.get_pattern_linter()
+    assert linter.dynamic is False
+    documents = [
+        {'_id': 1, 'type': 'date_pattern', 'term': 'slow', 'pattern': r'.*.*.*=.*'},
+        {'_id': 2, 'type': 'date_pattern', 'term': 'nested', 'pattern': r'^(\d+)*$'},
+        {'_id': 3, 'type': 'date_pattern', 'term': 'flagged', 'pattern': r'\b(20\d{2})\b',
+         'quarantined': True, 'quarantine_reason': 'slow_match'},
+    ]
+    safe, quarantined = linter.filter_documents(documents)
+    assert [doc['_id'] for doc in safe] == [1]
+    assert [(result.pattern_id, result.issues) for result in quarantined] == [
+        ('3', ['quarantined']), ('2', ['nested_quantifier', 'catastrophic_backtracking'])]
+
+
+def test_quarantine_updates():
+    """Only quarantined results become deactivating updates, with the error issues as reason."""
+    from bson import ObjectId
+    pattern_id = str(ObjectId())
+    bad = linter_module.PatternLintResult(pattern='(', pattern_id=pattern_id, issues=['compile_error', 'duplicate'])
+    good = linter_module.PatternLintResult(pattern='x', pattern_id=str(ObjectId()), issues=['duplicate'])
+
+    updates = linter_module.quarantine_updates([bad, good])
+    assert updates == [{"filter": {"_id": ObjectId(pattern_id)},
+                        "update": {"$set": {"active": False, "quarantined": True,
+                                            "quarantine_reason": "compile_error"}}}]
+
+
+if __name__ == "__main__":
+    print("Regex Pattern Linter Tests")
+    print("=" * 50)
+
+    tests = [
+        test_safe_patterns_pass,
+        test_catastrophic_patterns_quarantined,
+        test_slow_and_broken_patterns,
+        test_single_slow_sample_not_quarantined,
+        test_filter_documents,
+        test_load_time_linter_is_static,
+        test_quarantine_updates,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the streaming report accumulator in Pipeline Orchestrator (07)
+Validates that the running accumulator reproduces the multi-pass report
+statistics, keeps bounded reservoir samples spread over the whole stream, and
+that generateReport can emit a run report from processBatch without results.
+"""
+
+import os
+import sys
+import json
+import random
+import logging
+import tempfile
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+import orchestrator_test_helpers
+
+orchestrator_module = load_module("pipeline_orchestrator")
+ReportAccumulator = orchestrator_module.ReportAccumulator
+ProcessingResult = orchestrator_module.ProcessingResult
+ProcessingStatus = orchestrator_module.ProcessingStatus
+ExtractedElements = orchestrator_module.ExtractedElements
+
+# Configure logging for tests
+logging.basicConfig(level=logging.WARNING)
+
+STATUSES = [ProcessingStatus.COMPLETED, ProcessingStatus.FAILED, ProcessingStatus.REQUIRES_REVIEW]
+
+
+def make_results(count, seed=4):
+    rng = random.Random(seed)
+    results = []
+    for i in range(count):
+        status = rng.choices(STATUSES, weights=[7, 1, 2])[0]
+        confidence = None if status == ProcessingStatus.FAILED else {'overall_confidence': rng.random()}
+        timings = {stage: rng.random() / 100 for stage in orchestrator_module.PIPELINE_STAGES[:rng.randint(1, 6)]}
+        results.append(ProcessingResult(
+            title=f"Title {i}", original_title=f"Title {i}", batch_id="b", processing_id=f"p{i:06d}",
+            status=status, extracted_elements=ExtractedElements(), confidence_analysis=confidence,
+            processing_time_seconds=rng.random(), stage_timings=timings))
+    return results
+
+
+def test_matches_multi_pass_statistics():
+    """Running counters agree with computing each statistic over the full result list."""
+    results = make_results(5000)
+    summary = ReportAccumulator().add_many(results).summary()
+
+    completed = [r for r in results if r.status == ProcessingStatus.COMPLETED]
+    assert summary['total_titles'] == 5000
+    assert summary['completed'] == len(completed)
+    assert summary['failed'] == sum(1 for r in results if r.status == ProcessingStatus.FAILED)
+    assert abs(summary['average_processing_time'] - sum(r.processing_time_seconds for r in results) / 5000) < 1e-9
+
+    confidences = [r.confidence_analysis['overall_confidence'] for r in results if r.confidence_analysis]
+    distribution = summary['confidence_distribution']
+    assert distribution['count'] == len(confidences)
+    assert distribution['min'] == min(confidences) and distribution['max'] == max(confidences)
+    assert distribution['high_confidence'] == sum(1 for c in confidences if c >= 0.8)
+    assert distribution['medium_confidence'] == sum(1 for c in confidences if 0.5 <= c < 0.8)
+    assert distribution['low_confidence'] == sum(1 for c in confidences if c < 0.5)
+
+    last_stage = orchestrator_module.PIPELINE_STAGES[-1]
+    timings = [r.stage_timings[last_stage] for r in results if last_stage in r.stage_timings]
+    assert abs(summary['average_stage_time_ms'][last_stage] - sum(timings) / len(timings) * 1000) < 1e-9
+
+    assert ReportAccumulator().confidence_distribution() == {'error': 'No confidence scores available'}
+
+
+def test_reservoir_samples_are_bounded_and_spread():
+    """Samples stay at 10/5/5 per status, match their status and cover the whole stream."""
+    results = make_results(20000)
+    samples = ReportAccumulator().add_many(results).sample_results()
+    assert [len(samples[key]) for key in ('successful', 'failed', 'requires_review')] == [10, 5, 5]
+    assert all(document['status'] == 'completed' for document in samples['successful'])
+    assert all(document['status'] == 'failed' for document in samples['failed'])
+
+    # Arrival order is kept, and the sample is not just the head of the stream
+    ids = [document['processing_id'] for document in samples['successful']]
+    assert ids == sorted(ids)
+    assert max(ids) > "p010000"
+
+    # A short stream keeps every result, like the old head-of-list samples
+    short = make_results(8)
+    assert len(ReportAccumulator().add_many(short).sample_results()['successful']) == \
+        sum(1 for r in short if r.status == ProcessingStatus.COMPLETED)
+
+
+def test_generate_report_from_running_accumulator():
+    """processBatch feeds the run accumulator, so generateReport needs no results list."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        orchestrator = orchestrator_test_helpers.create_orchestrator(output_dir=temp_dir)
+        orchestrator.processBatch(["Widgets Market Report, 2030"] * 12, batch_id="b1")
+        orchestrator.processBatch(["Widgets Market Report, 2030"] * 3, batch_id="b2")
+
+        filename = orchestrator.generateReport("run")
+        assert os.path.dirname(filename) == temp_dir
+        with open(filename, 'r', encoding='utf-8') as f:
+            report = json.load(f)
+
+    assert report['batch_summary']['total_titles'] == 15
+    assert report['batch_summary']['completed'] == 15
+    assert report['batch_summary']['confidence_distribution']['high_confidence'] == 15
+    assert len(report['sample_results']['successful']) == 10
+    assert report['sample_results']['failed'] == []
+
+
+def test_generate_report_for_empty_results():
+    """An explicitly empty results list reports zero titles instead of the whole run."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        orchestrator = orchestrator_test_helpers.create_orchestrator(output_dir=temp_dir)
+        orchestrator.processBatch(["Widgets Market Report, 2030"] * 4, batch_id="b1")
+
+        with open(orchestrator.generateReport("empty", results=[]), 'r', encoding='utf-8') as f:
+            report = json.load(f)
+
+    assert report['batch_summary'] == {}
+    assert report['sample_results'] == []
+
+
+if __name__ == "__main__":
+    print("Report Accumulator Tests")
+    print("=" * 50)
+
+    tests = [
+        test_matches_multi_pass_statistics,
+        test_reservoir_samples_are_bounded_and_spread,
+        test_generate_report_from_running_accumulator,
+        test_generate_report_for_empty_results,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+"""
+Test script for the PipelineOrchestrator retry queue and dead-letter collection
+Validates that processBatch queues failed titles without sleeping, that the
+retry worker reprocesses them with backoff after the main stream, replacing the
+failure in the statistics, report and markets_processed, and that titles
+exhausting their retries are written to the dead-letter collection with their
+partial component_results.
+"""
+
+import os
+import sys
+import time
+import logging
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+import orchestrator_test_helpers
+
+orchestrator_module = load_module("pipeline_orchestrator")
+PipelineOrchestrator = orchestrator_module.PipelineOrchestrator
+ProcessingStatus = orchestrator_module.ProcessingStatus
+
+# Configure logging for tests
+logging.basicConfig(level=logging.CRITICAL)
+
+
+class FlakyDateExtractor:
+    """Fails a title the first `failures[title]` times it is seen."""
+
+    def __init__(self, failures):
+        self.failures = dict(failures)
+
+    def extract(self, title):
+        if self.failures.get(title, 0) > 0:
+            self.failures[title] -= 1
+            raise RuntimeError("date pattern cache unavailable")
+        return SimpleNamespace(extracted_date_range="2030", cleaned_title=title, confidence=0.95)
+
+
+def create_orchestrator(failures, retry_attempts=3):
+    """Shared orchestrator fixture with a flaky date extractor."""
+    orchestrator = orchestrator_test_helpers.create_orchestrator(
+        components={'date_extractor': FlakyDateExtractor(failures)}, retry_attempts=retry_attempts)
+    orchestrator.db = MagicMock()
+    orchestrator.retry_backoff_seconds = 0.05
+    return orchestrator
+
+
+def test_failures_queued_then_retried():
+    """processBatch does not block on failures; the retry queue recovers a transient one."""
+    orchestrator = create_orchestrator({"Flaky Widget Market": 1})
+    orchestrator.retry_backoff_seconds = 5.0
+    orchestrator.facet_index = orchestrator_module.FacetIndex()
+    start = time.monotonic()
+    results = orchestrator.processBatch(["Widget Market", "Flaky Widget Market"], batch_id="retry_test")
+    assert time.monotonic() - start < 1.0
+    assert results[1].status == ProcessingStatus.FAILED
+    assert [entry.title for entry in orchestrator.retry_queue] == ["Flaky Widget Market"]
+    assert orchestrator.retry_queue[0].attempt == 1
+
+    orchestrator.retry_queue[0].ready_at = time.monotonic()
+    retried = orchestrator.processRetryQueue()
+    assert len(retried) == 1
+    assert retried[0].status == ProcessingStatus.COMPLETED
+    assert retried[0].processing_id == results[1].processing_id
+    assert 'retried' in retried[0].flags
+    assert orchestrator.retry_queue == [] and orchestrator.dead_letters == []
+    assert orchestrator.processing_stats['failed_extractions'] == 0
+    assert orchestrator.processing_stats['successful_extractions'] == 2
+    assert orchestrator.processing_stats['retried_titles'] == 1
+
+    # The recovered result replaces the failure in the report and in markets_processed
+    summary = orchestrator.report_accumulator.summary()
+    assert (summary['total_titles'], summary['completed'], summary['failed']) == (2, 2, 0)
+    operations = orchestrator.db['markets_processed'].bulk_write.call_args.args[0]
+    assert [(op._filter, op._doc['status'], op._upsert) for op in operations] == [
+        ({'_id': results[1].processing_id}, 'completed', True)]
+    assert len(orchestrator.facet_index) == 2
+    assert orchestrator.facet_index.facet_counts('date_range') == {'2030': 2}
+
+
+def test_exhausted_retries_dead_lettered():
+    """The retry worker backs off between attempts, then dead-letters with partial results."""
+    orchestrator = create_orchestrator({"Broken Widget Market": 10}, retry_attempts=3)
+    orchestrator.processBatch(["Broken Widget Market"], batch_id="dead_letter_test")
+
+    start = time.monotonic()
+    orchestrator.processRetryQueue()
+    # Backoff of 0.05s then 0.1s between the three attempts
+    assert time.monotonic() - start >= 0.14
+
+    assert len(orchestrator.retry_results) == 1
+    final = orchestrator.retry_results[0]
+    assert final.status == ProcessingStatus.FAILED
+    assert 'dead_letter' in final.flags
+
+    assert len(orchestrator.dead_letters) == 1
+    letter = orchestrator.dead_letters[0]
+    assert letter['attempts'] == 3
+    assert "date pattern cache unavailable" in letter['last_error']
+    assert letter['component_results']['market_classification']['market_type'] == "standard"
+    collection = orchestrator.db[orchestrator_module.DEAD_LETTER_COLLECTION]
+    collection.replace_one.assert_called_once_with({'_id': letter['_id']}, letter, upsert=True)
+    assert orchestrator.processing_stats['dead_lettered_titles'] == 1
+    assert orchestrator.processing_stats['failed_extractions'] == 1
+    assert orchestrator.report_accumulator.summary()['failed'] == 1
+
+
+def test_retried_result_supersedes_sink_row():
+    """The final retry result is appended to the result sink and replaces the failed row on read."""
+    import tempfile
+    columnar_module = load_module("columnar_results_writer")
+
+    orchestrator = create_orchestrator({"Flaky Widget Market": 1})
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with columnar_module.ColumnarResultsWriter(os.path.join(temp_dir, "results"), backend="numpy") as sink:
+            results = orchestrator.processBatch(["Widget Market", "Flaky Widget Market"], batch_id="sink_test",
+                                                result_sink=sink)
+            orchestrator.retry_queue[0].ready_at = time.monotonic()
+            orchestrator.processRetryQueue(collection_name=None, result_sink=sink)
+        assert sink.rows_written == 3
+
+        columns = columnar_module.read_columnar_results(sink.path, columns=['status'], latest_only=True)
+        assert list(columns['processing_id']) == [result.processing_id for result in results]
+        assert list(columns['status']) == ['completed', 'completed']
+
+
+def test_deduplicated_retry_fans_out():
+    """A deduplicated title that recovers replaces the failure on every source _id, with no orphan."""
+    orchestrator = create_orchestrator({"Flaky Widget Market": 1})
+    source_documents = [
+        {'_id': 'raw_1', 'report_title_short': "Flaky Widget Market"},
+        {'_id': 'raw_2', 'report_title_short': "flaky widget  market"},
+        {'_id': 'raw_3', 'report_title_short': "Widget Market"},
+    ]
+    results, dedup_result = orchestrator.processDeduplicated(source_documents, "dedup_retry")
+    assert [result.status for result in results] == [ProcessingStatus.FAILED, ProcessingStatus.COMPLETED]
+    assert orchestrator.saveDeduplicatedResults(results, dedup_result)
+
+    orchestrator.retry_queue[0].ready_at = time.monotonic()
+    retried = orchestrator.processRetryQueue()
+    assert retried[0].status == ProcessingStatus.COMPLETED
+
+    operations = orchestrator.db['markets_processed'].bulk_write.call_args.args[0]
+    assert [(op._filter, op._doc['status'], op._doc['original_title']) for op in operations] == [
+        ({'_id': 'raw_1'}, 'completed', "Flaky Widget Market"),
+        ({'_id': 'raw_2'}, 'completed', "flaky widget  market")]
+    assert all(op._doc['dedup_processing_id'] == results[0].processing_id for op in operations)
+    assert orchestrator.dedup_retry_groups == {}
+
+
+if __name__ == "__main__":
+    print("Retry Queue and Dead-Letter Tests")
+    print("=" * 50)
+
+    tests = [
+        test_failures_queued_then_retried,
+        test_exhausted_retries_dead_lettered,
+        test_retried_result_supersedes_sink_row,
+        test_deduplicated_retry_fans_out,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+"""
+Test script for Title Deduplicator v1.0
+Validates normalized grouping, dedup statistics and result fan-out to source _ids.
+"""
+
+import os
+import sys
+import logging
+import tempfile
+
+# Import Title Deduplicator using importlib
+import importlib.util
+experiments_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location("title_deduplicator",
+                                              os.path.join(experiments_dir, "00d_title_deduplicator_v1.py"))
+title_deduplicator_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(title_deduplicator_module)
+
+TitleDeduplicator = title_deduplicator_module.TitleDeduplicator
+normalize_title = title_deduplicator_module.normalize_title
+
+# Configure logging for tests
+logging.basicConfig(level=logging.WARNING)
+
+SOURCE_DOCUMENTS = [
+    {'_id': 'a1', 'report_title_short': "Antimicrobial Medical Textiles Market, Industry Report, 2030"},
+    {'_id': 'a2', 'report_title_short': "Antimicrobial Medical Textiles Market, Industry Report, 2030"},
+    {'_id': 'a3', 'report_title_short': "  antimicrobial medical   textiles Market, Industry Report, 2030 "},
+    {'_id': 'b1', 'report_title_short': "U.S. Ammunition Market Size Report, 2030"},
+    {'_id': 'b2', 'report_title_short': "US Ammunition Market Size Report, 2030"},
+    {'_id': 'c1', 'report_title_short': ""},
+    {'_id': 'c2'},
+]
+
+
+def test_normalize_title():
+    """Whitespace and case variants share a key; punctuation does not."""
+    assert normalize_title("  Global  AI Market ") == "global ai market"
+    assert normalize_title("GLOBAL AI MARKET") == normalize_title("global ai market")
+    assert normalize_title("U.S. Market") != normalize_title("US Market")
+    assert normalize_title(None) == ""
+
+
+def test_group_documents():
+    """Exact and whitespace/case duplicates collapse into one group in first-seen order."""
+    result = TitleDeduplicator().group_documents(SOURCE_DOCUMENTS)
+
+    assert len(result.groups) == 3
+    assert result.unique_titles()[0] == SOURCE_DOCUMENTS[0]['report_title_short']
+    assert result.groups[0].source_ids == ['a1', 'a2', 'a3']
+    assert result.groups[1].source_ids == ['b1']
+    assert result.groups[2].source_ids == ['b2']
+
+    stats = result.stats
+    assert stats.total_documents == 7
+    assert stats.skipped_documents == 2
+    assert stats.unique_titles == 3
+    assert stats.duplicate_documents == 2
+    assert stats.exact_duplicates == 1
+    assert stats.variant_duplicates == 1
+    assert abs(stats.dedup_ratio - 5 / 3) < 1e-9
+    assert stats.largest_group_size == 3
+
+
+def test_positional_ids_for_exports():
+    """JSON exports without _id fall back to their position in the stream."""
+    documents = [{'report_title_short': "A Market"}, {'report_title_short': "a market"}]
+    result = TitleDeduplicator().group_documents(documents)
+
+    assert result.groups[0].source_ids == [0, 1]
+
+
+def test_fan_out():
+    """Each unique result is written once per source _id with that source's raw title."""
+    result = TitleDeduplicator().group_documents(SOURCE_DOCUMENTS)
+    processed = [{'topic': f"topic-{i}", 'original_title': title, 'processing_id': f"batch_title_{i:04d}"}
+                 for i, title in enumerate(result.unique_titles())]
+
+    fanned = list(result.fan_out(processed))
+
+    assert [doc['_id'] for doc in fanned] == ['a1', 'a2', 'a3', 'b1', 'b2']
+    assert fanned[2]['original_title'] == SOURCE_DOCUMENTS[2]['report_title_short']
+    assert fanned[2]['topic'] == 'topic-0'
+    assert fanned[2]['dedup_group_size'] == 3
+    assert fanned[3]['topic'] == 'topic-1'
+    # Keyed on one id, like saveResults: _id == processing_id for every document
+    assert all(doc['processing_id'] == doc['_id'] for doc in fanned)
+    assert fanned[2]['dedup_processing_id'] == "batch_title_0000"
+
+
+def test_json_export_object_ids():
+    """Extended JSON {"$oid": ...} ids decode to ObjectIds and upsert onto the source _id."""
+    from bson import ObjectId
+
+    source_id = ObjectId()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        export_path = os.path.join(temp_dir, "markets_raw.json")
+        with open(export_path, 'w', encoding='utf-8') as f:
+            f.write('[{"_id": {"$oid": "%s"}, "report_title_short": "AI Market"}]' % source_id)
+        result = TitleDeduplicator().load_from_json_export(export_path)
+
+    assert result.groups[0].source_ids == [source_id]
+    operation = result.build_bulk_operations([{'processing_id': "batch_title_0000"}])[0]
+    assert operation._filter == {'_id': source_id}
+    assert operation._doc['processing_id'] == source_id
+
+
+def test_fan_out_length_mismatch():
+    """Results must line up with groups."""
+    result = TitleDeduplicator().group_documents(SOURCE_DOCUMENTS)
+    try:
+        list(result.fan_out([{}]))
+    except ValueError:
+        return
+    raise AssertionError("Expected ValueError for misaligned results")
+
+
+if __name__ == "__main__":
+    print("Title Deduplicator Tests")
+    print("=" * 50)
+
+    tests = [
+        test_normalize_title,
+        test_group_documents,
+        test_positional_ids_for_exports,
+        test_fan_out,
+        test_fan_out_length_mismatch,
+        test_json_export_object_ids,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
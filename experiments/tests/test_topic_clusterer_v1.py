@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+
+"""
+Test script for Topic Clusterer v1.0
+Validates that near-duplicate topicName variants (plurals, separators) merge
+under the most frequent canonical topic while distinct topics stay apart, that
+injected variants are recovered at corpus scale with candidate pairs far below
+all-pairs, and the canonical-topic bulk updates.
+"""
+
+import os
+import sys
+import random
+import logging
+
+from pymongo import UpdateMany
+
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, project_root)
+from experiments import load_module
+
+clusterer_module = load_module("topic_clusterer")
+TopicClusterer = clusterer_module.TopicClusterer
+
+# Configure logging for tests
+logging.basicConfig(level=logging.WARNING)
+
+
+def test_variants_merge_distinct_topics_stay_apart():
+    """Plural and separator variants share a cluster; the canonical topic is the most frequent."""
+    result = TopicClusterer().cluster({
+        "antimicrobial-medical-textile": 2,
+        "antimicrobial-medical-textiles": 5,
+        "antimicrobial medical textiles": 1,
+        "batteries": 4,
+        "battery": 1,
+        "5g-chipsets": 3,
+        "4g-chipsets": 2,
+        "type-1-diabetes": 1,
+        "type-2-diabetes": 1,
+        "glass": 1,
+    })
+    assert result.canonical("antimicrobial-medical-textile") == "antimicrobial-medical-textiles"
+    assert result.canonical("antimicrobial medical textiles") == "antimicrobial-medical-textiles"
+    assert result.canonical("battery") == "batteries"
+    for topic in ["5g-chipsets", "4g-chipsets", "type-1-diabetes", "type-2-diabetes", "glass"]:
+        assert result.canonical(topic) == topic
+    assert result.canonical("never-seen") == "never-seen"
+
+    assert result.stats.total_topics == 10
+    assert result.stats.canonical_topics == 7
+    assert result.clusters[0].canonical_topic == "antimicrobial-medical-textiles"
+    assert result.clusters[0].title_count == 8
+
+    operations = result.build_bulk_operations()
+    assert len(operations) == 5 and all(isinstance(op, UpdateMany) for op in operations)
+    assert operations[0]._filter == {'extracted_elements.topicName': "antimicrobial-medical-textiles"}
+    assert operations[0]._doc == {'$set': {'extracted_elements.canonicalTopicName': "antimicrobial-medical-textiles"}}
+
+
+def test_numbered_variants_stay_apart():
+    """Long topics differing only in a number or roman numeral do not merge, directly or through a chain."""
+    pairs = [
+        ("Class II Medical Device Contract Manufacturing", "Class III Medical Device Contract Manufacturing"),
+        ("4G LTE Small Cell Base Station Equipment", "5G LTE Small Cell Base Station Equipment"),
+        ("type-1-diabetes-continuous-glucose-monitoring-devices", "type-2-diabetes-continuous-glucose-monitoring-devices"),
+    ]
+    for first, second in pairs:
+        assert clusterer_module.jaccard(clusterer_module.character_shingles(first),
+                                        clusterer_module.character_shingles(second)) >= 0.8
+        result = TopicClusterer().cluster({first: 3, second: 2})
+        assert result.canonical(second) == second, (first, second)
+        assert result.stats.canonical_topics == 2
+
+    # Plural variants of each numbered topic still merge with their own numeral only
+    result = TopicClusterer().cluster({
+        "class-ii-medical-device-contract-manufacturing": 3,
+        "class-ii-medical-devices-contract-manufacturing": 1,
+        "class-iii-medical-device-contract-manufacturing": 2,
+        "class-iii-medical-devices-contract-manufacturings": 1,
+    })
+    assert result.canonical("class-ii-medical-devices-contract-manufacturing") == \
+        "class-ii-medical-device-contract-manufacturing"
+    assert result.canonical("class-iii-medical-devices-contract-manufacturings") == \
+        "class-iii-medical-device-contract-manufacturing"
+    assert result.stats.canonical_topics == 2
+
+
+def test_negated_and_unfolded_variants_stay_apart():
+    """Topics differing in a negation prefix, or in a word that only looks plural, do not merge."""
+    pairs = [
+        ("organic-fertilizers", "inorganic-fertilizers"),
+        ("manned-aerial-vehicle", "unmanned-aerial-vehicle"),
+        ("news-media", "new-media"),
+        ("woven-fabrics", "non-woven-fabrics"),
+    ]
+    for first, second in pairs:
+        result = TopicClusterer().cluster({first: 3, second: 2})
+        assert result.canonical(second) == second, (first, second)
+        assert result.stats.canonical_topics == 2
+
+    # Variants of the negated topics, and words that merely start with 'in', still merge
+    result = TopicClusterer().cluster({
+        "inorganic-fertilizers": 3,
+        "inorganic-fertilizer": 1,
+        "organic-fertilizers": 2,
+        "non-woven-fabrics": 2,
+        "nonwoven-fabric": 1,
+        "woven-fabrics": 1,
+        "industrial-robots": 2,
+        "industrial-robot": 1,
+        "news-media": 1,
+    })
+    assert result.canonical("inorganic-fertilizer") == "inorganic-fertilizers"
+    assert result.canonical("nonwoven-fabric") == "non-woven-fabrics"
+    assert result.canonical("industrial-robot") == "industrial-robots"
+    assert result.canonical("organic-fertilizers") == "organic-fertilizers"
+    assert result.canonical("woven-fabrics") == "woven-fabrics"
+    assert result.stats.canonical_topics == 6
+
+
+def test_scale_recovers_injected_variants():
+    """Injected plural and spelling variants are all recovered among 19k topics without all-pairs comparison."""
+    rng = random.Random(3)
+    words = [''.join(rng.choice('abcdefghijklmnopqrstuvwxyz') for _ in range(rng.randint(5, 10))) + 'x'
+             for _ in range(4000)]
+    base_topics = list(dict.fromkeys('-'.join(rng.sample(words, 3)) for _ in range(18800)))
+    # Plurals merge on the folded key; one-letter suffix edits only through LSH + Jaccard verification
+    variants = {topic + 's': topic for topic in base_topics[:100]}
+    variants.update({topic + 'e': topic for topic in base_topics[100:200]})
+
+    topic_counts = {topic: 2 for topic in base_topics}
+    topic_counts.update({variant: 1 for variant in variants})
+    result = TopicClusterer().cluster(topic_counts)
+
+    for variant, topic in variants.items():
+        assert result.canonical(variant) == topic
+    assert result.stats.merged_topics == len(variants)
+    n = result.stats.total_topics
+    assert result.stats.candidate_pairs < n * 5, result.stats.candidate_pairs  # all-pairs would be ~n^2 / 2
+
+
+def test_cluster_topics_counts_stream():
+    """cluster_topics counts one topicName per title and ignores empty topics."""
+    result = TopicClusterer().cluster_topics(["smart-meters", "smart-meter", "smart-meter", "", None])
+    assert result.clusters[0].members == ["smart-meter", "smart-meters"]
+    assert result.clusters[0].title_count == 3
+
+
+if __name__ == "__main__":
+    print("Topic Clusterer Tests")
+    print("=" * 50)
+
+    tests = [
+        test_variants_merge_distinct_topics_stay_apart,
+        test_numbered_variants_stay_apart,
+        test_negated_and_unfolded_variants_stay_apart,
+        test_scale_recovers_injected_variants,
+        test_cluster_topics_counts_stream,
+    ]
+
+    failures = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failures += 1
+            print(f"❌ {test.__name__}: {e}")
+
+    print(f"\n{len(tests) - failures}/{len(tests)} tests passed")
+    sys.exit(1 if failures else 0)
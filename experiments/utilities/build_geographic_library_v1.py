@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Geographic Library Builder v1
+Builds the geographic_entity pattern library from regions.json,
+region-candidates.json and region_mappings.json with pandas and emits one
+bulk_write diff against pattern_libraries.
+
+Replaces the per-entity loops of merge_geographic_entities_v1.py (merge and
+conflict resolution, same rules), update_geographic_patterns_from_mappings.py
+(alias cleaning, priorities) and integrate_geographic_patterns_v1.py
+(add-only update of existing documents), which pushed changes one document
+at a time.
+
+Usage:
+    python3 build_geographic_library_v1.py                 # Plan and save the diff (dry run)
+    python3 build_geographic_library_v1.py --apply         # Plan, save and apply with one bulk_write
+    python3 build_geographic_library_v1.py --resources-dir PATH --no-mappings
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple, Any, Optional
+
+# Cached pipeline module loader
+_project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
+from experiments import load_module
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESOURCES_DIR = os.path.join(_project_root, "resources")
+
+# Alias conflict resolution: the alias stays with the most specific entity type
+# (resolve_conflicts in merge_geographic_entities_v1.py)
+TYPE_RESOLUTION_SCORE = {
+    'country': 10,
+    'us_state': 9,
+    'major_city': 8,
+    'canadian_province': 7,
+    'chinese_region': 6,
+    'indian_state': 6,
+    'brazilian_state': 6,
+    'german_state': 6,
+    'french_region': 6,
+    'japanese_region': 6,
+    'uk_region': 6,
+    'metropolitan_area': 5,
+    'tech_region': 4,
+    'census_region': 3,
+    'sub_regional': 2,
+    'multi_regional': 1,
+    'unknown': 0
+}
+
+# Pattern priority by entity type (get_priority_for_type in merge_geographic_entities_v1.py)
+TYPE_PATTERN_PRIORITY = {
+    'country': 10,
+    'us_state': 9,
+    'major_city': 8,
+    'canadian_province': 7,
+    'chinese_region': 6,
+    'indian_state': 6,
+    'brazilian_state': 6,
+    'german_state': 6,
+    'french_region': 6,
+    'japanese_region': 6,
+    'uk_region': 6,
+    'metropolitan_area': 5,
+    'tech_region': 4,
+    'census_region': 3,
+    'sub_regional': 2,
+    'multi_regional': 1,
+    'trade_bloc': 5,
+    'market_designation': 3,
+    'global': 8,
+    'continental': 7,
+    'oceanic': 4,
+    'designation': 2,
+    'historical_country': 5,
+    'us_territory': 7,
+    'us_city': 6,
+    'us_regional': 4
+}
+DEFAULT_TYPE_PRIORITY = 1
+
+# Priorities for region_mappings.json entries (determine_priority in update_geographic_patterns_from_mappings.py)
+MAPPING_PRIORITIES = {
+    1: ["Europe, Middle East and Africa", "Middle East and Africa", "Asia Pacific and India",
+        "Southern Europe and Middle East", "Association of Southeast Asian Nations"],
+    2: ["North America", "South America", "Central America", "Latin America", "Middle East",
+        "Asia Pacific", "South East Asia", "East Asia"],
+    3: ["Europe", "European Union", "Asia", "Africa", "Global", "Americas", "Caribbean", "Oceania"],
+    4: ["United States", "Brazil", "Malaysia", "Saudi Arabia", "United Arab Emirates", "Philippines"],
+}
+DEFAULT_MAPPING_PRIORITY = 3
+MAPPING_ENTITY_TYPE = 'unknown'
+
+# Punctuated variants kept as aliases (everything else with - ( ) . is dropped)
+SIMPLE_PUNCTUATED_ALIASES = {"U.S.", "US", "USA", "U.S.A.", "EU", "UAE", "U.A.E.", "APAC", "MEA", "EMEA", "ASEAN"}
+MAX_ALIAS_LENGTH = 50
+
+
+def get_timestamps() -> Dict[str, str]:
+    """Generate PDT and UTC timestamps"""
+    import pytz
+    utc_now = datetime.now(pytz.UTC)
+    pdt_now = utc_now.astimezone(pytz.timezone('US/Pacific'))
+
+    return {
+        'pdt': pdt_now.strftime('%Y-%m-%d %H:%M:%S PDT'),
+        'utc': utc_now.strftime('%Y-%m-%d %H:%M:%S UTC'),
+        'filename': pdt_now.strftime('%Y%m%d_%H%M%S')
+    }
+
+
+def normalize(series):
+    """Normalize terms for comparison (lowercase, strip spaces)."""
+    return series.str.lower().str.strip()
+
+
+def load_source_frames(resources_dir: str = DEFAULT_RESOURCES_DIR):
+    """
+    Load the three source files into frames.
+
+    Returns:
+        (entities, mappings): entities has one row per source entity in file order
+        (order, term, type, source, from_regions, aliases); mappings has one row per
+        region_mappings entry (standardized, variants)
+    """
+    import pandas as pd
+
+    def read(file_name: str) -> Dict:
+        with open(os.path.join(resources_dir, file_name), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    regions = pd.DataFrame(read("regions.json").get('geographic_entities', []))
+    regions['source'] = 'regions.json'
+
+    candidate_frames = [
+        pd.DataFrame(category.get('entities', [])).assign(source=f"candidates:{category.get('category', 'unknown')}")
+        for category in read("region-candidates.json").get('geographic_entities', [])
+    ]
+    entities = pd.concat([regions] + candidate_frames, ignore_index=True)
+    entities['type'] = entities.get('type', pd.Series(index=entities.index, dtype=object)).fillna('unknown')
+    entities['aliases'] = entities['aliases'].apply(lambda value: value if isinstance(value, list) else [])
+    entities['from_regions'] = entities['source'] == 'regions.json'
+    entities['order'] = range(len(entities))
+
+    mappings = pd.DataFrame(read("region_mappings.json").get('regions', []), columns=['standardized', 'variants'])
+    return entities[['order', 'term', 'type', 'source', 'from_regions', 'aliases']], mappings
+
+
+def _explode_aliases(frame, list_column: str = 'aliases'):
+    """One row per (entity row, alias) with the alias position inside its list."""
+    exploded = frame.explode(list_column)
+    exploded = exploded[exploded[list_column].notna()].rename(columns={list_column: 'alias'})
+    exploded['position'] = exploded.groupby(level=0).cumcount()
+    exploded['norm_alias'] = normalize(exploded['alias'])
+    return exploded.reset_index(drop=True)
+
+
+def merge_entities(entities) -> Tuple[Any, Any]:
+    """
+    Merge regions.json and candidate entities by normalized term.
+
+    The first entity of a normalized term owns it (term, type, alias list). Later
+    candidate entities contribute aliases not yet present (and not equal to the
+    term) plus their source; later regions.json duplicates are ignored.
+
+    Returns:
+        (library, aliases): library has one row per normalized term in first-seen
+        order (norm_term, term, type, sources, term_order); aliases has one row per
+        kept alias (norm_term, alias, norm_alias, sort keys)
+    """
+    entities = entities.copy()
+    entities['norm_term'] = normalize(entities['term'])
+    entities['is_owner'] = ~entities.duplicated('norm_term', keep='first')
+    contributing = entities[entities['is_owner'] | ~entities['from_regions']]
+
+    library = contributing[contributing['is_owner']][['norm_term', 'term', 'type', 'order']]
+    library = library.rename(columns={'order': 'term_order'}).reset_index(drop=True)
+
+    sources = (contributing.drop_duplicates(['norm_term', 'source'])
+               .groupby('norm_term', sort=False)['source'].agg(list))
+    library['sources'] = library['norm_term'].map(sources)
+
+    aliases = _explode_aliases(contributing[['norm_term', 'order', 'is_owner', 'aliases']])
+    # Owners keep their list as-is; contributed aliases skip the term itself and anything already present
+    aliases = aliases[aliases['is_owner'] | (aliases['norm_alias'] != aliases['norm_term'])]
+    aliases = aliases.sort_values(['order', 'position'], kind='stable')
+    already_present = aliases.duplicated(['norm_term', 'norm_alias'], keep='first')
+    aliases = aliases[aliases['is_owner'] | ~already_present]
+
+    aliases = aliases.merge(library[['norm_term', 'term_order']], on='norm_term', how='left')
+    aliases = aliases.sort_values(['term_order', 'order', 'position'], kind='stable').reset_index(drop=True)
+    return library, aliases[['norm_term', 'alias', 'norm_alias', 'term_order', 'order', 'position']]
+
+
+def detect_alias_conflicts(library, aliases):
+    """
+    Aliases used by more than one entry, with the entry that keeps each.
+
+    Returns:
+        Frame with norm_alias, terms (normalized terms using it, in library order)
+        and winner (normalized term with the highest TYPE_RESOLUTION_SCORE, first wins ties)
+    """
+    import pandas as pd
+
+    shared = aliases[aliases.duplicated('norm_alias', keep=False)]
+    if shared.empty:
+        return pd.DataFrame(columns=['norm_alias', 'terms', 'winner'])
+
+    shared = shared.merge(library[['norm_term', 'type']], on='norm_term', how='left')
+    shared['score'] = shared['type'].map(TYPE_RESOLUTION_SCORE).fillna(0)
+    shared = shared.sort_values(['term_order', 'order', 'position'], kind='stable').reset_index(drop=True)
+
+    grouped = shared.groupby('norm_alias', sort=False)
+    conflicts = grouped['norm_term'].agg(list).rename('terms').to_frame()
+    conflicts['winner'] = shared.loc[grouped['score'].idxmax(), ['norm_alias', 'norm_term']] \
+        .set_index('norm_alias')['norm_term']
+    return conflicts.reset_index()
+
+
+def resolve_alias_conflicts(aliases, conflicts):
+    """Drop every conflicting alias from all entries except the winner."""
+    if conflicts.empty:
+        return aliases
+    winners = conflicts.set_index('norm_alias')['winner']
+    winner = aliases['norm_alias'].map(winners)
+    return aliases[winner.isna() | (winner == aliases['norm_term'])].reset_index(drop=True)
+
+
+def clean_mapping_aliases(mappings):
+    """
+    Vectorized alias cleaning for region_mappings.json variants.
+
+    Keeps variants that differ from the standardized term; punctuated variants
+    only when whitelisted; drops overly long ones and space-only respellings;
+    exact duplicates are removed in order.
+    """
+    variants = mappings.explode('variants').rename(columns={'variants': 'alias'})
+    variants = variants[variants['alias'].notna()]
+    variants['position'] = variants.groupby(level=0).cumcount()
+    variants = variants.reset_index().rename(columns={'index': 'mapping_order'})
+
+    alias = variants['alias']
+    standardized = variants['standardized']
+    punctuated = alias.str.contains(r'[\-().]', regex=True)
+    keep = alias != standardized
+    keep &= ~punctuated | alias.isin(SIMPLE_PUNCTUATED_ALIASES)
+    keep &= punctuated | (alias.str.len() <= MAX_ALIAS_LENGTH)
+    keep &= punctuated | (alias.str.replace(' ', '', regex=False) != standardized.str.replace(' ', '', regex=False))
+
+    cleaned = variants[keep].drop_duplicates(['mapping_order', 'alias'])
+    cleaned = cleaned.assign(norm_term=normalize(cleaned['standardized']), norm_alias=normalize(cleaned['alias']))
+    return cleaned[['mapping_order', 'standardized', 'norm_term', 'alias', 'norm_alias', 'position']]
+
+
+def mapping_priorities(mappings):
+    """Priority per region_mappings entry (default 3)."""
+    priority_by_term = {term: priority for priority, terms in MAPPING_PRIORITIES.items() for term in terms}
+    return mappings['standardized'].map(priority_by_term).fillna(DEFAULT_MAPPING_PRIORITY).astype(int)
+
+
+def apply_mappings(library, aliases, mappings) -> Tuple[Any, Any]:
+    """
+    Overlay region_mappings.json: new standardized terms become entries and
+    cleaned variants are appended as aliases when not already present.
+    """
+    import pandas as pd
+
+    mappings = mappings.assign(norm_term=normalize(mappings['standardized']), priority=mapping_priorities(mappings))
+    mappings = mappings.drop_duplicates('norm_term')
+
+    new_terms = mappings[~mappings['norm_term'].isin(library['norm_term'])]
+    next_order = int(library['term_order'].max()) + 1 if len(library) else 0
+    library = pd.concat([library, pd.DataFrame({
+        'norm_term': new_terms['norm_term'],
+        'term': new_terms['standardized'],
+        'type': MAPPING_ENTITY_TYPE,
+        'term_order': range(next_order, next_order + len(new_terms)),
+        'sources': [['region_mappings.json']] * len(new_terms),
+        'mapping_priority': new_terms['priority']
+    })], ignore_index=True)
+
+    cleaned = clean_mapping_aliases(mappings)
+    cleaned = cleaned[cleaned['norm_alias'] != cleaned['norm_term']]
+    existing_keys = aliases[['norm_term', 'norm_alias']].assign(present=True)
+    cleaned = cleaned.merge(existing_keys.drop_duplicates(), on=['norm_term', 'norm_alias'], how='left')
+    cleaned = cleaned[cleaned['present'].isna()].drop_duplicates(['norm_term', 'norm_alias'])
+
+    cleaned = cleaned.merge(library[['norm_term', 'term_order']], on='norm_term', how='left')
+    max_order = int(aliases['order'].max()) + 1 if len(aliases) else 0
+    additions = pd.DataFrame({
+        'norm_term': cleaned['norm_term'],
+        'alias': cleaned['alias'],
+        'norm_alias': cleaned['norm_alias'],
+        'term_order': cleaned['term_order'],
+        'order': max_order + cleaned['mapping_order'],
+        'position': cleaned['position']
+    })
+    aliases = pd.concat([aliases, additions], ignore_index=True)
+    aliases = aliases.sort_values(['term_order', 'order', 'position'], kind='stable').reset_index(drop=True)
+    return library, aliases
+
+
+def build_geographic_library(resources_dir: str = DEFAULT_RESOURCES_DIR, include_mappings: bool = True) -> Dict[str, Any]:
+    """
+    Build the geographic library from the resource files.
+
+    Returns:
+        Dict with 'library' (frame: norm_term, term, type, priority, sources, aliases),
+        'conflicts' (frame) and 'statistics'
+    """
+    start = time.perf_counter()
+    entities, mappings = load_source_frames(resources_dir)
+    library, aliases = merge_entities(entities)
+    if include_mappings and len(mappings):
+        library, aliases = apply_mappings(library, aliases, mappings)
+
+    conflicts = detect_alias_conflicts(library, aliases)
+    aliases = resolve_alias_conflicts(aliases, conflicts)
+
+    alias_lists = aliases.groupby('norm_term', sort=False)['alias'].agg(list)
+    library = library.sort_values('term_order', kind='stable').reset_index(drop=True)
+    library['aliases'] = library['norm_term'].map(alias_lists).apply(lambda value: value if isinstance(value, list) else [])
+    priority = library['type'].map(TYPE_PATTERN_PRIORITY).fillna(DEFAULT_TYPE_PRIORITY)
+    if 'mapping_priority' in library:
+        priority = library['mapping_priority'].fillna(priority)
+    library['priority'] = priority.astype(int)
+
+    statistics = {
+        'source_entities': len(entities),
+        'library_entries': len(library),
+        'aliases': int(library['aliases'].str.len().sum()),
+        'conflicts_resolved': len(conflicts),
+        'mapping_entries': len(mappings) if include_mappings else 0,
+        'build_seconds': time.perf_counter() - start
+    }
+    logger.info(f"Built geographic library: {statistics['library_entries']} entries, "
+                f"{statistics['aliases']} aliases, {statistics['conflicts_resolved']} conflicts resolved "
+                f"in {statistics['build_seconds']:.2f}s")
+    return {
+        'library': library[['norm_term', 'term', 'type', 'priority', 'sources', 'aliases']],
+        'conflicts': conflicts,
+        'statistics': statistics
+    }
+
+
+def plan_library_diff(library, existing_docs: List[Dict[str, Any]], timestamp_utc: str) -> Dict[str, Any]:
+    """
+    Diff the built library against existing geographic_entity documents.
+
+    Existing documents (matched by normalized term) only gain aliases, a missing
+    entity_type and sources, as in integrate_geographic_patterns_v1.py. Aliases
+    already owned (as term or alias) by a different existing document are skipped
+    so the diff never creates cross-document conflicts.
+
+    Returns:
+        Dict with 'operations' (pymongo InsertOne/UpdateOne list), 'inserts',
+        'updates' and 'skipped_aliases' (JSON-friendly detail)
+    """
+    import pandas as pd
+    from pymongo import InsertOne, UpdateOne
+
+    existing = pd.DataFrame(existing_docs, columns=['_id', 'term', 'aliases', 'entity_type', 'source_files'])
+    existing['norm_term'] = normalize(existing['term'].fillna(''))
+    existing['aliases'] = existing['aliases'].apply(lambda value: value if isinstance(value, list) else [])
+    existing['source_files'] = existing['source_files'].apply(lambda value: value if isinstance(value, list) else [])
+    existing = existing.drop_duplicates('norm_term', keep='first').rename(columns={'_id': 'doc_id'})
+
+    # Who owns every normalized term/alias in the database today
+    existing_alias_rows = _explode_aliases(existing[['norm_term', 'aliases']])
+    owners = pd.concat([
+        existing[['norm_term']].assign(norm_alias=existing['norm_term']),
+        existing_alias_rows[['norm_term', 'norm_alias']]
+    ]).drop_duplicates('norm_alias').rename(columns={'norm_term': 'owner'})
+
+    built_aliases = _explode_aliases(library[['norm_term', 'aliases']])
+    built_aliases = built_aliases.merge(owners, on='norm_alias', how='left')
+    cross_conflict = built_aliases['owner'].notna() & (built_aliases['owner'] != built_aliases['norm_term'])
+    skipped = built_aliases[cross_conflict]
+    built_aliases = built_aliases[~cross_conflict]
+    already_present = built_aliases['owner'] == built_aliases['norm_term']
+
+    new_aliases = built_aliases[~already_present].groupby('norm_term', sort=False)['alias'].agg(list)
+    kept_aliases = built_aliases.groupby('norm_term', sort=False)['alias'].agg(list)
+
+    matched = library.merge(existing[['doc_id', 'norm_term', 'aliases', 'entity_type', 'source_files']],
+                            on='norm_term', how='left', suffixes=('', '_existing'))
+    operations, inserts, updates = [], [], []
+
+    for row in matched[matched['doc_id'].isna()].itertuples(index=False):
+        document = {
+            "type": "geographic_entity",
+            "term": row.term,
+            "aliases": kept_aliases.get(row.norm_term, []),
+            "priority": int(row.priority),
+            "active": True,
+            "success_count": 0,
+            "failure_count": 0,
+            "created_date": timestamp_utc,
+            "last_updated": timestamp_utc,
+            "source_files": list(row.sources),
+            "entity_type": row.type
+        }
+        operations.append(InsertOne(document))
+        inserts.append({'term': row.term, 'aliases': document['aliases'], 'priority': document['priority']})
+
+    for row in matched[matched['doc_id'].notna()].itertuples(index=False):
+        added = new_aliases.get(row.norm_term, [])
+        added_sources = [source for source in row.sources if source not in row.source_files]
+        missing_type = not isinstance(row.entity_type, str)
+        if not (added or added_sources or missing_type):
+            continue
+        changes = {
+            "aliases": list(row.aliases_existing) + added,
+            "source_files": list(row.source_files) + added_sources,
+            "last_updated": timestamp_utc
+        }
+        if missing_type:
+            changes["entity_type"] = row.type
+        operations.append(UpdateOne({"_id": row.doc_id}, {"$set": changes}))
+        updates.append({'_id': str(row.doc_id), 'term': row.term, 'added_aliases': added,
+                        'added_sources': added_sources, 'set_entity_type': missing_type})
+
+    return {
+        'operations': operations,
+        'inserts': inserts,
+        'updates': updates,
+        'skipped_aliases': skipped[['norm_term', 'alias', 'owner']].to_dict('records')
+    }
+
+
+def apply_library_diff(collection, operations: List[Any]) -> Dict[str, int]:
+    """Apply the whole diff with one unordered bulk_write."""
+    if not operations:
+        return {'inserted': 0, 'modified': 0}
+    result = collection.bulk_write(operations, ordered=False)
+    return {'inserted': result.inserted_count, 'modified': result.modified_count}
+
+
+def save_diff_report(build: Dict[str, Any], diff: Dict[str, Any], timestamps: Dict[str, str],
+                     applied: Optional[Dict[str, int]] = None) -> str:
+    """Save the diff and build summary to the organized output directory."""
+    output_module = load_module("output_directory_manager")
+    output_dir = output_module.create_organized_output_directory("geographic_library_build")
+    report = {
+        'analysis_date_pdt': timestamps['pdt'],
+        'analysis_date_utc': timestamps['utc'],
+        'statistics': build['statistics'],
+        'applied': applied,
+        'inserts': diff['inserts'],
+        'updates': diff['updates'],
+        'skipped_aliases': diff['skipped_aliases'],
+        'conflicts': build['conflicts'].to_dict('records')
+    }
+    with open(os.path.join(output_dir, "geographic_library_diff.json"), 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False, default=str)
+    return output_dir
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the geographic pattern library and diff it against MongoDB")
+    parser.add_argument("--resources-dir", default=DEFAULT_RESOURCES_DIR, help="Directory with the source JSON files")
+    parser.add_argument("--no-mappings", action="store_true", help="Skip region_mappings.json")
+    parser.add_argument("--apply", action="store_true", help="Apply the diff with one bulk_write")
+    args = parser.parse_args()
+
+    timestamps = get_timestamps()
+    build = build_geographic_library(args.resources_dir, include_mappings=not args.no_mappings)
+
+    conn_module = load_module("mongodb_connection_manager")
+    collection = conn_module.get_database(connection_string=os.getenv('MONGODB_URI'))['pattern_libraries']
+    existing_docs = list(conn_module.find_projected(
+        collection, {"type": "geographic_entity"}, ['term', 'aliases', 'entity_type', 'source_files']))
+
+    diff = plan_library_diff(build['library'], existing_docs, timestamps['utc'])
+    print(f"Library entries: {build['statistics']['library_entries']} "
+          f"(built in {build['statistics']['build_seconds']:.2f}s)")
+    print(f"Existing documents: {len(existing_docs)}")
+    print(f"Planned: {len(diff['inserts'])} inserts, {len(diff['updates'])} updates, "
+          f"{len(diff['skipped_aliases'])} aliases skipped (owned by another document)")
+
+    applied = None
+    if args.apply:
+        applied = apply_library_diff(collection, diff['operations'])
+        print(f"Applied: {applied['inserted']} inserted, {applied['modified']} modified")
+    else:
+        print("Dry run - pass --apply to write the diff")
+
+    output_dir = save_diff_report(build, diff, timestamps, applied)
+    print(f"Diff report: {output_dir}")
+
+
+if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    main()
@@ -1,14 +1,52 @@
 #!/usr/bin/env python3
 
 import os
+import sys
 import json
-from pymongo import MongoClient
 from dotenv import load_dotenv
 from collections import defaultdict
 
+# Cached pipeline module loader
+_project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if _project_root not in sys.path:
+    sys.path.append(_project_root)
+from experiments import load_module
+
 # Load environment variables
 load_dotenv()
 
+DETAIL_FIELDS = ['term', 'pattern', 'format_type', 'priority', 'active', 'created_date', 'notes']
+
+def load_duplicate_groups(manager):
+    """
+    Duplicate report_type term groups with per-document details.
+
+    Grouping on normalized term runs server-side and a client-side pass merges
+    case/whitespace/punctuation variants; details are then fetched for the
+    duplicate IDs only.
+    """
+    pattern_module = load_module("pattern_library_manager")
+    conn_module = load_module("mongodb_connection_manager")
+    audit = manager.find_duplicate_patterns(pattern_module.PatternType.REPORT_TYPE, group_by_subtype=False)
+
+    groups = [{"_id": " / ".join(group["terms"]), "count": group["count"], "ids": group["ids"]}
+              for group in audit["duplicate_groups"]]
+
+    duplicate_ids = [doc_id for group in groups for doc_id in group["ids"]]
+    details = {doc["_id"]: doc for doc in conn_module.find_projected(
+        manager.collection, {"_id": {"$in": duplicate_ids}}, DETAIL_FIELDS)}
+
+    for group in groups:
+        group["docs"] = [{"id": doc_id,
+                          "pattern": details.get(doc_id, {}).get("pattern"),
+                          "format_type": details.get(doc_id, {}).get("format_type"),
+                          "priority": details.get(doc_id, {}).get("priority"),
+                          "active": details.get(doc_id, {}).get("active"),
+                          "created": details.get(doc_id, {}).get("created_date"),
+                          "notes": details.get(doc_id, {}).get("notes")}
+                         for doc_id in group.pop("ids")]
+    return sorted(groups, key=lambda group: -group["count"])
+
 def analyze_all_duplicates():
     """Complete analysis of all duplicate report type patterns"""
     
@@ -18,34 +56,14 @@ def analyze_all_duplicates():
         print("ERROR: MONGODB_URI not found in environment")
         return False
         
-    client = MongoClient(mongodb_uri)
-    db = client['deathstar']
-    collection = db['pattern_libraries']
+    pattern_module = load_module("pattern_library_manager")
+    manager = pattern_module.PatternLibraryManager(mongodb_uri)
     
     print("=== COMPLETE DUPLICATE PATTERN ANALYSIS ===")
     print("GitHub Issue #16 - Systematic Audit\n")
     
-    # Get all report_type documents grouped by term
-    pipeline = [
-        {"$match": {"type": "report_type"}},
-        {"$group": {
-            "_id": "$term",
-            "count": {"$sum": 1},
-            "docs": {"$push": {
-                "id": "$_id",
-                "pattern": "$pattern", 
-                "format_type": "$format_type",
-                "priority": "$priority",
-                "active": "$active",
-                "created": "$created_date",
-                "notes": "$notes"
-            }}
-        }},
-        {"$match": {"count": {"$gt": 1}}},
-        {"$sort": {"count": -1}}
-    ]
-    
-    duplicates = list(collection.aggregate(pipeline))
+    # Duplicate report_type documents grouped by normalized term
+    duplicates = load_duplicate_groups(manager)
     
     print(f"Found {len(duplicates)} terms with duplicate patterns")
     print(f"Total duplicate documents: {sum(dup['count'] for dup in duplicates)}")
@@ -155,7 +173,7 @@ def analyze_all_duplicates():
     print("3. Implement pattern deduplication")
     print("4. Test Script 03 priority system")
     
-    client.close()
+    manager.close_connection()
     return True
 
 if __name__ == "__main__":